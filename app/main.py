@@ -88,23 +88,49 @@ def startup_event():
     Specification: docs/req.txt section 2.3
 
     Job Recovery:
-    - Any jobs left in "running" status from a previous server crash
+    - Jobs still in the durable job queue are submitted to the scheduler
+      again and continue with their unfinished items. With JOB_RUNNER=worker
+      they are left to the standalone workers instead.
+    - Any other jobs left in "running" status from a previous server crash
       are marked as "error" to prevent them from staying stuck forever.
     - This ensures users can see that those jobs were interrupted.
     """
     import json
     from backend.database import init_db, SessionLocal
     from backend.database.models import Job, JobItem, WorkflowJob
+    from backend.job_queue import external_workers_enabled, get_job_queue_store, recover_queued_jobs
+    from backend.job_scheduler import get_job_scheduler, load_job_scheduler_settings
     from datetime import datetime
 
     init_db()
     print("✓ Database initialized")
 
+    # Queue Recovery: Resubmit jobs that had not finished
+    resumed_job_ids = []
+    db = SessionLocal()
+    try:
+        if external_workers_enabled():
+            resumed_job_ids = [entry.job_id for entry in get_job_queue_store().prune()]
+            print(f"✓ Jobs run on standalone workers ({len(resumed_job_ids)} queued)")
+        else:
+            scheduler = get_job_scheduler()
+            scheduler.configure(**load_job_scheduler_settings(db))
+            resumed_job_ids = recover_queued_jobs(get_job_queue_store(), scheduler)
+            if resumed_job_ids:
+                print(f"✓ Resumed {len(resumed_job_ids)} queued job(s): {resumed_job_ids}")
+    except Exception as e:
+        print(f"⚠ Queue recovery failed: {e}")
+    finally:
+        db.close()
+
     # Job Recovery: Mark stale "running" jobs as error
     db = SessionLocal()
     try:
         # Find all jobs stuck in "running" status (from previous server crash)
-        stale_jobs = db.query(Job).filter(Job.status == "running").all()
+        stale_jobs = db.query(Job).filter(
+            Job.status == "running",
+            Job.id.notin_(resumed_job_ids)
+        ).all()
 
         if stale_jobs:
             print(f"⚠ Found {len(stale_jobs)} stale job(s) in 'running' status")
@@ -23,7 +23,8 @@ from backend.agent.task_runner import (
 from backend.mcp.tools import get_tool_registry
 from backend.agent.policy import get_policy_layer, OutputFilter
 from backend.database.database import SessionLocal
-from backend.database.models import AgentSession as AgentSessionDB, AgentMessage as AgentMessageDB, AgentTask as AgentTaskDB, SystemSetting
+from backend.database.models import AgentSession as AgentSessionDB, AgentMessage as AgentMessageDB, AgentTask as AgentTaskDB
+from backend.settings_cache import get_settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -51,16 +52,7 @@ def get_agent_stream_timeout() -> int:
     DEFAULT_TIMEOUT = 300  # 5 minutes
     db = SessionLocal()
     try:
-        setting = db.query(SystemSetting).filter(
-            SystemSetting.key == "agent_stream_timeout"
-        ).first()
-        if setting and setting.value:
-            try:
-                timeout = int(setting.value)
-                return max(60, min(timeout, 1800))
-            except ValueError:
-                return DEFAULT_TIMEOUT
-        return DEFAULT_TIMEOUT
+        return get_settings_cache().get_int(db, "agent_stream_timeout", DEFAULT_TIMEOUT, 60, 1800)
     finally:
         db.close()
 
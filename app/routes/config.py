@@ -85,7 +85,13 @@ def get_config(project_id: int = 1, db: Session = Depends(get_db)):
                 parsed_response=item.parsed_response,
                 status=item.status,
                 error_message=item.error_message,
-                turnaround_ms=item.turnaround_ms
+                turnaround_ms=item.turnaround_ms,
+                ttft_ms=item.ttft_ms,
+                tokens_per_second=item.tokens_per_second,
+                prompt_tokens=item.prompt_tokens,
+                completion_tokens=item.completion_tokens,
+                reasoning_tokens=item.reasoning_tokens,
+                cached_tokens=item.cached_tokens
             )
             for item in job_items
         ]
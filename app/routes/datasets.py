@@ -17,6 +17,7 @@ import io
 import json
 
 from backend.database import get_db, Dataset, Job, JobItem, Project, ProjectDataset
+from backend.database.dialect import get_table_columns, insert_returning_id
 from backend.dataset import DatasetImporter
 
 router = APIRouter()
@@ -744,9 +745,7 @@ async def append_excel_to_dataset(
         data_rows = data_rows[1:]
 
         # Get existing columns
-        pragma_sql = f'PRAGMA table_info("{dataset.sqlite_table_name}")'
-        result = db.execute(text(pragma_sql))
-        existing_columns = [row[1] for row in result if row[1] != "id"]
+        existing_columns = [col for col in get_table_columns(db, dataset.sqlite_table_name) if col != "id"]
 
         # Sanitize and map columns
         columns = [importer._sanitize_column_name(col) for col in header]
@@ -882,9 +881,7 @@ async def import_csv_dataset(
                 raise HTTPException(status_code=404, detail="Target dataset not found")
 
             # Get existing columns
-            pragma_sql = f'PRAGMA table_info("{dataset.sqlite_table_name}")'
-            result = db.execute(text(pragma_sql))
-            existing_columns = [row[1] for row in result if row[1] != "id"]
+            existing_columns = [col for col in get_table_columns(db, dataset.sqlite_table_name) if col != "id"]
 
             # Sanitize columns
             columns = [importer._sanitize_column_name(col) for col in header]
@@ -955,7 +952,7 @@ async def import_from_job(
     """Import dataset from job execution results.
 
     IMPORTANT: Header and data order consistency
-    - First try job.merged_csv_output (most reliable)
+    - First try the job's merged CSV (most reliable)
     - If csv_header exists: use csv_header + csv_output (same source, safe)
     - If csv_header missing: regenerate BOTH from fields (ignore csv_output)
     """
@@ -967,9 +964,13 @@ async def import_from_job(
     all_rows = []
     header = None
 
-    # First, try to use job.merged_csv_output if available (most reliable)
-    if job.merged_csv_output:
-        lines = [line.strip() for line in job.merged_csv_output.strip().split("\n") if line.strip()]
+    # First, try to use the job's merged CSV (stored or file-backed) if available (most reliable)
+    if job.has_merged_csv:
+        try:
+            with job.open_merged_csv() as stream:
+                lines = [line.strip() for line in stream if line.strip()]
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Merged CSV file is not readable: {e}")
         if lines:
             # First line is header
             header = lines[0].split(",")
@@ -1044,9 +1045,7 @@ async def import_from_job(
                 raise HTTPException(status_code=404, detail="Target dataset not found")
 
             # Get existing columns
-            pragma_sql = f'PRAGMA table_info("{dataset.sqlite_table_name}")'
-            result = db.execute(text(pragma_sql))
-            existing_columns = [row[1] for row in result if row[1] != "id"]
+            existing_columns = [col for col in get_table_columns(db, dataset.sqlite_table_name) if col != "id"]
 
             # Add RowID if requested (append mode)
             if request.add_row_id:
@@ -1312,7 +1311,7 @@ def get_dataset_rows(
 ):
     """Get dataset rows with rowid for editing.
 
-    Returns rows with SQLite rowid for identification.
+    Returns rows with their id (as "rowid") for identification.
     """
     dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
     if not dataset:
@@ -1324,25 +1323,24 @@ def get_dataset_rows(
 
     try:
         # Get column names
-        col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-        columns = [row[1] for row in col_result]
+        columns = get_table_columns(db, table_name)
 
         # Get total count
         count_result = db.execute(text(f'SELECT COUNT(*) FROM "{table_name}"'))
         total_count = count_result.scalar()
 
-        # Get rows with rowid
+        # Get rows with their id as rowid
         cols_sql = ', '.join([f'"{c}"' for c in columns])
         if limit > 0:
-            sql = f'SELECT rowid, {cols_sql} FROM "{table_name}" LIMIT :limit OFFSET :offset'
+            sql = f'SELECT id, {cols_sql} FROM "{table_name}" ORDER BY id LIMIT :limit OFFSET :offset'
             result = db.execute(text(sql), {"limit": limit, "offset": offset})
         else:
-            sql = f'SELECT rowid, {cols_sql} FROM "{table_name}"'
+            sql = f'SELECT id, {cols_sql} FROM "{table_name}" ORDER BY id'
             result = db.execute(text(sql))
 
         rows = []
         for row in result:
-            row_dict = {"rowid": row[0]}  # First element is rowid
+            row_dict = {"rowid": row[0]}  # First element is the row id
             for i, col in enumerate(columns):
                 row_dict[col] = row[i + 1]  # Data starts at index 1
             rows.append(row_dict)
@@ -1384,8 +1382,7 @@ def add_dataset_row(
 
     try:
         # Get valid column names
-        col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-        valid_columns = [row[1] for row in col_result]
+        valid_columns = get_table_columns(db, table_name)
 
         # Filter and prepare data
         insert_cols = []
@@ -1404,13 +1401,9 @@ def add_dataset_row(
         column_list = ', '.join([f'"{c}"' for c in insert_cols])
         placeholders = ', '.join([f":p{i}" for i in range(len(insert_cols))])
         insert_sql = f'INSERT INTO "{table_name}" ({column_list}) VALUES ({placeholders})'
-        db.execute(text(insert_sql), insert_vals)
+        new_rowid = insert_returning_id(db, insert_sql, insert_vals)
         db.commit()
 
-        # Get the inserted rowid
-        rowid_result = db.execute(text("SELECT last_insert_rowid()"))
-        new_rowid = rowid_result.scalar()
-
         return {
             "success": True,
             "rowid": new_rowid,
@@ -1435,7 +1428,7 @@ def update_dataset_row(
 
     Args:
         dataset_id: Dataset ID
-        rowid: SQLite rowid of the row to update
+        rowid: id of the row to update
         request: Updated row data as {column: value, ...}
 
     Returns:
@@ -1451,14 +1444,13 @@ def update_dataset_row(
 
     try:
         # Verify row exists
-        check_sql = f'SELECT rowid FROM "{table_name}" WHERE rowid = :rowid'
+        check_sql = f'SELECT id FROM "{table_name}" WHERE id = :rowid'
         result = db.execute(text(check_sql), {"rowid": rowid})
         if not result.fetchone():
             raise HTTPException(status_code=404, detail=f"Row with rowid {rowid} not found")
 
         # Get valid column names
-        col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-        valid_columns = [row[1] for row in col_result]
+        valid_columns = get_table_columns(db, table_name)
 
         # Build UPDATE statement
         set_clauses = []
@@ -1473,7 +1465,7 @@ def update_dataset_row(
         if not set_clauses:
             raise HTTPException(status_code=400, detail="No valid columns provided")
 
-        update_sql = f'UPDATE "{table_name}" SET {", ".join(set_clauses)} WHERE rowid = :rowid'
+        update_sql = f'UPDATE "{table_name}" SET {", ".join(set_clauses)} WHERE id = :rowid'
         db.execute(text(update_sql), params)
         db.commit()
 
@@ -1500,7 +1492,7 @@ def delete_dataset_row(
 
     Args:
         dataset_id: Dataset ID
-        rowid: SQLite rowid of the row to delete
+        rowid: id of the row to delete
 
     Returns:
         Success status
@@ -1515,13 +1507,13 @@ def delete_dataset_row(
 
     try:
         # Verify row exists
-        check_sql = f'SELECT rowid FROM "{table_name}" WHERE rowid = :rowid'
+        check_sql = f'SELECT id FROM "{table_name}" WHERE id = :rowid'
         result = db.execute(text(check_sql), {"rowid": rowid})
         if not result.fetchone():
             raise HTTPException(status_code=404, detail=f"Row with rowid {rowid} not found")
 
         # Delete row
-        delete_sql = f'DELETE FROM "{table_name}" WHERE rowid = :rowid'
+        delete_sql = f'DELETE FROM "{table_name}" WHERE id = :rowid'
         db.execute(text(delete_sql), {"rowid": rowid})
         db.commit()
 
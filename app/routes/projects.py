@@ -674,7 +674,13 @@ def get_project_jobs(project_id: int, limit: int = 50, offset: int = 0, job_type
                 parsed_response=item.parsed_response,
                 status=item.status,
                 error_message=item.error_message,
-                turnaround_ms=item.turnaround_ms
+                turnaround_ms=item.turnaround_ms,
+                ttft_ms=item.ttft_ms,
+                tokens_per_second=item.tokens_per_second,
+                prompt_tokens=item.prompt_tokens,
+                completion_tokens=item.completion_tokens,
+                reasoning_tokens=item.reasoning_tokens,
+                cached_tokens=item.cached_tokens
             )
             for item in job_items
         ]
@@ -705,6 +711,7 @@ def get_project_jobs(project_id: int, limit: int = 50, offset: int = 0, job_type
             finished_at=job.finished_at,
             turnaround_ms=job.turnaround_ms,
             merged_csv_output=job.merged_csv_output,
+            merged_csv_available=bool(job.merged_csv_path),
             model_name=job.model_name,
             prompt_id=prompt_id_val,
             prompt_name=prompt_name,
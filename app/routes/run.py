@@ -9,104 +9,88 @@ Background Job Execution:
 - Server restart will mark running jobs as 'error' (recovery on startup)
 """
 
+import asyncio
+import codecs
+import itertools
 import logging
-import threading
-import queue
+import os
+import sqlite3
+import time
 import urllib.parse
+import zlib
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, defer
+from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
 import json
 
 from backend.database import get_db, ProjectRevision, PromptRevision, JobItem, SessionLocal
+from backend.database.dialect import SQLITE
 from backend.database.models import Prompt, Job
+from backend.csv_merge import remove_merged_csv_file
 from backend.job import JobManager
+from backend.job_progress import get_job_progress_tracker
+from backend.job_queue import external_workers_enabled, get_job_queue_store
+from backend.usage import get_job_usage, get_model_usage
+from backend.job_scheduler import (
+    PRIORITY_BATCH, PRIORITY_INTERACTIVE, MAX_PRIORITY, get_job_scheduler, load_job_scheduler_settings
+)
 from app.schemas.requests import RunSingleRequest, RunBatchAllRequest
 from app.schemas.responses import RunSingleResponse, JobResponse, JobItemResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Global job queue for sequential execution
-_job_queue = queue.Queue()
-_worker_thread = None
-_worker_lock = threading.Lock()
-
-
-def _job_queue_worker():
-    """Background worker that processes jobs sequentially from the queue."""
-    logger.info("[QUEUE-WORKER] Job queue worker started")
-
-    while True:
-        try:
-            # Get next job from queue (blocks until available)
-            job_config = _job_queue.get(timeout=30)  # 30 second timeout
-
-            if job_config is None:  # Shutdown signal
-                logger.info("[QUEUE-WORKER] Received shutdown signal")
-                break
-
-            job_id = job_config['job_id']
-            model_name = job_config['model_name']
-            include_csv_header = job_config['include_csv_header']
-            temperature = job_config['temperature']
-
-            logger.info(f"[QUEUE-WORKER] Processing job {job_id} from queue")
-
-            db = SessionLocal()
-            try:
-                job_manager = JobManager(db)
-                job = job_manager.execute_job(
-                    job_id=job_id,
-                    model_name=model_name,
-                    include_csv_header=include_csv_header,
-                    temperature=temperature
-                )
-                logger.info(f"[QUEUE-WORKER] Job {job_id} completed with status={job.status}")
-            except Exception as e:
-                logger.error(f"[QUEUE-WORKER] Job {job_id} failed: {e}")
-            finally:
-                db.close()
-                _job_queue.task_done()
-
-        except queue.Empty:
-            # No jobs for 30 seconds, check if we should continue
-            if _job_queue.empty():
-                logger.info("[QUEUE-WORKER] Queue empty for 30s, worker exiting")
-                break
-
-    logger.info("[QUEUE-WORKER] Job queue worker stopped")
-
-
-def _ensure_worker_running():
-    """Ensure the job queue worker thread is running."""
-    global _worker_thread
+def enqueue_job(
+    job_id: int,
+    model_name: str,
+    include_csv_header: bool,
+    temperature: float,
+    populate_items: bool = False,
+    priority: int = PRIORITY_BATCH,
+    project_id: Optional[int] = None
+):
+    """Submit a job to the scheduler lane of its model.
 
-    with _worker_lock:
-        if _worker_thread is None or not _worker_thread.is_alive():
-            _worker_thread = threading.Thread(target=_job_queue_worker, daemon=True)
-            _worker_thread.start()
-            logger.info("[QUEUE] Started new job queue worker thread")
+    Set populate_items for batch jobs created with defer_items=True; the
+    scheduler then creates their items right before execution. The job is
+    also recorded in the durable job queue, so it is resubmitted if the
+    server restarts before it finishes.
 
+    With JOB_RUNNER=worker only the queue row is written; standalone
+    workers (python -m backend.worker) claim and execute the job.
 
-def enqueue_job(job_id: int, model_name: str, include_csv_header: bool, temperature: float):
-    """Add a job to the sequential execution queue."""
+    Returns:
+        Number of jobs waiting for a free slot
+    """
     job_config = {
         'job_id': job_id,
         'model_name': model_name,
         'include_csv_header': include_csv_header,
-        'temperature': temperature
+        'temperature': temperature,
+        'populate_items': populate_items
     }
-    _job_queue.put(job_config)
-    queue_size = _job_queue.qsize()
-    logger.info(f"[QUEUE] Job {job_id} added to queue (queue size: {queue_size})")
 
-    # Ensure worker is running
-    _ensure_worker_running()
+    lane = model_name or os.getenv("ACTIVE_LLM_MODEL", "azure-gpt-4.1")
+    store = get_job_queue_store()
+    if external_workers_enabled():
+        store.add(job_config, lane=lane, priority=priority, project_id=project_id)
+        return store.stats()["queued"]
+
+    scheduler = get_job_scheduler()
+    # Apply current lane limits before dispatching
+    db = SessionLocal()
+    try:
+        scheduler.configure(**load_job_scheduler_settings(db))
+    finally:
+        db.close()
 
-    return queue_size
+    store.add(job_config, lane=lane, priority=priority, project_id=project_id)
+    return scheduler.submit(job_config, lane=lane, priority=priority, project_id=project_id)
 
 
 def execute_job_background(job_id: int, model_name: str, include_csv_header: bool, temperature: float):
@@ -225,12 +209,14 @@ def run_single(request: RunSingleRequest, background_tasks: BackgroundTasks, db:
             model_name=request.model_name
         )
 
-        # Add job to sequential execution queue
+        # Interactive runs take priority over batches in the model's lane
         queue_size = enqueue_job(
             job.id,
             request.model_name,
             request.include_csv_header,
-            request.temperature
+            request.temperature,
+            priority=PRIORITY_INTERACTIVE,
+            project_id=request.project_id
         )
 
         # Load job items for immediate response (will be in pending state)
@@ -245,7 +231,13 @@ def run_single(request: RunSingleRequest, background_tasks: BackgroundTasks, db:
                 parsed_response=item.parsed_response,
                 status=item.status,
                 error_message=item.error_message,
-                turnaround_ms=item.turnaround_ms
+                turnaround_ms=item.turnaround_ms,
+                ttft_ms=item.ttft_ms,
+                tokens_per_second=item.tokens_per_second,
+                prompt_tokens=item.prompt_tokens,
+                completion_tokens=item.completion_tokens,
+                reasoning_tokens=item.reasoning_tokens,
+                cached_tokens=item.cached_tokens
             )
             for item in job_items
         ]
@@ -259,6 +251,7 @@ def run_single(request: RunSingleRequest, background_tasks: BackgroundTasks, db:
             finished_at=job.finished_at,
             turnaround_ms=job.turnaround_ms,
             merged_csv_output=job.merged_csv_output,
+            merged_csv_available=bool(job.merged_csv_path),
             model_name=job.model_name,
             items=items
         )
@@ -286,6 +279,7 @@ class RunBatchRequestWithHeader(BaseModel):
     include_csv_header: bool = True  # Include header for 1st row
     temperature: float = 0.7  # Temperature for LLM
     prompt_id: int = None  # NEW ARCHITECTURE: Optional prompt_id for specific prompt execution
+    priority: int = Field(default=PRIORITY_BATCH, ge=0, le=MAX_PRIORITY)  # Scheduler priority (lower runs first)
 
 
 @router.post("/api/run/batch", response_model=RunSingleResponse)
@@ -338,12 +332,14 @@ def run_batch(request: RunBatchRequestWithHeader, background_tasks: BackgroundTa
             model_name=request.model_name
         )
 
-        # Add job to sequential execution queue
+        # Add job to the scheduler lane of its model
         queue_size = enqueue_job(
             job.id,
             request.model_name,
             request.include_csv_header,
-            request.temperature
+            request.temperature,
+            priority=request.priority,
+            project_id=request.project_id
         )
 
         # Load job items for immediate response (will be in pending state)
@@ -358,7 +354,13 @@ def run_batch(request: RunBatchRequestWithHeader, background_tasks: BackgroundTa
                 parsed_response=item.parsed_response,
                 status=item.status,
                 error_message=item.error_message,
-                turnaround_ms=item.turnaround_ms
+                turnaround_ms=item.turnaround_ms,
+                ttft_ms=item.ttft_ms,
+                tokens_per_second=item.tokens_per_second,
+                prompt_tokens=item.prompt_tokens,
+                completion_tokens=item.completion_tokens,
+                reasoning_tokens=item.reasoning_tokens,
+                cached_tokens=item.cached_tokens
             )
             for item in job_items
         ]
@@ -372,6 +374,7 @@ def run_batch(request: RunBatchRequestWithHeader, background_tasks: BackgroundTa
             finished_at=job.finished_at,
             turnaround_ms=job.turnaround_ms,
             merged_csv_output=job.merged_csv_output,
+            merged_csv_available=bool(job.merged_csv_path),
             model_name=job.model_name,
             items=items
         )
@@ -412,6 +415,145 @@ def get_job_status(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
 
+@router.get("/api/jobs/{job_id}/usage", response_model=Dict[str, Any])
+def get_job_token_usage(job_id: int, db: Session = Depends(get_db)):
+    """Get token usage, throughput and estimated cost of a job.
+
+    Cost uses the llm_price_table setting (None if the model is not priced).
+    """
+    usage = get_job_usage(db, job_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return usage
+
+
+@router.get("/api/comparisons/{comparison_group}", response_model=Dict[str, Any])
+def get_comparison(comparison_group: str, db: Session = Depends(get_db)):
+    """Get progress of the per-model jobs of a multi-model batch run.
+
+    turnaround_ms is the wall-clock time of the whole group (the models run
+    concurrently), sum_job_turnaround_ms what running them one after another took.
+    """
+    try:
+        return JobManager(db).get_comparison_progress(comparison_group)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/api/usage/models", response_model=List[Dict[str, Any]])
+def get_model_token_usage(db: Session = Depends(get_db)):
+    """Get token usage, throughput and estimated cost per model over all jobs."""
+    return get_model_usage(db)
+
+
+# Job progress stream
+PROGRESS_STREAM_TICK_SECONDS = 0.25  # Interval of the (in-memory) change check
+PROGRESS_STREAM_REFRESH_SECONDS = 5.0  # Re-query anyway (changes from other processes) and keep alive
+PROGRESS_STREAM_WORKER_POLL_SECONDS = 1.0  # Re-query interval when jobs run on standalone workers
+PROGRESS_STREAM_MAX_SECONDS = 6 * 3600
+
+
+def _read_job_progress(bind, job_id: int) -> Optional[Dict[str, Any]]:
+    """Read job progress in a short-lived session (None if the job is gone)."""
+    db = Session(bind=bind)
+    try:
+        return JobManager(db).get_job_progress(job_id)
+    except ValueError:
+        return None
+    finally:
+        db.close()
+
+
+def _is_progress_final(progress: Dict[str, Any]) -> bool:
+    """Check whether a job's progress can no longer change."""
+    if progress["status"] in ("done", "error"):
+        return True
+    # Items that were already running finish after a cancel
+    return progress["status"] == "cancelled" and progress["running"] == 0
+
+
+@router.get("/api/jobs/{job_id}/progress/stream")
+async def stream_job_progress(job_id: int, db: Session = Depends(get_db)):
+    """Stream job progress using Server-Sent Events (SSE).
+
+    Sends the same payload as GET /api/jobs/{job_id} whenever it changes,
+    instead of the client polling for it. The executor notifies the stream
+    when it commits item updates; the stream ends once the job is finished.
+
+    When items are executed with streaming enabled, "partial" events carry
+    the response text received so far for each running item.
+
+    With standalone workers (JOB_RUNNER=worker) the executor runs in another
+    process and cannot notify the stream: progress is polled from the
+    database every PROGRESS_STREAM_WORKER_POLL_SECONDS, and no partial
+    events are sent.
+
+    Returns:
+        SSE stream with events in the format:
+        data: {"job_id": 1, "status": "running", "completed": 3, ...}
+        event: partial
+        data: {"items": {"12": "partial response text"}}
+    """
+    bind = db.get_bind()
+    progress = await run_in_threadpool(_read_job_progress, bind, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    tracker = get_job_progress_tracker()
+    # Jobs on standalone workers never notify this process's tracker
+    poll_seconds = PROGRESS_STREAM_WORKER_POLL_SECONDS if external_workers_enabled() else PROGRESS_STREAM_REFRESH_SECONDS
+
+    async def event_generator():
+        """Generate SSE events for the job."""
+        tracker.subscribe(job_id)
+        try:
+            last_progress = progress
+            version = tracker.version(job_id)
+            partial_version = 0
+            start_time = time.time()
+            last_query = last_sent = start_time
+            yield f"data: {json.dumps(last_progress, ensure_ascii=False)}\n\n"
+
+            while not _is_progress_final(last_progress):
+                if time.time() - start_time > PROGRESS_STREAM_MAX_SECONDS:
+                    break
+                await asyncio.sleep(PROGRESS_STREAM_TICK_SECONDS)
+
+                current_partial_version, partials = tracker.partial_texts(job_id)
+                if current_partial_version != partial_version:
+                    partial_version = current_partial_version
+                    yield f"event: partial\ndata: {json.dumps({'items': partials}, ensure_ascii=False)}\n\n"
+
+                current_version = tracker.version(job_id)
+                if current_version == version and time.time() - last_query < poll_seconds:
+                    continue
+
+                version = current_version
+                last_query = time.time()
+                current = await run_in_threadpool(_read_job_progress, bind, job_id)
+                if current is None:
+                    break
+                if current != last_progress:
+                    last_progress = current
+                    last_sent = time.time()
+                    yield f"data: {json.dumps(current, ensure_ascii=False)}\n\n"
+                elif time.time() - last_sent >= PROGRESS_STREAM_REFRESH_SECONDS:
+                    last_sent = time.time()
+                    yield ": keepalive\n\n"
+        finally:
+            tracker.unsubscribe(job_id)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
+
 @router.get("/api/jobs/{job_id}/details", response_model=JobResponse)
 def get_job_details(job_id: int, db: Session = Depends(get_db)):
     """Get job with all items and details.
@@ -437,7 +579,13 @@ def get_job_details(job_id: int, db: Session = Depends(get_db)):
             parsed_response=item.parsed_response,
             status=item.status,
             error_message=item.error_message,
-            turnaround_ms=item.turnaround_ms
+            turnaround_ms=item.turnaround_ms,
+            ttft_ms=item.ttft_ms,
+            tokens_per_second=item.tokens_per_second,
+            prompt_tokens=item.prompt_tokens,
+            completion_tokens=item.completion_tokens,
+            reasoning_tokens=item.reasoning_tokens,
+            cached_tokens=item.cached_tokens
         )
         for item in job_items
     ]
@@ -478,6 +626,7 @@ def get_job_details(job_id: int, db: Session = Depends(get_db)):
         finished_at=job.finished_at,
         turnaround_ms=job.turnaround_ms,
         merged_csv_output=job.merged_csv_output,
+        merged_csv_available=bool(job.merged_csv_path),
         model_name=job.model_name,
         prompt_id=prompt_id_val,
         prompt_name=prompt_name,
@@ -570,8 +719,12 @@ def retry_job_item(job_id: int, item_id: int, db: Session = Depends(get_db)):
         from backend.llm import get_llm_client
         from backend.parser import ResponseParser
 
+        from backend.llm.retry import RetryingLLMClient
+
         try:
-            llm_client = get_llm_client(model_name)
+            # No dispatch queue here: retryable failures are retried inline, and the
+            # waits are capped (INLINE_MAX_TOTAL_DELAY) so the request fails fast
+            llm_client = RetryingLLMClient(get_llm_client(model_name), JobManager(db)._get_retry_policy())
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get LLM client: {str(e)}")
 
@@ -653,6 +806,9 @@ def retry_job_item(job_id: int, item_id: int, db: Session = Depends(get_db)):
                 all_items = db.query(JobItem).filter(JobItem.job_id == job_id).all()
                 merged_csv = job_manager._merge_csv_outputs(all_items, include_csv_header=True)
                 job.merged_csv_output = merged_csv
+                # The stored text replaces the incrementally written file
+                replaced_csv_path = job.merged_csv_path
+                job.merged_csv_path = None
 
                 # Update job status
                 error_items = db.query(JobItem).filter(
@@ -662,6 +818,7 @@ def retry_job_item(job_id: int, item_id: int, db: Session = Depends(get_db)):
                 job.status = "error" if error_items > 0 else "done"
 
                 db.commit()
+                remove_merged_csv_file(replaced_csv_path)
 
                 return {
                     "success": True,
@@ -703,14 +860,17 @@ def retry_job_item(job_id: int, item_id: int, db: Session = Depends(get_db)):
 def retry_all_error_items(job_id: int, db: Session = Depends(get_db)):
     """Retry all failed job items in a job.
 
-    Re-executes all error items sequentially.
-    After all retries, regenerates merged_csv_output.
+    Resets the error items to pending and queues the job in its model's
+    scheduler lane, so the retries run in the background under the job's
+    concurrency limits (and the central retry policy), not inside this
+    request. Progress is reported like for any running job; the merged CSV
+    is regenerated when the job finishes.
 
     Args:
         job_id: ID of the job
 
     Returns:
-        Retry results with success/error counts
+        Number of items queued for retry
     """
     try:
         # Get the job
@@ -718,147 +878,45 @@ def retry_all_error_items(job_id: int, db: Session = Depends(get_db)):
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        # Get all error items
-        error_items = db.query(JobItem).filter(
+        if job.status in ("pending", "running"):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot retry errors while the job is {job.status}"
+            )
+
+        # Reset all error items in one statement
+        queued_count = db.query(JobItem).filter(
             JobItem.job_id == job_id,
             JobItem.status == "error"
-        ).all()
+        ).update({"status": "pending", "error_message": None}, synchronize_session=False)
 
-        if not error_items:
+        if not queued_count:
             return {
                 "success": True,
                 "job_id": job_id,
-                "success_count": 0,
-                "error_count": 0,
+                "queued_count": 0,
                 "message": "No error items to retry"
             }
 
-        # Get the revision
-        revision = None
-        if job.prompt_revision_id:
-            revision = db.query(PromptRevision).filter(
-                PromptRevision.id == job.prompt_revision_id
-            ).first()
-        elif job.project_revision_id:
-            revision = db.query(ProjectRevision).filter(
-                ProjectRevision.id == job.project_revision_id
-            ).first()
-
-        # Get LLM client
-        model_name = job.model_name
-        from backend.llm import get_llm_client
-        from backend.parser import ResponseParser
-        from backend.prompt import get_message_parser
-
-        try:
-            llm_client = get_llm_client(model_name)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to get LLM client: {str(e)}")
-
-        job_manager = JobManager(db)
-        message_parser = get_message_parser()
-        model_params = job_manager._get_model_parameters(model_name or llm_client.get_model_name())
-
-        actual_model_name = llm_client.get_model_name()
-        is_gpt5 = "gpt-5" in actual_model_name or "gpt5" in actual_model_name
-        temperature = 0.7
-
-        success_count = 0
-        still_error_count = 0
-
-        # Process each error item sequentially (avoid rate limiting)
-        for item in error_items:
-            item.status = "running"
-            item.error_message = None
-            db.commit()
-
-            try:
-                # Process images
-                images = []
-                if revision and revision.prompt_template:
-                    try:
-                        input_params = json.loads(item.input_params)
-                        images = job_manager._process_image_parameters(
-                            input_params,
-                            revision.prompt_template
-                        )
-                    except Exception as e:
-                        logger.error(f"Error processing images for retry item {item.id}: {e}")
-
-                # Parse prompt for role markers
-                if message_parser.has_role_markers(item.raw_prompt):
-                    messages = message_parser.to_messages_list(item.raw_prompt)
-                    prompt_arg = None
-                else:
-                    messages = None
-                    prompt_arg = item.raw_prompt
-
-                # Call LLM
-                if is_gpt5:
-                    response = llm_client.call(
-                        prompt=prompt_arg,
-                        messages=messages,
-                        images=images if images else None,
-                        **model_params
-                    )
-                else:
-                    call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
-                    response = llm_client.call(
-                        prompt=prompt_arg,
-                        messages=messages,
-                        images=images if images else None,
-                        temperature=temperature,
-                        **call_params
-                    )
-
-                if response.success:
-                    item.status = "done"
-                    item.raw_response = response.response_text
-                    item.turnaround_ms = response.turnaround_ms
-                    item.error_message = None
-
-                    # Apply parser
-                    if revision and revision.parser_config:
-                        parser = ResponseParser(revision.parser_config)
-                        parsed_result = parser.parse(response.response_text)
-                        item.parsed_response = json.dumps(parsed_result, ensure_ascii=False)
-                    else:
-                        item.parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
-
-                    success_count += 1
-                else:
-                    item.status = "error"
-                    item.error_message = response.error_message
-                    item.turnaround_ms = response.turnaround_ms
-                    still_error_count += 1
-
-            except Exception as e:
-                item.status = "error"
-                item.error_message = str(e)
-                still_error_count += 1
-
-            db.commit()
-
-        # Regenerate merged CSV
-        all_items = db.query(JobItem).filter(JobItem.job_id == job_id).all()
-        merged_csv = job_manager._merge_csv_outputs(all_items, include_csv_header=True)
-        job.merged_csv_output = merged_csv
-
-        # Update job status
-        remaining_errors = db.query(JobItem).filter(
-            JobItem.job_id == job_id,
-            JobItem.status == "error"
-        ).count()
-        job.status = "error" if remaining_errors > 0 else "done"
-
+        job.status = "pending"
         db.commit()
+        get_job_progress_tracker().notify(job_id)
+
+        queue_size = enqueue_job(
+            job_id,
+            job.model_name,
+            True,
+            0.7,
+            priority=PRIORITY_INTERACTIVE if job.job_type == "single" else PRIORITY_BATCH
+        )
+        logger.info(f"[RETRY-ALL] Job {job_id}: {queued_count} error items queued (queue size: {queue_size})")
 
         return {
             "success": True,
             "job_id": job_id,
-            "success_count": success_count,
-            "error_count": still_error_count,
-            "message": f"Retry completed: {success_count} success, {still_error_count} still error"
+            "queued_count": queued_count,
+            "queue_size": queue_size,
+            "message": f"Queued {queued_count} error items for retry"
         }
 
     except HTTPException:
@@ -867,45 +925,6 @@ def retry_all_error_items(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Bulk retry failed: {str(e)}")
 
 
-def execute_batch_all_background(job_configs: List[Dict], include_csv_header: bool):
-    """Execute multiple batch jobs sequentially in background.
-
-    This runs INDEPENDENTLY of the HTTP connection.
-    All jobs are created upfront, so they will all execute even if browser is closed.
-
-    Args:
-        job_configs: List of dicts with job_id, model_name, temperature
-        include_csv_header: Whether to include CSV header
-    """
-    logger.info(f"[BATCH-ALL] Starting execution of {len(job_configs)} batch jobs")
-
-    for i, config in enumerate(job_configs):
-        job_id = config['job_id']
-        model_name = config['model_name']
-        temperature = config['temperature']
-
-        logger.info(f"[BATCH-ALL] Executing job {i+1}/{len(job_configs)}: job_id={job_id}")
-
-        db = SessionLocal()
-        try:
-            job_manager = JobManager(db)
-            job = job_manager.execute_job(
-                job_id=job_id,
-                model_name=model_name,
-                include_csv_header=include_csv_header,
-                temperature=temperature
-            )
-            logger.info(f"[BATCH-ALL] Job {job_id} completed with status={job.status}")
-
-        except Exception as e:
-            logger.error(f"[BATCH-ALL] Job {job_id} failed: {e}")
-            # Continue with next job even if one fails
-        finally:
-            db.close()
-
-    logger.info(f"[BATCH-ALL] All {len(job_configs)} jobs completed")
-
-
 @router.post("/api/run/batch-all", response_model=Dict[str, Any])
 def run_batch_all(request: RunBatchAllRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Execute batch for ALL prompts in a project.
@@ -1001,27 +1020,40 @@ def run_batch_all(request: RunBatchAllRequest, background_tasks: BackgroundTasks
                 logger.warning(f"[BATCH-ALL] No revision found for prompt {prompt.id}, skipping")
                 continue
 
-            # Create batch job
-            job = job_manager.create_batch_job(
-                project_revision_id=None,
-                prompt_revision_id=prompt_revision.id,
-                dataset_id=request.dataset_id,
-                model_name=request.model_name
-            )
-
-            created_jobs.append({
-                'job_id': job.id,
-                'prompt_id': prompt.id,
-                'prompt_name': prompt.name
-            })
-
-            job_configs.append({
-                'job_id': job.id,
-                'model_name': request.model_name,
-                'temperature': request.temperature
-            })
-
-            logger.info(f"[BATCH-ALL] Created job {job.id} for prompt '{prompt.name}'")
+            if request.model_names:
+                # One job per model sharing a comparison group; the first job
+                # to run renders each row once and creates the items of all of them
+                jobs = job_manager.create_comparison_jobs(
+                    prompt_revision_id=prompt_revision.id,
+                    dataset_id=request.dataset_id,
+                    model_names=request.model_names
+                )
+            else:
+                # Create batch job; items are streamed in by the queue worker
+                jobs = [job_manager.create_batch_job(
+                    project_revision_id=None,
+                    prompt_revision_id=prompt_revision.id,
+                    dataset_id=request.dataset_id,
+                    model_name=request.model_name,
+                    defer_items=True
+                )]
+
+            for job in jobs:
+                created_jobs.append({
+                    'job_id': job.id,
+                    'prompt_id': prompt.id,
+                    'prompt_name': prompt.name,
+                    'model_name': job.model_name,
+                    'comparison_group': job.comparison_group
+                })
+
+                job_configs.append({
+                    'job_id': job.id,
+                    'model_name': job.model_name,
+                    'temperature': request.temperature
+                })
+
+                logger.info(f"[BATCH-ALL] Created job {job.id} for prompt '{prompt.name}' ({job.model_name})")
 
         if not created_jobs:
             raise HTTPException(
@@ -1029,23 +1061,26 @@ def run_batch_all(request: RunBatchAllRequest, background_tasks: BackgroundTasks
                 detail="No jobs could be created (no valid prompt revisions)"
             )
 
-        # Add ALL jobs to the sequential execution queue
+        # Add ALL jobs to the scheduler lane of their model
         for config in job_configs:
-            enqueue_job(
+            queue_size = enqueue_job(
                 config['job_id'],
                 config['model_name'],
                 request.include_csv_header,
-                config['temperature']
+                config['temperature'],
+                populate_items=True,
+                priority=request.priority,
+                project_id=request.project_id
             )
 
-        queue_size = _job_queue.qsize()
         logger.info(f"[BATCH-ALL] Enqueued {len(job_configs)} jobs (total queue size: {queue_size})")
 
         return {
             "success": True,
             "job_ids": [j['job_id'] for j in created_jobs],
             "jobs": created_jobs,
-            "prompt_count": len(created_jobs),
+            "prompt_count": len({j['prompt_id'] for j in created_jobs}),
+            "comparison_groups": sorted({j['comparison_group'] for j in created_jobs if j['comparison_group']}),
             "queue_size": queue_size,
             "message": f"Created and queued {len(created_jobs)} batch jobs for execution"
         }
@@ -1198,12 +1233,19 @@ def get_job_csv_preview(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # First, try to use job.merged_csv_output if available (most reliable)
-    if job.merged_csv_output:
-        lines = [line for line in job.merged_csv_output.strip().split("\n") if line.strip()]
+    # First, try to use the job's merged CSV (stored or file-backed) if available (most reliable)
+    merged_csv = None
+    if job.has_merged_csv:
+        try:
+            with job.open_merged_csv() as stream:
+                merged_csv = stream.read()
+        except OSError as e:
+            logger.error(f"Job {job_id}: merged CSV file {job.merged_csv_path} is not readable: {e}")
+    if merged_csv:
+        lines = [line for line in merged_csv.strip().split("\n") if line.strip()]
         return {
             "job_id": job_id,
-            "csv_data": job.merged_csv_output.strip() if lines else None,
+            "csv_data": merged_csv.strip() if lines else None,
             "row_count": len(lines) - 1 if len(lines) > 1 else 0  # -1 for header
         }
 
@@ -1255,69 +1297,257 @@ def get_job_csv_preview(
     }
 
 
+# Streaming CSV downloads
+CSV_STREAM_CHUNK_SIZE = 64 * 1024  # Characters read from a merged CSV per chunk
+CSV_STREAM_BATCH_ROWS = 1000  # Job items fetched (and lines encoded) per chunk
+CSV_BOM = "\ufeff"  # Lets Excel detect UTF-8
+
+
+def _iter_text_chunks(stream, chunk_size: int = CSV_STREAM_CHUNK_SIZE):
+    """Read a text stream in chunks, closing it when exhausted."""
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        stream.close()
+
+
+class _TextColumnReader:
+    """Text stream over a text column of one row, read without loading the value.
+
+    SQLite values are read with incremental blob I/O (Python 3.11+; older
+    versions read the value once), other databases in SUBSTR slices. Uses
+    its own connection on the request's engine, because the request session
+    is closed before the body is streamed.
+    """
+
+    def __init__(self, db: Session, column, row_id: int):
+        self._connection = db.get_bind().connect()
+        self._column = column
+        self._row_id = row_id
+        self._position = 1  # SUBSTR positions are 1-based
+        self._blob = None
+        self._decoder = None
+        self._pending = None
+
+        if self._connection.dialect.name == SQLITE:
+            driver_connection = self._connection.connection.driver_connection
+            if hasattr(driver_connection, "blobopen"):
+                try:
+                    # INTEGER PRIMARY KEY ids are the rowid
+                    self._blob = driver_connection.blobopen(
+                        column.expression.table.name, column.expression.name, row_id, readonly=True
+                    )
+                    self._decoder = codecs.getincrementaldecoder("utf-8")()
+                except sqlite3.OperationalError:
+                    self._pending = ""  # NULL value or no such row
+            else:
+                self._pending = self._select(func.coalesce(column, "")) or ""
+
+    def _select(self, expression):
+        table = self._column.expression.table
+        return self._connection.execute(
+            select(expression).where(table.c.id == self._row_id)
+        ).scalar()
+
+    def read(self, size: int) -> str:
+        if self._pending is not None:
+            chunk, self._pending = self._pending, ""
+            return chunk
+        if self._blob is not None:
+            # Multi-byte characters split across reads are completed by the next read
+            while True:
+                data = self._blob.read(size)
+                chunk = self._decoder.decode(data, final=not data)
+                if chunk or not data:
+                    return chunk
+        chunk = self._select(func.substr(self._column, self._position, size))
+        if not chunk:
+            return ""
+        self._position += len(chunk)
+        return chunk
+
+    def close(self):
+        if self._blob is not None:
+            self._blob.close()
+        self._connection.close()
+
+
+def _strip_text_chunks(chunks):
+    """Yield chunks of a text with its leading/trailing whitespace removed (str.strip() without joining)."""
+    started = False
+    held = ""
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        stripped = chunk.rstrip()
+        if stripped:
+            # Whitespace held back from earlier chunks turned out to be inner whitespace
+            yield held + stripped
+            held = chunk[len(stripped):]
+        else:
+            held += chunk
+
+
+def _iter_job_item_csv_chunks(db: Session, job_id: int, batch_rows: int = CSV_STREAM_BATCH_ROWS):
+    """Build CSV text from done job items, fetched with a server-side cursor.
+
+    Same rules as the csv-preview fallback: the header comes from the first
+    item with csv_header (or fields), then each item contributes its lines.
+    Uses its own session on the request's engine, because the request
+    session is closed once the endpoint returns, before the body is streamed.
+    """
+    stream_db = Session(bind=db.get_bind())
+    try:
+        yield from _build_job_item_csv_chunks(stream_db, job_id, batch_rows)
+    finally:
+        stream_db.close()
+
+
+def _build_job_item_csv_chunks(db: Session, job_id: int, batch_rows: int):
+    query = db.query(JobItem.parsed_response).filter(
+        JobItem.job_id == job_id,
+        JobItem.status == "done"
+    ).order_by(JobItem.id).yield_per(batch_rows)
+
+    header = None
+    lines = []
+    first_chunk = True
+
+    for (parsed_response,) in query:
+        if not parsed_response:
+            continue
+
+        try:
+            parsed = json.loads(parsed_response)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if not isinstance(parsed, dict):
+            continue
+
+        csv_output = parsed.get("csv_output", "")
+        csv_header = parsed.get("csv_header", "")
+        fields = parsed.get("fields", {})
+
+        if csv_header:
+            if header is None:
+                header = csv_header
+                lines.append(header)
+            if csv_output:
+                for line in csv_output.strip().split("\n"):
+                    if line.strip():
+                        lines.append(line)
+        elif fields:
+            if header is None:
+                header = ",".join(fields.keys())
+                lines.append(header)
+            lines.append(",".join([str(v) for v in fields.values()]))
+
+        if len(lines) >= batch_rows:
+            yield ("" if first_chunk else "\n") + "\n".join(lines)
+            first_chunk = False
+            lines = []
+
+    if lines:
+        yield ("" if first_chunk else "\n") + "\n".join(lines)
+
+
+def _encode_csv_chunks(first_chunk: str, chunks, gzip_enabled: bool):
+    """Encode CSV text chunks as UTF-8 with a BOM, optionally gzip-compressed."""
+    compressor = zlib.compressobj(wbits=31) if gzip_enabled else None  # wbits=31: gzip container
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    data = encode(CSV_BOM + first_chunk)
+    if data:
+        yield data
+    for chunk in chunks:
+        data = encode(chunk)
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def _csv_streaming_response(chunks, filename: str, gzip_enabled: bool, not_found_detail: str) -> StreamingResponse:
+    """Create a CSV download streamed from text chunks.
+
+    The first chunk is produced before responding so that an empty CSV can
+    still be reported as 404.
+    """
+    chunks = iter(chunks)
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+
+    # Use RFC 5987 encoding for non-ASCII filename support
+    filename_encoded = urllib.parse.quote(filename)
+    headers = {
+        "Content-Disposition": f"attachment; filename=\"{filename}\"; filename*=UTF-8''{filename_encoded}",
+        "Content-Type": "text/csv; charset=utf-8"
+    }
+    if gzip_enabled:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return StreamingResponse(
+        _encode_csv_chunks(first_chunk, chunks, gzip_enabled),
+        media_type="text/csv; charset=utf-8",
+        headers=headers
+    )
+
+
 @router.get("/api/jobs/{job_id}/csv")
 def download_job_csv(
     job_id: int,
+    gzip: bool = False,
     db: Session = Depends(get_db)
 ):
     """Download job results as CSV file.
 
     Returns a downloadable CSV file with Content-Disposition header.
-    This endpoint can be used as a direct download link.
+    This endpoint can be used as a direct download link. The file is
+    streamed (UTF-8 with BOM) instead of being built in memory; pass
+    gzip=true for a gzip-encoded transfer.
 
     Example: http://localhost:9200/api/jobs/123/csv
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    # A stored merged CSV (retried jobs, jobs merged before incremental output) is
+    # streamed from the database instead of being loaded with the job
+    job = db.query(Job).options(defer(Job.merged_csv_output)).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-
-    csv_data = None
-
-    # First, try to use job.merged_csv_output if available
-    if job.merged_csv_output:
-        csv_data = job.merged_csv_output.strip()
-    else:
+    has_stored_csv = db.query(Job.merged_csv_output.isnot(None)).filter(Job.id == job_id).scalar()
+
+    # First, try to use the job's merged CSV (stored or file-backed), like open_merged_csv()
+    chunks = None
+    if has_stored_csv:
+        chunks = _strip_text_chunks(_iter_text_chunks(_TextColumnReader(db, Job.merged_csv_output, job_id)))
+    elif job.merged_csv_path:
+        # Merged CSV file written as the job ran
+        try:
+            merged_stream = open(job.merged_csv_path, "r", encoding="utf-8", newline="")
+        except OSError as e:
+            logger.error(f"Job {job_id}: merged CSV file {job.merged_csv_path} is not readable: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="Merged CSV file not found; CSV_OUTPUT_DIR must be shared by the web process and the workers"
+            )
+        chunks = _strip_text_chunks(_iter_text_chunks(merged_stream))
+    if chunks is not None:
+        first_chunk = next(chunks, None)
+        chunks = itertools.chain([first_chunk], chunks) if first_chunk is not None else None
+    if chunks is None:
         # Fall back to building from job_items
-        job_items = db.query(JobItem).filter(
-            JobItem.job_id == job_id,
-            JobItem.status == "done"
-        ).all()
-
-        csv_lines = []
-        header = None
-
-        for item in job_items:
-            if not item.parsed_response:
-                continue
-
-            try:
-                parsed = json.loads(item.parsed_response)
-            except:
-                continue
-
-            csv_output = parsed.get("csv_output", "")
-            csv_header = parsed.get("csv_header", "")
-            fields = parsed.get("fields", {})
-
-            if csv_header:
-                if header is None:
-                    header = csv_header
-                    csv_lines.insert(0, header)
-                if csv_output:
-                    for line in csv_output.strip().split("\n"):
-                        if line.strip():
-                            csv_lines.append(line)
-            elif fields:
-                if header is None:
-                    header = ",".join(fields.keys())
-                    csv_lines.insert(0, header)
-                csv_lines.append(",".join([str(v) for v in fields.values()]))
-
-        if csv_lines:
-            csv_data = "\n".join(csv_lines)
-
-    if not csv_data:
-        raise HTTPException(status_code=404, detail="No CSV data available for this job")
+        chunks = _iter_job_item_csv_chunks(db, job_id)
 
     # Get project name for filename
     project_name = "job"
@@ -1331,43 +1561,42 @@ def download_job_csv(
             project_name = f"project_{project.id}"
 
     filename = f"{project_name}_job_{job_id}.csv"
-    # Use RFC 5987 encoding for non-ASCII filename support
-    filename_encoded = urllib.parse.quote(filename)
-
-    return Response(
-        content=csv_data,
-        media_type="text/csv; charset=utf-8",
-        headers={
-            "Content-Disposition": f"attachment; filename=\"{filename}\"; filename*=UTF-8''{filename_encoded}",
-            "Content-Type": "text/csv; charset=utf-8"
-        }
-    )
+    return _csv_streaming_response(chunks, filename, gzip, "No CSV data available for this job")
 
 
 @router.get("/api/workflow-jobs/{job_id}/csv")
 def download_workflow_job_csv(
     job_id: int,
+    gzip: bool = False,
     db: Session = Depends(get_db)
 ):
     """Download workflow job results as CSV file.
 
-    Returns a downloadable CSV file with Content-Disposition header.
+    Returns a downloadable CSV file with Content-Disposition header,
+    streamed as UTF-8 with BOM (gzip=true for a gzip-encoded transfer).
 
     Example: http://localhost:9200/api/workflow-jobs/123/csv
     """
     from backend.database.models import WorkflowJob, Workflow
 
-    wf_job = db.query(WorkflowJob).filter(WorkflowJob.id == job_id).first()
+    # merged_csv_output is streamed from the database instead of being loaded;
+    # merged_output (vars and execution trace) is only loaded for the fallback below
+    wf_job = db.query(WorkflowJob).options(
+        defer(WorkflowJob.merged_csv_output), defer(WorkflowJob.merged_output)
+    ).filter(WorkflowJob.id == job_id).first()
     if not wf_job:
         raise HTTPException(status_code=404, detail="Workflow job not found")
 
-    csv_data = None
-
     # Primary: use merged_csv_output if available
-    if wf_job.merged_csv_output:
-        csv_data = wf_job.merged_csv_output.strip()
+    chunks = _strip_text_chunks(_iter_text_chunks(_TextColumnReader(db, WorkflowJob.merged_csv_output, job_id)))
+    first_chunk = next(chunks, None)
+    if first_chunk is not None:
+        chunks = itertools.chain([first_chunk], chunks)
+    else:
+        chunks = None
+
     # Fallback: generate CSV from merged_output vars
-    elif wf_job.merged_output:
+    if chunks is None and wf_job.merged_output:
         try:
             output = json.loads(wf_job.merged_output)
             vars_data = output.get("vars", {})
@@ -1385,11 +1614,11 @@ def download_workflow_job_csv(
                     csv_lines = []
                     csv_lines.append(",".join(flat_vars.keys()))  # header
                     csv_lines.append(",".join(flat_vars.values()))  # data
-                    csv_data = "\n".join(csv_lines)
+                    chunks = iter(["\n".join(csv_lines)])
         except (json.JSONDecodeError, Exception):
             pass  # Fall through to error
 
-    if not csv_data:
+    if chunks is None:
         raise HTTPException(status_code=404, detail="No CSV data available for this workflow job")
 
     # Get workflow name for filename
@@ -1404,17 +1633,7 @@ def download_workflow_job_csv(
                 workflow_name = f"workflow_{workflow.id}"
 
     filename = f"{workflow_name}_job_{job_id}.csv"
-    # Use RFC 5987 encoding for non-ASCII filename support
-    filename_encoded = urllib.parse.quote(filename)
-
-    return Response(
-        content=csv_data,
-        media_type="text/csv; charset=utf-8",
-        headers={
-            "Content-Disposition": f"attachment; filename=\"{filename}\"; filename*=UTF-8''{filename_encoded}",
-            "Content-Type": "text/csv; charset=utf-8"
-        }
-    )
+    return _csv_streaming_response(chunks, filename, gzip, "No CSV data available for this workflow job")
 
 
 @router.get("/api/workflow-jobs/{job_id}/csv-preview")
@@ -4,11 +4,12 @@ Based on specification in docs/req.txt section 4.5 (システム設定)
 Phase 2 implementation.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional, Union, Any
 from pydantic import BaseModel
 import json
+import os
 
 from backend.database import get_db, SystemSetting
 from backend.llm import get_available_models
@@ -154,6 +155,920 @@ def set_job_parallelism(parallelism: int, db: Session = Depends(get_db)):
     }
 
 
+# Job item execution modes (must match JobManager.EXECUTION_MODES)
+JOB_EXECUTION_MODES = ["auto", "serial", "thread", "async", "offload"]
+DEFAULT_JOB_ASYNC_CONCURRENCY = 100
+# Offload mode providers and threshold (must match JobManager.OFFLOAD_PROVIDERS)
+JOB_OFFLOAD_PROVIDERS = ["auto", "local"]
+DEFAULT_JOB_OFFLOAD_MIN_ITEMS = 1000
+
+
+@router.get("/api/settings/job-execution-mode")
+def get_job_execution_mode(db: Session = Depends(get_db)):
+    """Get job execution mode setting.
+
+    Returns:
+        Dictionary with mode (auto/serial/thread/async/offload), async
+        concurrency (1-999), offload provider (auto/local), the minimum
+        batch size for offloading and whether item calls are streamed
+    """
+    mode_setting = db.query(SystemSetting).filter(SystemSetting.key == "job_execution_mode").first()
+    mode = mode_setting.value.strip().lower() if mode_setting and mode_setting.value else "auto"
+    if mode not in JOB_EXECUTION_MODES:
+        mode = "auto"
+
+    concurrency_setting = db.query(SystemSetting).filter(SystemSetting.key == "job_async_concurrency").first()
+    if concurrency_setting and concurrency_setting.value:
+        try:
+            concurrency = max(1, min(int(concurrency_setting.value), 999))
+        except ValueError:
+            concurrency = DEFAULT_JOB_ASYNC_CONCURRENCY
+    else:
+        concurrency = DEFAULT_JOB_ASYNC_CONCURRENCY
+
+    provider_setting = db.query(SystemSetting).filter(SystemSetting.key == "job_offload_provider").first()
+    provider = provider_setting.value.strip().lower() if provider_setting and provider_setting.value else "auto"
+    if provider not in JOB_OFFLOAD_PROVIDERS:
+        provider = "auto"
+
+    min_items_setting = db.query(SystemSetting).filter(SystemSetting.key == "job_offload_min_items").first()
+    try:
+        min_items = max(1, int(min_items_setting.value)) if min_items_setting and min_items_setting.value \
+            else DEFAULT_JOB_OFFLOAD_MIN_ITEMS
+    except ValueError:
+        min_items = DEFAULT_JOB_OFFLOAD_MIN_ITEMS
+
+    streaming_setting = db.query(SystemSetting).filter(SystemSetting.key == "job_streaming_enabled").first()
+    streaming = bool(streaming_setting and (streaming_setting.value or "").lower() == "true")
+
+    return {
+        "mode": mode,
+        "async_concurrency": concurrency,
+        "offload_provider": provider,
+        "offload_min_items": min_items,
+        "streaming": streaming,
+        "available_modes": JOB_EXECUTION_MODES
+    }
+
+
+@router.put("/api/settings/job-execution-mode")
+def set_job_execution_mode(
+    mode: str,
+    async_concurrency: Optional[int] = None,
+    offload_provider: Optional[str] = None,
+    offload_min_items: Optional[int] = None,
+    streaming: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    """Set job execution mode setting.
+
+    Args:
+        mode: auto (serial/thread by parallelism), serial, thread, async, or
+            offload (provider batch API for large batch jobs)
+        async_concurrency: Max in-flight LLM requests in async mode (1-999)
+        offload_provider: auto (the model's batch API) or local (file-based stand-in)
+        offload_min_items: Batch jobs with fewer items run as auto in offload mode
+        streaming: Use the streaming API for item calls in serial/thread execution
+            (records time to first token and tokens/second per item)
+
+    Returns:
+        Updated mode and concurrency values
+    """
+    mode = mode.strip().lower()
+    if mode not in JOB_EXECUTION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mode must be one of: {', '.join(JOB_EXECUTION_MODES)}"
+        )
+    if async_concurrency is not None and (async_concurrency < 1 or async_concurrency > 999):
+        raise HTTPException(
+            status_code=400,
+            detail="Async concurrency must be between 1 and 999"
+        )
+    if offload_provider is not None:
+        offload_provider = offload_provider.strip().lower()
+        if offload_provider not in JOB_OFFLOAD_PROVIDERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Offload provider must be one of: {', '.join(JOB_OFFLOAD_PROVIDERS)}"
+            )
+    if offload_min_items is not None and offload_min_items < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Offload minimum items must be at least 1"
+        )
+
+    updates = {"job_execution_mode": mode}
+    if async_concurrency is not None:
+        updates["job_async_concurrency"] = str(async_concurrency)
+    if offload_provider is not None:
+        updates["job_offload_provider"] = offload_provider
+    if offload_min_items is not None:
+        updates["job_offload_min_items"] = str(offload_min_items)
+    if streaming is not None:
+        updates["job_streaming_enabled"] = "true" if streaming else "false"
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_job_execution_mode(db)
+    result["message"] = f"Job execution mode set to {result['mode']}"
+    return result
+
+
+DEFAULT_ADAPTIVE_CONCURRENCY_MAX = 32
+
+
+@router.get("/api/settings/adaptive-concurrency")
+def get_adaptive_concurrency(db: Session = Depends(get_db)):
+    """Get adaptive (AIMD) per-model concurrency settings and current limits.
+
+    Returns:
+        Dictionary with enabled flag, upper bound (1-999) and the limit each
+        model is currently running at
+    """
+    from backend.llm.concurrency import get_concurrency_controller
+
+    enabled_setting = db.query(SystemSetting).filter(SystemSetting.key == "adaptive_concurrency_enabled").first()
+    enabled = bool(enabled_setting and (enabled_setting.value or "").lower() == "true")
+
+    max_setting = db.query(SystemSetting).filter(SystemSetting.key == "adaptive_concurrency_max").first()
+    if max_setting and max_setting.value:
+        try:
+            max_limit = max(1, min(int(max_setting.value), 999))
+        except ValueError:
+            max_limit = DEFAULT_ADAPTIVE_CONCURRENCY_MAX
+    else:
+        max_limit = DEFAULT_ADAPTIVE_CONCURRENCY_MAX
+
+    return {
+        "enabled": enabled,
+        "max_limit": max_limit,
+        "limits": get_concurrency_controller().get_limits()
+    }
+
+
+@router.put("/api/settings/adaptive-concurrency")
+def set_adaptive_concurrency(
+    enabled: bool,
+    max_limit: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Enable/disable adaptive concurrency and set its upper bound.
+
+    Args:
+        enabled: Use per-model AIMD limits instead of fixed job parallelism
+        max_limit: Upper bound for each model's limit (1-999)
+
+    Returns:
+        Updated settings and current limits
+    """
+    if max_limit is not None and (max_limit < 1 or max_limit > 999):
+        raise HTTPException(
+            status_code=400,
+            detail="Max limit must be between 1 and 999"
+        )
+
+    updates = {"adaptive_concurrency_enabled": "true" if enabled else "false"}
+    if max_limit is not None:
+        updates["adaptive_concurrency_max"] = str(max_limit)
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_adaptive_concurrency(db)
+    result["message"] = f"Adaptive concurrency {'enabled' if enabled else 'disabled'} (max {result['max_limit']})"
+    return result
+
+
+@router.delete("/api/settings/adaptive-concurrency/limits")
+def reset_adaptive_concurrency_limits(model_name: Optional[str] = None):
+    """Forget learned limits so they are re-learned from job_parallelism.
+
+    Args:
+        model_name: Model to reset (all models if omitted)
+    """
+    from backend.llm.concurrency import get_concurrency_controller
+
+    get_concurrency_controller().reset(model_name)
+    return {
+        "model_name": model_name,
+        "message": f"Adaptive limits reset for {model_name or 'all models'}"
+    }
+
+
+# Hedged requests (must match JobManager.DEFAULT_HEDGE_*)
+DEFAULT_JOB_HEDGE_PERCENTILE = 95.0
+DEFAULT_JOB_HEDGE_MAX_RATE = 0.1
+
+
+@router.get("/api/settings/job-hedging")
+def get_job_hedging(db: Session = Depends(get_db)):
+    """Get hedged request settings.
+
+    Returns:
+        Dictionary with enabled flag, latency percentile that triggers a
+        hedge (50-99.9), maximum share of hedged calls (0.01-1.0) and the
+        optional alternate model hedges are sent to
+    """
+    settings = {
+        s.key: s.value for s in db.query(SystemSetting).filter(
+            SystemSetting.key.in_([
+                "job_hedging_enabled", "job_hedge_percentile", "job_hedge_max_rate", "job_hedge_alternate_model"
+            ])
+        ).all()
+    }
+
+    try:
+        percentile = max(50.0, min(float(settings.get("job_hedge_percentile") or DEFAULT_JOB_HEDGE_PERCENTILE), 99.9))
+    except ValueError:
+        percentile = DEFAULT_JOB_HEDGE_PERCENTILE
+    try:
+        max_rate = max(0.01, min(float(settings.get("job_hedge_max_rate") or DEFAULT_JOB_HEDGE_MAX_RATE), 1.0))
+    except ValueError:
+        max_rate = DEFAULT_JOB_HEDGE_MAX_RATE
+
+    return {
+        "enabled": (settings.get("job_hedging_enabled") or "").lower() == "true",
+        "percentile": percentile,
+        "max_rate": max_rate,
+        "alternate_model": settings.get("job_hedge_alternate_model") or None
+    }
+
+
+@router.put("/api/settings/job-hedging")
+def set_job_hedging(
+    enabled: bool,
+    percentile: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    alternate_model: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Enable/disable hedged requests.
+
+    Args:
+        enabled: Send a duplicate request for calls slower than the percentile
+        percentile: Latency percentile of the model's recent calls (50-99.9)
+        max_rate: Maximum share of a job's calls that may be hedged (0.01-1.0)
+        alternate_model: Model hedges are sent to ("" = the job's own model)
+
+    Returns:
+        Updated settings
+    """
+    if percentile is not None and (percentile < 50 or percentile > 99.9):
+        raise HTTPException(
+            status_code=400,
+            detail="Percentile must be between 50 and 99.9"
+        )
+    if max_rate is not None and (max_rate < 0.01 or max_rate > 1.0):
+        raise HTTPException(
+            status_code=400,
+            detail="Max rate must be between 0.01 and 1.0"
+        )
+    if alternate_model and alternate_model not in [m["name"] for m in get_available_models()]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown model: {alternate_model}"
+        )
+
+    updates = {"job_hedging_enabled": "true" if enabled else "false"}
+    if percentile is not None:
+        updates["job_hedge_percentile"] = str(percentile)
+    if max_rate is not None:
+        updates["job_hedge_max_rate"] = str(max_rate)
+    if alternate_model is not None:
+        updates["job_hedge_alternate_model"] = alternate_model
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_job_hedging(db)
+    result["message"] = f"Hedged requests {'enabled' if enabled else 'disabled'} (p{result['percentile']:g})"
+    return result
+
+
+# Retries of failed calls (must match JobManager.DEFAULT_RETRY_* / MAX_RETRY_ATTEMPTS)
+DEFAULT_JOB_RETRY_MAX_ATTEMPTS = 4
+MAX_JOB_RETRY_ATTEMPTS = 10
+DEFAULT_JOB_RETRY_MAX_DELAY = 60.0
+
+
+@router.get("/api/settings/job-retry")
+def get_job_retry(db: Session = Depends(get_db)):
+    """Get retry settings of failed LLM calls.
+
+    Returns:
+        Dictionary with max_attempts per item (1-10, 1 = no retries) and the
+        cap of the exponential backoff in seconds (1-600). A provider's
+        Retry-After is honored instead of the backoff.
+    """
+    settings = {
+        s.key: s.value for s in db.query(SystemSetting).filter(
+            SystemSetting.key.in_(["job_retry_max_attempts", "job_retry_max_delay"])
+        ).all()
+    }
+
+    try:
+        max_attempts = max(1, min(
+            int(settings.get("job_retry_max_attempts") or DEFAULT_JOB_RETRY_MAX_ATTEMPTS), MAX_JOB_RETRY_ATTEMPTS
+        ))
+    except ValueError:
+        max_attempts = DEFAULT_JOB_RETRY_MAX_ATTEMPTS
+    try:
+        max_delay = max(1.0, min(float(settings.get("job_retry_max_delay") or DEFAULT_JOB_RETRY_MAX_DELAY), 600.0))
+    except ValueError:
+        max_delay = DEFAULT_JOB_RETRY_MAX_DELAY
+
+    return {
+        "max_attempts": max_attempts,
+        "max_delay": max_delay
+    }
+
+
+@router.put("/api/settings/job-retry")
+def set_job_retry(
+    max_attempts: int,
+    max_delay: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """Set retry settings of failed LLM calls.
+
+    Rate limits, timeouts, 5xx errors and empty responses are retried;
+    content filter and other client errors are final.
+
+    Args:
+        max_attempts: Calls per item, including the first (1-10, 1 = no retries)
+        max_delay: Cap of the exponential backoff in seconds (1-600)
+
+    Returns:
+        Updated settings
+    """
+    if max_attempts < 1 or max_attempts > MAX_JOB_RETRY_ATTEMPTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Max attempts must be between 1 and {MAX_JOB_RETRY_ATTEMPTS}"
+        )
+    if max_delay is not None and (max_delay < 1 or max_delay > 600):
+        raise HTTPException(
+            status_code=400,
+            detail="Max delay must be between 1 and 600 seconds"
+        )
+
+    updates = {"job_retry_max_attempts": str(max_attempts)}
+    if max_delay is not None:
+        updates["job_retry_max_delay"] = str(max_delay)
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_job_retry(db)
+    result["message"] = f"Failed calls are tried up to {result['max_attempts']} times"
+    return result
+
+
+@router.get("/api/settings/llm-cache")
+def get_llm_cache(db: Session = Depends(get_db)):
+    """Get LLM response cache settings and usage.
+
+    Returns:
+        Dictionary with mode (bypass/read-through/replay-only), size budget in MB
+        (1-102400), TTL in hours (0 = never expire) and current entry/size/hit totals
+    """
+    from sqlalchemy import func
+    from backend.database import LLMResponseCache
+    from backend.llm.response_cache import (
+        get_response_cache_store, CACHE_MODES,
+        DEFAULT_CACHE_MODE, DEFAULT_CACHE_MAX_MB, DEFAULT_CACHE_TTL_HOURS
+    )
+
+    settings = {
+        s.key: s.value for s in db.query(SystemSetting).filter(
+            SystemSetting.key.in_(["llm_cache_mode", "llm_cache_max_mb", "llm_cache_ttl_hours"])
+        ).all()
+    }
+
+    mode = (settings.get("llm_cache_mode") or DEFAULT_CACHE_MODE).strip().lower()
+    if mode not in CACHE_MODES:
+        mode = DEFAULT_CACHE_MODE
+    try:
+        max_mb = max(1, min(int(settings.get("llm_cache_max_mb") or DEFAULT_CACHE_MAX_MB), 102400))
+    except ValueError:
+        max_mb = DEFAULT_CACHE_MAX_MB
+    try:
+        ttl_hours = max(0, int(settings.get("llm_cache_ttl_hours") or DEFAULT_CACHE_TTL_HOURS))
+    except ValueError:
+        ttl_hours = DEFAULT_CACHE_TTL_HOURS
+
+    # Write pending hit counts before reading totals
+    get_response_cache_store().flush()
+    entries, size_bytes, hits = db.query(
+        func.count(LLMResponseCache.cache_key),
+        func.coalesce(func.sum(LLMResponseCache.size_bytes), 0),
+        func.coalesce(func.sum(LLMResponseCache.hit_count), 0)
+    ).one()
+
+    return {
+        "mode": mode,
+        "available_modes": CACHE_MODES,
+        "max_mb": max_mb,
+        "ttl_hours": ttl_hours,
+        "default_mode": DEFAULT_CACHE_MODE,
+        "stats": {"entries": entries, "size_bytes": size_bytes, "hits": hits}
+    }
+
+
+@router.put("/api/settings/llm-cache")
+def set_llm_cache(
+    mode: str,
+    max_mb: Optional[int] = None,
+    ttl_hours: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Set LLM response cache settings.
+
+    Args:
+        mode: bypass (disabled), read-through (serve hits, store misses) or
+              replay-only (serve hits, fail misses without calling the provider)
+        max_mb: Size budget in MB (1-102400), least recently used entries are evicted
+        ttl_hours: Entry lifetime in hours (0 = never expire)
+
+    Returns:
+        Updated settings and cache usage
+    """
+    from backend.llm.response_cache import CACHE_MODES
+
+    mode = mode.strip().lower()
+    if mode not in CACHE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid cache mode '{mode}'. Must be one of: {', '.join(CACHE_MODES)}"
+        )
+    if max_mb is not None and (max_mb < 1 or max_mb > 102400):
+        raise HTTPException(
+            status_code=400,
+            detail="Cache size must be between 1 and 102400 MB"
+        )
+    if ttl_hours is not None and ttl_hours < 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Cache TTL must be 0 (never expire) or a positive number of hours"
+        )
+
+    updates = {"llm_cache_mode": mode}
+    if max_mb is not None:
+        updates["llm_cache_max_mb"] = str(max_mb)
+    if ttl_hours is not None:
+        updates["llm_cache_ttl_hours"] = str(ttl_hours)
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_llm_cache(db)
+    result["message"] = f"LLM response cache mode set to {mode}"
+    return result
+
+
+@router.delete("/api/settings/llm-cache/entries")
+def clear_llm_cache(db: Session = Depends(get_db)):
+    """Delete all cached LLM responses."""
+    from backend.database import LLMResponseCache
+    from backend.llm.response_cache import get_response_cache_store
+
+    get_response_cache_store().flush()
+    deleted = db.query(LLMResponseCache).delete()
+    db.commit()
+    return {
+        "deleted": deleted,
+        "message": f"Deleted {deleted} cached responses"
+    }
+
+
+@router.get("/api/settings/image-cache")
+def get_image_cache_settings(db: Session = Depends(get_db)):
+    """Get image payload cache budget and usage.
+
+    Returns:
+        Dictionary with budget in MB (0 = disabled) and cache statistics
+    """
+    from backend.image_cache import get_image_cache, DEFAULT_IMAGE_CACHE_MAX_MB
+
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "image_cache_max_mb").first()
+    if setting and setting.value:
+        try:
+            max_mb = max(0, min(int(setting.value), 16384))
+        except ValueError:
+            max_mb = DEFAULT_IMAGE_CACHE_MAX_MB
+    else:
+        max_mb = DEFAULT_IMAGE_CACHE_MAX_MB
+
+    return {
+        "max_mb": max_mb,
+        "default": DEFAULT_IMAGE_CACHE_MAX_MB,
+        "stats": get_image_cache().stats()
+    }
+
+
+@router.put("/api/settings/image-cache")
+def set_image_cache_settings(max_mb: int, db: Session = Depends(get_db)):
+    """Set image payload cache budget.
+
+    Args:
+        max_mb: Memory budget for cached image data URIs in MB (0-16384, 0 = disabled)
+
+    Returns:
+        Updated budget and cache statistics
+    """
+    from backend.image_cache import get_image_cache
+
+    if max_mb < 0 or max_mb > 16384:
+        raise HTTPException(
+            status_code=400,
+            detail="Image cache size must be between 0 and 16384 MB"
+        )
+
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "image_cache_max_mb").first()
+    if setting:
+        setting.value = str(max_mb)
+    else:
+        db.add(SystemSetting(key="image_cache_max_mb", value=str(max_mb)))
+
+    db.commit()
+
+    # Apply immediately instead of waiting for the next job
+    get_image_cache().configure(max_mb * 1024 * 1024)
+
+    result = get_image_cache_settings(db)
+    result["message"] = f"Image cache size set to {max_mb} MB"
+    return result
+
+
+@router.delete("/api/settings/image-cache/entries")
+def clear_image_cache():
+    """Drop all cached image payloads."""
+    from backend.image_cache import get_image_cache
+
+    get_image_cache().clear()
+    return {"message": "Image cache cleared"}
+
+
+DEFAULT_IMAGE_PREFETCH_DEPTH = 32
+
+
+@router.get("/api/settings/image-preprocessing")
+def get_image_preprocessing(db: Session = Depends(get_db)):
+    """Get process-pool image preprocessing settings.
+
+    Returns:
+        Dictionary with worker process count (0-64, 0 = load images inline on the
+        dispatch threads) and prefetch depth (1-1000 items ahead of dispatch)
+    """
+    settings = {
+        s.key: s.value for s in db.query(SystemSetting).filter(
+            SystemSetting.key.in_(["image_preprocess_workers", "image_prefetch_depth"])
+        ).all()
+    }
+
+    try:
+        workers = max(0, min(int(settings.get("image_preprocess_workers") or 0), 64))
+    except ValueError:
+        workers = 0
+    try:
+        depth = int(settings.get("image_prefetch_depth") or DEFAULT_IMAGE_PREFETCH_DEPTH)
+        depth = max(1, min(depth, 1000))
+    except ValueError:
+        depth = DEFAULT_IMAGE_PREFETCH_DEPTH
+
+    return {
+        "workers": workers,
+        "prefetch_depth": depth,
+        "cpu_count": os.cpu_count(),
+        "default_prefetch_depth": DEFAULT_IMAGE_PREFETCH_DEPTH
+    }
+
+
+@router.put("/api/settings/image-preprocessing")
+def set_image_preprocessing(
+    workers: int,
+    prefetch_depth: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Set process-pool image preprocessing settings.
+
+    Args:
+        workers: Worker processes for FILEPATH image decode/resize/encode (0-64, 0 = inline)
+        prefetch_depth: Number of items whose images are prepared ahead of dispatch (1-1000)
+
+    Returns:
+        Updated settings
+    """
+    if workers < 0 or workers > 64:
+        raise HTTPException(
+            status_code=400,
+            detail="Image preprocessing workers must be between 0 and 64"
+        )
+    if prefetch_depth is not None and (prefetch_depth < 1 or prefetch_depth > 1000):
+        raise HTTPException(
+            status_code=400,
+            detail="Prefetch depth must be between 1 and 1000"
+        )
+
+    updates = {"image_preprocess_workers": str(workers)}
+    if prefetch_depth is not None:
+        updates["image_prefetch_depth"] = str(prefetch_depth)
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = get_image_preprocessing(db)
+    result["message"] = f"Image preprocessing set to {workers} worker(s), prefetch depth {result['prefetch_depth']}"
+    return result
+
+
+JOB_DEDUP_MODES = ["off", "auto", "force"]  # Must match JobManager.DEDUP_MODES
+
+
+@router.get("/api/settings/job-dedup")
+def get_job_dedup(db: Session = Depends(get_db)):
+    """Get in-batch deduplication mode.
+
+    Returns:
+        Dictionary with mode:
+        - off: every job item is sent to the LLM (default)
+        - auto: items with identical prompts share one LLM call when temperature is 0
+        - force: always share one LLM call between identical items
+    """
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "job_dedup_mode").first()
+
+    mode = (setting.value or "").strip().lower() if setting else ""
+    if mode not in JOB_DEDUP_MODES:
+        mode = "off"
+
+    return {
+        "mode": mode,
+        "available_modes": JOB_DEDUP_MODES,
+        "default": "off"
+    }
+
+
+@router.put("/api/settings/job-dedup")
+def set_job_dedup(mode: str, db: Session = Depends(get_db)):
+    """Set in-batch deduplication mode.
+
+    Args:
+        mode: off, auto or force
+
+    Returns:
+        Updated mode
+    """
+    mode = mode.strip().lower()
+    if mode not in JOB_DEDUP_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid dedup mode '{mode}'. Must be one of: {', '.join(JOB_DEDUP_MODES)}"
+        )
+
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "job_dedup_mode").first()
+    if setting:
+        setting.value = mode
+    else:
+        db.add(SystemSetting(key="job_dedup_mode", value=mode))
+
+    db.commit()
+
+    return {
+        "mode": mode,
+        "message": f"Job dedup mode set to {mode}"
+    }
+
+
+# Provider prompt-prefix caching (must match JobManager.DEFAULT_PROMPT_CACHE_ENABLED)
+DEFAULT_PROMPT_PREFIX_CACHE_ENABLED = True
+
+
+@router.get("/api/settings/prompt-prefix-cache")
+def get_prompt_prefix_cache(db: Session = Depends(get_db)):
+    """Get provider prompt-prefix caching setting of batch jobs.
+
+    Returns:
+        Dictionary with enabled (default True) and min_prefix_chars: the static
+        template text before the first parameter must be at least this long
+    """
+    from backend.llm.prompt_cache import MIN_PREFIX_CHARS
+
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "job_prompt_cache_enabled").first()
+    if setting and setting.value:
+        enabled = setting.value.lower() == "true"
+    else:
+        enabled = DEFAULT_PROMPT_PREFIX_CACHE_ENABLED
+
+    return {
+        "enabled": enabled,
+        "min_prefix_chars": MIN_PREFIX_CHARS,
+        "default": DEFAULT_PROMPT_PREFIX_CACHE_ENABLED
+    }
+
+
+@router.put("/api/settings/prompt-prefix-cache")
+def set_prompt_prefix_cache(enabled: bool, db: Session = Depends(get_db)):
+    """Enable/disable provider prompt-prefix caching of batch jobs.
+
+    Args:
+        enabled: Mark the static prompt prefix for provider caching
+            (Anthropic cache_control) and send the first item of a job alone
+
+    Returns:
+        Updated setting
+    """
+    value = "true" if enabled else "false"
+    setting = db.query(SystemSetting).filter(SystemSetting.key == "job_prompt_cache_enabled").first()
+    if setting:
+        setting.value = value
+    else:
+        db.add(SystemSetting(key="job_prompt_cache_enabled", value=value))
+
+    db.commit()
+
+    return {
+        "enabled": enabled,
+        "message": f"Prompt prefix caching {'enabled' if enabled else 'disabled'}"
+    }
+
+
+@router.get("/api/settings/job-scheduler")
+def get_job_scheduler_settings(db: Session = Depends(get_db)):
+    """Get job scheduler lane limits and the current lane state.
+
+    Queued jobs run in one lane per model. Single runs take priority over
+    batches and may use one reserved slot per lane.
+
+    Returns:
+        Dictionary with lane_concurrency (1-64), max_running (1-256),
+        per-model lane_overrides, running/queued job IDs per lane of this
+        process, the durable queue (queued/leased rows and lease owners, i.e.
+        the active standalone workers with JOB_RUNNER=worker) and the shared
+        SDK client pool (connections per client, cached clients)
+    """
+    from backend.job_queue import external_workers_enabled, get_job_queue_store
+    from backend.job_scheduler import get_job_scheduler, load_job_scheduler_settings
+
+    from backend.llm.client_pool import get_sdk_client_registry
+
+    result = load_job_scheduler_settings(db)
+    result["scheduler"] = get_job_scheduler().stats()
+    result["queue"] = get_job_queue_store().stats()
+    result["queue"]["external_workers"] = external_workers_enabled()
+    result["client_pool"] = get_sdk_client_registry().stats()
+    return result
+
+
+@router.put("/api/settings/job-scheduler")
+def set_job_scheduler_settings(
+    lane_concurrency: Optional[int] = None,
+    max_running: Optional[int] = None,
+    lane_overrides: Optional[Dict[str, int]] = Body(default=None, embed=True),
+    db: Session = Depends(get_db)
+):
+    """Set job scheduler lane limits.
+
+    Args:
+        lane_concurrency: Jobs running at once per model lane (1-64)
+        max_running: Jobs running at once across all lanes (1-256)
+        lane_overrides: Per-model lane concurrency, e.g. {"gpt-5": 1} (replaces existing overrides)
+
+    Returns:
+        Updated settings
+    """
+    from backend.job_scheduler import (
+        MAX_LANE_CONCURRENCY, MAX_RUNNING_JOBS_LIMIT, get_job_scheduler, load_job_scheduler_settings
+    )
+
+    if lane_concurrency is not None and (lane_concurrency < 1 or lane_concurrency > MAX_LANE_CONCURRENCY):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Lane concurrency must be between 1 and {MAX_LANE_CONCURRENCY}"
+        )
+    if max_running is not None and (max_running < 1 or max_running > MAX_RUNNING_JOBS_LIMIT):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Max running jobs must be between 1 and {MAX_RUNNING_JOBS_LIMIT}"
+        )
+    if lane_overrides is not None:
+        invalid = [model for model, n in lane_overrides.items() if n < 1 or n > MAX_LANE_CONCURRENCY]
+        if invalid:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Lane concurrency for {', '.join(invalid)} must be between 1 and {MAX_LANE_CONCURRENCY}"
+            )
+
+    updates = {}
+    if lane_concurrency is not None:
+        updates["job_lane_concurrency"] = str(lane_concurrency)
+    if max_running is not None:
+        updates["job_max_running"] = str(max_running)
+    if lane_overrides is not None:
+        updates["job_lane_overrides"] = json.dumps(lane_overrides)
+
+    for key, value in updates.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+
+    db.commit()
+
+    result = load_job_scheduler_settings(db)
+    get_job_scheduler().configure(**result)
+    result["message"] = (
+        f"Job scheduler set to {result['lane_concurrency']} job(s) per lane, "
+        f"{result['max_running']} in total"
+    )
+    return result
+
+
+@router.get("/api/settings/llm-prices")
+def get_llm_prices(db: Session = Depends(get_db)):
+    """Get the price table used for job cost estimates.
+
+    Returns:
+        Dictionary with prices: {model_name: {input, output, cached_input}}
+        in USD per 1M tokens
+    """
+    from backend.usage import load_price_table
+
+    return {"prices": load_price_table(db)}
+
+
+@router.put("/api/settings/llm-prices")
+def set_llm_prices(
+    prices: Dict[str, Dict[str, float]] = Body(..., embed=True),
+    db: Session = Depends(get_db)
+):
+    """Set the price table used for job cost estimates (replaces the existing table).
+
+    Args:
+        prices: USD per 1M tokens by model name, e.g.
+            {"azure-gpt-4.1": {"input": 2.0, "output": 8.0, "cached_input": 0.5}}
+            (cached_input defaults to input)
+
+    Returns:
+        Updated price table
+    """
+    from backend.usage import PRICE_TABLE_SETTING_KEY, validate_price_table
+
+    error = validate_price_table(prices)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    value = json.dumps(prices)
+    setting = db.query(SystemSetting).filter(SystemSetting.key == PRICE_TABLE_SETTING_KEY).first()
+    if setting:
+        setting.value = value
+    else:
+        db.add(SystemSetting(key=PRICE_TABLE_SETTING_KEY, value=value))
+    db.commit()
+
+    result = get_llm_prices(db)
+    result["message"] = f"Prices set for {len(prices)} model(s)"
+    return result
+
+
 # Default agent max iterations
 DEFAULT_AGENT_MAX_ITERATIONS = 30
 
@@ -12,6 +12,7 @@ from pydantic import BaseModel
 from datetime import datetime
 
 from backend.database import get_db, Tag, PromptTag, Prompt, SystemSetting
+from backend.settings_cache import get_settings_cache
 
 router = APIRouter()
 
@@ -340,16 +341,15 @@ def remove_tag_from_prompt(prompt_id: int, tag_id: int, db: Session = Depends(ge
 
 def get_model_allowed_tags_setting(model_name: str, db: Session) -> List[int]:
     """Get allowed tag IDs for a model from system settings."""
-    setting_key = f"model_allowed_tags_{model_name}"
-    setting = db.query(SystemSetting).filter(SystemSetting.key == setting_key).first()
+    value = get_settings_cache().get(db, f"model_allowed_tags_{model_name}")
 
-    if not setting or not setting.value:
+    if not value:
         # Default: only "ALL" tag is allowed
         all_tag = db.query(Tag).filter(Tag.name == "ALL").first()
         return [all_tag.id] if all_tag else []
 
     try:
-        return json.loads(setting.value)
+        return json.loads(value)
     except json.JSONDecodeError:
         return []
 
@@ -4,7 +4,7 @@ Based on specification in docs/req.txt section 3.2, 3.3, 4.2
 NEW ARCHITECTURE (v3.0): Supports prompt_id for new architecture.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -85,6 +85,11 @@ class RunBatchAllRequest(BaseModel):
         default=None,
         description="LLM model to use"
     )
+    model_names: Optional[List[str]] = Field(
+        default=None,
+        description="Models to compare: one job per prompt and model, linked by a comparison group "
+                    "and run concurrently in the models' scheduler lanes (overrides model_name)"
+    )
     include_csv_header: bool = Field(
         default=True,
         description="Include CSV header in output"
@@ -99,3 +104,9 @@ class RunBatchAllRequest(BaseModel):
         default=False,
         description="Force execution even if there are already running jobs"
     )
+    priority: int = Field(
+        default=50,
+        ge=0,
+        le=100,
+        description="Scheduler priority (lower runs first; batches default to 50, single runs use 0)"
+    )
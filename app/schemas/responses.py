@@ -30,6 +30,12 @@ class JobItemResponse(BaseModel):
     status: str
     error_message: Optional[str]
     turnaround_ms: Optional[int]
+    ttft_ms: Optional[int] = None  # Time to first token (streamed calls only)
+    tokens_per_second: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    reasoning_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
 
 
 class JobResponse(BaseModel):
@@ -41,7 +47,8 @@ class JobResponse(BaseModel):
     started_at: Optional[str]
     finished_at: Optional[str]
     turnaround_ms: Optional[int]
-    merged_csv_output: Optional[str] = None  # Merged CSV for batch jobs
+    merged_csv_output: Optional[str] = None  # Merged CSV for batch jobs (stored text)
+    merged_csv_available: bool = False  # Merged CSV file, download via /api/jobs/{id}/csv
     model_name: Optional[str] = None  # LLM model used for execution
     prompt_id: Optional[int] = None  # Prompt ID used for execution (new architecture)
     prompt_name: Optional[str] = None  # Prompt name used for execution
@@ -1698,6 +1698,27 @@ function displayJobResults(job, targetContainer = null) {
                 個別実行結果 / Individual Results
             </h3>
         `;
+    } else if (job.merged_csv_available) {
+        // File-backed merged CSV: not included in the job data, downloaded from the server
+        mergedCsvSection = `
+            <div class="result-item" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-left: 5px solid #f39c12;">
+                <div class="item-header" style="color: white; font-size: 1.2rem;">
+                    📊 バッチ実行結果 (CSV統合) / Batch Results (Merged CSV)
+                </div>
+                <div style="margin-top: 1rem; background: white; color: #2c3e50; padding: 1rem; border-radius: 4px;">
+                    <a href="/api/jobs/${job.id}/csv" download
+                       style="display: inline-block; padding: 0.5rem 1.5rem; background: #3498db; color: white; border-radius: 4px; text-decoration: none; font-weight: bold;">
+                        💾 CSVをダウンロード / Download CSV
+                    </a>
+                    <p style="margin-top: 1rem; color: #7f8c8d; font-size: 0.9rem;">
+                        ${job.items.length}件の実行結果を統合しました / Merged ${job.items.length} execution results
+                    </p>
+                </div>
+            </div>
+            <h3 style="margin-top: 2rem; color: #34495e; border-bottom: 2px solid #ecf0f1; padding-bottom: 0.5rem;">
+                個別実行結果 / Individual Results
+            </h3>
+        `;
     }
 
     const itemsHtml = job.items.map((item, index) => {
@@ -2116,17 +2137,86 @@ async function pollWorkflowJobProgress(jobId, workflowId) {
     }, 3000);
 }
 
+// Run refresh() whenever a job's progress changes
+const JOB_PROGRESS_MIN_REFRESH_MS = 1000;
+
+function watchJobProgress(jobId, refresh) {
+    let source = null;
+    let intervalId = null;
+    let timerId = null;
+    let refreshing = false;
+    let lastRefresh = 0;
+    let stopped = false;
+
+    // Coalesce bursts of progress events into at most one refresh per second
+    const run = () => {
+        if (stopped) return;
+        const wait = lastRefresh + JOB_PROGRESS_MIN_REFRESH_MS - Date.now();
+        if (refreshing || wait > 0) {
+            if (!timerId) {
+                timerId = setTimeout(() => {
+                    timerId = null;
+                    run();
+                }, Math.max(wait, 100));
+            }
+            return;
+        }
+        refreshing = true;
+        lastRefresh = Date.now();
+        Promise.resolve(refresh()).finally(() => {
+            refreshing = false;
+        });
+    };
+
+    const startPolling = () => {
+        if (!stopped && !intervalId) {
+            intervalId = setInterval(run, 3000);
+        }
+    };
+
+    if (typeof EventSource !== 'undefined') {
+        source = new EventSource(`/api/jobs/${jobId}/progress/stream`);
+        source.onmessage = run;
+        source.onerror = () => {
+            // Stream ended or connection lost: fall back to polling
+            source.close();
+            source = null;
+            startPolling();
+        };
+    } else {
+        startPolling();
+    }
+
+    return {
+        stop() {
+            stopped = true;
+            if (source) {
+                source.close();
+                source = null;
+            }
+            if (intervalId) {
+                clearInterval(intervalId);
+                intervalId = null;
+            }
+            if (timerId) {
+                clearTimeout(timerId);
+                timerId = null;
+            }
+        }
+    };
+}
+
 // Poll single job progress until completion
-let singlePollIntervalId = null;
+let singleProgressWatcher = null;
 
 async function pollSingleJobProgress(jobId, projectId) {
-    // Clear any existing polling interval
-    if (singlePollIntervalId) {
-        clearInterval(singlePollIntervalId);
+    // Stop any existing progress watcher
+    if (singleProgressWatcher) {
+        singleProgressWatcher.stop();
     }
 
-    // Poll every 3 seconds
-    singlePollIntervalId = setInterval(async () => {
+    // Refresh whenever progress changes (SSE, or polling every 3 seconds)
+    singleProgressWatcher = watchJobProgress(jobId, async () => {
         try {
             // Fetch updated job data
             const response = await fetch(`/api/projects/${projectId}/jobs`);
@@ -2135,8 +2225,8 @@ async function pollSingleJobProgress(jobId, projectId) {
 
             if (!job) {
                 // Job not found, stop polling
-                clearInterval(singlePollIntervalId);
-                singlePollIntervalId = null;
+                singleProgressWatcher?.stop();
+                singleProgressWatcher = null;
                 hideSingleStopButton();
                 return;
             }
@@ -2155,8 +2245,8 @@ async function pollSingleJobProgress(jobId, projectId) {
 
             if (isComplete || allItemsComplete) {
                 // Job finished, stop polling
-                clearInterval(singlePollIntervalId);
-                singlePollIntervalId = null;
+                singleProgressWatcher?.stop();
+                singleProgressWatcher = null;
                 hideSingleStopButton();
 
                 // Update final status in history
@@ -2179,7 +2269,7 @@ async function pollSingleJobProgress(jobId, projectId) {
             console.error('Error polling single job:', error);
             // Continue polling on error (network issue might be temporary)
         }
-    }, 3000); // Poll every 3 seconds
+    });
 }
 
 function hideSingleStopButton() {
@@ -5068,16 +5158,16 @@ async function pollWorkflowBatchJobs(jobIds) {
 }
 
 // Poll batch job progress until completion
-let batchPollIntervalId = null;
+let batchProgressWatcher = null;
 
 async function pollBatchJobProgress(jobId, projectId) {
-    // Clear any existing polling interval
-    if (batchPollIntervalId) {
-        clearInterval(batchPollIntervalId);
+    // Stop any existing progress watcher
+    if (batchProgressWatcher) {
+        batchProgressWatcher.stop();
     }
 
-    // Poll every 3 seconds
-    batchPollIntervalId = setInterval(async () => {
+    // Refresh whenever progress changes (SSE, or polling every 3 seconds)
+    batchProgressWatcher = watchJobProgress(jobId, async () => {
         try {
             // Fetch updated job data
             const response = await fetch(`/api/projects/${projectId}/jobs`);
@@ -5086,8 +5176,8 @@ async function pollBatchJobProgress(jobId, projectId) {
 
             if (!job) {
                 // Job not found, stop polling
-                clearInterval(batchPollIntervalId);
-                batchPollIntervalId = null;
+                batchProgressWatcher?.stop();
+                batchProgressWatcher = null;
                 hideBatchStopButton();
                 return;
             }
@@ -5106,8 +5196,8 @@ async function pollBatchJobProgress(jobId, projectId) {
 
             if (isComplete || allItemsComplete) {
                 // Job finished, stop polling
-                clearInterval(batchPollIntervalId);
-                batchPollIntervalId = null;
+                batchProgressWatcher?.stop();
+                batchProgressWatcher = null;
                 hideBatchStopButton();
 
                 // Update final status in history
@@ -5120,7 +5210,7 @@ async function pollBatchJobProgress(jobId, projectId) {
             console.error('Error polling batch job:', error);
             // Continue polling on error (network issue might be temporary)
         }
-    }, 3000); // Poll every 3 seconds
+    });
 }
 
 function hideBatchStopButton() {
@@ -9794,9 +9884,9 @@ async function cancelJob(jobId, buttonId, statusId) {
 
 async function cancelSingleJob() {
     // Stop polling first
-    if (singlePollIntervalId) {
-        clearInterval(singlePollIntervalId);
-        singlePollIntervalId = null;
+    if (singleProgressWatcher) {
+        singleProgressWatcher.stop();
+        singleProgressWatcher = null;
     }
 
     const jobId = currentSingleJobId;
@@ -9826,9 +9916,9 @@ async function cancelSingleJob() {
 
 async function cancelBatchJob() {
     // Stop polling first
-    if (batchPollIntervalId) {
-        clearInterval(batchPollIntervalId);
-        batchPollIntervalId = null;
+    if (batchProgressWatcher) {
+        batchProgressWatcher.stop();
+        batchProgressWatcher = null;
     }
 
     const jobId = currentBatchJobId;
@@ -18510,15 +18600,29 @@ async function retryAllErrors(jobId, btn) {
 
         const result = await response.json();
 
-        if (result.success) {
-            const statusType = result.error_count > 0 ? 'warning' : 'success';
+        if (!response.ok) {
+            showStatus(`一括再送失敗 / Bulk retry failed: ${result.detail || 'Unknown error'}`, 'error');
+        } else if (result.success && result.queued_count > 0) {
             showStatus(
-                `再送完了 / Retry completed: 成功${result.success_count}件 / ${result.success_count} success, ` +
-                `失敗${result.error_count}件 / ${result.error_count} still error`,
-                statusType
+                `再送開始 / Retry queued: ${result.queued_count}件 / ${result.queued_count} items`,
+                'info'
             );
-            // Refresh job display
+            // Retries run in the background: refresh until the job finishes
+            const watcher = watchJobProgress(jobId, async () => {
+                await refreshJobDisplay(jobId);
+                const job = lastDisplayedJob;
+                if (job && job.id === jobId && !['pending', 'running'].includes(job.status)) {
+                    watcher.stop();
+                    const errorCount = (job.items || []).filter(i => i.status === 'error').length;
+                    showStatus(
+                        `再送完了 / Retry completed: 失敗${errorCount}件 / ${errorCount} still error`,
+                        errorCount > 0 ? 'warning' : 'success'
+                    );
+                }
+            });
             await refreshJobDisplay(jobId);
+        } else if (result.success) {
+            showStatus('再送対象なし / No error items to retry', 'info');
         } else {
             showStatus(`一括再送失敗 / Bulk retry failed: ${result.message || 'Unknown error'}`, 'error');
         }
@@ -25,7 +25,7 @@ from backend.mcp.tools import get_tool_registry, MCPToolRegistry
 from backend.mcp.client import MCPClient
 from backend.llm.factory import get_llm_client
 from backend.database.database import SessionLocal
-from backend.database.models import SystemSetting
+from backend.settings_cache import get_settings_cache
 from backend.agent.policy import (
     PolicyLayer, PolicyDecision, PolicyResult, InputCategory,
     get_policy_layer, wrap_untrusted_content
@@ -460,10 +460,7 @@ input_mapping: {"QUESTION": "{{vars.ROW.question}}", "CHOICES": "format_choices(
         """Get default model from system settings."""
         db = SessionLocal()
         try:
-            setting = db.query(SystemSetting).filter(
-                SystemSetting.key == "active_llm_model"
-            ).first()
-            return setting.value if setting else "claude-3.5-sonnet"
+            return get_settings_cache().get(db, "active_llm_model", "claude-3.5-sonnet")
         finally:
             db.close()
 
@@ -471,17 +468,8 @@ input_mapping: {"QUESTION": "{{vars.ROW.question}}", "CHOICES": "format_choices(
         """Get max iterations from system settings."""
         db = SessionLocal()
         try:
-            setting = db.query(SystemSetting).filter(
-                SystemSetting.key == "agent_max_iterations"
-            ).first()
-            if setting and setting.value:
-                try:
-                    max_iter = int(setting.value)
-                    # Clamp to valid range (10-99)
-                    return max(10, min(max_iter, 99))
-                except ValueError:
-                    pass
-            return 30  # Default value
+            # Default 30, clamped to valid range (10-99)
+            return get_settings_cache().get_int(db, "agent_max_iterations", 30, 10, 99)
         finally:
             db.close()
 
@@ -494,17 +482,8 @@ input_mapping: {"QUESTION": "{{vars.ROW.question}}", "CHOICES": "format_choices(
         """
         db = SessionLocal()
         try:
-            setting = db.query(SystemSetting).filter(
-                SystemSetting.key == "agent_max_tokens"
-            ).first()
-            if setting and setting.value:
-                try:
-                    max_tokens = int(setting.value)
-                    # Clamp to valid range (1024-65536)
-                    return max(1024, min(max_tokens, 65536))
-                except ValueError:
-                    pass
-            return 16384  # Default value for reasoning models
+            # Default 16384 for reasoning models, clamped to valid range (1024-65536)
+            return get_settings_cache().get_int(db, "agent_max_tokens", 16384, 1024, 65536)
         finally:
             db.close()
 
@@ -516,17 +495,8 @@ input_mapping: {"QUESTION": "{{vars.ROW.question}}", "CHOICES": "format_choices(
         """
         db = SessionLocal()
         try:
-            setting = db.query(SystemSetting).filter(
-                SystemSetting.key == "agent_llm_timeout"
-            ).first()
-            if setting and setting.value:
-                try:
-                    timeout = int(setting.value)
-                    # Clamp to valid range (60-1800 seconds = 1-30 minutes)
-                    return float(max(60, min(timeout, 1800)))
-                except ValueError:
-                    pass
-            return 600.0  # Default: 10 minutes
+            # Default 10 minutes, clamped to valid range (60-1800 seconds = 1-30 minutes)
+            return float(get_settings_cache().get_int(db, "agent_llm_timeout", 600, 60, 1800))
         finally:
             db.close()
 
@@ -371,16 +371,17 @@ class GuardrailChain:
     def _get_client(self):
         """Lazy initialization of LLM client."""
         if self._client is None:
-            from backend.llm.factory import get_llm_client
+            # Plugins make one attempt; 429/5xx failures are retried inline here
+            from backend.llm.factory import get_retrying_llm_client
             try:
-                self._client = get_llm_client(self.model_name)
+                self._client = get_retrying_llm_client(self.model_name)
                 logger.info(f"[Guardrail] Initialized with model: {self.model_name}")
             except Exception as e:
                 logger.error(f"[Guardrail] Failed to initialize model '{self.model_name}': {e}")
                 # Try fallback
                 for fallback in ["openai-gpt-4.1-nano", "openai-gpt-5-nano", "azure-gpt-5-nano"]:
                     try:
-                        self._client = get_llm_client(fallback)
+                        self._client = get_retrying_llm_client(fallback)
                         self.model_name = fallback
                         logger.info(f"[Guardrail] Using fallback model: {fallback}")
                         break
@@ -841,12 +842,9 @@ def get_guardrail_chain(model_name: str = None) -> GuardrailChain:
         # Try to get from system settings
         try:
             from backend.database.database import SessionLocal
-            from backend.database.models import SystemSetting
+            from backend.settings_cache import get_settings_cache
             db = SessionLocal()
-            setting = db.query(SystemSetting).filter(
-                SystemSetting.key == "guardrail_model"
-            ).first()
-            model_name = setting.value if setting else "openai-gpt-4.1-nano"
+            model_name = get_settings_cache().get(db, "guardrail_model", "openai-gpt-4.1-nano")
             db.close()
         except Exception:
             model_name = "openai-gpt-4.1-nano"
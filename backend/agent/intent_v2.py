@@ -546,15 +546,16 @@ class LLMIntentClassifier:
     def _get_client(self):
         """Lazy initialization of LLM client."""
         if self._client is None:
-            from backend.llm.factory import get_llm_client
+            # Plugins make one attempt; 429/5xx failures are retried inline here
+            from backend.llm.factory import get_retrying_llm_client
             try:
-                self._client = get_llm_client(self.model_name)
+                self._client = get_retrying_llm_client(self.model_name)
             except Exception as e:
                 logger.warning(f"Failed to initialize LLM client '{self.model_name}': {e}")
                 # Try fallback models
                 for fallback in ["openai-gpt-4.1-nano", "openai-gpt-5-nano", "azure-gpt-5-nano"]:
                     try:
-                        self._client = get_llm_client(fallback)
+                        self._client = get_retrying_llm_client(fallback)
                         self.model_name = fallback
                         logger.info(f"Using fallback model: {fallback}")
                         break
@@ -0,0 +1,260 @@
+"""Incremental merged CSV output for jobs.
+
+Rebuilding the merged CSV at the end of a job means re-querying every item
+and decoding every parsed_response at once, then holding the whole CSV in one
+string. IncrementalCsvMerger instead appends rows to a file as items finish.
+Rows are written in item id order (the order _merge_csv_outputs() used):
+results that finish ahead of an unfinished lower id wait in a small reorder
+buffer. An item on a long retry delay could hold back every later row, so
+beyond max_ready rows the buffer is moved to a spill file next to the output
+(only file offsets stay in memory). When the job ends, only that remainder
+is written and the file is renamed into place.
+
+The file is only written where every process serving downloads can read it:
+with CSV_OUTPUT_DIR set (shared storage), or when jobs run in the web process
+on SQLite. Otherwise (standalone workers, PostgreSQL) no merged file is
+written and downloads build the CSV from the job items.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def get_csv_output_dir() -> str:
+    """Get the directory for merged CSV files (CSV_OUTPUT_DIR, default next to the database)."""
+    env_dir = os.getenv("CSV_OUTPUT_DIR")
+    if env_dir:
+        return os.path.abspath(os.path.expanduser(env_dir))
+    database_path = os.getenv("DATABASE_PATH", "database/app.db")
+    return os.path.abspath(os.path.join(os.path.dirname(database_path) or ".", "csv_output"))
+
+
+def merged_csv_files_enabled(dialect: str, external_workers: bool) -> bool:
+    """Check whether merged CSV files can be kept on disk for downloads.
+
+    Args:
+        dialect: Database dialect name of the job's session
+        external_workers: Jobs run on standalone workers (JOB_RUNNER=worker)
+
+    Returns:
+        True if CSV_OUTPUT_DIR is set (it must be shared by the web process and
+        the workers) or jobs run in the web process on SQLite
+    """
+    if os.getenv("CSV_OUTPUT_DIR"):
+        return True
+    return dialect == "sqlite" and not external_workers
+
+
+def remove_merged_csv_file(path: Optional[str]):
+    """Delete a job's merged CSV file once it is no longer referenced (missing files are ignored)."""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"CSV merge: Could not delete {path}: {e}")
+
+
+def extract_csv_row(parsed_response: str, item_id: int = None) -> Optional[Tuple[str, dict]]:
+    """Extract the CSV line and fields from an item's parsed_response.
+
+    Args:
+        parsed_response: JSON string stored in JobItem.parsed_response
+        item_id: JobItem ID (for logging)
+
+    Returns:
+        (csv_output, fields), or None if the item has no CSV output
+    """
+    if not parsed_response:
+        return None
+    try:
+        parsed = json.loads(parsed_response)
+
+        # Handle double-encoded JSON (string instead of dict)
+        if isinstance(parsed, str):
+            try:
+                parsed = json.loads(parsed)
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"CSV merge: Item {item_id} has double-encoded JSON that couldn't be parsed")
+                return None
+
+        # Ensure parsed is a dictionary
+        if not isinstance(parsed, dict):
+            logger.warning(f"CSV merge: Item {item_id} parsed_response is not a dict: {type(parsed)}")
+            return None
+
+        csv_output = parsed.get("csv_output", "")
+        if not csv_output:
+            logger.warning(f"CSV merge: Item {item_id} has no csv_output field in parsed response")
+            return None
+
+        return csv_output, parsed.get("fields", {}) or {}
+
+    except (json.JSONDecodeError, KeyError, AttributeError, TypeError) as e:
+        logger.error(f"CSV merge: Error parsing item {item_id}: {e}")
+        return None
+
+
+def build_csv_header(fields: dict, field_order: Optional[List[str]]) -> str:
+    """Build the CSV header line from an item's fields.
+
+    Uses csv_template field order if available, otherwise fields.keys() order.
+    """
+    if field_order:
+        # Filter to only include fields that actually exist
+        return ",".join(f for f in field_order if f in fields)
+    return ",".join(fields.keys())
+
+
+class IncrementalCsvMerger:
+    """Writes a job's merged CSV to disk as its items complete."""
+
+    DEFAULT_MAX_READY = 1000
+
+    def __init__(
+        self,
+        path: str,
+        item_ids: List[int],
+        include_header: bool,
+        field_order: Optional[List[str]] = None,
+        max_ready: int = DEFAULT_MAX_READY
+    ):
+        """Initialize merger and open the output file.
+
+        Args:
+            path: Final path of the merged CSV file
+            item_ids: IDs of all items of the job
+            include_header: Add a header line before the first row
+            field_order: csv_template field order for the header
+            max_ready: Rows kept in memory while waiting on a lower id
+        """
+        self.path = path
+        self.include_header = include_header
+        self.field_order = field_order
+        self.max_ready = max_ready
+        self._positions = {item_id: index for index, item_id in enumerate(sorted(item_ids))}
+        self._count = len(self._positions)
+        self._next = 0
+        self._ready: Dict[int, Optional[Tuple[str, dict]]] = {}
+        self._spilled: Dict[int, int] = {}  # position -> spill file offset (-1: no row)
+        self._spill_file = None
+        self._header_added = False
+        self._lines_written = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._tmp_path = f"{path}.part"
+        self._file = open(self._tmp_path, "w", encoding="utf-8", newline="")
+        self._spill_path = f"{path}.spill"
+
+    def record(self, item_id: int, status: str, parsed_response: Optional[str]):
+        """Report the final result of an item (rows are only taken from done items)."""
+        row = extract_csv_row(parsed_response, item_id) if status == "done" else None
+        self._put(item_id, row)
+
+    def skip(self, item_id: int):
+        """Report an item that will not produce a row (error, cancelled, not executed)."""
+        self._put(item_id, None)
+
+    def _put(self, item_id: int, row: Optional[Tuple[str, dict]]):
+        position = self._positions.get(item_id)
+        if position is None:
+            return
+        with self._lock:
+            if self._file is None or position < self._next:
+                return
+            self._ready[position] = row
+            while self._next in self._ready or self._next in self._spilled:
+                self._write(self._take(self._next))
+                self._next += 1
+            if len(self._ready) > self.max_ready:
+                self._spill_ready()
+
+    def _take(self, position: int) -> Optional[Tuple[str, dict]]:
+        """Remove the row at a position from the buffer or the spill file (caller holds the lock)."""
+        if position in self._ready:
+            return self._ready.pop(position)
+        offset = self._spilled.pop(position)
+        if offset < 0:
+            return None
+        self._spill_file.seek(offset)
+        csv_output, fields = json.loads(self._spill_file.readline())
+        return csv_output, fields
+
+    def _spill_ready(self):
+        """Move the buffered rows to the spill file (caller holds the lock)."""
+        if self._spill_file is None:
+            self._spill_file = open(self._spill_path, "w+", encoding="utf-8", newline="")
+        for position, row in self._ready.items():
+            if row is None:
+                self._spilled[position] = -1
+                continue
+            self._spill_file.seek(0, os.SEEK_END)
+            self._spilled[position] = self._spill_file.tell()
+            self._spill_file.write(json.dumps(row) + "\n")
+        logger.debug(f"CSV merge: Spilled {len(self._ready)} rows waiting on item position {self._next}")
+        self._ready.clear()
+
+    def _close_spill(self):
+        if self._spill_file is None:
+            return
+        self._spill_file.close()
+        self._spill_file = None
+        try:
+            os.remove(self._spill_path)
+        except OSError:
+            pass
+
+    def _write(self, row: Optional[Tuple[str, dict]]):
+        """Append one row (caller holds the lock)."""
+        if row is None:
+            return
+        csv_output, fields = row
+        # Add header from first successful item (only once)
+        if not self._header_added and self.include_header and fields:
+            self._write_line(build_csv_header(fields, self.field_order))
+            self._header_added = True
+        self._write_line(csv_output)
+
+    def _write_line(self, line: str):
+        if self._lines_written:
+            self._file.write("\n")
+        self._file.write(line)
+        self._lines_written += 1
+
+    def finalize(self) -> str:
+        """Write rows still waiting on unfinished items and move the file into place.
+
+        Returns:
+            Path of the merged CSV file
+        """
+        with self._lock:
+            for position in sorted([*self._ready, *self._spilled]):
+                self._write(self._take(position))
+            self._next = self._count
+            self._file.close()
+            self._file = None
+            self._close_spill()
+        os.replace(self._tmp_path, self.path)
+        logger.info(f"CSV merge: Wrote {self._lines_written} lines to {self.path}")
+        return self.path
+
+    def discard(self):
+        """Close and delete the partial file (job aborted)."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            self._close_spill()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
@@ -9,6 +9,10 @@ from .models import (
     Tag, PromptTag,
     # DATASET MULTI-PROJECT (v3.2)
     ProjectDataset,
+    # LLM RESPONSE CACHE
+    LLMResponseCache,
+    # DURABLE JOB QUEUE
+    JobQueueEntry,
 )
 from .database import engine, SessionLocal, get_db, init_db
 
@@ -33,6 +37,10 @@ __all__ = [
     "PromptTag",
     # DATASET MULTI-PROJECT (v3.2)
     "ProjectDataset",
+    # LLM RESPONSE CACHE
+    "LLMResponseCache",
+    # DURABLE JOB QUEUE
+    "JobQueueEntry",
     # Database utilities
     "engine",
     "SessionLocal",
@@ -0,0 +1,118 @@
+"""Dialect-neutral helpers for raw SQL.
+
+The application runs on SQLite (default) or PostgreSQL (DATABASE_URL, see
+database.py). Most queries go through the ORM or portable text() SQL; the
+helpers here replace the SQLite-only constructs the dataset code used:
+
+- PRAGMA table_info -> get_table_columns() / describe_table_columns()
+- INTEGER PRIMARY KEY AUTOINCREMENT -> id_column_ddl()
+- SELECT last_insert_rowid() -> insert_returning_id()
+- INSERT OR REPLACE -> upsert()
+
+Dataset tables are addressed by their "id" column, never by SQLite's
+implicit rowid. (ORDER BY RANDOM() is valid on both databases.)
+
+Writes that must not interleave with each other beyond single-row
+conditions (job queue claims checked against lease counts) take
+lock_transaction().
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import NoSuchTableError
+from sqlalchemy.orm import Session
+
+POSTGRESQL = "postgresql"
+SQLITE = "sqlite"
+
+Bind = Union[Session, Connection, Engine]
+
+
+def dialect_name(bind: Bind) -> str:
+    """Get the dialect name ("sqlite", "postgresql", ...) of a session, connection or engine."""
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    return bind.dialect.name
+
+
+def describe_table_columns(db: Session, table_name: str) -> List[dict]:
+    """Get the columns of a table in definition order.
+
+    Uses the session's connection, so tables created in the current
+    transaction are visible.
+
+    Returns:
+        [{"name": ..., "type": "TEXT"/"INTEGER"/...}] ([] if the table does not exist)
+    """
+    try:
+        columns = inspect(db.connection()).get_columns(table_name)
+    except NoSuchTableError:
+        return []
+    return [{"name": column["name"], "type": str(column["type"])} for column in columns]
+
+
+def get_table_columns(db: Session, table_name: str) -> List[str]:
+    """Get the column names of a table in definition order ([] if it does not exist)."""
+    return [column["name"] for column in describe_table_columns(db, table_name)]
+
+
+def id_column_ddl(db: Session, autoincrement: bool = True) -> str:
+    """Column definition of the integer "id" primary key of a dataset table.
+
+    Args:
+        autoincrement: On SQLite, never reuse IDs of deleted rows
+            (PostgreSQL sequences never do)
+    """
+    if dialect_name(db) == POSTGRESQL:
+        return "id SERIAL PRIMARY KEY"
+    return "id INTEGER PRIMARY KEY AUTOINCREMENT" if autoincrement else "id INTEGER PRIMARY KEY"
+
+
+def reset_id_sequence(db: Union[Session, Connection], table_name: str, column: str = "id"):
+    """Move the ID sequence of a table past its largest ID (no-op on SQLite).
+
+    Needed on PostgreSQL after rows were inserted with explicit IDs.
+    """
+    if dialect_name(db) != POSTGRESQL:
+        return
+    db.execute(
+        text(
+            f'SELECT setval(pg_get_serial_sequence(:table, :column), '
+            f'COALESCE((SELECT MAX("{column}") FROM "{table_name}"), 0) + 1, false)'
+        ),
+        {"table": f'"{table_name}"', "column": column}
+    )
+
+
+def insert_returning_id(db: Session, insert_sql: str, params: Optional[dict] = None) -> int:
+    """Execute an INSERT statement and return the generated "id"."""
+    if dialect_name(db) == POSTGRESQL:
+        return db.execute(text(f"{insert_sql} RETURNING id"), params or {}).scalar()
+    return db.execute(text(insert_sql), params or {}).lastrowid
+
+
+def lock_transaction(db: Session, name: str):
+    """Serialize the current transaction with others taking the same named lock.
+
+    PostgreSQL takes a transaction-level advisory lock (released on commit or
+    rollback). No-op on SQLite, where write transactions are serialized anyway.
+    """
+    if dialect_name(db) == POSTGRESQL:
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": name})
+
+
+def upsert(db: Session, table: Table, values: Dict, key_columns: Iterable[str]):
+    """Insert a row, or overwrite the given columns of the row with the same key."""
+    if dialect_name(db) == POSTGRESQL:
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    key_columns = list(key_columns)
+    stmt = insert(table).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: stmt.excluded[column] for column in values if column not in key_columns}
+    )
+    db.execute(stmt)
@@ -3,8 +3,10 @@
 Based on specification in docs/req.txt section 5 (DB設計).
 """
 
+import io
 from datetime import datetime
-from sqlalchemy import Column, Integer, Text, ForeignKey, Index
+from typing import Optional, TextIO
+from sqlalchemy import Column, Float, Integer, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -144,7 +146,20 @@ class Job(Base):
     started_at = Column(Text, nullable=True)
     finished_at = Column(Text, nullable=True)
     turnaround_ms = Column(Integer, nullable=True)
-    merged_csv_output = Column(Text, nullable=True)  # Merged CSV output for batch jobs
+    # Merged CSV output for batch jobs: stored text (jobs merged before
+    # incremental output, retried items), or the file at merged_csv_path
+    merged_csv_output = Column(Text, nullable=True)
+    merged_csv_path = Column(Text, nullable=True)
+    dedup_saved_calls = Column(Integer, nullable=False, default=0)  # LLM calls skipped by in-batch dedup
+    hedged_calls = Column(Integer, nullable=False, default=0)  # Calls that got a hedge request
+    hedge_wins = Column(Integer, nullable=False, default=0)  # Hedge requests that answered first
+    hedge_saved_ms = Column(Integer, nullable=False, default=0)  # Measured latency saved by hedge wins
+    comparison_group = Column(Text, nullable=True)  # Shared by the per-model jobs of a multi-model run
+    # Item creation of a comparison group is claimed on its first job (see
+    # JobManager.populate_batch_job_items): 1 once all items exist, and the
+    # claim of the process creating them ("<expiry> <token>")
+    items_populated = Column(Integer, nullable=False, default=0)
+    items_population_lease = Column(Text, nullable=True)
 
     # Relationships - OLD (backward compatibility)
     project_revision = relationship("ProjectRevision", back_populates="jobs")
@@ -157,8 +172,30 @@ class Job(Base):
     __table_args__ = (
         Index("idx_job_status", "status"),
         Index("idx_job_created", "created_at"),
+        Index("idx_job_comparison_group", "comparison_group"),
     )
 
+    @property
+    def has_merged_csv(self) -> bool:
+        """Check whether the job has a merged CSV (stored or file-backed) without reading it."""
+        return bool(self.merged_csv_output) or bool(self.merged_csv_path)
+
+    def open_merged_csv(self) -> Optional[TextIO]:
+        """Open the merged CSV as a text stream without loading a file-backed CSV.
+
+        Returns:
+            Text stream (caller closes it), or None if the job has no merged CSV
+
+        Raises:
+            OSError: merged_csv_path is set but the file cannot be read (for
+                example CSV_OUTPUT_DIR is not shared with the worker that wrote it)
+        """
+        if self.merged_csv_output is not None:
+            return io.StringIO(self.merged_csv_output)
+        if self.merged_csv_path:
+            return open(self.merged_csv_path, "r", encoding="utf-8", newline="")
+        return None
+
 
 class JobItem(Base):
     """Job item table - stores individual execution results.
@@ -177,6 +214,12 @@ class JobItem(Base):
     status = Column(Text, nullable=False, default="pending")  # pending/running/done/error
     error_message = Column(Text, nullable=True)
     turnaround_ms = Column(Integer, nullable=True)
+    ttft_ms = Column(Integer, nullable=True)  # Time to first token (streamed calls only)
+    tokens_per_second = Column(Float, nullable=True)  # Output rate after the first token (streamed calls only)
+    prompt_tokens = Column(Integer, nullable=True)  # Token usage reported by the provider
+    completion_tokens = Column(Integer, nullable=True)
+    reasoning_tokens = Column(Integer, nullable=True)
+    cached_tokens = Column(Integer, nullable=True)
 
     # Relationships
     job = relationship("Job", back_populates="job_items")
@@ -185,6 +228,7 @@ class JobItem(Base):
     __table_args__ = (
         Index("idx_job_item_job", "job_id"),
         Index("idx_job_item_status", "status"),
+        Index("idx_job_item_job_status", "job_id", "status"),
     )
 
 
@@ -514,3 +558,54 @@ class AgentTask(Base):
         Index("idx_agent_tasks_status", "status"),
         Index("idx_agent_tasks_created", "created_at"),
     )
+
+
+# ========== LLM RESPONSE CACHE ==========
+
+class LLMResponseCache(Base):
+    """Content-addressed cache of successful LLM responses.
+
+    Keyed by a hash of (model, normalized messages, image digests, params).
+    Size-bounded with LRU eviction by last_accessed_at; see backend/llm/response_cache.py.
+    """
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(Text, primary_key=True)  # sha256 hex digest
+    model_name = Column(Text, nullable=False)
+    response_text = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(Text, nullable=False, default=lambda: datetime.utcnow().isoformat())
+    last_accessed_at = Column(Text, nullable=False, default=lambda: datetime.utcnow().isoformat())
+
+    __table_args__ = (
+        Index("idx_llm_response_cache_accessed", "last_accessed_at"),
+    )
+
+
+# ========== DURABLE JOB QUEUE ==========
+
+class JobQueueEntry(Base):
+    """Job queue table - jobs submitted to the scheduler that have not finished.
+
+    A row is removed when its job finishes. While the job executes, the row
+    holds a lease (owner + expiry) renewed by a heartbeat; rows left behind by
+    a restart are submitted again. See backend/job_queue.py.
+    """
+    __tablename__ = "job_queue"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    lane = Column(Text, nullable=False)  # Scheduler lane (model name)
+    priority = Column(Integer, nullable=False, default=50)
+    project_id = Column(Integer)
+    job_config = Column(Text, nullable=False)  # JSON: execution arguments (model, temperature, ...)
+    lease_owner = Column(Text)  # "host:pid:token" of the executing process
+    lease_expires_at = Column(Text)  # ISO timestamp; NULL = not leased
+    heartbeat_at = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)  # Number of times a lease was taken
+    created_at = Column(Text, nullable=False, default=lambda: datetime.utcnow().isoformat())
+
+    __table_args__ = (
+        Index("idx_job_queue_job", "job_id", unique=True),
+    )
@@ -0,0 +1,91 @@
+"""SQLite performance profile.
+
+The engine used SQLite's defaults: rollback journal, full fsync on every
+commit and no busy timeout. With many executor threads committing at once,
+writers failed with "database is locked" instead of waiting. Every new
+connection now gets:
+
+- journal_mode=WAL: readers no longer block the writer (and vice versa)
+- synchronous=NORMAL: no fsync per commit in WAL mode (a power loss may lose
+  the last commits, never corrupts the database)
+- busy_timeout: wait for the write lock instead of failing right away
+- cache_size, mmap_size, temp_store=MEMORY: fewer reads through the OS
+
+Writes from executor threads are serialized by DatabaseWriter
+(backend/database/writer.py), which also checkpoints the WAL.
+
+Set SQLITE_JOURNAL_MODE (e.g. DELETE) for file systems without shared
+memory support, where WAL cannot be used.
+"""
+
+import logging
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_MS = 30000
+CACHE_SIZE_KIB = 65536  # Page cache per connection (64 MiB)
+MMAP_SIZE_BYTES = 268435456  # 256 MiB
+
+JOURNAL_MODE_WAL = "wal"
+
+
+def get_journal_mode() -> str:
+    """Get the configured journal mode (SQLITE_JOURNAL_MODE, default WAL)."""
+    return os.getenv("SQLITE_JOURNAL_MODE", JOURNAL_MODE_WAL).strip().lower() or JOURNAL_MODE_WAL
+
+
+def is_file_database(engine: Engine) -> bool:
+    """Check whether an engine is a SQLite database file (not in-memory)."""
+    database = engine.url.database
+    return engine.dialect.name == "sqlite" and bool(database) and database != ":memory:" \
+        and not database.startswith("file::memory:")
+
+
+def apply_sqlite_profile(dbapi_connection, journal_mode: str = None):
+    """Set the performance pragmas on a new DB-API connection.
+
+    Args:
+        dbapi_connection: sqlite3 connection
+        journal_mode: Journal mode (default: get_journal_mode())
+
+    Returns:
+        Journal mode reported by SQLite (differs if the requested one is unsupported)
+    """
+    journal_mode = journal_mode or get_journal_mode()
+    cursor = dbapi_connection.cursor()
+    try:
+        # busy_timeout first: switching to WAL needs a lock
+        cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+        actual_mode = (cursor.fetchone() or [""])[0].lower()
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+    finally:
+        cursor.close()
+    return actual_mode
+
+
+def configure_sqlite_engine(engine: Engine):
+    """Apply the performance profile to every connection of a SQLite file engine.
+
+    Other engines (in-memory databases, other dialects) are left unchanged.
+    """
+    if not is_file_database(engine):
+        return
+    journal_mode = get_journal_mode()
+    warned = []
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        actual_mode = apply_sqlite_profile(dbapi_connection, journal_mode)
+        if actual_mode != journal_mode and not warned:
+            warned.append(True)
+            logger.warning(
+                f"[DATABASE] journal_mode={journal_mode} not supported here, using {actual_mode}"
+            )
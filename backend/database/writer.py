@@ -0,0 +1,237 @@
+"""Single writer thread for SQLite databases.
+
+SQLite allows one writer at a time. Executor threads that commit on their
+own connections wait for each other through the busy handler (or fail with
+"database is locked" when the wait is too long), and every one of them
+holds a pooled connection while it waits. DatabaseWriter runs writes on one
+thread with a dedicated connection instead:
+
+    writer = get_database_writer(db.get_bind())
+    status = writer.run(lambda session: session.execute(stmt).fetchone())
+
+Each submitted function gets a Session on the writer connection. The writer
+commits after the function returns, or rolls back if it raises, and
+returns the result (or raises the exception) in the calling thread. Reads
+keep using the caller's own session and run concurrently (WAL mode, see
+sqlite_profile).
+
+run_write() is the entry point for callers: it uses the engine's writer
+if there is one, and otherwise writes and commits on the caller's session
+(in-memory and non-SQLite databases).
+
+Checkpoints: SQLite checkpoints the WAL automatically on commit, but a
+checkpoint cannot pass pages that long-running readers still see, so the
+WAL file keeps growing under constant load. Between writes, the writer runs
+a PASSIVE checkpoint every CHECKPOINT_INTERVAL seconds. When the WAL file is
+larger than WAL_TRUNCATE_BYTES, it runs a TRUNCATE checkpoint, which waits
+for readers (up to busy_timeout) and resets the file.
+
+Set SQLITE_WRITER_THREAD=false to write from the calling threads again.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .sqlite_profile import JOURNAL_MODE_WAL, get_journal_mode, is_file_database
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CHECKPOINT_INTERVAL = 60.0  # seconds between PASSIVE checkpoints
+WAL_TRUNCATE_BYTES = 64 * 1024 * 1024  # TRUNCATE checkpoint above this WAL size
+
+
+def writer_thread_enabled() -> bool:
+    """Check whether SQLite writes go through the writer thread (SQLITE_WRITER_THREAD, default on)."""
+    return os.getenv("SQLITE_WRITER_THREAD", "true").strip().lower() != "false"
+
+
+class DatabaseWriter:
+    """Executes write functions one at a time on a dedicated connection."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        checkpoint_interval: float = CHECKPOINT_INTERVAL,
+        wal_truncate_bytes: int = WAL_TRUNCATE_BYTES
+    ):
+        """Initialize writer and start its thread.
+
+        Args:
+            engine: SQLite file engine to write to
+            checkpoint_interval: Seconds between PASSIVE checkpoints (0 disables them)
+            wal_truncate_bytes: WAL size that triggers a TRUNCATE checkpoint
+        """
+        self.engine = engine
+        self.checkpoint_interval = checkpoint_interval
+        self.wal_truncate_bytes = wal_truncate_bytes
+        self.wal_path = f"{engine.url.database}-wal"
+        self.writes = 0
+        self.checkpoints = 0
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="db_writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        """Queue a write function; the future resolves after its commit."""
+        if self._closed:
+            raise RuntimeError("Database writer is closed")
+        return self._submit(fn, raw=False)
+
+    def _submit(self, fn: Callable, raw: bool) -> Future:
+        future: Future = Future()
+        self._queue.put((fn, future, raw))
+        return future
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        """Execute a write function on the writer thread and wait for its result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Write functions must not submit writes themselves")
+        return self.submit(fn).result()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple:
+        """Run a WAL checkpoint on the writer thread.
+
+        Returns:
+            (busy, wal_pages, checkpointed_pages) as reported by SQLite
+        """
+        if self._closed:
+            raise RuntimeError("Database writer is closed")
+        return self._submit(lambda connection: self._checkpoint(connection, mode), raw=True).result()
+
+    def close(self):
+        """Finish queued writes and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self):
+        connection = self.engine.connect()
+        last_checkpoint = time.monotonic()
+        try:
+            while True:
+                timeout = None
+                if self.checkpoint_interval:
+                    timeout = max(0.0, last_checkpoint + self.checkpoint_interval - time.monotonic())
+                try:
+                    task = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    task = ()
+
+                if task is None:
+                    break
+                if task:
+                    self._execute(connection, *task)
+                if self.checkpoint_interval and time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                    last_checkpoint = time.monotonic()
+                    self._maintain_wal(connection)
+        finally:
+            connection.close()
+
+    def _execute(self, connection, fn: Callable, future: Future, raw: bool):
+        if not future.set_running_or_notify_cancel():
+            return
+        if raw:
+            # Maintenance on the connection itself (checkpoints)
+            try:
+                future.set_result(fn(connection))
+            except BaseException as e:
+                future.set_exception(e)
+            return
+
+        session = Session(bind=connection)
+        try:
+            result = fn(session)
+            session.commit()
+        except BaseException as e:
+            session.rollback()
+            future.set_exception(e)
+        else:
+            self.writes += 1
+            future.set_result(result)
+        finally:
+            session.close()
+
+    def _checkpoint(self, connection, mode: str) -> tuple:
+        row = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        connection.commit()
+        self.checkpoints += 1
+        return tuple(row) if row else (0, 0, 0)
+
+    def _maintain_wal(self, connection):
+        try:
+            mode = "PASSIVE"
+            if os.path.exists(self.wal_path) and os.path.getsize(self.wal_path) > self.wal_truncate_bytes:
+                mode = "TRUNCATE"
+            busy, wal_pages, checkpointed = self._checkpoint(connection, mode)
+            logger.debug(
+                f"[DB-WRITER] {mode} checkpoint: {checkpointed}/{wal_pages} pages"
+                f"{' (readers busy)' if busy else ''}"
+            )
+        except Exception as e:
+            logger.warning(f"[DB-WRITER] WAL checkpoint failed: {e}")
+
+
+def run_write(db: Session, fn: Callable[[Session], T]) -> T:
+    """Execute and commit a write, through the writer thread if the database has one.
+
+    Args:
+        db: Caller's session (written to directly if there is no writer)
+        fn: Write function receiving the session to use
+
+    Returns:
+        Result of fn
+    """
+    writer = get_database_writer(db.get_bind())
+    if writer is None:
+        try:
+            result = fn(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result
+    return writer.run(fn)
+
+
+# One writer per database file
+_writers: Dict[str, DatabaseWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_database_writer(engine: Engine) -> Optional[DatabaseWriter]:
+    """Get the writer of a SQLite file database in WAL mode (None for other databases)."""
+    engine = getattr(engine, "engine", engine)
+    if not is_file_database(engine) or get_journal_mode() != JOURNAL_MODE_WAL or not writer_thread_enabled():
+        return None
+    key = os.path.abspath(engine.url.database)
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = DatabaseWriter(engine)
+                _writers[key] = writer
+    return writer
+
+
+def reset_database_writers():
+    """Close all writers (for testing)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from backend.database.dialect import id_column_ddl
 from backend.database.models import Dataset
 
 logger = logging.getLogger(__name__)
@@ -343,7 +344,7 @@ class HuggingFaceImporter:
             column_defs = ", ".join([f'"{col}" TEXT' for col in sanitized_columns])
             create_sql = f'''
                 CREATE TABLE IF NOT EXISTS "{table_name}" (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    {id_column_ddl(self.db)},
                     {column_defs}
                 )
             '''
@@ -13,6 +13,7 @@ import openpyxl
 from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
+from backend.database.dialect import get_table_columns, id_column_ddl, reset_id_sequence
 from backend.database.models import Dataset
 
 
@@ -175,7 +176,7 @@ class DatasetImporter:
         column_defs = ", ".join([f'"{col}" TEXT' for col in columns])
         create_sql = f"""
             CREATE TABLE IF NOT EXISTS "{table_name}" (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                {id_column_ddl(self.db)},
                 {column_defs}
             )
         """
@@ -292,9 +293,7 @@ class DatasetImporter:
         table_name = dataset.sqlite_table_name
 
         # 1. Get current columns
-        pragma_sql = f'PRAGMA table_info("{table_name}")'
-        result = self.db.execute(text(pragma_sql))
-        current_columns = [row[1] for row in result if row[1] != "id"]
+        current_columns = [col for col in get_table_columns(self.db, table_name) if col != "id"]
 
         if not current_columns:
             raise ValueError("No columns found in dataset")
@@ -324,7 +323,7 @@ class DatasetImporter:
         self.db.execute(text(f'DROP TABLE IF EXISTS "{temp_table}"'))
 
         col_defs = ", ".join([f'"{new}" TEXT' for old, new in new_columns])
-        create_sql = f'CREATE TABLE "{temp_table}" (id INTEGER PRIMARY KEY, {col_defs})'
+        create_sql = f'CREATE TABLE "{temp_table}" ({id_column_ddl(self.db, autoincrement=False)}, {col_defs})'
         self.db.execute(text(create_sql))
 
         # 4. Copy data
@@ -339,6 +338,7 @@ class DatasetImporter:
         # 5. Swap tables
         self.db.execute(text(f'DROP TABLE "{table_name}"'))
         self.db.execute(text(f'ALTER TABLE "{temp_table}" RENAME TO "{table_name}"'))
+        reset_id_sequence(self.db, table_name)
 
         self.db.commit()
 
@@ -382,9 +382,7 @@ class DatasetImporter:
         column_renames = column_renames or {}
 
         # 1. Get current columns
-        pragma_sql = f'PRAGMA table_info("{table_name}")'
-        result = self.db.execute(text(pragma_sql))
-        current_columns = [row[1] for row in result if row[1] != "id"]
+        current_columns = [col for col in get_table_columns(self.db, table_name) if col != "id"]
 
         if not new_column_list:
             raise ValueError("At least one column is required")
@@ -427,7 +425,7 @@ class DatasetImporter:
         self.db.execute(text(f'DROP TABLE IF EXISTS "{temp_table}"'))
 
         col_defs = ", ".join([f'"{new_col}" TEXT' for new_col, _ in column_sources])
-        create_sql = f'CREATE TABLE "{temp_table}" (id INTEGER PRIMARY KEY, {col_defs})'
+        create_sql = f'CREATE TABLE "{temp_table}" ({id_column_ddl(self.db, autoincrement=False)}, {col_defs})'
         self.db.execute(text(create_sql))
 
         # 5. Copy data
@@ -452,6 +450,7 @@ class DatasetImporter:
         # 6. Swap tables
         self.db.execute(text(f'DROP TABLE "{table_name}"'))
         self.db.execute(text(f'ALTER TABLE "{temp_table}" RENAME TO "{table_name}"'))
+        reset_id_sequence(self.db, table_name)
 
         self.db.commit()
 
@@ -478,9 +477,7 @@ class DatasetImporter:
         table_name = dataset.sqlite_table_name
 
         # Get column names
-        pragma_sql = f'PRAGMA table_info("{table_name}")'
-        result = self.db.execute(text(pragma_sql))
-        columns = [row[1] for row in result if row[1] != "id"]
+        columns = [col for col in get_table_columns(self.db, table_name) if col != "id"]
 
         # Get preview data (limit=0 means no limit, show all)
         if limit > 0:
@@ -0,0 +1,140 @@
+"""Process-wide cache of preprocessed image payloads.
+
+Vision batches often attach the same handful of reference images to every row.
+Without caching, each job item re-opens, resizes (LANCZOS) and base64-encodes
+the file. The cache keeps the final data URIs in an LRU bounded by a byte
+budget (system setting "image_cache_max_mb", 0 = disabled).
+
+Keys:
+- FILEPATH: ("path", real path, mtime_ns, size, max dimension), so an edited
+  file or a changed resize policy misses the cache
+- FILE: ("file", SHA-256 of the parameter value)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_CACHE_MAX_MB = 128
+
+
+def filepath_cache_key(real_path: str, max_dimension: int) -> tuple:
+    """Build the cache key of an image file.
+
+    Args:
+        real_path: Resolved path of the image file
+        max_dimension: Resize policy (longest side) applied to the image
+
+    Raises:
+        OSError: If the file cannot be stat'ed
+    """
+    stat = os.stat(real_path)
+    return ("path", real_path, stat.st_mtime_ns, stat.st_size, max_dimension)
+
+
+def file_payload_cache_key(param_value: str) -> tuple:
+    """Build the cache key of a FILE parameter value (data URI or raw base64)."""
+    return ("file", hashlib.sha256(param_value.encode("utf-8")).hexdigest())
+
+
+class ImagePayloadCache:
+    """Thread-safe LRU of data URIs with a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_MAX_MB * 1024 * 1024):
+        """Initialize cache.
+
+        Args:
+            max_bytes: Total size budget of cached data URIs (0 = disabled)
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def configure(self, max_bytes: int):
+        """Change the byte budget, evicting entries if it shrank."""
+        with self._lock:
+            self.max_bytes = max(0, max_bytes)
+            self._evict()
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Get a cached data URI and mark it as recently used."""
+        with self._lock:
+            data_uri = self._entries.get(key)
+            if data_uri is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return data_uri
+
+    def contains(self, key: tuple) -> bool:
+        """Check for an entry without touching LRU order or statistics."""
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: tuple, data_uri: str):
+        """Store a data URI; entries larger than the whole budget are not cached."""
+        size = len(data_uri)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data_uri
+            self._size += size
+            self._evict()
+
+    def clear(self):
+        """Drop all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        """Get entry count, cached bytes and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+    def _evict(self):
+        """Drop least recently used entries while over budget (caller holds the lock)."""
+        while self._size > self.max_bytes and self._entries:
+            _, data_uri = self._entries.popitem(last=False)
+            self._size -= len(data_uri)
+
+
+# Singleton instance
+_image_cache = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImagePayloadCache:
+    """Get the process-wide image payload cache."""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImagePayloadCache()
+    return _image_cache
+
+
+def reset_image_cache():
+    """Reset the image cache singleton (for testing)."""
+    global _image_cache
+    _image_cache = None
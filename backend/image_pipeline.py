@@ -0,0 +1,179 @@
+"""Image preprocessing for FILEPATH parameters.
+
+Decoding, resizing (LANCZOS) and base64-encoding large photos is CPU-bound.
+Done inline, it runs on the same threads that wait on LLM I/O, competes for
+the GIL and stalls dispatch. ImagePrefetcher moves that work into a process
+pool: while item N is being dispatched, images of the next `depth` items are
+already being encoded on other cores, and the dispatch stage picks up the
+finished data URIs.
+
+encode_image_file() is a module-level function so it can be pickled into
+worker processes; JobManager uses it for inline loading as well.
+"""
+
+import base64
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_IMAGE_FORMATS = ["JPEG", "PNG", "GIF", "WEBP"]
+
+MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp"
+}
+
+
+def resize_image(img: Image.Image, max_dimension: int) -> Image.Image:
+    """Resize image so its longest side is at most max_dimension.
+
+    Args:
+        img: PIL Image object
+        max_dimension: Maximum width/height in pixels
+
+    Returns:
+        Resized image (or original if within limits)
+    """
+    if max(img.size) > max_dimension:
+        ratio = max_dimension / max(img.size)
+        new_size = tuple(int(dim * ratio) for dim in img.size)
+        logger.info(f"Resizing image from {img.size} to {new_size}")
+        return img.resize(new_size, Image.Resampling.LANCZOS)
+
+    return img
+
+
+def encode_image_file(real_path: str, max_dimension: int) -> str:
+    """Read an image file and convert it to a data URI.
+
+    The file is sent as-is unless it exceeds max_dimension (PIL re-encoding
+    can cause recognition failures, so it is only done when resizing).
+
+    Args:
+        real_path: Resolved path of an image file (access already checked)
+        max_dimension: Resize policy (longest side)
+
+    Returns:
+        Data URI string (e.g., "data:image/png;base64,iVBORw0...")
+
+    Raises:
+        ValueError: If the image format is not supported
+    """
+    # First, validate format with PIL
+    with Image.open(real_path) as img:
+        if img.format not in SUPPORTED_IMAGE_FORMATS:
+            raise ValueError(
+                f"Unsupported image format: {img.format}. "
+                "Supported: JPEG, PNG, GIF, WEBP"
+            )
+
+        detected_format = img.format
+
+        # Check if resizing is needed
+        needs_resize = max(img.size) > max_dimension
+
+    # If resizing is needed, use PIL
+    if needs_resize:
+        with Image.open(real_path) as img:
+            img = resize_image(img, max_dimension)
+            buffer = io.BytesIO()
+            save_format = img.format if img.format in SUPPORTED_IMAGE_FORMATS else "JPEG"
+            img.save(buffer, format=save_format)
+            image_bytes = buffer.getvalue()
+            detected_format = save_format
+    else:
+        # Read file directly for best LLM compatibility
+        with open(real_path, 'rb') as f:
+            image_bytes = f.read()
+
+    base64_data = base64.b64encode(image_bytes).decode("utf-8")
+    mime_type = MIME_TYPES.get(detected_format, "image/jpeg")
+    return f"data:{mime_type};base64,{base64_data}"
+
+
+class ImagePrefetcher:
+    """Encodes images of upcoming job items in a process pool.
+
+    The dispatch stage calls advance(index) before executing item `index`,
+    which submits the images of items up to index + depth. take(cache_key)
+    then returns the future of an image that was submitted ahead of time.
+    Futures are reference-counted per item that needs them and dropped once
+    every such item has taken it.
+    """
+
+    def __init__(
+        self,
+        item_targets: Callable[[int], List[tuple]],
+        item_count: int,
+        depth: int,
+        workers: int,
+        max_dimension: int
+    ):
+        """Initialize prefetcher.
+
+        Args:
+            item_targets: Returns [(cache_key, real_path), ...] for the item at an index
+            item_count: Number of items in dispatch order
+            depth: Number of items to prefetch ahead of dispatch
+            workers: Worker process count
+            max_dimension: Resize policy passed to encode_image_file()
+        """
+        self._item_targets = item_targets
+        self.item_count = item_count
+        self.depth = depth
+        self.max_dimension = max_dimension
+        # spawn: forking a process that runs worker threads can copy held locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._pending: Dict[tuple, list] = {}  # cache_key -> [future, remaining uses]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def advance(self, index: int):
+        """Make sure images of items up to index + depth are submitted."""
+        with self._lock:
+            end = min(self.item_count, index + self.depth + 1)
+            while self._next < end:
+                for cache_key, real_path in self._item_targets(self._next):
+                    entry = self._pending.get(cache_key)
+                    if entry is None:
+                        future = self._executor.submit(encode_image_file, real_path, self.max_dimension)
+                        self._pending[cache_key] = [future, 1]
+                    else:
+                        entry[1] += 1
+                self._next += 1
+
+    def take(self, cache_key: tuple) -> Optional[Future]:
+        """Get the prefetch future of an image (None if it was not prefetched)."""
+        with self._lock:
+            entry = self._pending.get(cache_key)
+            if entry is None:
+                return None
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._pending[cache_key]
+            return entry[0]
+
+    def close(self):
+        """Stop worker processes, dropping images that were never taken."""
+        with self._lock:
+            self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
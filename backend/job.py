@@ -3,23 +3,52 @@
 Based on specification in docs/req.txt section 4.2.3 (実行処理) and 3.2 (通信フロー).
 """
 
+import asyncio
+import collections
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
 import re
-import base64
-from datetime import datetime
-from typing import Dict, List, Optional
-from sqlalchemy.orm import Session
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy.orm import Session, defer, load_only
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PIL import Image
-import io
 
-from .database.models import Job, JobItem, ProjectRevision, PromptRevision, Dataset, SystemSetting, Prompt
+from .database.models import Job, JobItem, ProjectRevision, PromptRevision, Dataset, Prompt
 from .prompt import PromptTemplateParser, get_message_parser
-from .llm import get_llm_client, LLMClient
+from .llm import get_llm_client, LLMClient, LLMResponse
+from .llm.batch import BATCH_RUNNING, BatchProvider, get_batch_provider
+from .llm.client_pool import get_sdk_client_registry
+from .llm.hedging import HedgedLLMClient, get_latency_tracker
+from .llm.retry import RetryPolicy, RetrySchedule, final_error_message, DEFAULT_MAX_ATTEMPTS, DEFAULT_MAX_DELAY
+from .llm.prompt_cache import CACHE_PREFIX_KEY, MIN_PREFIX_CHARS, PrefixWarmingClient
+from .llm.concurrency import get_concurrency_controller
+from .llm.response_cache import (
+    CachedLLMClient, get_response_cache_store,
+    CACHE_MODES, DEFAULT_CACHE_MODE, DEFAULT_CACHE_MAX_MB, DEFAULT_CACHE_TTL_HOURS
+)
 from .parser import ResponseParser
-from sqlalchemy import text
+from .job_buffer import JobItemWriteBuffer
+from .job_progress import get_job_progress_tracker
+from .job_scheduler import load_job_scheduler_settings
+from .settings_cache import get_settings_cache
+from .usage import TOKEN_USAGE_COLUMNS
+from .image_cache import (
+    get_image_cache, filepath_cache_key, file_payload_cache_key, DEFAULT_IMAGE_CACHE_MAX_MB
+)
+from .image_pipeline import ImagePrefetcher, encode_image_file, resize_image
+from .csv_merge import (
+    IncrementalCsvMerger, extract_csv_row, build_csv_header, get_csv_output_dir, merged_csv_files_enabled
+)
+from .database.dialect import dialect_name
+from .job_queue import JobLease, external_workers_enabled
+from sqlalchemy import bindparam, func, text
 
 # Import tag validation (lazy import to avoid circular dependencies)
 def validate_prompt_tags(prompt_id: int, model_name: str, db: Session) -> tuple:
@@ -47,6 +76,24 @@ def extract_csv_template_field_order(csv_template: str) -> List[str]:
     pattern = r'\$([^$]+)\$'
     return re.findall(pattern, csv_template)
 
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    execute_job() is normally called from worker threads without an event loop,
+    where asyncio.run() can be used directly. When called from inside a running
+    loop (e.g. async MCP tool handlers), the coroutine is run on a helper thread
+    with its own loop while the caller blocks, as the sync API requires.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="job_async_") as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,14 +106,103 @@ class JobManager:
     # Default text file extensions (must match settings.py)
     DEFAULT_TEXT_FILE_EXTENSIONS = "txt,csv,md,json,xml,yaml,yml,log,ini,cfg,conf,html,htm,css,js,ts,py,java,c,cpp,h,hpp,cs,go,rs,rb,php,sql,sh,bash,zsh,ps1,bat,cmd"
 
-    def __init__(self, db: Session):
+    # Item execution modes (system setting "job_execution_mode", must match settings.py)
+    # - auto: serial when job_parallelism == 1, otherwise thread pool (original behavior)
+    # - serial / thread: force the corresponding path
+    # - async: asyncio pipeline bounded by job_async_concurrency
+    # - offload: batch jobs of at least job_offload_min_items items are sent as
+    #   provider batch submissions (see backend/llm/batch.py), others run as auto
+    EXECUTION_MODES = ["auto", "serial", "thread", "async", "offload"]
+    DEFAULT_ASYNC_CONCURRENCY = 100
+    MAX_ASYNC_CONCURRENCY = 999
+
+    # Offload mode (system settings "job_offload_provider" and "job_offload_min_items")
+    # - auto: the model's provider batch API; jobs on models without one run as auto
+    # - local: file-based stand-in provider running the regular client
+    OFFLOAD_PROVIDERS = ["auto", "local"]
+    DEFAULT_OFFLOAD_MIN_ITEMS = 1000
+    OFFLOAD_MAX_BATCH_REQUESTS = 10000
+    OFFLOAD_POLL_SECONDS = 30.0
+
+    # Upper bound of adaptive per-model concurrency (system setting "adaptive_concurrency_max")
+    DEFAULT_ADAPTIVE_MAX_CONCURRENCY = 32
+
+    # Hedged requests (system settings "job_hedging_enabled", "job_hedge_percentile",
+    # "job_hedge_max_rate", "job_hedge_alternate_model"): calls slower than the
+    # model's recent latency percentile get a duplicate request (see backend/llm/hedging.py)
+    DEFAULT_HEDGE_PERCENTILE = 95.0
+    DEFAULT_HEDGE_MAX_RATE = 0.1
+
+    # Retries of failed calls (system settings "job_retry_max_attempts" and
+    # "job_retry_max_delay"): rate limits, timeouts, 5xx and empty responses are
+    # re-queued with backoff or Retry-After (see backend/llm/retry.py)
+    DEFAULT_RETRY_MAX_ATTEMPTS = DEFAULT_MAX_ATTEMPTS
+    MAX_RETRY_ATTEMPTS = 10
+    DEFAULT_RETRY_MAX_DELAY = DEFAULT_MAX_DELAY
+    # Longest a dispatcher sleeps while only delayed retries are left (re-checks cancellation)
+    RETRY_POLL_SECONDS = 1.0
+
+    # Provider prompt-prefix caching of batch jobs (system setting "job_prompt_cache_enabled"):
+    # the template text before the first parameter is marked as cacheable prefix
+    # (see backend/llm/prompt_cache.py)
+    DEFAULT_PROMPT_CACHE_ENABLED = True
+
+    # Pending items the async pipeline claims per write (capped by its concurrency)
+    ASYNC_CLAIM_BATCH_SIZE = 50
+
+    # Pending items read per query during execution (keyset pagination on the item ID)
+    PENDING_ITEM_BATCH_SIZE = 500
+    # Items the thread pool holds queued per worker (submitted as earlier ones finish)
+    THREAD_QUEUE_ITEMS_PER_WORKER = 2
+
+    # Dataset rows read and job items inserted per chunk in batch job creation
+    BATCH_ITEM_CHUNK_SIZE = 1000
+
+    # Claim on comparison group item creation, renewed with every chunk (seconds)
+    COMPARISON_POPULATION_LEASE_SECONDS = 60
+    COMPARISON_POPULATION_POLL_SECONDS = 0.5
+
+    # In-batch deduplication of identical prompts (system setting "job_dedup_mode")
+    # - off: every item is sent to the LLM (default)
+    # - auto: deduplicate when the job runs at temperature 0
+    # - force: always deduplicate
+    DEDUP_MODES = ["off", "auto", "force"]
+    DEDUP_FANOUT_CHUNK_SIZE = 500
+    DEDUP_FANOUT_COLUMNS = ["status", "raw_response", "parsed_response", "error_message", "turnaround_ms"]
+
+    # Longest image side sent to the LLM; larger images are resized (LANCZOS)
+    MAX_IMAGE_DIMENSION = 2048
+
+    # Process-pool image preprocessing (system settings "image_preprocess_workers",
+    # 0 = inline, and "image_prefetch_depth")
+    MAX_IMAGE_PREPROCESS_WORKERS = 64
+    DEFAULT_IMAGE_PREFETCH_DEPTH = 32
+    MAX_IMAGE_PREFETCH_DEPTH = 1000
+
+    def __init__(self, db: Session, lease: Optional[JobLease] = None):
         """Initialize job manager.
 
         Args:
             db: SQLAlchemy database session
+            lease: Queue lease the job runs under (see execute_leased_job); once
+                it is lost, executors stop and the final status is not written
         """
         self.db = db
+        self.lease = lease
         self.parser = PromptTemplateParser()
+        # prompt_template -> FILE/FILEPATH parameter definitions
+        self._image_param_defs: Dict[str, list] = {}
+        # Image prefetch stage of the job being executed (None = load inline)
+        self._image_prefetcher: Optional[ImagePrefetcher] = None
+        # Merged CSV writer of the job being executed (None = no merged CSV)
+        self._csv_merger: Optional[IncrementalCsvMerger] = None
+        self._duplicate_members: Dict[int, List[int]] = {}
+        # Job whose item calls are streamed (None = non-streaming call())
+        self._stream_job_id: Optional[int] = None
+        # Delayed retries of the job being executed (None = failed calls are final)
+        self._retry_schedule: Optional[RetrySchedule] = None
+        # Static prompt prefix shared by the job's items (None = no prefix caching)
+        self._prompt_prefix: Optional[str] = None
 
     def _get_text_file_extensions(self) -> List[str]:
         """Get list of text file extensions from system settings.
@@ -75,14 +211,7 @@ class JobManager:
             List of extensions (lowercase, without dots) that should be treated as text.
             Empty list if setting is explicitly empty (disables auto-expansion).
         """
-        setting = self.db.query(SystemSetting).filter(
-            SystemSetting.key == "text_file_extensions"
-        ).first()
-
-        if setting is not None:
-            extensions = setting.value
-        else:
-            extensions = self.DEFAULT_TEXT_FILE_EXTENSIONS
+        extensions = get_settings_cache().get(self.db, "text_file_extensions", self.DEFAULT_TEXT_FILE_EXTENSIONS)
 
         # Parse into list (lowercase, trimmed)
         if extensions:
@@ -223,6 +352,7 @@ class JobManager:
             job.finished_at = start_time.isoformat()
             job.turnaround_ms = 0
             self.db.commit()
+            get_job_progress_tracker().notify(job.id, finished=True)
             self.db.refresh(job)
             return job
 
@@ -260,14 +390,12 @@ class JobManager:
                 self.db.commit()
 
                 # Set error message on all pending items
-                pending_items = self.db.query(JobItem).filter(
+                self.db.query(JobItem).filter(
                     JobItem.job_id == job_id,
                     JobItem.status == "pending"
-                ).all()
-                for item in pending_items:
-                    item.status = "error"
-                    item.error_message = error_msg
+                ).update({"status": "error", "error_message": error_msg}, synchronize_session=False)
                 self.db.commit()
+                get_job_progress_tracker().notify(job.id, finished=True)
                 self.db.refresh(job)
                 return job
 
@@ -275,8 +403,10 @@ class JobManager:
         job.status = "running"
         job.started_at = start_time.isoformat()
         self.db.commit()
+        get_job_progress_tracker().notify(job.id)
 
-        # Get LLM client
+        # Get LLM client (SDK clients come from the shared pool, sized to the current settings)
+        get_sdk_client_registry().configure(self._get_connection_pool_size())
         try:
             llm_client = get_llm_client(model_name)
         except Exception as e:
@@ -289,14 +419,12 @@ class JobManager:
             self.db.commit()
 
             # Set error status on all pending items
-            pending_items = self.db.query(JobItem).filter(
+            self.db.query(JobItem).filter(
                 JobItem.job_id == job_id,
                 JobItem.status == "pending"
-            ).all()
-            for item in pending_items:
-                item.status = "error"
-                item.error_message = error_msg
+            ).update({"status": "error", "error_message": error_msg}, synchronize_session=False)
             self.db.commit()
+            get_job_progress_tracker().notify(job.id, finished=True)
             self.db.refresh(job)
             return job
 
@@ -307,11 +435,11 @@ class JobManager:
         actual_model_name = model_name or llm_client.get_model_name()
         model_params = self._get_model_parameters(actual_model_name)
 
-        # Execute all pending job items
-        job_items = self.db.query(JobItem).filter(
+        # Pending items are counted here and read in keyset batches during dispatch
+        item_count = self.db.query(func.count(JobItem.id)).filter(
             JobItem.job_id == job_id,
             JobItem.status == "pending"
-        ).all()
+        ).scalar()
 
         error_count = 0
 
@@ -326,28 +454,137 @@ class JobManager:
                 ProjectRevision.id == job.project_revision_id
             ).first()
 
-        if parallelism == 1:
-            # Serial execution (original behavior)
-            error_count = self._execute_items_serial(job_items, llm_client, revision, temperature, model_params)
-        else:
-            # Parallel execution
-            error_count = self._execute_items_parallel(job_items, llm_client, revision, temperature, parallelism, model_params)
+        execution_mode = self._get_execution_mode()
+        batch_provider = None
+        if execution_mode == "offload":
+            batch_provider = self._get_batch_provider(job, llm_client, item_count)
+            if batch_provider is None:
+                execution_mode = "auto"
+            else:
+                logger.info(f"[JOB-EXEC] Job {job.id}: offloading {item_count} items to {batch_provider.name} batch API")
+
+        get_image_cache().configure(self._get_image_cache_max_mb() * 1024 * 1024)
+
+        # Streaming records TTFT/throughput and publishes partial text (serial/thread paths)
+        if self._get_streaming_enabled() and execution_mode in ("auto", "serial", "thread"):
+            self._stream_job_id = job.id
+
+        # Shared prompt prefix: marked for provider caching, first call goes alone to warm the cache
+        self._prompt_prefix = self._get_prompt_prefix(job, revision, item_count)
+        if self._prompt_prefix is not None:
+            if execution_mode != "offload":
+                llm_client = PrefixWarmingClient(llm_client)
+            logger.info(f"[JOB-EXEC] Job {job.id}: prompt prefix caching, {len(self._prompt_prefix)} chars")
+
+        # Adaptive concurrency: job_parallelism only seeds the per-model limit,
+        # workers are sized to the upper bound and gated by the controller
+        adaptive_enabled, adaptive_max = self._get_adaptive_concurrency_setting()
+        if adaptive_enabled and execution_mode not in ("serial", "offload"):
+            controller = get_concurrency_controller()
+            controller.set_max_limit(adaptive_max)
+            llm_client = controller.wrap(llm_client, initial_limit=parallelism)
+            parallelism = adaptive_max
+            logger.info(f"[JOB-EXEC] Job {job.id}: adaptive concurrency, max={adaptive_max}")
+
+        # Hedging sits outside the limiter so the duplicate request takes its own slot
+        hedged_client = None
+        hedge_enabled, hedge_percentile, hedge_max_rate, hedge_alternate = self._get_hedging_setting()
+        if hedge_enabled and execution_mode != "offload":
+            alternate_client = None
+            if hedge_alternate and hedge_alternate != llm_client.get_model_name():
+                try:
+                    alternate_client = get_llm_client(hedge_alternate)
+                except Exception as e:
+                    logger.warning(f"[JOB-EXEC] Job {job.id}: hedge alternate {hedge_alternate} unavailable: {e}")
+            llm_client = hedged_client = HedgedLLMClient(
+                llm_client, get_latency_tracker(), hedge_percentile, hedge_max_rate, alternate_client
+            )
+            logger.info(f"[JOB-EXEC] Job {job.id}: hedging at p{hedge_percentile:g}, max rate {hedge_max_rate:g}")
+
+        # Response cache sits outside the limiter so cache hits don't take a slot
+        cache_mode, cache_max_mb, cache_ttl_hours = self._get_response_cache_setting()
+        if cache_mode != "bypass" and execution_mode != "offload":
+            store = get_response_cache_store()
+            store.configure(cache_max_mb * 1024 * 1024, cache_ttl_hours * 3600)
+            llm_client = CachedLLMClient(llm_client, store, cache_mode)
+            logger.info(f"[JOB-EXEC] Job {job.id}: response cache mode={cache_mode}")
 
         # Merge CSV outputs for batch jobs and single executions
         # Phase 2: batch and repeated single executions
         # Phase 3: Also for single item when include_csv_header is True (to show header)
         should_merge_csv = (
             job.job_type == "batch" or
-            (job.job_type == "single" and len(job_items) > 1) or
+            (job.job_type == "single" and item_count > 1) or
             (job.job_type == "single" and include_csv_header)  # Include header even for 1 item
         )
+
+        # Deduplication: only one representative per identical payload is executed,
+        # its result is copied to the other members as soon as it finishes
+        member_ids = set()
+        if self._should_deduplicate(llm_client, temperature):
+            self._duplicate_members = self._group_duplicate_items(self._iter_pending_items(job.id), revision)
+            for members in self._duplicate_members.values():
+                member_ids.update(members)
+            if member_ids:
+                item_count -= len(member_ids)
+                job.dedup_saved_calls = len(member_ids)
+                self.db.commit()
+                logger.info(f"[JOB-EXEC] Job {job.id}: dedup saves {len(member_ids)} LLM calls")
+
+        # Failed calls are re-queued by the executors (the provider batch retries on its own)
+        retry_policy = self._get_retry_policy()
+        if retry_policy.max_attempts > 1 and execution_mode != "offload":
+            self._retry_schedule = RetrySchedule(retry_policy)
+
+        # FILEPATH images are encoded in worker processes ahead of dispatch
+        # (reading the items on a session of its own, as it runs on the dispatching threads)
+        prefetch_session = Session(bind=self.db.get_bind())
+        self._image_prefetcher = self._create_image_prefetcher(
+            self._iter_pending_items(job.id, member_ids, prefetch_session), revision, item_count
+        )
+        # Merged CSV rows are appended to a file as items complete
         if should_merge_csv:
-            # Expire session cache to ensure we get fresh data from database
-            self.db.expire_all()
-            # Re-fetch job items to get updated status and parsed_response after execution
-            job_items_for_csv = self.db.query(JobItem).filter(JobItem.job_id == job_id).all()
-            merged_csv = self._merge_csv_outputs(job_items_for_csv, include_csv_header)
-            job.merged_csv_output = merged_csv
+            self._csv_merger = self._create_csv_merger(job, revision, include_csv_header)
+        # Representatives only: duplicates receive their results by fan-out
+        job_items = self._iter_pending_items(job.id, member_ids)
+        try:
+            if execution_mode == "offload":
+                # Provider batch submission (polled until the batch ends)
+                error_count = self._execute_items_offload(job_items, batch_provider, revision, temperature, model_params)
+            elif execution_mode == "async":
+                # Asyncio pipeline (single session, hundreds of in-flight requests)
+                concurrency = self._get_async_concurrency()
+                logger.info(f"[JOB-EXEC] Job {job.id}: async mode, concurrency={concurrency}")
+                error_count = self._execute_items_async(job_items, llm_client, revision, temperature, concurrency, model_params)
+            elif execution_mode == "serial" or (execution_mode == "auto" and parallelism == 1):
+                # Serial execution (original behavior)
+                error_count = self._execute_items_serial(job_items, llm_client, revision, temperature, model_params)
+            else:
+                # Parallel execution
+                error_count = self._execute_items_parallel(job_items, llm_client, revision, temperature, parallelism, model_params)
+
+            if self._csv_merger:
+                # Only rows still waiting on unfinished items are left to write
+                job.merged_csv_path = self._csv_merger.finalize()
+                job.merged_csv_output = None
+            elif should_merge_csv:
+                # Without a merged CSV file, downloads build the CSV from the job items
+                job.merged_csv_output = None
+        finally:
+            if self._image_prefetcher:
+                self._image_prefetcher.close()
+                self._image_prefetcher = None
+            prefetch_session.close()
+            if self._csv_merger:
+                self._csv_merger.discard()
+                self._csv_merger = None
+            self._duplicate_members = {}
+            self._stream_job_id = None
+            self._prompt_prefix = None
+            if self._retry_schedule is not None:
+                if self._retry_schedule.retries:
+                    logger.info(f"[JOB-EXEC] Job {job.id}: {self._retry_schedule.retries} calls retried")
+                self._retry_schedule = None
 
         # Calculate actual wall-clock time for job execution
         end_time = datetime.utcnow()
@@ -372,6 +609,11 @@ class JobManager:
         # Update job completion info
         job.finished_at = end_time.isoformat()
         job.turnaround_ms = actual_turnaround_ms  # Real elapsed time, not sum of individual times
+        if hedged_client:
+            hedge_stats = hedged_client.stats.to_dict()
+            job.hedged_calls = hedge_stats["hedged"]
+            job.hedge_wins = hedge_stats["hedge_wins"]
+            job.hedge_saved_ms = hedge_stats["saved_ms"]
 
         # Preserve "cancelled" status if job was cancelled during execution
         if current_status != "cancelled":
@@ -380,7 +622,14 @@ class JobManager:
         else:
             logger.info(f"[JOB-STATUS] Job {job.id} preserving cancelled status")
 
+        # Fencing: a worker that lost its lease leaves the job to the new owner
+        if self.lease is not None and not self.lease.hold(self.db):
+            self.db.rollback()
+            logger.warning(f"[JOB-STATUS] Job {job.id}: lease lost, final status left to the new owner")
+            return job
+
         self.db.commit()
+        get_job_progress_tracker().notify(job.id, finished=True)
         self.db.refresh(job)
 
         return job
@@ -395,18 +644,8 @@ class JobManager:
             Dictionary of model parameters (empty if not customized)
             Filtered to only include parameters applicable to the model type.
         """
-        import json as json_module
-        setting_key = f"model_params_{model_name}"
-        setting = self.db.query(SystemSetting).filter(
-            SystemSetting.key == setting_key
-        ).first()
-
-        if setting and setting.value:
-            try:
-                params = json_module.loads(setting.value)
-            except (json_module.JSONDecodeError, TypeError):
-                return {}
-        else:
+        params = get_settings_cache().get_json(self.db, f"model_params_{model_name}")
+        if not isinstance(params, dict):
             return {}
 
         # Filter parameters based on model type
@@ -435,28 +674,499 @@ class JobManager:
         Returns:
             Parallelism value (1-99), defaults to 1
         """
-        setting = self.db.query(SystemSetting).filter(
-            SystemSetting.key == "job_parallelism"
-        ).first()
+        return get_settings_cache().get_int(self.db, "job_parallelism", 1, 1, 99)
+
+    def _get_adaptive_concurrency_setting(self) -> tuple:
+        """Get adaptive (AIMD) concurrency settings from system settings.
+
+        Returns:
+            tuple: (enabled, max_limit), defaults to (False, DEFAULT_ADAPTIVE_MAX_CONCURRENCY)
+        """
+        settings = get_settings_cache().values(self.db)
+
+        enabled = (settings.get("adaptive_concurrency_enabled") or "").lower() == "true"
+        try:
+            max_limit = int(settings.get("adaptive_concurrency_max") or self.DEFAULT_ADAPTIVE_MAX_CONCURRENCY)
+            max_limit = max(1, min(max_limit, self.MAX_ASYNC_CONCURRENCY))
+        except ValueError:
+            max_limit = self.DEFAULT_ADAPTIVE_MAX_CONCURRENCY
+        return enabled, max_limit
+
+    def _get_hedging_setting(self) -> tuple:
+        """Get hedged request settings from system settings.
+
+        Returns:
+            tuple: (enabled, percentile 50-99.9, max_rate 0.01-1.0, alternate model name or None)
+        """
+        settings = get_settings_cache().values(self.db)
+
+        enabled = (settings.get("job_hedging_enabled") or "").lower() == "true"
+        try:
+            percentile = float(settings.get("job_hedge_percentile") or self.DEFAULT_HEDGE_PERCENTILE)
+            percentile = max(50.0, min(percentile, 99.9))
+        except ValueError:
+            percentile = self.DEFAULT_HEDGE_PERCENTILE
+        try:
+            max_rate = float(settings.get("job_hedge_max_rate") or self.DEFAULT_HEDGE_MAX_RATE)
+            max_rate = max(0.01, min(max_rate, 1.0))
+        except ValueError:
+            max_rate = self.DEFAULT_HEDGE_MAX_RATE
+        return enabled, percentile, max_rate, settings.get("job_hedge_alternate_model") or None
+
+    def _get_retry_policy(self) -> RetryPolicy:
+        """Get the retry policy of failed calls from system settings.
+
+        Returns:
+            RetryPolicy with max_attempts (1-MAX_RETRY_ATTEMPTS, 1 = no retries)
+            and max_delay (1-600 seconds) of the exponential backoff
+        """
+        settings = get_settings_cache().values(self.db)
+        try:
+            max_attempts = int(settings.get("job_retry_max_attempts") or self.DEFAULT_RETRY_MAX_ATTEMPTS)
+            max_attempts = max(1, min(max_attempts, self.MAX_RETRY_ATTEMPTS))
+        except ValueError:
+            max_attempts = self.DEFAULT_RETRY_MAX_ATTEMPTS
+        try:
+            max_delay = float(settings.get("job_retry_max_delay") or self.DEFAULT_RETRY_MAX_DELAY)
+            max_delay = max(1.0, min(max_delay, 600.0))
+        except ValueError:
+            max_delay = self.DEFAULT_RETRY_MAX_DELAY
+        return RetryPolicy(max_attempts=max_attempts, max_delay=max_delay)
+
+    def _get_response_cache_setting(self) -> tuple:
+        """Get LLM response cache settings from system settings.
+
+        Returns:
+            tuple: (mode, max_mb, ttl_hours); mode defaults to "bypass" (cache disabled)
+        """
+        settings = get_settings_cache().values(self.db)
+
+        mode = (settings.get("llm_cache_mode") or DEFAULT_CACHE_MODE).strip().lower()
+        if mode not in CACHE_MODES:
+            logger.warning(f"Unknown llm_cache_mode '{mode}', using '{DEFAULT_CACHE_MODE}'")
+            mode = DEFAULT_CACHE_MODE
+        try:
+            max_mb = max(1, int(settings.get("llm_cache_max_mb") or DEFAULT_CACHE_MAX_MB))
+        except ValueError:
+            max_mb = DEFAULT_CACHE_MAX_MB
+        try:
+            ttl_hours = max(0, int(settings.get("llm_cache_ttl_hours") or DEFAULT_CACHE_TTL_HOURS))
+        except ValueError:
+            ttl_hours = DEFAULT_CACHE_TTL_HOURS
+        return mode, max_mb, ttl_hours
+
+    def _get_image_cache_max_mb(self) -> int:
+        """Get image payload cache budget from system settings.
+
+        Returns:
+            Budget in MB (0 = disabled), defaults to DEFAULT_IMAGE_CACHE_MAX_MB
+        """
+        return get_settings_cache().get_int(self.db, "image_cache_max_mb", DEFAULT_IMAGE_CACHE_MAX_MB, 0)
+
+    def _get_image_preprocess_setting(self) -> tuple:
+        """Get process-pool image preprocessing settings from system settings.
+
+        Returns:
+            tuple: (workers, prefetch_depth); workers 0 means images are loaded inline
+        """
+        settings = get_settings_cache().values(self.db)
+
+        try:
+            workers = int(settings.get("image_preprocess_workers") or 0)
+            workers = max(0, min(workers, self.MAX_IMAGE_PREPROCESS_WORKERS))
+        except ValueError:
+            workers = 0
+        try:
+            depth = int(settings.get("image_prefetch_depth") or self.DEFAULT_IMAGE_PREFETCH_DEPTH)
+            depth = max(1, min(depth, self.MAX_IMAGE_PREFETCH_DEPTH))
+        except ValueError:
+            depth = self.DEFAULT_IMAGE_PREFETCH_DEPTH
+        return workers, depth
+
+    def _create_image_prefetcher(
+        self,
+        job_items: Iterable[JobItem],
+        revision,
+        item_count: Optional[int] = None
+    ) -> Optional[ImagePrefetcher]:
+        """Create the image prefetch stage for items in dispatch order.
 
-        if setting and setting.value:
+        Args:
+            job_items: Items in dispatch order, read as the prefetch runs ahead
+            revision: Prompt/project revision (for FILEPATH parameter names)
+            item_count: Number of items (len(job_items) if omitted)
+
+        Returns:
+            ImagePrefetcher, or None when disabled or the template has no FILEPATH parameters
+        """
+        if item_count is None:
+            item_count = len(job_items)
+        if not item_count or not revision or not revision.prompt_template:
+            return None
+        filepath_params = [
+            param_def.name for param_def in self._get_image_param_defs(revision.prompt_template)
+            if param_def.type == "FILEPATH"
+        ]
+        if not filepath_params:
+            return None
+        workers, depth = self._get_image_preprocess_setting()
+        if workers == 0:
+            return None
+
+        # The prefetcher asks for the targets of each index once, in order
+        input_params_iter = (item.input_params for item in job_items)
+        allowed_dirs = self._get_allowed_image_directories()
+        image_cache = get_image_cache()
+
+        def item_targets(index: int) -> List[tuple]:
+            # Same access checks as _load_image_from_filepath(); anything that fails
+            # is left to the inline path, which reports the error
+            targets = []
             try:
-                parallelism = int(setting.value)
-                return max(1, min(parallelism, 99))  # Clamp to 1-99
+                input_params = json.loads(next(input_params_iter, None) or "{}")
             except ValueError:
-                return 1
-        return 1
+                return targets
+            for name in filepath_params:
+                value = input_params.get(name)
+                if not value:
+                    continue
+                real_path = os.path.realpath(os.path.expanduser(value))
+                if not any(real_path.startswith(d) for d in allowed_dirs) or not os.path.isfile(real_path):
+                    continue
+                try:
+                    cache_key = filepath_cache_key(real_path, self.MAX_IMAGE_DIMENSION)
+                except OSError:
+                    continue
+                if not image_cache.contains(cache_key):
+                    targets.append((cache_key, real_path))
+            return targets
+
+        try:
+            prefetcher = ImagePrefetcher(item_targets, item_count, depth, workers, self.MAX_IMAGE_DIMENSION)
+        except Exception as e:
+            logger.warning(f"[JOB-EXEC] Image process pool unavailable, loading images inline: {e}")
+            return None
+        logger.info(f"[JOB-EXEC] Image preprocessing: {workers} processes, prefetch depth {depth}")
+        return prefetcher
+
+    def _advance_image_prefetch(self, index: Optional[int]):
+        """Let the prefetch stage run ahead of the item about to be dispatched (None: a retry)."""
+        prefetcher = self._image_prefetcher
+        if prefetcher and index is not None:
+            try:
+                prefetcher.advance(index)
+            except Exception as e:
+                logger.warning(f"[JOB-EXEC] Image prefetch failed: {e}")
+
+    def _create_csv_merger(self, job: Job, revision, include_csv_header: bool) -> Optional[IncrementalCsvMerger]:
+        """Create the merged CSV writer for a job about to be executed.
+
+        Items that are not pending (finished in an earlier run) are recorded
+        right away; pending items are recorded by the executors as they finish.
+
+        Returns:
+            IncrementalCsvMerger, or None if no merged CSV file is written
+            (CSV_OUTPUT_DIR not set up for workers, or the file cannot be created)
+        """
+        # Without a shared CSV_OUTPUT_DIR, other processes could not read the file
+        if not merged_csv_files_enabled(dialect_name(self.db), external_workers_enabled()):
+            logger.warning(
+                f"[JOB-EXEC] Job {job.id}: no merged CSV file, set CSV_OUTPUT_DIR to storage shared "
+                "by the web process and the workers"
+            )
+            return None
+        field_order = self._get_csv_template_field_order(revision.parser_config if revision else None)
+        path = os.path.join(get_csv_output_dir(), f"job_{job.id}.csv")
+
+        item_rows = self.db.query(JobItem.id, JobItem.status).filter(JobItem.job_id == job.id).all()
+        try:
+            merger = IncrementalCsvMerger(path, [row[0] for row in item_rows], include_csv_header, field_order)
+        except OSError as e:
+            logger.warning(f"[JOB-EXEC] Job {job.id}: cannot write merged CSV file: {e}")
+            return None
+
+        finished_ids = [item_id for item_id, status in item_rows if status != "pending"]
+        for i in range(0, len(finished_ids), self.DEDUP_FANOUT_CHUNK_SIZE):
+            chunk = finished_ids[i:i + self.DEDUP_FANOUT_CHUNK_SIZE]
+            for item_id, status, parsed_response in self.db.query(
+                JobItem.id, JobItem.status, JobItem.parsed_response
+            ).filter(JobItem.id.in_(chunk)):
+                merger.record(item_id, status, parsed_response)
+        return merger
+
+    def _record_csv_result(self, item_id: int, values: Optional[dict]):
+        """Pass an item result (None = item skipped) to the merged CSV writer."""
+        merger = self._csv_merger
+        if merger is None:
+            return
+        if values is None:
+            merger.skip(item_id)
+        else:
+            merger.record(item_id, values.get("status"), values.get("parsed_response"))
+
+    def _get_dedup_mode(self) -> str:
+        """Get in-batch deduplication mode from system settings.
+
+        Returns:
+            One of DEDUP_MODES, defaults to "off"
+        """
+        value = get_settings_cache().get(self.db, "job_dedup_mode")
+        if value:
+            mode = value.strip().lower()
+            if mode in self.DEDUP_MODES:
+                return mode
+            logger.warning(f"Unknown job_dedup_mode '{value}', using 'off'")
+        return "off"
+
+    def _should_deduplicate(self, llm_client: LLMClient, temperature: float) -> bool:
+        """Check whether identical prompts of this job may share one LLM call."""
+        mode = self._get_dedup_mode()
+        if mode == "force":
+            return True
+        if mode == "auto":
+            # GPT-5 models ignore temperature, so their output is never deterministic
+            model_name = llm_client.get_model_name()
+            is_gpt5 = "gpt-5" in model_name or "gpt5" in model_name
+            return temperature == 0 and not is_gpt5
+        return False
+
+    def _group_duplicate_items(self, job_items: Iterable[JobItem], revision) -> Dict[int, List[int]]:
+        """Group job items whose LLM request payload is identical.
+
+        The payload key covers the rendered prompt and the values of FILE/FILEPATH
+        parameters (which determine the attached images). Items are read once;
+        only a digest per distinct payload is kept.
+
+        Args:
+            job_items: Pending job items in dispatch order
+            revision: Prompt/project revision (for image parameter names)
+
+        Returns:
+            {representative_id: [member item ids]}; items that are not members
+            are the representatives
+        """
+        image_params = []
+        if revision and revision.prompt_template:
+            image_params = [
+                param_def.name for param_def in self.parser.parse_template(revision.prompt_template)
+                if param_def.type in ["FILE", "FILEPATH"]
+            ]
+
+        representative_by_key = {}
+        members = {}
+        for item in job_items:
+            images = []
+            if image_params:
+                try:
+                    input_params = json.loads(item.input_params or "{}")
+                except ValueError:
+                    input_params = {}
+                images = [input_params.get(name) for name in image_params]
+            key = hashlib.sha256(
+                json.dumps([item.raw_prompt, images], ensure_ascii=False).encode("utf-8")
+            ).digest()
+
+            representative_id = representative_by_key.setdefault(key, item.id)
+            if representative_id != item.id:
+                members.setdefault(representative_id, []).append(item.id)
+
+        return members
+
+    def _iter_pending_items(self, job_id: int, skip_ids=(), session: Session = None) -> Iterator[JobItem]:
+        """Yield the pending items of a job in ID order, reading PENDING_ITEM_BATCH_SIZE at a time.
+
+        Keyset pagination with only the dispatch columns loaded, so memory
+        stays at one batch however many items the job has. Each batch is read
+        when the previous one is used up: items that stopped being pending
+        meanwhile (cancelled) are not returned.
+
+        Args:
+            job_id: Job ID
+            skip_ids: Item IDs to leave out (duplicates served by fan-out)
+            session: Session to read with (default: self.db)
+
+        Yields:
+            JobItem with id, job_id, raw_prompt and input_params loaded
+        """
+        session = session or self.db
+        last_id = 0
+        while True:
+            batch = session.query(JobItem).options(
+                load_only(JobItem.id, JobItem.job_id, JobItem.raw_prompt, JobItem.input_params)
+            ).filter(
+                JobItem.job_id == job_id,
+                JobItem.status == "pending",
+                JobItem.id > last_id
+            ).order_by(JobItem.id).limit(self.PENDING_ITEM_BATCH_SIZE).all()
+            if not batch:
+                return
+            last_id = batch[-1].id
+            for item in batch:
+                if item.id not in skip_ids:
+                    yield item
+
+    def _record_final_result(self, buffer: JobItemWriteBuffer, item_id: int, values: Optional[dict]) -> int:
+        """Record the merged CSV row of a finished item and copy its result to its duplicates.
+
+        Members are written through the buffer, so those that are no longer
+        pending (e.g. cancelled) are left unchanged. Members of a skipped
+        item (values None) stay pending.
+
+        Args:
+            buffer: Write buffer of the job
+            item_id: JobItem ID
+            values: Final column values of the item, or None if it was skipped
+
+        Returns:
+            Number of member items that received an error result
+        """
+        self._record_csv_result(item_id, values)
+        member_ids = self._duplicate_members.get(item_id)
+        if not member_ids or values is None or values.get("status") not in ("done", "error"):
+            return 0
+        member_values = {col: values.get(col) for col in self.DEDUP_FANOUT_COLUMNS}
+        for member_id in member_ids:
+            buffer.record_result(member_id, **member_values)
+            self._record_csv_result(member_id, member_values)
+        return len(member_ids) if values["status"] == "error" else 0
+
+    def _get_execution_mode(self) -> str:
+        """Get job item execution mode from system settings.
+
+        Returns:
+            One of EXECUTION_MODES, defaults to "auto"
+        """
+        value = get_settings_cache().get(self.db, "job_execution_mode")
+        if value:
+            mode = value.strip().lower()
+            if mode in self.EXECUTION_MODES:
+                return mode
+            logger.warning(f"Unknown job_execution_mode '{value}', using 'auto'")
+        return "auto"
+
+    def _get_batch_provider(self, job: Job, llm_client: LLMClient, item_count: int) -> Optional[BatchProvider]:
+        """Get the batch provider for an offload-mode job.
+
+        Returns:
+            BatchProvider, or None if the job should run as auto instead
+            (single jobs, fewer than job_offload_min_items items, or no batch
+            API for the model)
+        """
+        settings = get_settings_cache().values(self.db)
+        provider = (settings.get("job_offload_provider") or "auto").strip().lower()
+        if provider not in self.OFFLOAD_PROVIDERS:
+            provider = "auto"
+        try:
+            min_items = max(1, int(settings.get("job_offload_min_items") or self.DEFAULT_OFFLOAD_MIN_ITEMS))
+        except ValueError:
+            min_items = self.DEFAULT_OFFLOAD_MIN_ITEMS
+
+        if job.job_type != "batch" or item_count < min_items:
+            return None
+        batch_provider = get_batch_provider(llm_client, provider)
+        if batch_provider is None:
+            logger.warning(f"[JOB-EXEC] Job {job.id}: {llm_client.get_model_name()} has no batch API, running as auto")
+        return batch_provider
+
+    def _get_streaming_enabled(self) -> bool:
+        """Get whether item LLM calls use the streaming API (system setting "job_streaming_enabled").
+
+        Returns:
+            True if enabled, defaults to False
+        """
+        return get_settings_cache().get_bool(self.db, "job_streaming_enabled")
+
+    def _get_prompt_prefix(self, job: Job, revision, item_count: int) -> Optional[str]:
+        """Get the static prompt prefix of a job for provider prompt caching.
+
+        Returns:
+            Template text before the first parameter, or None when disabled,
+            for single runs and fewer than two items (nothing to share) or
+            when the prefix is shorter than MIN_PREFIX_CHARS
+        """
+        if not get_settings_cache().get_bool(self.db, "job_prompt_cache_enabled", self.DEFAULT_PROMPT_CACHE_ENABLED):
+            return None
+        if job.job_type != "batch" or item_count < 2 or not revision or not revision.prompt_template:
+            return None
+        prefix = self.parser.static_prefix(revision.prompt_template)
+        if len(prefix.strip()) < MIN_PREFIX_CHARS:
+            return None
+        return prefix
+
+    def _build_call_input(self, raw_prompt: str) -> tuple:
+        """Get the prompt/messages arguments of an item's LLM call.
+
+        Prompts with [SYSTEM]/[USER]/[ASSISTANT] markers are sent as messages.
+        While the job has a static prompt prefix, the message where it ends
+        carries the "_cache_prefix" hint for the plugin.
+
+        Returns:
+            tuple: (prompt, messages); one of them is None
+        """
+        message_parser = get_message_parser()
+        if message_parser.has_role_markers(raw_prompt):
+            return None, message_parser.to_messages_list(raw_prompt, self._prompt_prefix)
+        prefix = self._prompt_prefix
+        if prefix and raw_prompt.startswith(prefix):
+            return None, [{"role": "user", "content": raw_prompt, CACHE_PREFIX_KEY: len(prefix)}]
+        return raw_prompt, None
+
+    def _get_async_concurrency(self) -> int:
+        """Get maximum in-flight LLM requests for async execution mode.
+
+        Returns:
+            Concurrency value (1-999), defaults to DEFAULT_ASYNC_CONCURRENCY
+        """
+        return get_settings_cache().get_int(
+            self.db, "job_async_concurrency", self.DEFAULT_ASYNC_CONCURRENCY, 1, self.MAX_ASYNC_CONCURRENCY
+        )
+
+    def _get_connection_pool_size(self) -> int:
+        """Get the HTTP connection pool size for SDK clients.
+
+        A model lane runs up to lane_concurrency jobs at once (plus the slot
+        reserved for single runs), each with up to the per-job concurrency of
+        the configured execution mode in flight.
+
+        Returns:
+            Connections per pooled SDK client
+        """
+        scheduler_settings = load_job_scheduler_settings(self.db)
+        jobs_per_lane = max(
+            scheduler_settings["lane_concurrency"], *scheduler_settings["lane_overrides"].values(), 0
+        ) + 1
+
+        per_job = self._get_parallelism_setting()
+        adaptive_enabled, adaptive_max = self._get_adaptive_concurrency_setting()
+        if adaptive_enabled:
+            per_job = max(per_job, adaptive_max)
+        if self._get_execution_mode() == "async":
+            per_job = max(per_job, self._get_async_concurrency())
+        return jobs_per_lane * per_job
+
+    def _get_image_param_defs(self, prompt_template: str) -> list:
+        """Get FILE/FILEPATH parameter definitions of a template (parsed once per template)."""
+        param_defs = self._image_param_defs.get(prompt_template)
+        if param_defs is None:
+            param_defs = [
+                param_def for param_def in self.parser.parse_template(prompt_template)
+                if param_def.type in ["FILE", "FILEPATH"]
+            ]
+            self._image_param_defs[prompt_template] = param_defs
+        return param_defs
 
     def _process_image_parameters(
         self,
         input_params: Dict[str, str],
-        prompt_template: str
+        prompt_template: str,
+        allowed_dirs: List[str] = None
     ) -> List[str]:
         """Process FILE and FILEPATH parameters into Base64 image data.
 
         Args:
             input_params: Dictionary of parameter name -> value
             prompt_template: Prompt template string with {{}} syntax
+            allowed_dirs: Allowed FILEPATH directories (looked up if omitted)
 
         Returns:
             List of data URI strings (with MIME type and Base64 data)
@@ -472,21 +1182,18 @@ class JobManager:
         """
         logger.debug(f"Processing image parameters from input_params: {list(input_params.keys())}")
 
-        # Parse template to identify FILE and FILEPATH parameters
-        param_defs = self.parser.parse_template(prompt_template)
+        # FILE and FILEPATH parameters of the template
+        param_defs = self._get_image_param_defs(prompt_template)
 
         images = []
-        allowed_dirs = self._get_allowed_image_directories()
-        logger.debug(f"Allowed image directories: {allowed_dirs}")
+        if param_defs and allowed_dirs is None:
+            allowed_dirs = self._get_allowed_image_directories()
+            logger.debug(f"Allowed image directories: {allowed_dirs}")
 
         for param_def in param_defs:
             param_name = param_def.name
             param_type = param_def.type
 
-            # Skip non-image parameters
-            if param_type not in ["FILE", "FILEPATH"]:
-                continue
-
             logger.debug(f"Found image parameter: {param_name} (type={param_type})")
 
             # Get parameter value
@@ -501,13 +1208,18 @@ class JobManager:
                     # Expected format: "data:image/jpeg;base64,/9j/4AAQ..."
                     logger.debug(f"Processing FILE parameter '{param_name}' (data length: {len(param_value)} chars)")
 
-                    # Extract MIME type from data URI
-                    mime_type = self._extract_mime_type_from_data_uri(param_value)
-                    base64_data = self._extract_base64_from_file_param(param_value)
-
-                    # Reconstruct data URI with correct MIME type
-                    data_uri = f"data:{mime_type};base64,{base64_data}"
-                    logger.debug(f"FILE '{param_name}' processed: {mime_type}, Base64: {len(base64_data)} chars")
+                    image_cache = get_image_cache()
+                    cache_key = file_payload_cache_key(param_value)
+                    data_uri = image_cache.get(cache_key)
+                    if data_uri is None:
+                        # Extract MIME type from data URI
+                        mime_type = self._extract_mime_type_from_data_uri(param_value)
+                        base64_data = self._extract_base64_from_file_param(param_value)
+
+                        # Reconstruct data URI with correct MIME type
+                        data_uri = f"data:{mime_type};base64,{base64_data}"
+                        logger.debug(f"FILE '{param_name}' processed: {mime_type}, Base64: {len(base64_data)} chars")
+                        image_cache.put(cache_key, data_uri)
                     images.append(data_uri)
 
                 elif param_type == "FILEPATH":
@@ -632,55 +1344,27 @@ class JobManager:
         if not os.path.isfile(real_path):
             raise ValueError(f"Path is not a file: {file_path}")
 
-        # Read file directly without PIL re-encoding (preserves all metadata)
-        # This ensures LLM compatibility - PIL re-encoding can cause recognition failures
-        try:
-            # First, validate format with PIL
-            with Image.open(real_path) as img:
-                if img.format not in ["JPEG", "PNG", "GIF", "WEBP"]:
-                    raise ValueError(
-                        f"Unsupported image format: {img.format}. "
-                        "Supported: JPEG, PNG, GIF, WEBP"
-                    )
+        # Reuse the encoded payload while the file and resize policy are unchanged
+        image_cache = get_image_cache()
+        cache_key = filepath_cache_key(real_path, self.MAX_IMAGE_DIMENSION)
+        cached = image_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-                detected_format = img.format
-
-                # Check if resizing is needed
-                needs_resize = max(img.size) > 2048
-
-            # If resizing is needed, use PIL
-            if needs_resize:
-                with Image.open(real_path) as img:
-                    img = self._resize_image_if_needed(img)
-                    buffer = io.BytesIO()
-                    save_format = img.format if img.format in ["JPEG", "PNG", "GIF", "WEBP"] else "JPEG"
-                    img.save(buffer, format=save_format)
-                    image_bytes = buffer.getvalue()
-                    detected_format = save_format
+        # Take the result of the prefetch stage if the image was submitted ahead
+        prefetcher = self._image_prefetcher
+        future = prefetcher.take(cache_key) if prefetcher else None
+        try:
+            if future is not None:
+                data_uri = future.result()
             else:
-                # Read file directly for best LLM compatibility
-                with open(real_path, 'rb') as f:
-                    image_bytes = f.read()
-
-            # Encode to Base64
-            base64_data = base64.b64encode(image_bytes).decode("utf-8")
-
-            # Create MIME type from format
-            mime_type_map = {
-                "JPEG": "image/jpeg",
-                "PNG": "image/png",
-                "GIF": "image/gif",
-                "WEBP": "image/webp"
-            }
-            mime_type = mime_type_map.get(detected_format, "image/jpeg")
-
-            # Return data URI
-            data_uri = f"data:{mime_type};base64,{base64_data}"
-            return data_uri
-
+                data_uri = encode_image_file(real_path, self.MAX_IMAGE_DIMENSION)
         except Exception as e:
             raise IOError(f"Failed to load image from '{file_path}': {e}")
 
+        image_cache.put(cache_key, data_uri)
+        return data_uri
+
     def _resize_image_if_needed(self, img: Image.Image) -> Image.Image:
         """Resize image if dimensions exceed maximum.
 
@@ -692,19 +1376,11 @@ class JobManager:
 
         Specification: docs/image_parameter_spec.md (Performance optimization)
         """
-        max_dim = 2048
-
-        if max(img.size) > max_dim:
-            ratio = max_dim / max(img.size)
-            new_size = tuple(int(dim * ratio) for dim in img.size)
-            logger.info(f"Resizing image from {img.size} to {new_size}")
-            return img.resize(new_size, Image.Resampling.LANCZOS)
-
-        return img
+        return resize_image(img, self.MAX_IMAGE_DIMENSION)
 
     def _execute_items_serial(
         self,
-        job_items: List[JobItem],
+        job_items: Iterable[JobItem],
         llm_client: LLMClient,
         revision: ProjectRevision,
         temperature: float,
@@ -713,7 +1389,7 @@ class JobManager:
         """Execute job items serially (one at a time).
 
         Args:
-            job_items: List of job items to execute
+            job_items: Job items to execute (read as they are dispatched)
             llm_client: LLM client instance
             revision: Project revision for parser
             temperature: LLM temperature
@@ -724,98 +1400,284 @@ class JobManager:
         """
         error_count = 0
         model_params = model_params or {}
+        job_id, payloads = self._item_payloads(job_items)
+        if payloads is None:
+            return 0
 
-        for item in job_items:
-            # Check if item was cancelled
-            self.db.refresh(item)
-            if item.status == "cancelled":
+        with self._create_write_buffer(job_id) as buffer:
+            for index, (item_id, raw_prompt, input_params_json) in self._dispatch_order(payloads, buffer):
+                # Stop dispatching once the job was cancelled (checked on each flush)
+                if buffer.stopped:
+                    break
+
+                error_count += self._execute_buffered_item(
+                    buffer, index, item_id, raw_prompt, input_params_json,
+                    llm_client, revision, temperature, model_params
+                )
+
+        return error_count
+
+    @staticmethod
+    def _item_payloads(job_items: Iterable[JobItem]) -> tuple:
+        """Detach plain data from job items as they are read (buffer flushes expire sessions).
+
+        Returns:
+            (job_id, iterator of (item_id, raw_prompt, input_params_json)),
+            or (None, None) if there are no items
+        """
+        items = iter(job_items)
+        first = next(items, None)
+        if first is None:
+            return None, None
+        return first.job_id, (
+            (item.id, item.raw_prompt, item.input_params) for item in itertools.chain([first], items)
+        )
+
+    def _execute_buffered_item(
+        self,
+        buffer: JobItemWriteBuffer,
+        index: Optional[int],
+        item_id: int,
+        raw_prompt: str,
+        input_params_json: str,
+        llm_client: LLMClient,
+        revision: ProjectRevision,
+        temperature: float,
+        model_params: dict,
+        allowed_dirs: List[str] = None
+    ) -> int:
+        """Execute one job item and record its result (shared by serial and thread paths).
+
+        Args:
+            buffer: Write buffer of the job
+            index: Position of the item in dispatch order (None for retries, see image prefetch)
+            item_id: JobItem ID to process
+            raw_prompt: The prompt text to send to LLM
+            input_params_json: JSON string of input parameters
+            llm_client: LLM client instance
+            revision: Project revision for parser
+            temperature: LLM temperature
+            model_params: Additional model parameters (e.g., max_output_tokens)
+            allowed_dirs: Allowed FILEPATH directories (looked up if omitted)
+
+        Returns:
+            1 if the item failed, 0 if it succeeded or was re-queued for a retry
+        """
+        self._advance_image_prefetch(index)
+        buffer.mark_running(item_id)
+        values = self._execute_single_item_call(
+            item_id, raw_prompt, input_params_json,
+            llm_client, revision, temperature, model_params, allowed_dirs
+        )
+        buffer.record_result(item_id, **values)
+        if values["status"] == "pending":
+            return 0  # Re-queued for a retry
+        duplicate_errors = self._record_final_result(buffer, item_id, values)
+        return (1 if values["status"] == "error" else 0) + duplicate_errors
+
+    def _create_write_buffer(self, job_id: int) -> JobItemWriteBuffer:
+        """Create a write-behind buffer for item updates of a job.
+
+        The buffer gets its own session on the same engine, since its flusher
+        thread must not share self.db with the executing thread.
+        """
+        stop_event = self.lease.lost if self.lease is not None else None
+        return JobItemWriteBuffer(Session(bind=self.db.get_bind()), job_id, stop_event=stop_event)
+
+    def _retry_or_fail(self, item_id: int, payload: tuple, values: dict, response: LLMResponse = None) -> dict:
+        """Re-queue a failed call through the retry schedule if its error allows it.
+
+        Args:
+            item_id: JobItem ID
+            payload: (item_id, raw_prompt, input_params_json) to dispatch again
+            values: Error column values of the failed call
+            response: Failed response (None if the call raised)
+
+        Returns:
+            {"status": "pending", ...} if the item was re-queued, otherwise the
+            error values (noting the number of attempts)
+        """
+        schedule = self._retry_schedule
+        if schedule is None:
+            return values
+        if schedule.schedule(item_id, payload, response, values.get("error_message")) is not None:
+            return {"status": "pending", "turnaround_ms": values.get("turnaround_ms")}
+        values["error_message"] = final_error_message(values.get("error_message"), schedule.attempts(item_id))
+        return values
+
+    def _retry_wait(self) -> Optional[float]:
+        """Seconds to wait for the next due retry (None if no retries are scheduled)."""
+        schedule = self._retry_schedule
+        next_due = schedule.next_due_in() if schedule is not None else None
+        return None if next_due is None else min(next_due, self.RETRY_POLL_SECONDS)
+
+    def _due_retries(self, buffer: JobItemWriteBuffer) -> List[tuple]:
+        """Take the payloads of all due retries (dropping them once the job was cancelled)."""
+        schedule = self._retry_schedule
+        if schedule is None:
+            return []
+        if buffer.stopped:
+            schedule.clear()
+            return []
+        due = []
+        while True:
+            entry = schedule.pop_due()
+            if entry is None:
+                return due
+            due.append(entry[1])
+
+    def _dispatch_order(self, payloads: Iterable[tuple], buffer: JobItemWriteBuffer):
+        """Yield (index, payload) for items in order, interleaving due retries (index None).
+
+        Once all items are dispatched, waits for the remaining retries, so
+        delayed items never hold up the items behind them.
+        """
+        fresh = enumerate(payloads)
+        while True:
+            due = self._due_retries(buffer)
+            for payload in due:
+                yield None, payload
+            if due:
+                continue
+            entry = next(fresh, None)
+            if entry is not None:
+                yield entry
                 continue
+            wait_seconds = self._retry_wait()
+            if wait_seconds is None or buffer.stopped:
+                return
+            time.sleep(wait_seconds)
 
-            # Update item status
-            item.status = "running"
-            self.db.commit()
+    def _execute_single_item_call(
+        self,
+        item_id: int,
+        raw_prompt: str,
+        input_params_json: str,
+        llm_client: LLMClient,
+        revision: ProjectRevision,
+        temperature: float,
+        model_params: dict,
+        allowed_dirs: List[str] = None
+    ) -> dict:
+        """Execute the LLM call of one job item without touching the database.
 
-            # Execute LLM call
-            try:
-                # Process image parameters (FILE and FILEPATH types)
-                images = []
-                if revision and revision.prompt_template:
-                    try:
-                        input_params = json.loads(item.input_params)
-                        images = self._process_image_parameters(
-                            input_params,
-                            revision.prompt_template
-                        )
-                    except Exception as e:
-                        logger.error(f"Error processing images for item {item.id}: {e}")
-                        # Continue without images if processing fails
+        Args:
+            item_id: JobItem ID (for logging)
+            raw_prompt: The prompt text to send to LLM
+            input_params_json: JSON string of input parameters
+            llm_client: LLM client instance
+            revision: Project revision for parser
+            temperature: LLM temperature
+            model_params: Additional model parameters (e.g., max_output_tokens)
+            allowed_dirs: Allowed FILEPATH directories (looked up if omitted)
 
-                # Call LLM with prompt, optional images, and model parameters
-                # Parse prompt for [SYSTEM]/[USER]/[ASSISTANT] role markers
-                message_parser = get_message_parser()
-                if message_parser.has_role_markers(item.raw_prompt):
-                    # Use messages mode for structured prompts
-                    messages = message_parser.to_messages_list(item.raw_prompt)
-                    prompt_arg = None
-                else:
-                    # Use simple prompt mode (backward compatible)
-                    messages = None
-                    prompt_arg = item.raw_prompt
-
-                # GPT-5 models don't use temperature parameter
-                model_name = llm_client.get_model_name()
-                is_gpt5 = "gpt-5" in model_name or "gpt5" in model_name
-
-                if is_gpt5:
-                    # GPT-5: Don't pass temperature
-                    response = llm_client.call(
-                        prompt=prompt_arg,
-                        messages=messages,
-                        images=images if images else None,
-                        **model_params
+        Returns:
+            Column values for the item (status "done" or "error")
+        """
+        # Execute LLM call
+        try:
+            # Process image parameters (FILE and FILEPATH types)
+            images = []
+            if revision and revision.prompt_template:
+                try:
+                    input_params = json.loads(input_params_json)
+                    images = self._process_image_parameters(
+                        input_params,
+                        revision.prompt_template,
+                        allowed_dirs
                     )
+                except Exception as e:
+                    logger.error(f"Error processing images for item {item_id}: {e}")
+                    # Continue without images if processing fails
+
+            # Call LLM with prompt, optional images, and model parameters
+            # Parse prompt for [SYSTEM]/[USER]/[ASSISTANT] role markers
+            prompt_arg, messages = self._build_call_input(raw_prompt)
+
+            # Streamed calls publish partial text to progress streams
+            stream_job_id = self._stream_job_id
+            if stream_job_id is not None:
+                tracker = get_job_progress_tracker()
+                call_llm = functools.partial(
+                    llm_client.stream,
+                    on_text=lambda text: tracker.add_partial_text(stream_job_id, item_id, text)
+                )
+            else:
+                call_llm = llm_client.call
+
+            # GPT-5 models don't use temperature parameter
+            model_name = llm_client.get_model_name()
+            is_gpt5 = "gpt-5" in model_name or "gpt5" in model_name
+
+            if is_gpt5:
+                # GPT-5: Don't pass temperature
+                response = call_llm(
+                    prompt=prompt_arg,
+                    messages=messages,
+                    images=images if images else None,
+                    **model_params
+                )
+            else:
+                # GPT-4 and other models: Pass temperature
+                # Remove temperature from model_params to avoid duplicate keyword argument
+                call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
+                response = call_llm(
+                    prompt=prompt_arg,
+                    messages=messages,
+                    images=images if images else None,
+                    temperature=temperature,
+                    **call_params
+                )
+
+            if response.success:
+                # Apply parser (Phase 2)
+                if revision and revision.parser_config:
+                    parser = ResponseParser(revision.parser_config)
+                    parsed_result = parser.parse(response.response_text)
+                    parsed_response = json.dumps(parsed_result, ensure_ascii=False)
                 else:
-                    # GPT-4 and other models: Pass temperature
-                    # Remove temperature from model_params to avoid duplicate keyword argument
-                    call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
-                    response = llm_client.call(
-                        prompt=prompt_arg,
-                        messages=messages,
-                        images=images if images else None,
-                        temperature=temperature,
-                        **call_params
-                    )
+                    parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
+                values = {
+                    "status": "done",
+                    "raw_response": response.response_text,
+                    "parsed_response": parsed_response,
+                    "turnaround_ms": response.turnaround_ms
+                }
+            else:
+                values = self._retry_or_fail(item_id, (item_id, raw_prompt, input_params_json), {
+                    "status": "error",
+                    "error_message": response.error_message,
+                    "turnaround_ms": response.turnaround_ms
+                }, response)
+            if response.ttft_ms is not None:
+                values["ttft_ms"] = response.ttft_ms
+                values["tokens_per_second"] = response.tokens_per_second
+            values.update(self._usage_values(response))
+            return values
 
-                if response.success:
-                    item.status = "done"
-                    item.raw_response = response.response_text
-                    item.turnaround_ms = response.turnaround_ms
-
-                    # Apply parser (Phase 2)
-                    if revision and revision.parser_config:
-                        parser = ResponseParser(revision.parser_config)
-                        parsed_result = parser.parse(response.response_text)
-                        item.parsed_response = json.dumps(parsed_result, ensure_ascii=False)
-                    else:
-                        item.parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
-                else:
-                    item.status = "error"
-                    item.error_message = response.error_message
-                    item.turnaround_ms = response.turnaround_ms
-                    error_count += 1
+        except Exception as e:
+            return self._retry_or_fail(
+                item_id, (item_id, raw_prompt, input_params_json), {"status": "error", "error_message": str(e)}
+            )
+        finally:
+            if self._stream_job_id is not None:
+                get_job_progress_tracker().clear_partial_text(self._stream_job_id, item_id)
 
-            except Exception as e:
-                item.status = "error"
-                item.error_message = str(e)
-                error_count += 1
+    @staticmethod
+    def _usage_values(response: LLMResponse) -> dict:
+        """Get the token usage columns of an item result.
 
-            self.db.commit()
+        Args:
+            response: LLM response
 
-        return error_count
+        Returns:
+            {column: count} for prompt/completion/reasoning/cached tokens
+        """
+        return {column: getattr(response, column) for column in TOKEN_USAGE_COLUMNS}
 
     def _execute_items_parallel(
         self,
-        job_items: List[JobItem],
+        job_items: Iterable[JobItem],
         llm_client: LLMClient,
         revision: ProjectRevision,
         temperature: float,
@@ -824,8 +1686,11 @@ class JobManager:
     ) -> int:
         """Execute job items in parallel using ThreadPoolExecutor.
 
+        Items are read and submitted as earlier ones finish, so at most
+        THREAD_QUEUE_ITEMS_PER_WORKER items per worker are held at a time.
+
         Args:
-            job_items: List of job items to execute
+            job_items: Job items to execute (read as they are dispatched)
             llm_client: LLM client instance
             revision: Project revision for parser
             temperature: LLM temperature
@@ -835,186 +1700,445 @@ class JobManager:
         Returns:
             Number of errors encountered
         """
-        from backend.database import SessionLocal
-
         error_count = 0
         model_params = model_params or {}
+        job_id, payloads = self._item_payloads(job_items)
+        if payloads is None:
+            return 0
 
-        def execute_single_item(
-            item_id: int,
-            raw_prompt: str,
-            input_params_json: str,
-            prompt_template: str,
-            parser_config: str
-        ) -> int:
-            """Execute a single job item with its own database session.
-
-            Args:
-                item_id: JobItem ID to process
-                raw_prompt: The prompt text to send to LLM
-                input_params_json: JSON string of input parameters
-                prompt_template: Prompt template for image processing
-                parser_config: Parser configuration JSON
-
-            Returns:
-                1 if error, 0 if success
-            """
-            # Create new session for this thread
-            db = SessionLocal()
+        buffer = self._create_write_buffer(job_id)
+        allowed_dirs = self._get_allowed_image_directories()
+
+        def execute_single_item(index: Optional[int], item_id: int, raw_prompt: str, input_params_json: str) -> int:
+            """Execute a single job item on a worker thread (1 if error, 0 otherwise)."""
+            # Skip remaining items once the job was cancelled (checked on each flush)
+            if buffer.stopped:
+                self._record_csv_result(item_id, None)
+                return 0
+            return self._execute_buffered_item(
+                buffer, index, item_id, raw_prompt, input_params_json,
+                llm_client, revision, temperature, model_params, allowed_dirs
+            )
+
+        fresh = enumerate(payloads)
+        max_queued = max_workers * self.THREAD_QUEUE_ITEMS_PER_WORKER
+
+        # Execute items in parallel; closing the buffer flushes remaining updates
+        with buffer, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = set()
+            while True:
+                # Top up the queue with the next items (no more once the job was cancelled)
+                while len(futures) < max_queued and not buffer.stopped:
+                    entry = next(fresh, None)
+                    if entry is None:
+                        break
+                    index, (item_id, raw_prompt, input_params_json) = entry
+                    futures.add(executor.submit(execute_single_item, index, item_id, raw_prompt, input_params_json))
+
+                if not futures and self._retry_wait() is None:
+                    break
+
+                # Wait for completion and collect errors; delayed retries are
+                # submitted once due, so they hold no worker while waiting
+                if futures:
+                    done, futures = wait(futures, timeout=self._retry_wait(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        error_count += future.result()
+                else:
+                    time.sleep(self._retry_wait())
+                for item_id, raw_prompt, input_params_json in self._due_retries(buffer):
+                    futures.add(executor.submit(execute_single_item, None, item_id, raw_prompt, input_params_json))
+
+        return error_count
+
+    def _execute_items_async(
+        self,
+        job_items: Iterable[JobItem],
+        llm_client: LLMClient,
+        revision: ProjectRevision,
+        temperature: float,
+        concurrency: int,
+        model_params: dict = None
+    ) -> int:
+        """Execute job items through an asyncio pipeline.
+
+        Up to `concurrency` items are in flight at once, using the client's
+        acall() (native async SDK clients where the plugin provides them).
+        Pending items are claimed in batches, and results go through the same
+        JobItemWriteBuffer as the serial and thread paths. Database writes and
+        image loading run on helper threads, never on the event loop.
+
+        Args:
+            job_items: Job items to execute (read as they are claimed)
+            llm_client: LLM client instance
+            revision: Project revision for parser
+            temperature: LLM temperature
+            concurrency: Maximum number of in-flight LLM requests
+            model_params: Additional model parameters (e.g., max_output_tokens)
+
+        Returns:
+            Number of errors encountered
+        """
+        job_id, payloads = self._item_payloads(job_items)
+        if payloads is None:
+            return 0
+
+        # Closing the buffer (after the event loop ends) flushes remaining updates
+        with self._create_write_buffer(job_id) as buffer:
+            return _run_coroutine_sync(
+                self._run_items_async(
+                    buffer, payloads, llm_client, revision, temperature, concurrency, model_params or {}
+                )
+            )
+
+    async def _run_items_async(
+        self,
+        buffer: JobItemWriteBuffer,
+        payloads: Iterator[tuple],
+        llm_client: LLMClient,
+        revision: ProjectRevision,
+        temperature: float,
+        concurrency: int,
+        model_params: dict
+    ) -> int:
+        """Coroutine body of _execute_items_async().
+
+        Args:
+            buffer: Write buffer of the job
+            payloads: Iterator of (item_id, raw_prompt, input_params_json) tuples
+            llm_client: LLM client instance
+            revision: Project revision for parser
+            temperature: LLM temperature
+            concurrency: Number of dispatch workers (= max in-flight requests)
+            model_params: Additional model parameters
+
+        Returns:
+            Number of errors encountered
+        """
+        parser_config = revision.parser_config if revision else None
+        prompt_template = revision.prompt_template if revision else None
+        claim_batch_size = max(1, min(concurrency, self.ASYNC_CLAIM_BATCH_SIZE))
+
+        # GPT-5 models don't use temperature parameter
+        model_name = llm_client.get_model_name()
+        is_gpt5 = "gpt-5" in model_name or "gpt5" in model_name
+        if is_gpt5:
+            call_params = dict(model_params)
+        else:
+            # Remove temperature from model_params to avoid duplicate keyword argument
+            call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
+            call_params["temperature"] = temperature
+
+        def load_images(index: Optional[int], item_id: int, input_params_json: str) -> list:
+            """Advance the image prefetch and process image parameters (run off the event loop)."""
+            self._advance_image_prefetch(index)
+            if not prompt_template:
+                return []
             try:
-                # Get fresh item from database
-                item = db.query(JobItem).filter(JobItem.id == item_id).first()
-                if not item:
-                    return 1
+                return self._process_image_parameters(json.loads(input_params_json), prompt_template)
+            except Exception as e:
+                logger.error(f"Error processing images for item {item_id}: {e}")
+                return []
 
-                # Check if item was cancelled
-                if item.status == "cancelled":
-                    return 0
+        async def run_item(index: Optional[int], item_id: int, raw_prompt: str, input_params_json: str) -> int:
+            """Execute one claimed item. Returns 1 on error, 0 otherwise."""
+            try:
+                # Process image parameters (FILE and FILEPATH types)
+                images = await asyncio.to_thread(load_images, index, item_id, input_params_json)
 
-                # Update item status
-                item.status = "running"
-                db.commit()
+                # Parse prompt for [SYSTEM]/[USER]/[ASSISTANT] role markers
+                prompt_arg, messages = self._build_call_input(raw_prompt)
 
-                # Execute LLM call
-                try:
-                    # Process image parameters (FILE and FILEPATH types)
+                response = await llm_client.acall(
+                    prompt=prompt_arg,
+                    messages=messages,
+                    images=images if images else None,
+                    **call_params
+                )
+
+                if response.success:
+                    if parser_config:
+                        parser = ResponseParser(parser_config)
+                        parsed_response = json.dumps(parser.parse(response.response_text), ensure_ascii=False)
+                    else:
+                        parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
+                    values = {
+                        "status": "done",
+                        "raw_response": response.response_text,
+                        "parsed_response": parsed_response,
+                        "turnaround_ms": response.turnaround_ms
+                    }
+                    error = 0
+                else:
+                    values = self._retry_or_fail(item_id, (item_id, raw_prompt, input_params_json), {
+                        "status": "error",
+                        "error_message": response.error_message,
+                        "turnaround_ms": response.turnaround_ms
+                    }, response)
+                    error = 1
+                values.update(self._usage_values(response))
+            except Exception as e:
+                values = self._retry_or_fail(
+                    item_id, (item_id, raw_prompt, input_params_json), {"status": "error", "error_message": str(e)}
+                )
+                error = 1
+
+            # The buffer may flush (a database write), so record off the event loop
+            await asyncio.to_thread(buffer.record_result, item_id, **values)
+            if values["status"] == "pending":
+                return 0  # Re-queued for a retry
+            return error + await asyncio.to_thread(self._record_final_result, buffer, item_id, values)
+
+        pending = enumerate(payloads)
+        claimed: List[tuple] = []
+        claim_lock = asyncio.Lock()
+        due_retries = collections.deque()
+
+        async def next_claimed() -> Optional[tuple]:
+            """Take the next claimed item, claiming a batch of pending items when none are left.
+
+            Items cancelled since the job started are not claimed and skipped.
+            """
+            async with claim_lock:
+                if buffer.stopped:
+                    return None
+                while not claimed:
+                    if buffer.stopped:
+                        return None
+                    # Reading the next items may query the database
+                    batch = await asyncio.to_thread(list, itertools.islice(pending, claim_batch_size))
+                    if not batch:
+                        return None
+                    claimed_ids = set(await asyncio.to_thread(
+                        buffer.claim, [item_id for _, (item_id, _, _) in batch]
+                    ))
+                    for index, payload in batch:
+                        if payload[0] in claimed_ids:
+                            claimed.append((index, payload))
+                        else:
+                            self._record_csv_result(payload[0], None)
+                    claimed.reverse()
+                return claimed.pop()
+
+        async def dispatch_worker() -> int:
+            """Pull items until exhausted; bounded worker count caps in-flight requests.
+
+            Due retries go first. A worker with nothing left to dispatch waits
+            for the remaining retries instead of holding a request slot.
+            """
+            errors = 0
+            while True:
+                if not due_retries:
+                    due_retries.extend(self._due_retries(buffer))
+                if due_retries:
+                    item_id, raw_prompt, input_params_json = due_retries.popleft()
+                    # Supersedes the buffered re-queue, as in the thread paths
+                    await asyncio.to_thread(buffer.mark_running, item_id)
+                    errors += await run_item(None, item_id, raw_prompt, input_params_json)
+                    continue
+                entry = await next_claimed()
+                if entry is None:
+                    wait_seconds = self._retry_wait()
+                    if wait_seconds is None:
+                        return errors
+                    await asyncio.sleep(wait_seconds)
+                    continue
+                index, (item_id, raw_prompt, input_params_json) = entry
+                errors += await run_item(index, item_id, raw_prompt, input_params_json)
+
+        results = await asyncio.gather(*(dispatch_worker() for _ in range(max(1, concurrency))))
+        return sum(results)
+
+    def _execute_items_offload(
+        self,
+        job_items: Iterable[JobItem],
+        batch_provider: BatchProvider,
+        revision: ProjectRevision,
+        temperature: float,
+        model_params: dict = None
+    ) -> int:
+        """Execute job items as provider batch submissions.
+
+        Items are submitted in batches of OFFLOAD_MAX_BATCH_REQUESTS and marked
+        running; each batch is polled every OFFLOAD_POLL_SECONDS until it ends,
+        then its results are parsed and written like any other item result.
+        If the job is cancelled, the running batch is cancelled at the provider
+        and its items are marked cancelled.
+
+        Args:
+            job_items: Job items to execute (read one batch at a time)
+            batch_provider: Provider the batches are submitted to
+            revision: Project revision for parser
+            temperature: LLM temperature
+            model_params: Additional model parameters (e.g., max_output_tokens)
+
+        Returns:
+            Number of errors encountered
+        """
+        job_id, payloads = self._item_payloads(job_items)
+        if payloads is None:
+            return 0
+
+        model_params = model_params or {}
+        parser_config = revision.parser_config if revision else None
+        prompt_template = revision.prompt_template if revision else None
+
+        # GPT-5 models don't use temperature parameter
+        model_name = batch_provider.llm_client.get_model_name()
+        if "gpt-5" in model_name or "gpt5" in model_name:
+            call_params = dict(model_params)
+        else:
+            call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
+            call_params["temperature"] = temperature
+
+        error_count = 0
+        with self._create_write_buffer(job_id) as buffer:
+            for start in itertools.count(0, self.OFFLOAD_MAX_BATCH_REQUESTS):
+                chunk = list(itertools.islice(payloads, self.OFFLOAD_MAX_BATCH_REQUESTS))
+                if not chunk:
+                    break
+                buffer.flush()
+                if buffer.stopped:
+                    break
+
+                # Build the batch entries (same request body as a direct call)
+                requests = []
+                for offset, (item_id, raw_prompt, input_params_json) in enumerate(chunk):
+                    self._advance_image_prefetch(start + offset)
                     images = []
                     if prompt_template:
                         try:
-                            input_params = json.loads(input_params_json)
-                            # Create temporary parser for this thread
-                            temp_parser = PromptTemplateParser()
-                            param_defs = temp_parser.parse_template(prompt_template)
-
-                            # Process images using helper methods
-                            # Note: We need to reimplement image processing here
-                            # since we can't access self methods in parallel threads
-                            allowed_dirs = self._get_allowed_image_directories()
-
-                            for param_def in param_defs:
-                                param_name = param_def.name
-                                param_type = param_def.type
-
-                                if param_type not in ["FILE", "FILEPATH"]:
-                                    continue
-
-                                param_value = input_params.get(param_name)
-                                if not param_value:
-                                    continue
-
-                                try:
-                                    if param_type == "FILE":
-                                        # FILE type: Reconstruct data URI with MIME type
-                                        mime_type = self._extract_mime_type_from_data_uri(param_value)
-                                        base64_data = self._extract_base64_from_file_param(param_value)
-                                        data_uri = f"data:{mime_type};base64,{base64_data}"
-                                        images.append(data_uri)
-                                    elif param_type == "FILEPATH":
-                                        # FILEPATH type: _load_image_from_filepath now returns data URI
-                                        data_uri = self._load_image_from_filepath(param_value, allowed_dirs)
-                                        images.append(data_uri)
-                                except Exception as e:
-                                    logger.error(f"Error processing image parameter '{param_name}' in item {item_id}: {e}")
-
+                            images = self._process_image_parameters(json.loads(input_params_json), prompt_template)
                         except Exception as e:
                             logger.error(f"Error processing images for item {item_id}: {e}")
-
-                    # Call LLM with prompt, optional images, and model parameters
-                    # Parse prompt for [SYSTEM]/[USER]/[ASSISTANT] role markers
-                    message_parser = get_message_parser()
-                    if message_parser.has_role_markers(raw_prompt):
-                        # Use messages mode for structured prompts
-                        messages = message_parser.to_messages_list(raw_prompt)
-                        prompt_arg = None
-                    else:
-                        # Use simple prompt mode (backward compatible)
-                        messages = None
-                        prompt_arg = raw_prompt
-
-                    # GPT-5 models don't use temperature parameter
-                    model_name = llm_client.get_model_name()
-                    is_gpt5 = "gpt-5" in model_name or "gpt5" in model_name
-
-                    if is_gpt5:
-                        # GPT-5: Don't pass temperature
-                        response = llm_client.call(
-                            prompt=prompt_arg,
-                            messages=messages,
-                            images=images if images else None,
-                            **model_params
-                        )
-                    else:
-                        # GPT-4 and other models: Pass temperature
-                        # Remove temperature from model_params to avoid duplicate keyword argument
-                        call_params = {k: v for k, v in model_params.items() if k != 'temperature'}
-                        response = llm_client.call(
-                            prompt=prompt_arg,
-                            messages=messages,
-                            images=images if images else None,
-                            temperature=temperature,
-                            **call_params
-                        )
-
+                    prompt_arg, messages = self._build_call_input(raw_prompt)
+                    call_args = {"messages": messages} if messages else {"prompt": prompt_arg}
+                    if images:
+                        call_args["images"] = images
+                    call_args.update(call_params)
+                    requests.append(batch_provider.build_request(f"item-{item_id}", call_args))
+
+                item_ids = [item_id for item_id, _, _ in chunk]
+                try:
+                    batch_id = batch_provider.submit(requests)
+                except Exception as e:
+                    logger.error(f"[JOB-OFFLOAD] Batch submission failed: {e}")
+                    for item_id in item_ids:
+                        values = {"status": "error", "error_message": f"Batch submission failed: {e}"}
+                        buffer.record_result(item_id, **values)
+                        error_count += self._record_final_result(buffer, item_id, values)
+                    error_count += len(item_ids)
+                    continue
+                del requests
+                logger.info(f"[JOB-OFFLOAD] Submitted batch {batch_id} ({len(item_ids)} items)")
+                for item_id in item_ids:
+                    buffer.mark_running(item_id)
+
+                state = self._wait_for_offload_batch(batch_provider, batch_id, buffer)
+                if state is None:
+                    # Job cancelled while the batch was running
+                    try:
+                        batch_provider.cancel(batch_id)
+                    except Exception as e:
+                        logger.warning(f"[JOB-OFFLOAD] Failed to cancel batch {batch_id}: {e}")
+                    for item_id in item_ids:
+                        buffer.record_result(item_id, status="cancelled", error_message="Cancelled by user")
+                        self._record_csv_result(item_id, None)
+                    break
+
+                remaining = set(item_ids)
+                for custom_id, response in batch_provider.iter_results(batch_id):
+                    item_id = int(custom_id.split("-", 1)[1])
+                    if item_id not in remaining:
+                        continue
+                    remaining.discard(item_id)
                     if response.success:
-                        item.status = "done"
-                        item.raw_response = response.response_text
-                        item.turnaround_ms = response.turnaround_ms
-
-                        # Apply parser
                         if parser_config:
                             parser = ResponseParser(parser_config)
-                            parsed_result = parser.parse(response.response_text)
-                            item.parsed_response = json.dumps(parsed_result, ensure_ascii=False)
+                            parsed_response = json.dumps(parser.parse(response.response_text), ensure_ascii=False)
                         else:
-                            item.parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
-
-                        db.commit()
-                        return 0
+                            parsed_response = json.dumps({"raw": response.response_text, "parsed": False})
+                        values = {
+                            "status": "done",
+                            "raw_response": response.response_text,
+                            "parsed_response": parsed_response,
+                            "turnaround_ms": response.turnaround_ms
+                        }
                     else:
-                        item.status = "error"
-                        item.error_message = response.error_message
-                        item.turnaround_ms = response.turnaround_ms
-                        db.commit()
-                        return 1
+                        values = {
+                            "status": "error",
+                            "error_message": response.error_message,
+                            "turnaround_ms": response.turnaround_ms
+                        }
+                        error_count += 1
+                    values.update(self._usage_values(response))
+                    buffer.record_result(item_id, **values)
+                    error_count += self._record_final_result(buffer, item_id, values)
+
+                for item_id in sorted(remaining):
+                    values = {"status": "error", "error_message": f"No result in batch {batch_id} ({state})"}
+                    buffer.record_result(item_id, **values)
+                    error_count += self._record_final_result(buffer, item_id, values)
+                error_count += len(remaining)
 
-                except Exception as e:
-                    item.status = "error"
-                    item.error_message = str(e)
-                    db.commit()
-                    return 1
+        return error_count
 
-            finally:
-                # Always close session
-                db.close()
+    def _wait_for_offload_batch(self, batch_provider: BatchProvider, batch_id: str, buffer: JobItemWriteBuffer) -> Optional[str]:
+        """Poll a submitted batch until it ends.
 
-        # Prepare data for parallel execution
-        parser_config = revision.parser_config if revision else None
-        prompt_template = revision.prompt_template if revision else None
+        Returns:
+            Final batch state, or None if the job was cancelled meanwhile
+        """
+        while True:
+            try:
+                state = batch_provider.poll(batch_id)
+            except Exception as e:
+                # Transient API errors: keep polling, the batch runs on regardless
+                logger.warning(f"[JOB-OFFLOAD] Polling batch {batch_id} failed: {e}")
+                state = BATCH_RUNNING
+            if state != BATCH_RUNNING:
+                return state
+            time.sleep(self.OFFLOAD_POLL_SECONDS)
+            buffer.flush()
+            if buffer.job_cancelled:
+                return None
+
+    def _get_csv_template_field_order(self, parser_config_str: Optional[str]) -> Optional[List[str]]:
+        """Get the csv_template field order from a revision's parser_config.
 
-        # Execute items in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all items with their data (not the ORM objects)
-            future_to_item = {
-                executor.submit(
-                    execute_single_item,
-                    item.id,
-                    item.raw_prompt,
-                    item.input_params,
-                    prompt_template,
-                    parser_config
-                ): item
-                for item in job_items
-            }
-
-            # Wait for completion and collect errors
-            for future in as_completed(future_to_item):
-                error_count += future.result()
+        Args:
+            parser_config_str: Parser configuration JSON (may be multiply encoded)
 
-        return error_count
+        Returns:
+            List of field names, or None if there is no csv_template
+        """
+        if not parser_config_str:
+            return None
+        try:
+            parser_config = json.loads(parser_config_str)
+            # Handle multiple levels of JSON encoding (up to 3 levels)
+            decode_attempts = 0
+            while isinstance(parser_config, str) and decode_attempts < 3:
+                parser_config = json.loads(parser_config)
+                decode_attempts += 1
+            if not isinstance(parser_config, dict):
+                logger.warning(f"CSV merge: parser_config is not a dict after decoding: {type(parser_config)}")
+                parser_config = {}
+            csv_template = parser_config.get("csv_template", "")
+            if csv_template:
+                field_order = extract_csv_template_field_order(csv_template)
+                logger.info(f"CSV merge: Extracted field order from csv_template: {field_order}")
+                return field_order
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"CSV merge: Could not parse parser_config: {e}")
+        return None
 
     def _merge_csv_outputs(self, job_items: List[JobItem], include_csv_header: bool) -> str:
         """Merge CSV outputs from multiple job items.
 
+        execute_job() writes the merged CSV incrementally (IncrementalCsvMerger);
+        this builds it in memory from already finished items, e.g. after retries.
+
         Args:
             job_items: List of job items with parsed responses
             include_csv_header: If True, include header from first item
@@ -1056,23 +2180,7 @@ class JobManager:
                     if project_rev:
                         parser_config_str = project_rev.parser_config
 
-                if parser_config_str:
-                    try:
-                        parser_config = json.loads(parser_config_str)
-                        # Handle multiple levels of JSON encoding (up to 3 levels)
-                        decode_attempts = 0
-                        while isinstance(parser_config, str) and decode_attempts < 3:
-                            parser_config = json.loads(parser_config)
-                            decode_attempts += 1
-                        if not isinstance(parser_config, dict):
-                            logger.warning(f"CSV merge: parser_config is not a dict after decoding: {type(parser_config)}")
-                            parser_config = {}
-                        csv_template = parser_config.get("csv_template", "")
-                        if csv_template:
-                            csv_template_field_order = extract_csv_template_field_order(csv_template)
-                            logger.info(f"CSV merge: Extracted field order from csv_template: {csv_template_field_order}")
-                    except (json.JSONDecodeError, TypeError) as e:
-                        logger.warning(f"CSV merge: Could not parse parser_config: {e}")
+                csv_template_field_order = self._get_csv_template_field_order(parser_config_str)
 
         for item in sorted_items:
             # Skip items that are not successfully completed
@@ -1080,54 +2188,21 @@ class JobManager:
                 logger.debug(f"CSV merge: Skipping item {item.id} - status={item.status}, has_parsed={bool(item.parsed_response)}")
                 continue
 
-            try:
-                parsed = json.loads(item.parsed_response)
-
-                # Handle double-encoded JSON (string instead of dict)
-                if isinstance(parsed, str):
-                    try:
-                        parsed = json.loads(parsed)
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(f"CSV merge: Item {item.id} has double-encoded JSON that couldn't be parsed")
-                        continue
-
-                # Ensure parsed is a dictionary
-                if not isinstance(parsed, dict):
-                    logger.warning(f"CSV merge: Item {item.id} parsed_response is not a dict: {type(parsed)}")
-                    continue
-
-                csv_output = parsed.get("csv_output", "")
+            row = extract_csv_row(item.parsed_response, item.id)
+            if row is None:
+                continue
+            csv_output, fields = row
 
-                logger.debug(f"CSV merge: Item {item.id} - has_csv_output={bool(csv_output)}, parsed_keys={list(parsed.keys())}")
+            # Add header from first successful item (only once)
+            if not header_added and include_csv_header and fields:
+                header_line = build_csv_header(fields, csv_template_field_order)
+                csv_lines.append(header_line)
+                header_added = True
+                logger.info(f"CSV merge: Added header: {header_line}")
 
-                if not csv_output:
-                    logger.warning(f"CSV merge: Item {item.id} has no csv_output field in parsed response")
-                    continue
-
-                # Add header from first successful item (only once)
-                if not header_added and include_csv_header:
-                    fields = parsed.get("fields", {})
-                    if fields:
-                        # Use csv_template field order if available, otherwise fall back to fields.keys()
-                        if csv_template_field_order:
-                            # Filter to only include fields that actually exist
-                            ordered_fields = [f for f in csv_template_field_order if f in fields]
-                            header_line = ",".join(ordered_fields)
-                        else:
-                            # Fallback: use fields.keys() order (may not match csv_template)
-                            header_line = ",".join(fields.keys())
-                        csv_lines.append(header_line)
-                        header_added = True
-                        logger.info(f"CSV merge: Added header: {header_line}")
-
-                # Add data line
-                csv_lines.append(csv_output)
-                logger.debug(f"CSV merge: Added line from item {item.id}: {csv_output[:100]}")
-
-            except (json.JSONDecodeError, KeyError, AttributeError, TypeError) as e:
-                # Skip items with invalid parsed response
-                logger.error(f"CSV merge: Error parsing item {item.id}: {e}")
-                continue
+            # Add data line
+            csv_lines.append(csv_output)
+            logger.debug(f"CSV merge: Added line from item {item.id}: {csv_output[:100]}")
 
         result = "\n".join(csv_lines)
         logger.info(f"CSV merge: Completed with {len(csv_lines)} lines (including header if present)")
@@ -1177,7 +2252,9 @@ class JobManager:
         project_revision_id: int = None,
         prompt_revision_id: int = None,
         dataset_id: int = None,
-        model_name: str = None
+        model_name: str = None,
+        defer_items: bool = False,
+        comparison_group: str = None
     ) -> Job:
         """Create a batch execution job from dataset.
 
@@ -1186,6 +2263,10 @@ class JobManager:
             prompt_revision_id: ID of prompt revision to use (new architecture)
             dataset_id: ID of dataset to process
             model_name: Name of LLM model to use (optional)
+            defer_items: Return the job without items; the caller must run
+                populate_batch_job_items() before executing it
+            comparison_group: Group ID shared with jobs running the same
+                revision and dataset on other models (see create_comparison_jobs)
 
         Returns:
             Created Job object (not yet executed)
@@ -1226,58 +2307,345 @@ class JobManager:
             job_type="batch",
             status="pending",
             dataset_id=dataset_id,
-            model_name=model_name
+            model_name=model_name,
+            comparison_group=comparison_group
         )
         self.db.add(job)
-        self.db.flush()
-
-        # Get data from dataset table
-        table_name = dataset.sqlite_table_name
-        select_sql = f'SELECT * FROM "{table_name}"'
-        result = self.db.execute(text(select_sql))
+        self.db.commit()
+        self.db.refresh(job)
 
-        # Fetch all rows first
-        rows = result.fetchall()
-        if not rows:
-            self.db.commit()
+        if not defer_items:
+            self.populate_batch_job_items(job.id, dataset=dataset, prompt_template=prompt_template)
             self.db.refresh(job)
-            return job  # No data to process
 
-        # Get column names from first row's mapping (excluding id)
-        columns = [col for col in rows[0]._mapping.keys() if col != "id"]
+        return job
 
-        # Get allowed directories and text extensions
-        allowed_dirs = self._get_allowed_image_directories()
-        text_extensions = self._get_text_file_extensions()
+    def create_comparison_jobs(
+        self,
+        prompt_revision_id: int,
+        dataset_id: int,
+        model_names: List[str],
+        defer_items: bool = True
+    ) -> List[Job]:
+        """Create one batch job per model for the same prompt revision and dataset.
 
-        # Create job items for each row
-        for row in rows:
-            # Build input_params from row data using _mapping
-            input_params = {}
-            for col in columns:
-                value = row._mapping.get(col)
-                input_params[col] = str(value) if value is not None else ""
+        The jobs share a comparison group. Their items are created in a single
+        pass over the dataset (each row is rendered once) by the first
+        populate_batch_job_items() call of the group. Each job then runs in its
+        model's scheduler lane, under that model's own concurrency limits.
 
-            # Substitute parameters into template
-            raw_prompt = self.parser.substitute_parameters(
-                prompt_template,
-                input_params,
-                allowed_dirs,
-                text_extensions
+        Args:
+            prompt_revision_id: ID of prompt revision to use
+            dataset_id: ID of dataset to process
+            model_names: Models to compare (duplicates are ignored)
+            defer_items: Return the jobs without items (see create_batch_job)
+
+        Returns:
+            Created Job objects, in model_names order
+        """
+        model_names = list(dict.fromkeys(model_names))
+        if not model_names:
+            raise ValueError("At least one model is required")
+
+        group = uuid.uuid4().hex
+        jobs = [
+            self.create_batch_job(
+                prompt_revision_id=prompt_revision_id,
+                dataset_id=dataset_id,
+                model_name=model_name,
+                defer_items=True,
+                comparison_group=group
             )
+            for model_name in model_names
+        ]
+        if not defer_items:
+            self.populate_batch_job_items(jobs[0].id)
+            for job in jobs:
+                self.db.refresh(job)
+        logger.info(f"[JOB-CREATE] Comparison group {group}: jobs {[job.id for job in jobs]}")
+        return jobs
 
-            job_item = JobItem(
-                job_id=job.id,
-                input_params=json.dumps(input_params, ensure_ascii=False),
-                raw_prompt=raw_prompt,
-                status="pending"
+    def populate_batch_job_items(
+        self,
+        job_id: int,
+        dataset: Dataset = None,
+        prompt_template: str = None
+    ) -> int:
+        """Create job items for a batch job by streaming its dataset.
+
+        Rows are read in keyset-paginated chunks of BATCH_ITEM_CHUNK_SIZE,
+        rendered with a precompiled template and bulk-inserted with one Core
+        INSERT per chunk, so memory use does not grow with dataset size.
+        Each chunk is committed separately. Stops early if the job is cancelled.
+        If the job already has items (population was interrupted by a restart),
+        continues after the rows they were created from.
+        For a job of a comparison group, the items of all pending/running jobs
+        of the group are created in the same pass, by whichever job claims the
+        group first in the database (other processes included).
+
+        Args:
+            job_id: ID of batch job (created by create_batch_job)
+            dataset: Dataset of the job (looked up if omitted)
+            prompt_template: Prompt template of the job's revision (looked up if omitted)
+
+        Returns:
+            Number of job items created (over all jobs of the comparison group)
+        """
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+
+        if dataset is None:
+            dataset = self.db.query(Dataset).filter(Dataset.id == job.dataset_id).first()
+            if not dataset:
+                raise ValueError(f"Dataset {job.dataset_id} not found")
+        if prompt_template is None:
+            if job.prompt_revision_id:
+                revision = self.db.query(PromptRevision).filter(
+                    PromptRevision.id == job.prompt_revision_id
+                ).first()
+            else:
+                revision = self.db.query(ProjectRevision).filter(
+                    ProjectRevision.id == job.project_revision_id
+                ).first()
+            if not revision:
+                raise ValueError(f"Revision for job {job_id} not found")
+            prompt_template = revision.prompt_template
+
+        # Compile template once (allowed directories and text extensions included)
+        render = self.parser.compile_template(
+            prompt_template,
+            self._get_allowed_image_directories(),
+            self._get_text_file_extensions()
+        )
+
+        if not job.comparison_group:
+            return self._insert_batch_items([job_id], dataset, render)
+
+        # Comparison group: every job renders the same rows, so one pass fills all of them.
+        # Whichever job (in any process) claims the group first creates the items;
+        # the others wait and then find them already created.
+        leader_id = self.db.query(func.min(Job.id)).filter(Job.comparison_group == job.comparison_group).scalar()
+        lease = self._claim_comparison_population(leader_id)
+        if lease is None:
+            return 0
+        group_job_ids = [
+            row[0] for row in self.db.query(Job.id).filter(
+                Job.comparison_group == job.comparison_group,
+                Job.status.in_(["pending", "running"])
+            ).order_by(Job.id).all()
+        ]
+        claim = [lease]  # Current claim value, replaced by each renewal (None once lost)
+        populated = False
+        try:
+            created = self._insert_batch_items(
+                group_job_ids or [job_id], dataset, render,
+                before_commit=lambda: self._renew_comparison_population(leader_id, claim)
             )
-            self.db.add(job_item)
+            populated = True
+            return created
+        finally:
+            if claim[0] is not None:
+                self._release_comparison_population(leader_id, claim[0], populated)
 
-        self.db.commit()
-        self.db.refresh(job)
+    def _population_lease(self) -> str:
+        """Build a population claim value: fixed-width expiry first, so claims compare by time."""
+        expires_at = datetime.utcnow() + timedelta(seconds=self.COMPARISON_POPULATION_LEASE_SECONDS)
+        return f"{expires_at.isoformat(timespec='microseconds')} {uuid.uuid4().hex[:8]}"
 
-        return job
+    def _claim_comparison_population(self, leader_id: int) -> Optional[str]:
+        """Claim item creation of a comparison group, waiting while another process holds it.
+
+        The claim is a conditional UPDATE of the group's first job, so only one
+        session wins it. A claim that is not renewed expires, letting another
+        job resume an interrupted population.
+
+        Returns:
+            The claim value, or None if the group's items were created meanwhile
+        """
+        while True:
+            now = datetime.utcnow().isoformat(timespec="microseconds")
+            lease = self._population_lease()
+            result = self.db.execute(
+                text(
+                    "UPDATE jobs SET items_population_lease = :lease "
+                    "WHERE id = :job_id AND items_populated = 0 "
+                    "AND (items_population_lease IS NULL OR items_population_lease < :now)"
+                ),
+                {"lease": lease, "job_id": leader_id, "now": now}
+            )
+            self.db.commit()
+            if result.rowcount == 1:
+                return lease
+            populated = self.db.execute(
+                text("SELECT items_populated FROM jobs WHERE id = :job_id"), {"job_id": leader_id}
+            ).scalar()
+            if populated:
+                return None
+            logger.info(f"[JOB-CREATE] Comparison group of job {leader_id} is being populated, waiting")
+            time.sleep(self.COMPARISON_POPULATION_POLL_SECONDS)
+
+    def _renew_comparison_population(self, leader_id: int, claim: List[str]) -> bool:
+        """Extend our population claim (in the transaction of the next item chunk).
+
+        Args:
+            leader_id: First job of the comparison group
+            claim: One-element list holding the current claim value (updated,
+                set to None if the claim was lost)
+
+        Returns:
+            False if the claim expired and was taken by another process
+        """
+        renewed = self._population_lease()
+        result = self.db.execute(
+            text(
+                "UPDATE jobs SET items_population_lease = :renewed "
+                "WHERE id = :job_id AND items_population_lease = :lease"
+            ),
+            {"renewed": renewed, "job_id": leader_id, "lease": claim[0]}
+        )
+        claim[0] = renewed if result.rowcount == 1 else None
+        return claim[0] is not None
+
+    def _release_comparison_population(self, leader_id: int, lease: str, populated: bool):
+        """Give up our population claim, marking the group populated if item creation finished."""
+        try:
+            self.db.execute(
+                text(
+                    "UPDATE jobs SET items_population_lease = NULL, items_populated = :populated "
+                    "WHERE id = :job_id AND items_population_lease = :lease"
+                ),
+                {"populated": 1 if populated else 0, "job_id": leader_id, "lease": lease}
+            )
+            self.db.commit()
+        except Exception as e:
+            # The claim expires on its own
+            self.db.rollback()
+            logger.error(f"[JOB-CREATE] Could not release population claim of job {leader_id}: {e}")
+
+    def _insert_batch_items(
+        self,
+        job_ids: List[int],
+        dataset: Dataset,
+        render,
+        before_commit: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """Stream the dataset and insert one item per row for each job.
+
+        Each row is rendered once. Jobs that already have items (interrupted
+        population, or filled by another job of the group) only receive the
+        rows after their existing items.
+
+        Args:
+            job_ids: Batch jobs sharing the dataset and prompt template
+            dataset: Dataset of the jobs
+            render: Compiled prompt template
+            before_commit: Called in each chunk's transaction; returning False
+                discards the chunk and stops (another process took over)
+
+        Returns:
+            Number of job items created (over all jobs)
+        """
+        table_name = dataset.sqlite_table_name
+        select_sql = text(
+            f'SELECT * FROM "{table_name}" WHERE id > :last_id ORDER BY id LIMIT :limit'
+        )
+        insert_stmt = JobItem.__table__.insert()
+
+        created = 0
+        last_id = -1
+        # Chunks are committed in row order, so existing items map to the first rows
+        existing = dict(
+            self.db.query(JobItem.job_id, func.count(JobItem.id))
+            .filter(JobItem.job_id.in_(job_ids))
+            .group_by(JobItem.job_id)
+            .all()
+        )
+        existing = {job_id: existing.get(job_id, 0) for job_id in job_ids}
+        row_index = min(existing.values())
+        if row_index:
+            resume_row = self.db.execute(
+                text(f'SELECT id FROM "{table_name}" ORDER BY id LIMIT 1 OFFSET :offset'),
+                {"offset": row_index - 1}
+            ).fetchone()
+            if resume_row is None:
+                return 0
+            last_id = resume_row[0]
+            logger.info(f"[JOB-CREATE] Jobs {job_ids}: resuming item creation after {row_index} items")
+        try:
+            while True:
+                result = self.db.execute(
+                    select_sql,
+                    {"last_id": last_id, "limit": self.BATCH_ITEM_CHUNK_SIZE}
+                )
+                # Column names (excluding id)
+                columns = [col for col in result.keys() if col != "id"]
+                rows = result.fetchall()
+                if not rows:
+                    break
+
+                created_at = datetime.utcnow().isoformat()
+                values = []
+                for row in rows:
+                    mapping = row._mapping
+                    # Build input_params from row data
+                    input_params = {}
+                    for col in columns:
+                        value = mapping.get(col)
+                        input_params[col] = str(value) if value is not None else ""
+
+                    input_params_json = json.dumps(input_params, ensure_ascii=False)
+                    raw_prompt = render(input_params)
+                    for job_id, job_existing in existing.items():
+                        if job_existing <= row_index:
+                            values.append({
+                                "job_id": job_id,
+                                "created_at": created_at,
+                                "input_params": input_params_json,
+                                "raw_prompt": raw_prompt,
+                                "status": "pending"
+                            })
+                    row_index += 1
+                last_id = rows[-1]._mapping["id"]
+
+                if values:
+                    self.db.execute(insert_stmt.values(values))
+                    if before_commit is not None and not before_commit():
+                        self.db.rollback()
+                        logger.warning(f"[JOB-CREATE] Jobs {job_ids}: item creation taken over by another process")
+                        return created
+                    self.db.commit()
+                    created += len(values)
+
+                if len(rows) < self.BATCH_ITEM_CHUNK_SIZE:
+                    break
+
+                # Stop filling jobs that were cancelled while items were being created
+                cancelled_ids = {
+                    row[0] for row in self.db.execute(
+                        text("SELECT id FROM jobs WHERE id IN :ids AND status = 'cancelled'")
+                        .bindparams(bindparam("ids", expanding=True)),
+                        {"ids": list(existing)}
+                    ).fetchall()
+                }
+                for job_id in cancelled_ids:
+                    logger.info(f"[JOB-CREATE] Job {job_id} cancelled after {row_index} rows")
+                    del existing[job_id]
+                if not existing:
+                    break
+        except Exception as e:
+            # Leave no half-created job behind looking runnable
+            self.db.rollback()
+            logger.error(f"[JOB-CREATE] Jobs {job_ids}: item creation failed after {created} items: {e}")
+            self.db.execute(
+                text("UPDATE jobs SET status = 'error' WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": job_ids}
+            )
+            self.db.commit()
+            raise
+
+        logger.info(f"[JOB-CREATE] Jobs {job_ids}: created {created} items")
+        return created
 
     def get_job_progress(self, job_id: int) -> Dict[str, any]:
         """Get execution progress for a job.
@@ -1291,18 +2659,24 @@ class JobManager:
         Specification: docs/req.txt section 3.3 (バッチ実行通信フロー step 6)
         Phase 2
         """
-        job = self.db.query(Job).filter(Job.id == job_id).first()
+        # The merged CSV can be large and is not part of progress
+        job = self.db.query(Job).options(defer(Job.merged_csv_output)).filter(Job.id == job_id).first()
         if not job:
             raise ValueError(f"Job {job_id} not found")
 
-        # Count items by status
-        all_items = self.db.query(JobItem).filter(JobItem.job_id == job_id).all()
-        total = len(all_items)
-        completed = sum(1 for item in all_items if item.status == "done")
-        errors = sum(1 for item in all_items if item.status == "error")
-        pending = sum(1 for item in all_items if item.status == "pending")
-        running = sum(1 for item in all_items if item.status == "running")
-        cancelled = sum(1 for item in all_items if item.status == "cancelled")
+        # Count items by status in the database (covered by idx_job_item_job_status)
+        counts = dict(
+            self.db.query(JobItem.status, func.count(JobItem.id))
+            .filter(JobItem.job_id == job_id)
+            .group_by(JobItem.status)
+            .all()
+        )
+        total = sum(counts.values())
+        completed = counts.get("done", 0)
+        errors = counts.get("error", 0)
+        pending = counts.get("pending", 0)
+        running = counts.get("running", 0)
+        cancelled = counts.get("cancelled", 0)
 
         return {
             "job_id": job.id,
@@ -1317,7 +2691,54 @@ class JobManager:
             "progress_percent": int((completed + errors + cancelled) / total * 100) if total > 0 else 0,
             "started_at": job.started_at,
             "finished_at": job.finished_at,
-            "turnaround_ms": job.turnaround_ms
+            "turnaround_ms": job.turnaround_ms,
+            "dedup_saved_calls": job.dedup_saved_calls or 0,
+            "hedged_calls": job.hedged_calls or 0,
+            "hedge_wins": job.hedge_wins or 0,
+            "hedge_rate": round((job.hedged_calls or 0) / (total - (job.dedup_saved_calls or 0)), 4)
+            if total > (job.dedup_saved_calls or 0) else 0.0,
+            "hedge_saved_ms": job.hedge_saved_ms or 0,
+            "comparison_group": job.comparison_group
+        }
+
+    def get_comparison_progress(self, comparison_group: str) -> Dict[str, any]:
+        """Get execution progress of the per-model jobs of a comparison group.
+
+        Args:
+            comparison_group: Group ID (see create_comparison_jobs)
+
+        Returns:
+            Dictionary with the group status, wall-clock turnaround and the
+            progress of each job (including its model_name)
+        """
+        jobs = self.db.query(Job.id, Job.model_name).filter(
+            Job.comparison_group == comparison_group
+        ).order_by(Job.id).all()
+        if not jobs:
+            raise ValueError(f"Comparison group {comparison_group} not found")
+
+        job_progress = []
+        for job_id, model_name in jobs:
+            progress = self.get_job_progress(job_id)
+            progress["model_name"] = model_name
+            job_progress.append(progress)
+
+        active = [p for p in job_progress if p["status"] in ("pending", "running")]
+        started = [p["started_at"] for p in job_progress if p["started_at"]]
+        finished = [p["finished_at"] for p in job_progress if p["finished_at"]]
+        turnaround_ms = None
+        if not active and started and finished:
+            # The models run concurrently: the group takes as long as its slowest job
+            elapsed = datetime.fromisoformat(max(finished)) - datetime.fromisoformat(min(started))
+            turnaround_ms = int(elapsed.total_seconds() * 1000)
+
+        return {
+            "comparison_group": comparison_group,
+            "status": "running" if active else "done",
+            "model_names": [p["model_name"] for p in job_progress],
+            "turnaround_ms": turnaround_ms,
+            "sum_job_turnaround_ms": sum(p["turnaround_ms"] or 0 for p in job_progress),
+            "jobs": job_progress
         }
 
     def cancel_pending_items(self, job_id: int) -> Dict[str, any]:
@@ -1373,6 +2794,7 @@ class JobManager:
             job.finished_at = datetime.utcnow().isoformat()
 
         self.db.commit()
+        get_job_progress_tracker().notify(job_id)
 
         return {
             "job_id": job_id,
@@ -0,0 +1,254 @@
+"""Write-behind buffer for job item state transitions.
+
+Serial and thread-pool execution used to commit every item twice ("running",
+then "done"/"error"). On SQLite each commit is an fsync, so large batches were
+bound by the database rather than the LLM. JobItemWriteBuffer coalesces those
+transitions and flushes them as executemany UPDATEs in a single transaction
+when a size threshold is reached, every max_delay seconds from a background
+flusher thread, and always on close().
+
+Flushes of SQLite file databases run on the database writer thread
+(backend/database/writer.py), so buffers of concurrent jobs no longer
+compete for the write lock.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import bindparam, or_, text
+from sqlalchemy.orm import Session
+
+from .database.models import JobItem
+from .database.writer import run_write
+from .job_progress import get_job_progress_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class JobItemWriteBuffer:
+    """Coalesces job item status updates and writes them in bulk.
+
+    Buffered writes only apply to items that are still pending/running in the
+    database. If cancel_pending_items() cancels an item whose "running" mark has
+    not been flushed yet, the cancel wins and the late result is dropped.
+
+    The job's own status is re-read on every flush and exposed as
+    job_cancelled, replacing the per-item refresh the executors used to do.
+    Executors check stopped, which is also set once the job's queue lease
+    is lost (stop_event).
+
+    Thread-safe: all database access happens under an internal lock, so one
+    buffer (and its session) can be shared by a ThreadPoolExecutor. Because
+    the flusher thread uses the session too, callers must not touch it (or
+    lazy-load ORM attributes through it) until close() returns.
+
+    Usage:
+        with JobItemWriteBuffer(db, job_id) as buffer:
+            buffer.mark_running(item_id)
+            buffer.record_result(item_id, status="done", raw_response="...")
+    """
+
+    DEFAULT_MAX_ITEMS = 100
+    DEFAULT_MAX_DELAY = 1.0  # seconds
+
+    def __init__(
+        self,
+        db: Session,
+        job_id: int,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        stop_event: Optional[threading.Event] = None
+    ):
+        """Initialize write buffer.
+
+        Args:
+            db: SQLAlchemy session used for flushes (owned by the buffer, closed on close())
+            job_id: Job whose items are buffered
+            max_items: Flush once this many item updates are buffered
+            max_delay: Interval of the background flusher thread (seconds)
+            stop_event: Set when execution must stop for another reason than
+                cancellation (the job's queue lease was lost)
+        """
+        self.db = db
+        self.job_id = job_id
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.job_cancelled = False
+        self._stop_event = stop_event
+
+        self._lock = threading.Lock()
+        self._running: Set[int] = set()
+        self._results: Dict[int, dict] = {}
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name=f"job_buffer_{job_id}",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def __enter__(self) -> "JobItemWriteBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def stopped(self) -> bool:
+        """Whether executors should stop dispatching items (job cancelled or lease lost)."""
+        return self.job_cancelled or (self._stop_event is not None and self._stop_event.is_set())
+
+    def mark_running(self, item_id: int):
+        """Buffer the pending -> running transition of an item.
+
+        Supersedes a buffered re-queue (status "pending") of a retried item.
+        """
+        with self._lock:
+            self._results.pop(item_id, None)
+            self._running.add(item_id)
+            self._maybe_flush()
+
+    def claim(self, item_ids: List[int]) -> List[int]:
+        """Mark a batch of pending items running right away, along with a flush.
+
+        Used by the async pipeline, which must not dispatch items that were
+        cancelled meanwhile (mark_running() would only find out on a later flush).
+
+        Returns:
+            IDs of the items that were still pending (now running), in the given order
+        """
+        with self._lock:
+            claimed = self._flush(item_ids)
+        return [item_id for item_id in item_ids if item_id in claimed]
+
+    def record_result(self, item_id: int, **values):
+        """Buffer the final column values of an item.
+
+        Args:
+            item_id: JobItem ID
+            **values: Column values, must include status ("done"/"error",
+                or "pending" for an item re-queued for a retry)
+        """
+        with self._lock:
+            self._running.discard(item_id)
+            self._results[item_id] = values
+            self._maybe_flush()
+
+    def flush(self):
+        """Write all buffered updates now."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Stop the flusher, write remaining updates and close the session.
+
+        Called on job completion and cancellation; raises if the final flush fails.
+        """
+        self._closed.set()
+        if self._flusher.is_alive() and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        try:
+            self.flush()
+        finally:
+            self.db.close()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.max_delay):
+            with self._lock:
+                if self._running or self._results:
+                    self._try_flush()
+
+    def _maybe_flush(self):
+        if len(self._running) + len(self._results) >= self.max_items:
+            self._try_flush()
+
+    def _try_flush(self):
+        try:
+            self._flush()
+        except Exception as e:
+            # Updates were re-queued; the next flush (or close()) retries them
+            logger.error(f"[JOB-BUFFER] Flush failed for job {self.job_id}: {e}")
+
+    def _flush(self, claim_ids: Optional[List[int]] = None) -> Set[int]:
+        running_ids = list(self._running)
+        results = self._results
+        self._running = set()
+        self._results = {}
+
+        try:
+            status_row, claimed = run_write(
+                self.db, lambda session: self._write(session, running_ids, results, claim_ids)
+            )
+        except Exception:
+            # Re-queue; results recorded since take precedence
+            self._running.update(i for i in running_ids if i not in self._results)
+            for item_id, values in results.items():
+                self._results.setdefault(item_id, values)
+            raise
+
+        self.job_cancelled = bool(status_row and status_row[0] == "cancelled")
+        if running_ids or results or claimed:
+            get_job_progress_tracker().notify(self.job_id)
+            logger.debug(
+                f"[JOB-BUFFER] Job {self.job_id}: flushed {len(running_ids)} running, "
+                f"{len(results)} results"
+            )
+        return claimed
+
+    def _write(
+        self,
+        session: Session,
+        running_ids: list,
+        results: Dict[int, dict],
+        claim_ids: Optional[List[int]] = None
+    ):
+        """Execute the buffered updates (committed by the caller).
+
+        Returns:
+            (row with the job's current status, IDs of the claimed items)
+        """
+        if running_ids:
+            session.execute(
+                text(
+                    "UPDATE job_items SET status = 'running' "
+                    "WHERE id IN :ids AND status = 'pending'"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"ids": running_ids}
+            )
+
+        # executemany needs identical parameter keys, so group by column set
+        groups: Dict[tuple, list] = {}
+        for item_id, values in results.items():
+            columns = tuple(sorted(values))
+            row = {f"v_{column}": value for column, value in values.items()}
+            row["_item_id"] = item_id
+            groups.setdefault(columns, []).append(row)
+
+        table = JobItem.__table__
+        for columns, rows in groups.items():
+            stmt = (
+                table.update()
+                .where(table.c.id == bindparam("_item_id"))
+                .where(or_(table.c.status == "pending", table.c.status == "running"))
+                .values({column: bindparam(f"v_{column}") for column in columns})
+            )
+            session.execute(stmt, rows)
+
+        claimed = set()
+        if claim_ids:
+            result = session.execute(
+                text(
+                    "UPDATE job_items SET status = 'running' "
+                    "WHERE id IN :ids AND status = 'pending' RETURNING id"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"ids": claim_ids}
+            )
+            claimed = {row[0] for row in result}
+
+        status_row = session.execute(
+            text("SELECT status FROM jobs WHERE id = :job_id"),
+            {"job_id": self.job_id}
+        ).fetchone()
+        return status_row, claimed
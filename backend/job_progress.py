@@ -0,0 +1,130 @@
+"""Change notifications for job progress.
+
+Progress itself is read from the database with one GROUP BY query
+(JobManager.get_job_progress). Code that commits job or job item state calls
+notify() afterwards, which bumps a per-job version number. Progress streams
+compare the version between ticks and only re-query when it changed, so an
+idle stream costs a dictionary lookup instead of a database round trip.
+
+Versions are process-local: streams still re-query at a slow interval to pick
+up changes committed by other processes. With standalone workers
+(JOB_RUNNER=worker) jobs never run in the web process, so its tracker sees
+no changes at all; progress streams then poll the database at a short
+interval instead, and partial item text is not available.
+
+Streamed LLM calls also publish the partial response text of running items
+here (in memory only, never committed). It has its own version counter, so
+text deltas do not trigger progress queries.
+
+A job's entries are dropped once it is finished (notify(finished=True)) and
+no progress stream is subscribed to it any more.
+"""
+
+import threading
+from typing import Dict, List, Set, Tuple
+
+
+class JobProgressTracker:
+    """Thread-safe per-job version counters and partial item texts."""
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._partials: Dict[int, Dict[int, List[str]]] = {}  # job_id -> item_id -> text deltas
+        self._partial_versions: Dict[int, int] = {}
+        self._subscribers: Dict[int, int] = {}  # job_id -> open progress streams
+        self._finished: Set[int] = set()  # Finished jobs kept for their subscribers
+        self._lock = threading.Lock()
+
+    def notify(self, job_id: int, finished: bool = False):
+        """Record that the job or its items changed (call after committing).
+
+        Args:
+            job_id: Job ID
+            finished: The job reached a final status; its entries are dropped
+                once no stream is subscribed to it
+        """
+        with self._lock:
+            self._versions[job_id] = self._versions.get(job_id, 0) + 1
+            if not finished:
+                self._finished.discard(job_id)
+            elif self._subscribers.get(job_id):
+                self._finished.add(job_id)
+            else:
+                self._drop(job_id)
+
+    def subscribe(self, job_id: int):
+        """Register a progress stream of a job (keeps its entries while open)."""
+        with self._lock:
+            self._subscribers[job_id] = self._subscribers.get(job_id, 0) + 1
+
+    def unsubscribe(self, job_id: int):
+        """Unregister a progress stream; drops the job's entries if it was the last of a finished job."""
+        with self._lock:
+            remaining = self._subscribers.get(job_id, 0) - 1
+            if remaining > 0:
+                self._subscribers[job_id] = remaining
+                return
+            self._subscribers.pop(job_id, None)
+            if job_id in self._finished:
+                self._drop(job_id)
+
+    def _drop(self, job_id: int):
+        self._versions.pop(job_id, None)
+        self._partials.pop(job_id, None)
+        self._partial_versions.pop(job_id, None)
+        self._finished.discard(job_id)
+
+    def tracked_jobs(self) -> int:
+        """Get the number of jobs with entries (for monitoring and tests)."""
+        with self._lock:
+            return len(set(self._versions) | set(self._partials) | set(self._partial_versions))
+
+    def version(self, job_id: int) -> int:
+        """Get the current version of a job (0 if it never changed in this process)."""
+        with self._lock:
+            return self._versions.get(job_id, 0)
+
+    def add_partial_text(self, job_id: int, item_id: int, text: str):
+        """Append a streamed text delta of a running item."""
+        with self._lock:
+            self._partials.setdefault(job_id, {}).setdefault(item_id, []).append(text)
+            self._partial_versions[job_id] = self._partial_versions.get(job_id, 0) + 1
+
+    def clear_partial_text(self, job_id: int, item_id: int):
+        """Drop the partial text of an item (its result was recorded)."""
+        with self._lock:
+            items = self._partials.get(job_id)
+            if items and items.pop(item_id, None) is not None:
+                if not items:
+                    del self._partials[job_id]
+                self._partial_versions[job_id] = self._partial_versions.get(job_id, 0) + 1
+
+    def partial_texts(self, job_id: int) -> Tuple[int, Dict[int, str]]:
+        """Get (partial version, {item_id: text so far}) of a job's streaming items."""
+        with self._lock:
+            items = self._partials.get(job_id, {})
+            return (
+                self._partial_versions.get(job_id, 0),
+                {item_id: "".join(parts) for item_id, parts in items.items()}
+            )
+
+
+# Singleton instance
+_job_progress_tracker = None
+_job_progress_tracker_lock = threading.Lock()
+
+
+def get_job_progress_tracker() -> JobProgressTracker:
+    """Get the process-wide job progress tracker."""
+    global _job_progress_tracker
+    if _job_progress_tracker is None:
+        with _job_progress_tracker_lock:
+            if _job_progress_tracker is None:
+                _job_progress_tracker = JobProgressTracker()
+    return _job_progress_tracker
+
+
+def reset_job_progress_tracker():
+    """Reset the job progress tracker singleton (for testing)."""
+    global _job_progress_tracker
+    _job_progress_tracker = None
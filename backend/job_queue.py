@@ -0,0 +1,493 @@
+"""Durable job queue.
+
+The scheduler's lanes live in memory. A restart used to lose every job that
+had not started, and startup marked running jobs as failed even when most of
+their items were already done. Every job submitted through enqueue_job() now
+also gets a job_queue row, which is deleted when the job finishes:
+
+- Executing a job takes a lease on its row (owner + expiry). A heartbeat
+  thread renews the lease while the job runs.
+- On startup, recover_queued_jobs() submits the remaining rows to the
+  scheduler again. Leases of dead processes on this host are released right
+  away. A lease that is still live makes the runner wait until it expires or
+  the row disappears.
+- Taking a lease resets the job's stale "running" items to "pending". Items
+  that already finished are kept, so the job continues where it stopped.
+- A process whose lease was taken over (e.g. after a long pause) is fenced
+  off: the heartbeat sets JobLease.lost, which stops the item executors, and
+  the job's final status is only written while the lease is still ours.
+
+With JOB_RUNNER=worker the web process only adds rows; standalone workers
+(python -m backend.worker, see backend/worker.py) take them with
+claim_next(), on one or more machines sharing the database.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.orm import Session, aliased
+
+from .database.dialect import lock_transaction
+from .database.models import Job, JobQueueEntry
+from .job_progress import get_job_progress_tracker
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 60
+HEARTBEAT_SECONDS = 15
+
+JOB_RUNNER_LOCAL = "local"  # Jobs run on the web process's scheduler (default)
+JOB_RUNNER_WORKER = "worker"  # Jobs run on standalone worker processes
+
+
+def external_workers_enabled() -> bool:
+    """Check whether queued jobs are left to standalone workers (JOB_RUNNER=worker)."""
+    return os.getenv("JOB_RUNNER", JOB_RUNNER_LOCAL).strip().lower() == JOB_RUNNER_WORKER
+
+
+def _timestamp(dt: datetime) -> str:
+    """Format a lease timestamp (fixed width, so strings compare chronologically)."""
+    return dt.isoformat(timespec="microseconds")
+
+
+def _owner_is_dead(owner: Optional[str]) -> bool:
+    """Check whether a lease owner is a process on this host that no longer exists."""
+    if not owner:
+        return False
+    try:
+        host, pid, _ = owner.rsplit(":", 2)
+        pid = int(pid)
+    except ValueError:
+        return False
+    if host != socket.gethostname() or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobLease:
+    """The lease a running job is executed under, for fencing its writes."""
+
+    def __init__(self, job_id: int, owner: str):
+        self.job_id = job_id
+        self.owner = owner
+        # Set by the heartbeat once another owner took the job
+        self.lost = threading.Event()
+
+    def hold(self, db: Session) -> bool:
+        """Check that the lease is still ours, within the caller's transaction.
+
+        Touches the row (UPDATE ... WHERE lease_owner = us), so a takeover
+        cannot commit in between until the caller commits its final writes.
+
+        Returns:
+            False if the lease was lost (the caller should roll back)
+        """
+        if self.lost.is_set():
+            return False
+        result = db.execute(
+            update(JobQueueEntry)
+            .where(JobQueueEntry.job_id == self.job_id, JobQueueEntry.lease_owner == self.owner)
+            .values(heartbeat_at=_timestamp(datetime.utcnow()))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            self.lost.set()
+            return False
+        return True
+
+
+class JobQueueStore:
+    """Persists queued jobs and their execution leases."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        owner: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS
+    ):
+        """Initialize store.
+
+        Args:
+            session_factory: Creates a database session per operation
+            owner: Lease owner ID (defaults to "host:pid:token")
+            lease_seconds: Lease duration
+            heartbeat_seconds: Lease renewal interval while a job runs
+        """
+        self._session_factory = session_factory
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+
+    def add(self, job_config: dict, lane: str, priority: int, project_id: Optional[int] = None):
+        """Record a submitted job (replaces an earlier row of the same job)."""
+        db = self._session_factory()
+        try:
+            db.query(JobQueueEntry).filter(JobQueueEntry.job_id == job_config["job_id"]).delete()
+            db.add(JobQueueEntry(
+                job_id=job_config["job_id"],
+                lane=lane,
+                priority=priority,
+                project_id=project_id,
+                job_config=json.dumps(job_config)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def remove(self, job_id: int):
+        """Delete the row of a finished job."""
+        db = self._session_factory()
+        try:
+            db.query(JobQueueEntry).filter(JobQueueEntry.job_id == job_id).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def _lease_values(self, now: datetime) -> dict:
+        return {
+            "lease_owner": self.owner,
+            "lease_expires_at": _timestamp(now + timedelta(seconds=self.lease_seconds)),
+            "heartbeat_at": _timestamp(now),
+            "attempts": JobQueueEntry.attempts + 1
+        }
+
+    def acquire(self, job_id: int) -> Optional[bool]:
+        """Take the lease of a queued job.
+
+        Returns:
+            True if acquired, False if another owner holds a live lease,
+            None if the job is no longer queued
+        """
+        now = datetime.utcnow()
+        db = self._session_factory()
+        try:
+            result = db.execute(
+                update(JobQueueEntry)
+                .where(
+                    JobQueueEntry.job_id == job_id,
+                    or_(
+                        JobQueueEntry.lease_expires_at.is_(None),
+                        JobQueueEntry.lease_expires_at < _timestamp(now),
+                        JobQueueEntry.lease_owner == self.owner
+                    )
+                )
+                .values(**self._lease_values(now))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            if result.rowcount:
+                return True
+            exists = db.query(JobQueueEntry.id).filter(JobQueueEntry.job_id == job_id).first()
+            return False if exists else None
+        finally:
+            db.close()
+
+    def claim_next(
+        self,
+        lanes: Optional[List[str]] = None,
+        limits: Optional[Callable[[JobQueueEntry], Tuple[int, int]]] = None
+    ) -> Optional[dict]:
+        """Take the lease of the next unleased job (lowest priority value, then oldest).
+
+        Several processes may claim concurrently: the lease is taken with a
+        conditional UPDATE, and a row another process took first is skipped.
+        The limits are checked by the same UPDATE (live lease counts in
+        subqueries), so racing workers cannot exceed them.
+
+        Args:
+            lanes: Only claim jobs of these lanes (None: any lane)
+            limits: Called with a candidate; returns the (lane, total) numbers of
+                live leases below which it may be claimed (None: no limits)
+
+        Returns:
+            The claimed job config, or None if nothing can be claimed
+        """
+        now = datetime.utcnow()
+        db = self._session_factory()
+        try:
+            unleased = or_(
+                JobQueueEntry.lease_expires_at.is_(None),
+                JobQueueEntry.lease_expires_at < _timestamp(now)
+            )
+            query = db.query(JobQueueEntry).filter(unleased)
+            if lanes:
+                query = query.filter(JobQueueEntry.lane.in_(lanes))
+            candidates = query.order_by(JobQueueEntry.priority, JobQueueEntry.id).all()
+            db.commit()
+
+            leased = aliased(JobQueueEntry)
+            live = leased.lease_expires_at >= _timestamp(now)
+            for entry in candidates:
+                conditions = [JobQueueEntry.id == entry.id, unleased]
+                if limits is not None:
+                    lane_limit, total_limit = limits(entry)
+                    conditions.append(
+                        select(func.count(leased.id)).where(live, leased.lane == entry.lane)
+                        .scalar_subquery() < lane_limit
+                    )
+                    conditions.append(select(func.count(leased.id)).where(live).scalar_subquery() < total_limit)
+                    # Counts and claim must not interleave with another claim
+                    lock_transaction(db, "job_queue_claim")
+                result = db.execute(
+                    update(JobQueueEntry)
+                    .where(*conditions)
+                    .values(**self._lease_values(now))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if result.rowcount:
+                    return json.loads(entry.job_config)
+            return None
+        finally:
+            db.close()
+
+    def release(self, job_id: int):
+        """Give up our lease of a job without removing it (another worker may take it)."""
+        db = self._session_factory()
+        try:
+            db.execute(
+                update(JobQueueEntry)
+                .where(JobQueueEntry.job_id == job_id, JobQueueEntry.lease_owner == self.owner)
+                .values(lease_owner=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def renew(self, job_id: int) -> bool:
+        """Extend our lease of a job (heartbeat). Returns False if the lease was lost."""
+        now = datetime.utcnow()
+        db = self._session_factory()
+        try:
+            result = db.execute(
+                update(JobQueueEntry)
+                .where(JobQueueEntry.job_id == job_id, JobQueueEntry.lease_owner == self.owner)
+                .values(
+                    lease_expires_at=_timestamp(now + timedelta(seconds=self.lease_seconds)),
+                    heartbeat_at=_timestamp(now)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    def wait_for_lease(self, job_id: int, poll_seconds: Optional[float] = None) -> bool:
+        """Acquire the lease of a job, waiting while another owner holds it.
+
+        Returns:
+            True once acquired, False if the job left the queue meanwhile
+        """
+        poll_seconds = poll_seconds or self.heartbeat_seconds
+        while True:
+            acquired = self.acquire(job_id)
+            if acquired is None:
+                return False
+            if acquired:
+                return True
+            logger.info(f"[JOB-QUEUE] Job {job_id} is leased by another process, waiting")
+            time.sleep(poll_seconds)
+
+    @contextmanager
+    def heartbeat(self, job_id: int):
+        """Renew the lease of a job in a background thread while the block runs.
+
+        Yields:
+            JobLease of the job; its lost event is set once the lease was taken over
+        """
+        stop = threading.Event()
+        lease = JobLease(job_id, self.owner)
+
+        def beat():
+            while not stop.wait(self.heartbeat_seconds):
+                try:
+                    if not self.renew(job_id):
+                        logger.warning(f"[JOB-QUEUE] Lost lease of job {job_id}, stopping its execution")
+                        lease.lost.set()
+                        return
+                except Exception as e:
+                    logger.error(f"[JOB-QUEUE] Heartbeat failed for job {job_id}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"job_heartbeat_{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield lease
+        finally:
+            stop.set()
+            thread.join()
+
+    def reset_stale_items(self, job_id: int) -> int:
+        """Set items left "running" by an interrupted execution back to "pending".
+
+        Only call while holding the job's lease.
+
+        Returns:
+            Number of items reset
+        """
+        db = self._session_factory()
+        try:
+            result = db.execute(
+                text("UPDATE job_items SET status = 'pending' WHERE job_id = :job_id AND status = 'running'"),
+                {"job_id": job_id}
+            )
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    def fail_job(self, job_id: int, error_message: str) -> bool:
+        """Mark a job whose execution raised as "error", along with its unfinished items.
+
+        Jobs that already reached a final status are left as they are.
+
+        Returns:
+            False if the database could not be updated (the job should stay queued)
+        """
+        db = self._session_factory()
+        try:
+            db.execute(
+                text(
+                    "UPDATE job_items SET status = 'error', error_message = :error_message "
+                    "WHERE job_id = :job_id AND status IN ('pending', 'running')"
+                ),
+                {"job_id": job_id, "error_message": error_message}
+            )
+            db.execute(
+                text(
+                    "UPDATE jobs SET status = 'error', finished_at = :finished_at "
+                    "WHERE id = :job_id AND status IN ('pending', 'running')"
+                ),
+                {"job_id": job_id, "finished_at": datetime.utcnow().isoformat()}
+            )
+            db.commit()
+            get_job_progress_tracker().notify(job_id, finished=True)
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[JOB-QUEUE] Could not mark job {job_id} as failed: {e}")
+            return False
+        finally:
+            db.close()
+
+    def prune(self) -> List[JobQueueEntry]:
+        """Clean up rows left by previous processes.
+
+        Rows of jobs that are gone or already finished are deleted, and
+        leases of dead processes on this host are released.
+
+        Returns:
+            Remaining entries in submission order (detached from the session)
+        """
+        db = self._session_factory()
+        try:
+            entries = db.query(JobQueueEntry).order_by(JobQueueEntry.id).all()
+            job_statuses = dict(
+                db.query(Job.id, Job.status).filter(Job.id.in_([entry.job_id for entry in entries])).all()
+            ) if entries else {}
+
+            remaining_ids = []
+            for entry in entries:
+                status = job_statuses.get(entry.job_id)
+                if status is None or status in ("done", "error", "cancelled"):
+                    db.delete(entry)
+                    continue
+                if _owner_is_dead(entry.lease_owner):
+                    entry.lease_owner = None
+                    entry.lease_expires_at = None
+                remaining_ids.append(entry.id)
+            db.commit()
+            # Reload rather than refresh: jobs finishing meanwhile may have removed their rows
+            remaining = db.query(JobQueueEntry).filter(
+                JobQueueEntry.id.in_(remaining_ids)
+            ).order_by(JobQueueEntry.id).all() if remaining_ids else []
+            db.expunge_all()
+            return remaining
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Get queued/leased row counts and the owners of live leases."""
+        now = _timestamp(datetime.utcnow())
+        db = self._session_factory()
+        try:
+            rows = db.query(JobQueueEntry.lease_owner, JobQueueEntry.lease_expires_at).all()
+        finally:
+            db.close()
+        leased = [owner for owner, expires_at in rows if expires_at is not None and expires_at >= now]
+        return {
+            "queued": len(rows) - len(leased),
+            "leased": len(leased),
+            "owners": sorted(set(leased))
+        }
+
+    def entries(self) -> List[JobQueueEntry]:
+        """Get all queued jobs in submission order (detached from the session)."""
+        db = self._session_factory()
+        try:
+            entries = db.query(JobQueueEntry).order_by(JobQueueEntry.id).all()
+            db.expunge_all()
+            return entries
+        finally:
+            db.close()
+
+
+def recover_queued_jobs(store: JobQueueStore, scheduler) -> List[int]:
+    """Submit jobs left in the queue by a previous process to the scheduler.
+
+    Rows of jobs that are gone or already finished are deleted.
+
+    Args:
+        store: Durable queue
+        scheduler: JobScheduler to submit the jobs to
+
+    Returns:
+        IDs of the resubmitted jobs
+    """
+    resubmit = [
+        (entry.job_id, json.loads(entry.job_config), entry.lane, entry.priority, entry.project_id)
+        for entry in store.prune()
+    ]
+    for job_id, job_config, lane, priority, project_id in resubmit:
+        scheduler.submit(job_config, lane=lane, priority=priority, project_id=project_id)
+        logger.info(f"[JOB-QUEUE] Job {job_id} resubmitted to lane '{lane}'")
+    return [job_id for job_id, *_ in resubmit]
+
+
+# Singleton instance
+_job_queue_store = None
+_job_queue_store_lock = threading.Lock()
+
+
+def get_job_queue_store() -> JobQueueStore:
+    """Get the process-wide durable job queue."""
+    global _job_queue_store
+    if _job_queue_store is None:
+        with _job_queue_store_lock:
+            if _job_queue_store is None:
+                from .database import SessionLocal
+                _job_queue_store = JobQueueStore(SessionLocal)
+    return _job_queue_store
+
+
+def reset_job_queue_store():
+    """Reset the durable job queue singleton (for testing)."""
+    global _job_queue_store
+    _job_queue_store = None
@@ -0,0 +1,400 @@
+"""Multi-lane job scheduler.
+
+Queued jobs used to run one at a time on a single worker thread, so a long
+batch on a slow model blocked every job behind it, including one-off
+interactive runs on a different model. JobScheduler keeps one lane per model:
+
+- Lanes run independently, each with its own concurrency (default 1 job,
+  overridable per model).
+- Lower priority values run first. Interactive jobs (PRIORITY_INTERACTIVE,
+  used for single runs) may additionally take one reserved slot per lane and
+  one beyond max_running, so they never wait for a running batch.
+- Within a priority, the project with the fewest running jobs in the lane
+  goes first, then the one served least recently (round robin across
+  projects); jobs of one project run in submission order.
+- max_running caps the number of jobs running across all lanes.
+
+Each admitted job runs on its own daemon thread, so there is no long-lived
+worker to keep alive between jobs.
+
+Usage:
+    scheduler = get_job_scheduler()
+    scheduler.submit({"job_id": 1, ...}, lane="gpt-4.1", priority=PRIORITY_BATCH, project_id=3)
+"""
+
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .settings_cache import get_settings_cache
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 50
+MAX_PRIORITY = 100
+
+DEFAULT_LANE_CONCURRENCY = 1
+MAX_LANE_CONCURRENCY = 64
+DEFAULT_MAX_RUNNING_JOBS = 8
+MAX_RUNNING_JOBS_LIMIT = 256
+INTERACTIVE_RESERVED_SLOTS = 1
+
+
+@dataclass
+class QueuedJob:
+    """A job waiting in (or running from) a lane."""
+    job_config: dict
+    lane: str
+    priority: int
+    project_id: Optional[int]
+    seq: int
+    thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    @property
+    def job_id(self) -> Optional[int]:
+        return self.job_config.get("job_id")
+
+    @property
+    def interactive(self) -> bool:
+        return self.priority <= PRIORITY_INTERACTIVE
+
+
+def run_queued_job(job_config: dict):
+    """Execute a queued job in its own database session (default runner).
+
+    Set populate_items for batch jobs created with defer_items=True; their
+    items are created right before execution.
+
+    The job's durable queue row is leased while it runs (see job_queue) and
+    deleted once execution returns. Items left running by an interrupted
+    execution are set back to pending first, so a resubmitted job only
+    executes what is left.
+    """
+    from .job_queue import get_job_queue_store
+
+    job_id = job_config["job_id"]
+    store = get_job_queue_store()
+    if not store.wait_for_lease(job_id):
+        logger.info(f"[SCHEDULER] Job {job_id} is no longer queued, skipping")
+        return
+    execute_leased_job(store, job_config)
+
+
+def execute_leased_job(store, job_config: dict):
+    """Execute a job whose queue lease the caller holds, then remove its queue row.
+
+    Shared by the in-process scheduler and standalone workers (backend.worker).
+
+    If execution raises (e.g. a database error), the job and its unfinished
+    items are marked "error" before the row is removed. If that fails too,
+    the lease is released and the row kept, so the job runs again once a
+    worker claims it or the server restarts.
+
+    If the lease is lost meanwhile (another worker took the job over),
+    execution stops and the row and job are left to the new owner.
+
+    Args:
+        store: JobQueueStore holding the lease
+        job_config: Queued job config (job_id, model_name, ...)
+    """
+    from .database import SessionLocal
+    from .job import JobManager
+
+    job_id = job_config["job_id"]
+    db = SessionLocal()
+    lease = None
+    try:
+        with store.heartbeat(job_id) as lease:
+            reset = store.reset_stale_items(job_id)
+            if reset:
+                logger.info(f"[SCHEDULER] Job {job_id}: {reset} interrupted items reset to pending")
+            job_manager = JobManager(db, lease=lease)
+            if job_config.get("populate_items"):
+                job_manager.populate_batch_job_items(job_id)
+            job = job_manager.execute_job(
+                job_id=job_id,
+                model_name=job_config["model_name"],
+                include_csv_header=job_config["include_csv_header"],
+                temperature=job_config["temperature"]
+            )
+    except Exception as e:
+        logger.exception(f"[SCHEDULER] Job {job_id} execution failed")
+        if lease is not None and lease.lost.is_set():
+            return
+        if store.fail_job(job_id, f"Job execution failed: {e}"):
+            store.remove(job_id)
+        else:
+            store.release(job_id)
+        return
+    finally:
+        db.close()
+
+    if lease.lost.is_set():
+        logger.warning(f"[SCHEDULER] Job {job_id} stopped: its lease was taken over")
+        return
+    logger.info(f"[SCHEDULER] Job {job_id} completed with status={job.status}")
+    store.remove(job_id)
+
+
+class JobScheduler:
+    """Dispatches queued jobs to per-model lanes."""
+
+    def __init__(
+        self,
+        runner: Callable[[dict], None] = run_queued_job,
+        lane_concurrency: int = DEFAULT_LANE_CONCURRENCY,
+        max_running: int = DEFAULT_MAX_RUNNING_JOBS,
+        lane_overrides: Optional[Dict[str, int]] = None
+    ):
+        """Initialize scheduler.
+
+        Args:
+            runner: Executes one job config (called on a worker thread)
+            lane_concurrency: Jobs running at once per lane
+            max_running: Jobs running at once across all lanes
+            lane_overrides: Per-lane concurrency {lane: jobs}
+        """
+        self._runner = runner
+        self.lane_concurrency = lane_concurrency
+        self.max_running = max_running
+        self.lane_overrides = dict(lane_overrides or {})
+
+        self._queued: Dict[str, List[QueuedJob]] = {}
+        self._running: Dict[str, List[QueuedJob]] = {}
+        self._last_served: Dict[tuple, int] = {}  # (lane, project_id) -> dispatch counter
+        self._submit_seq = itertools.count()
+        self._dispatch_seq = itertools.count()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def configure(
+        self,
+        lane_concurrency: Optional[int] = None,
+        max_running: Optional[int] = None,
+        lane_overrides: Optional[Dict[str, int]] = None
+    ):
+        """Change limits; queued jobs start right away if capacity grew."""
+        with self._lock:
+            if lane_concurrency is not None:
+                self.lane_concurrency = max(1, lane_concurrency)
+            if max_running is not None:
+                self.max_running = max(1, max_running)
+            if lane_overrides is not None:
+                self.lane_overrides = {lane: max(1, n) for lane, n in lane_overrides.items()}
+            self._dispatch()
+
+    def submit(
+        self,
+        job_config: dict,
+        lane: str,
+        priority: int = PRIORITY_BATCH,
+        project_id: Optional[int] = None
+    ) -> int:
+        """Queue a job and start it if its lane has a free slot.
+
+        Args:
+            job_config: Passed to the runner (must contain job_id)
+            lane: Lane name (the model the job runs on)
+            priority: Lower runs first; PRIORITY_INTERACTIVE may use reserved slots
+            project_id: Project used for fair sharing within the lane
+
+        Returns:
+            Number of jobs waiting in all lanes after dispatch
+        """
+        job = QueuedJob(
+            job_config=job_config,
+            lane=lane,
+            priority=priority,
+            project_id=project_id,
+            seq=next(self._submit_seq)
+        )
+        with self._lock:
+            self._queued.setdefault(lane, []).append(job)
+            self._dispatch()
+            queued = self._queued_count()
+        logger.info(
+            f"[SCHEDULER] Job {job.job_id} submitted to lane '{lane}' "
+            f"(priority={priority}, project={project_id}, queued={queued})"
+        )
+        return queued
+
+    def queued_count(self) -> int:
+        """Get the number of jobs waiting in all lanes."""
+        with self._lock:
+            return self._queued_count()
+
+    def get_lane_concurrency(self, lane: str) -> int:
+        """Get the regular slot count of a lane."""
+        return self.lane_overrides.get(lane, self.lane_concurrency)
+
+    def stats(self) -> dict:
+        """Get running/queued job IDs per lane."""
+        with self._lock:
+            lanes = {}
+            for lane in sorted(set(self._queued) | set(self._running)):
+                lanes[lane] = {
+                    "concurrency": self.get_lane_concurrency(lane),
+                    "running": [job.job_id for job in self._running.get(lane, [])],
+                    "queued": [job.job_id for job in self._ordered_queue(lane)]
+                }
+            return {
+                "lane_concurrency": self.lane_concurrency,
+                "max_running": self.max_running,
+                "lane_overrides": dict(self.lane_overrides),
+                "running": self._running_count(),
+                "queued": self._queued_count(),
+                "lanes": lanes
+            }
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is queued or running (returns False on timeout)."""
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._running_count() and not self._queued_count(),
+                timeout=timeout
+            )
+
+    def _queued_count(self) -> int:
+        return sum(len(jobs) for jobs in self._queued.values())
+
+    def _running_count(self) -> int:
+        return sum(len(jobs) for jobs in self._running.values())
+
+    def _ordered_queue(self, lane: str) -> List[QueuedJob]:
+        """Queued jobs of a lane in dispatch order (caller holds the lock)."""
+        running_per_project: Dict[Optional[int], int] = {}
+        for job in self._running.get(lane, []):
+            running_per_project[job.project_id] = running_per_project.get(job.project_id, 0) + 1
+        return sorted(
+            self._queued.get(lane, []),
+            key=lambda job: (
+                job.priority,
+                running_per_project.get(job.project_id, 0),
+                self._last_served.get((lane, job.project_id), -1),
+                job.seq
+            )
+        )
+
+    def _admissible(self, job: QueuedJob) -> bool:
+        """Check lane and global capacity for a job (caller holds the lock)."""
+        reserved = INTERACTIVE_RESERVED_SLOTS if job.interactive else 0
+        lane_running = len(self._running.get(job.lane, []))
+        if lane_running >= self.get_lane_concurrency(job.lane) + reserved:
+            return False
+        return self._running_count() < self.max_running + reserved
+
+    def _dispatch(self):
+        """Start queued jobs while capacity allows (caller holds the lock).
+
+        Each round picks the best admissible candidate of every lane, then
+        starts the one with the lowest (priority, submission order).
+        """
+        while True:
+            candidates = []
+            for lane in list(self._queued):
+                for job in self._ordered_queue(lane):
+                    if self._admissible(job):
+                        candidates.append(job)
+                        break
+            if not candidates:
+                return
+            job = min(candidates, key=lambda candidate: (candidate.priority, candidate.seq))
+            self._start(job)
+
+    def _start(self, job: QueuedJob):
+        """Move a job from its queue to running and start its thread (caller holds the lock)."""
+        queue = self._queued[job.lane]
+        queue.remove(job)
+        if not queue:
+            del self._queued[job.lane]
+        self._running.setdefault(job.lane, []).append(job)
+        self._last_served[(job.lane, job.project_id)] = next(self._dispatch_seq)
+
+        job.thread = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"job_{job.job_id}",
+            daemon=True
+        )
+        job.thread.start()
+        logger.info(f"[SCHEDULER] Job {job.job_id} started on lane '{job.lane}'")
+
+    def _run(self, job: QueuedJob):
+        try:
+            self._runner(job.job_config)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Job {job.job_id} failed: {e}")
+        finally:
+            with self._lock:
+                running = self._running.get(job.lane, [])
+                if job in running:
+                    running.remove(job)
+                if not running:
+                    self._running.pop(job.lane, None)
+                    # Forget fair-share history of idle lanes
+                    if job.lane not in self._queued:
+                        self._last_served = {
+                            key: value for key, value in self._last_served.items() if key[0] != job.lane
+                        }
+                self._dispatch()
+                self._idle.notify_all()
+
+
+def load_job_scheduler_settings(db: Session) -> dict:
+    """Read scheduler limits from system settings (clamped, defaults if unset).
+
+    Returns:
+        Dictionary with lane_concurrency, max_running and lane_overrides
+    """
+    values = get_settings_cache().values(db)
+
+    def read_int(key: str, default: int, upper: int) -> int:
+        try:
+            return max(1, min(int(values.get(key) or default), upper))
+        except ValueError:
+            return default
+
+    lane_overrides = {}
+    try:
+        raw_overrides = json.loads(values.get("job_lane_overrides") or "{}")
+    except json.JSONDecodeError:
+        raw_overrides = {}
+    if isinstance(raw_overrides, dict):
+        for lane, concurrency in raw_overrides.items():
+            try:
+                lane_overrides[lane] = max(1, min(int(concurrency), MAX_LANE_CONCURRENCY))
+            except (TypeError, ValueError):
+                continue
+
+    return {
+        "lane_concurrency": read_int("job_lane_concurrency", DEFAULT_LANE_CONCURRENCY, MAX_LANE_CONCURRENCY),
+        "max_running": read_int("job_max_running", DEFAULT_MAX_RUNNING_JOBS, MAX_RUNNING_JOBS_LIMIT),
+        "lane_overrides": lane_overrides
+    }
+
+
+# Singleton instance
+_job_scheduler = None
+_job_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Get the process-wide job scheduler."""
+    global _job_scheduler
+    if _job_scheduler is None:
+        with _job_scheduler_lock:
+            if _job_scheduler is None:
+                _job_scheduler = JobScheduler()
+    return _job_scheduler
+
+
+def reset_job_scheduler():
+    """Reset the job scheduler singleton (for testing)."""
+    global _job_scheduler
+    _job_scheduler = None
@@ -9,7 +9,7 @@ from .azure_gpt_5_nano import AzureGPT5NanoClient
 from .openai_gpt_4_nano import OpenAIGPT4NanoClient
 from .openai_gpt_5_nano import OpenAIGPT5NanoClient
 from .openai_o4_mini import OpenAIO4MiniClient
-from .factory import get_llm_client, get_available_models
+from .factory import get_llm_client, get_retrying_llm_client, get_available_models
 
 __all__ = [
     "LLMClient",
@@ -23,5 +23,6 @@ __all__ = [
     "OpenAIGPT5NanoClient",
     "OpenAIO4MiniClient",
     "get_llm_client",
+    "get_retrying_llm_client",
     "get_available_models",
 ]
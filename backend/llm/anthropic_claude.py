@@ -13,7 +13,9 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
-from .base import LLMClient, LLMResponse, Message, EnvVarConfig
+from .base import LLMClient, LLMResponse, extract_error_details, extract_usage, Message, EnvVarConfig
+from .client_pool import get_sdk_client_registry
+from .prompt_cache import CACHE_PREFIX_KEY, split_cache_prefix
 
 # Load environment variables
 load_dotenv()
@@ -46,13 +48,137 @@ class AnthropicClaudeClient(LLMClient):
         # Import anthropic SDK
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = get_sdk_client_registry().get(self.DISPLAY_NAME, anthropic.Anthropic, api_key=self.api_key)
         except ImportError:
             raise ValueError(
                 "anthropic package not installed. "
                 "Please run: pip install anthropic"
             )
 
+    def _build_request(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        **kwargs
+    ) -> dict:
+        """Build messages.create() arguments.
+
+        Shared by call(), acall() and stream() so all paths send identical requests.
+
+        Returns:
+            Dictionary of keyword arguments for messages.create()
+        """
+        # Get parameters with defaults
+        temperature = kwargs.get("temperature", 0.7)
+        max_tokens = kwargs.get("max_tokens", 4096)
+        top_p = kwargs.get("top_p", 1.0)
+
+        # Normalize input to messages list
+        normalized_messages = self._normalize_messages(prompt, messages, images)
+
+        # Separate system message from other messages (Claude API requirement)
+        system_content = None
+        system_cache_prefix = None
+        api_messages = []
+
+        for msg in normalized_messages:
+            role = msg.get("role", "user")
+            content = msg.get("content", "")
+            msg_images = msg.get("_images")
+            # Static batch prefix ends in this message: add a cache breakpoint after it
+            cache_prefix = msg.get(CACHE_PREFIX_KEY)
+
+            if role == "system":
+                # Claude uses system as a separate parameter
+                if isinstance(content, list):
+                    text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
+                    system_content = "".join(text_parts)
+                else:
+                    system_content = content
+                system_cache_prefix = cache_prefix
+                continue
+
+            if cache_prefix:
+                if isinstance(content, list):
+                    content = "".join(c.get("text", "") for c in content if c.get("type") == "text")
+                cached_blocks = split_cache_prefix(content, cache_prefix)
+            else:
+                cached_blocks = None
+
+            # Handle multimodal content (images) for user messages
+            if msg_images and role == "user":
+                # The cached prefix goes before the images, the rest of the text after them
+                api_content = cached_blocks[:1] if cached_blocks else []
+                # Add images
+                for img_data_uri in msg_images:
+                    if img_data_uri.startswith("data:"):
+                        parts = img_data_uri.split(",", 1)
+                        if len(parts) == 2:
+                            media_info = parts[0]
+                            base64_data = parts[1]
+                            media_type = media_info.replace("data:", "").replace(";base64", "")
+                            logger.debug(f"Claude Vision: Adding image (media_type: {media_type})")
+                            api_content.append({
+                                "type": "image",
+                                "source": {
+                                    "type": "base64",
+                                    "media_type": media_type,
+                                    "data": base64_data
+                                }
+                            })
+                    else:
+                        api_content.append({
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "image/png",
+                                "data": img_data_uri
+                            }
+                        })
+                # Add text content
+                if cached_blocks:
+                    api_content.extend(cached_blocks[1:])
+                elif isinstance(content, str):
+                    api_content.append({"type": "text", "text": content})
+                elif isinstance(content, list):
+                    for c in content:
+                        if c.get("type") == "text":
+                            api_content.append({"type": "text", "text": c.get("text", "")})
+                logger.debug(f"Claude Vision: Sending {len(msg_images)} image(s) with prompt")
+                api_messages.append({"role": role, "content": api_content})
+            elif cached_blocks:
+                api_messages.append({"role": role, "content": cached_blocks})
+            else:
+                # Text-only content
+                if isinstance(content, list):
+                    text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
+                    api_messages.append({"role": role, "content": "".join(text_parts)})
+                else:
+                    api_messages.append({"role": role, "content": content})
+
+        # Build API call parameters
+        api_params = {
+            "model": self.MODEL_NAME,
+            "max_tokens": max_tokens,
+            "messages": api_messages,
+            "temperature": temperature,
+        }
+
+        # Claude 4.5 models don't support both temperature and top_p
+        # Only add top_p for non-4.5 models
+        if "4-5" not in self.MODEL_NAME:
+            api_params["top_p"] = top_p
+
+        # Add system message if present
+        if system_content:
+            if system_cache_prefix:
+                api_params["system"] = split_cache_prefix(system_content, system_cache_prefix)
+            else:
+                api_params["system"] = system_content
+
+        return api_params
+
     def call(
         self,
         prompt: str = None,
@@ -77,94 +203,7 @@ class AnthropicClaudeClient(LLMClient):
         start_time = time.time()
 
         try:
-            # Get parameters with defaults
-            temperature = kwargs.get("temperature", 0.7)
-            max_tokens = kwargs.get("max_tokens", 4096)
-            top_p = kwargs.get("top_p", 1.0)
-
-            # Normalize input to messages list
-            normalized_messages = self._normalize_messages(prompt, messages, images)
-
-            # Separate system message from other messages (Claude API requirement)
-            system_content = None
-            api_messages = []
-
-            for msg in normalized_messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                msg_images = msg.get("_images")
-
-                if role == "system":
-                    # Claude uses system as a separate parameter
-                    if isinstance(content, list):
-                        text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
-                        system_content = "".join(text_parts)
-                    else:
-                        system_content = content
-                    continue
-
-                # Handle multimodal content (images) for user messages
-                if msg_images and role == "user":
-                    api_content = []
-                    # Add images first
-                    for img_data_uri in msg_images:
-                        if img_data_uri.startswith("data:"):
-                            parts = img_data_uri.split(",", 1)
-                            if len(parts) == 2:
-                                media_info = parts[0]
-                                base64_data = parts[1]
-                                media_type = media_info.replace("data:", "").replace(";base64", "")
-                                logger.debug(f"Claude Vision: Adding image (media_type: {media_type})")
-                                api_content.append({
-                                    "type": "image",
-                                    "source": {
-                                        "type": "base64",
-                                        "media_type": media_type,
-                                        "data": base64_data
-                                    }
-                                })
-                        else:
-                            api_content.append({
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": img_data_uri
-                                }
-                            })
-                    # Add text content
-                    if isinstance(content, str):
-                        api_content.append({"type": "text", "text": content})
-                    elif isinstance(content, list):
-                        for c in content:
-                            if c.get("type") == "text":
-                                api_content.append({"type": "text", "text": c.get("text", "")})
-                    logger.debug(f"Claude Vision: Sending {len(msg_images)} image(s) with prompt")
-                    api_messages.append({"role": role, "content": api_content})
-                else:
-                    # Text-only content
-                    if isinstance(content, list):
-                        text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
-                        api_messages.append({"role": role, "content": "".join(text_parts)})
-                    else:
-                        api_messages.append({"role": role, "content": content})
-
-            # Build API call parameters
-            api_params = {
-                "model": self.MODEL_NAME,
-                "max_tokens": max_tokens,
-                "messages": api_messages,
-                "temperature": temperature,
-            }
-
-            # Claude 4.5 models don't support both temperature and top_p
-            # Only add top_p for non-4.5 models
-            if "4-5" not in self.MODEL_NAME:
-                api_params["top_p"] = top_p
-
-            # Add system message if present
-            if system_content:
-                api_params["system"] = system_content
+            api_params = self._build_request(prompt, messages, images, **kwargs)
 
             # Call Claude API
             response = self.client.messages.create(**api_params)
@@ -182,7 +221,92 @@ class AnthropicClaudeClient(LLMClient):
                 success=True,
                 response_text=response_text,
                 error_message=None,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
+            )
+
+        except Exception as e:
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message=str(e),
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
+            )
+
+    def stream(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        on_text=None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute Claude API call with the streaming API.
+
+        Same arguments as call(), plus on_text (called with each text delta).
+        Records time to first token and output throughput.
+        """
+        start_time = time.time()
+
+        try:
+            api_params = self._build_request(prompt, messages, images, **kwargs)
+
+            # Stream Claude API response
+            with self.client.messages.stream(**api_params) as stream:
+                # The final message carries the usage of the whole stream
+                return self._collect_stream(
+                    stream.text_stream, start_time, on_text, final_usage=stream.get_final_message
+                )
+
+        except Exception as e:
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message=str(e),
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
+            )
+
+    async def acall(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute Claude API call with the native async client.
+
+        Same arguments and return value as call(). Used by the asyncio
+        execution mode so in-flight requests do not hold a thread each.
+        """
+        start_time = time.time()
+
+        try:
+            api_params = self._build_request(prompt, messages, images, **kwargs)
+
+            # Call Claude API (non-blocking)
+            response = await self._get_async_client().messages.create(**api_params)
+
+            # Calculate turnaround time
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            # Extract response text
+            response_text = ""
+            for block in response.content:
+                if block.type == "text":
+                    response_text += block.text
+
+            return LLMResponse(
+                success=True,
+                response_text=response_text,
+                error_message=None,
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
             )
 
         except Exception as e:
@@ -192,9 +316,15 @@ class AnthropicClaudeClient(LLMClient):
                 success=False,
                 response_text=None,
                 error_message=str(e),
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
+    def _get_async_client(self):
+        """Get the pooled async SDK client of the running event loop (used by acall())."""
+        import anthropic
+        return get_sdk_client_registry().get_async(self.DISPLAY_NAME, anthropic.AsyncAnthropic, api_key=self.api_key)
+
     def get_default_parameters(self) -> dict:
         """Get default parameters for Claude.
 
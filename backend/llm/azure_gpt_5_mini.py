@@ -12,7 +12,8 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
-from .base import LLMClient, LLMResponse, Message, EnvVarConfig
+from .base import LLMClient, LLMResponse, extract_error_details, extract_usage, Message, EnvVarConfig
+from .client_pool import get_sdk_client_registry
 
 # Load environment variables
 load_dotenv()
@@ -60,7 +61,8 @@ class AzureGPT5MiniClient(LLMClient):
             pool=60.0      # 60 seconds for pool timeout
         )
 
-        self.client = AzureOpenAI(
+        self.client = get_sdk_client_registry().get(
+            self.DISPLAY_NAME, AzureOpenAI,
             azure_endpoint=self.endpoint,
             api_key=self.api_key,
             api_version=self.api_version,
@@ -75,7 +77,7 @@ class AzureGPT5MiniClient(LLMClient):
         images: list = None,
         **kwargs
     ) -> LLMResponse:
-        """Execute Azure OpenAI GPT-5-mini call with retry logic.
+        """Execute Azure OpenAI GPT-5-mini call.
 
         Args:
             prompt: The prompt text to send (simple mode, treated as 'user' role)
@@ -90,186 +92,106 @@ class AzureGPT5MiniClient(LLMClient):
             Temperature, verbosity, and reasoning_effort are not used.
             Reference: Azure OpenAI GPT-5 documentation
 
-            Retry Logic:
-            - Retries up to 4 times on errors or empty responses
-            - Retry delays: 15s → 30s → 60s → 60s (exponential backoff)
-            - Retries on: rate limits, timeouts, empty responses
+            Failed and empty responses are returned as errors. Retries are
+            scheduled by the caller (see backend/llm/retry.py), so a worker
+            never sleeps through a backoff here.
 
         Returns:
             LLMResponse with result or error
 
         Specification: docs/image_parameter_spec.md
         """
-        max_retries = 4
-        retry_delays = [15, 30, 60, 60]  # seconds for each retry attempt
         start_time = time.time()
 
-        for attempt in range(max_retries):
-            attempt_start = time.time()
-
-            try:
-                # Get parameters with defaults
-                # Support both max_output_tokens (GPT-5 style) and max_tokens (legacy)
-                max_tokens = kwargs.get("max_output_tokens", kwargs.get("max_tokens", 8192))
-
-                # Normalize input to messages list
-                normalized_messages = self._normalize_messages(prompt, messages, images)
-
-                # Build API messages format
-                api_messages = []
-
-                # Check if system message exists, if not add default
-                has_system = any(msg.get("role") == "system" for msg in normalized_messages)
-                if not has_system:
-                    api_messages.append({"role": "system", "content": "You are a helpful AI assistant."})
-
-                for msg in normalized_messages:
-                    role = msg.get("role", "user")
-                    content = msg.get("content", "")
-                    msg_images = msg.get("_images")
-
-                    # Handle multimodal content (images)
-                    if msg_images and role == "user":
-                        if isinstance(content, str):
-                            api_content = [{"type": "text", "text": content}]
-                        else:
-                            api_content = content.copy() if isinstance(content, list) else [content]
-
-                        for img_data_uri in msg_images:
-                            api_content.append({
-                                "type": "image_url",
-                                "image_url": {"url": img_data_uri}
-                            })
-                        api_messages.append({"role": role, "content": api_content})
-                    else:
-                        # Text-only content
-                        if isinstance(content, list):
-                            text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
-                            api_messages.append({"role": role, "content": "".join(text_parts)})
-                        else:
-                            api_messages.append({"role": role, "content": content})
-
-                # Call Azure OpenAI GPT-5 API using chat.completions.create()
-                # Reference: Azure OpenAI GPT-5 SDK documentation
-                completion = self.client.chat.completions.create(
-                    model=self.deployment_name,
-                    messages=api_messages,
-                    max_completion_tokens=max_tokens,
-                    stop=None,
-                    stream=False
-                )
+        try:
+            # Get parameters with defaults
+            # Support both max_output_tokens (GPT-5 style) and max_tokens (legacy)
+            max_tokens = kwargs.get("max_output_tokens", kwargs.get("max_tokens", 8192))
 
-                # Calculate turnaround time for this attempt
-                attempt_ms = int((time.time() - attempt_start) * 1000)
-
-                # Extract response text with validation
-                output_text = completion.choices[0].message.content
-
-                # Check for empty response (None)
-                if output_text is None:
-                    if attempt < max_retries - 1:
-                        delay = retry_delays[attempt]
-                        logger.warning(f"GPT-5-mini: API returned None response (attempt {attempt + 1}/{max_retries}, turnaround: {attempt_ms}ms)")
-                        logger.warning(f"   Completion ID: {completion.id if hasattr(completion, 'id') else 'N/A'}")
-                        logger.warning(f"   Retrying in {delay} seconds...")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        # Last attempt failed
-                        total_ms = int((time.time() - start_time) * 1000)
-                        logger.error(f"GPT-5-mini: API returned None response after {max_retries} attempts (total: {total_ms}ms)")
-                        return LLMResponse(
-                            success=False,
-                            response_text=None,
-                            error_message=f"API returned None response after {max_retries} retry attempts. Check Azure OpenAI quota and rate limits.",
-                            turnaround_ms=total_ms
-                        )
-
-                # Check for empty response (whitespace only)
-                if not output_text.strip():
-                    if attempt < max_retries - 1:
-                        delay = retry_delays[attempt]
-                        finish_reason = completion.choices[0].finish_reason if completion.choices else 'N/A'
-                        logger.warning(f"GPT-5-mini: API returned empty response (attempt {attempt + 1}/{max_retries}, turnaround: {attempt_ms}ms)")
-                        logger.warning(f"   Completion ID: {completion.id if hasattr(completion, 'id') else 'N/A'}")
-                        logger.warning(f"   Finish reason: {finish_reason}")
-                        logger.warning(f"   Retrying in {delay} seconds...")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        # Last attempt failed
-                        total_ms = int((time.time() - start_time) * 1000)
-                        finish_reason = completion.choices[0].finish_reason if completion.choices else 'unknown'
-                        logger.error(f"GPT-5-mini: API returned empty response after {max_retries} attempts (total: {total_ms}ms)")
-                        return LLMResponse(
-                            success=False,
-                            response_text=None,
-                            error_message=f"API returned empty response after {max_retries} retry attempts. Finish reason: {finish_reason}. Check rate limits or reduce parallelism.",
-                            turnaround_ms=total_ms
-                        )
-
-                # Success!
-                total_ms = int((time.time() - start_time) * 1000)
-                if attempt > 0:
-                    logger.info(f"GPT-5-mini: Success on attempt {attempt + 1}/{max_retries} (total: {total_ms}ms)")
-
-                return LLMResponse(
-                    success=True,
-                    response_text=output_text,
-                    error_message=None,
-                    turnaround_ms=total_ms
-                )
+            # Normalize input to messages list
+            normalized_messages = self._normalize_messages(prompt, messages, images)
 
-            except Exception as e:
-                attempt_ms = int((time.time() - attempt_start) * 1000)
+            # Build API messages format
+            api_messages = []
 
-                # Detailed error message for debugging
-                error_type = type(e).__name__
-                error_msg = str(e)
+            # Check if system message exists, if not add default
+            has_system = any(msg.get("role") == "system" for msg in normalized_messages)
+            if not has_system:
+                api_messages.append({"role": "system", "content": "You are a helpful AI assistant."})
 
-                # Check if error is retryable
-                is_rate_limit = "rate" in error_msg.lower() or "quota" in error_msg.lower() or "429" in error_msg
-                is_timeout = "timeout" in error_msg.lower()
-                should_retry = is_rate_limit or is_timeout
+            for msg in normalized_messages:
+                role = msg.get("role", "user")
+                content = msg.get("content", "")
+                msg_images = msg.get("_images")
 
-                # Tag error type
-                if is_rate_limit:
-                    error_tag = "[RATE_LIMIT]"
-                elif is_timeout:
-                    error_tag = "[TIMEOUT]"
-                else:
-                    error_tag = "[ERROR]"
-
-                if should_retry and attempt < max_retries - 1:
-                    delay = retry_delays[attempt]
-                    logger.warning(f"GPT-5-mini {error_tag}: {error_type} (attempt {attempt + 1}/{max_retries}, turnaround: {attempt_ms}ms)")
-                    logger.warning(f"   Error: {error_msg}")
-                    logger.warning(f"   Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                    continue
+                # Handle multimodal content (images)
+                if msg_images and role == "user":
+                    if isinstance(content, str):
+                        api_content = [{"type": "text", "text": content}]
+                    else:
+                        api_content = content.copy() if isinstance(content, list) else [content]
+
+                    for img_data_uri in msg_images:
+                        api_content.append({
+                            "type": "image_url",
+                            "image_url": {"url": img_data_uri}
+                        })
+                    api_messages.append({"role": role, "content": api_content})
                 else:
-                    # Last attempt or non-retryable error
-                    total_ms = int((time.time() - start_time) * 1000)
-                    if should_retry:
-                        logger.error(f"GPT-5-mini {error_tag}: Failed after {max_retries} attempts (total: {total_ms}ms)")
+                    # Text-only content
+                    if isinstance(content, list):
+                        text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
+                        api_messages.append({"role": role, "content": "".join(text_parts)})
                     else:
-                        logger.error(f"GPT-5-mini {error_tag}: Non-retryable error [{error_type}]: {error_msg}")
-
-                    return LLMResponse(
-                        success=False,
-                        response_text=None,
-                        error_message=f"{error_type}: {error_tag} {error_msg}",
-                        turnaround_ms=total_ms
-                    )
-
-        # Should never reach here, but just in case
-        total_ms = int((time.time() - start_time) * 1000)
-        return LLMResponse(
-            success=False,
-            response_text=None,
-            error_message=f"Failed after {max_retries} retry attempts",
-            turnaround_ms=total_ms
-        )
+                        api_messages.append({"role": role, "content": content})
+
+            # Call Azure OpenAI GPT-5 API using chat.completions.create()
+            # Reference: Azure OpenAI GPT-5 SDK documentation
+            completion = self.client.chat.completions.create(
+                model=self.deployment_name,
+                messages=api_messages,
+                max_completion_tokens=max_tokens,
+                stop=None,
+                stream=False
+            )
+
+            turnaround_ms = int((time.time() - start_time) * 1000)
+            output_text = completion.choices[0].message.content
+
+            # Empty responses (None or whitespace) are reported as errors;
+            # the job's retry scheduler re-queues them like rate limits
+            if output_text is None or not output_text.strip():
+                finish_reason = completion.choices[0].finish_reason if completion.choices else 'unknown'
+                logger.warning(f"GPT-5-mini: API returned empty response (finish reason: {finish_reason}, turnaround: {turnaround_ms}ms)")
+                return LLMResponse(
+                    success=False,
+                    response_text=None,
+                    error_message=f"API returned empty response. Finish reason: {finish_reason}. Check rate limits or reduce parallelism.",
+                    turnaround_ms=turnaround_ms
+                )
+
+            return LLMResponse(
+                success=True,
+                response_text=output_text,
+                error_message=None,
+                turnaround_ms=turnaround_ms,
+                **extract_usage(completion)
+            )
+
+        except Exception as e:
+            turnaround_ms = int((time.time() - start_time) * 1000)
+            error_type = type(e).__name__
+            error_msg = str(e)
+
+            logger.error(f"GPT-5-mini: [{error_type}] {error_msg}")
+
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message=f"{error_type}: {error_msg}",
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
+            )
 
     def get_default_parameters(self) -> dict:
         """Get default parameters for Azure GPT-5-mini.
@@ -9,10 +9,13 @@ Plugin Architecture:
 - Environment variables are defined as metadata via ENV_VARS class attribute
 """
 
+import asyncio
 import os
+import re
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Union, Any
+from typing import Callable, Iterable, Optional, List, Dict, Union, Any
 
 
 @dataclass
@@ -22,6 +25,133 @@ class LLMResponse:
     response_text: Optional[str] = None
     error_message: Optional[str] = None
     turnaround_ms: Optional[int] = None
+    ttft_ms: Optional[int] = None  # Time to first token (streaming only)
+    tokens_per_second: Optional[float] = None  # Output rate after the first token (streaming only; from completion_tokens, or the chunk count when usage is missing)
+    prompt_tokens: Optional[int] = None  # Input tokens billed (including cached)
+    completion_tokens: Optional[int] = None  # Output tokens (including reasoning)
+    reasoning_tokens: Optional[int] = None  # Hidden reasoning tokens (o-series, GPT-5, Gemini thinking)
+    cached_tokens: Optional[int] = None  # Input tokens served from the provider prompt cache
+    status_code: Optional[int] = None  # HTTP status of a failed call, if the SDK reported one
+    retry_after: Optional[float] = None  # Seconds the provider asked to wait (Retry-After)
+
+
+def _usage_value(usage: Any, name: str) -> Optional[int]:
+    """Read one usage counter from an SDK object or a dict (batch results)."""
+    if usage is None:
+        return None
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return value if isinstance(value, int) else None
+
+
+def extract_usage(response: Any) -> Dict[str, Optional[int]]:
+    """Extract token usage from a provider response.
+
+    Understands OpenAI / Azure OpenAI (usage.prompt_tokens ...), Anthropic
+    (usage.input_tokens ...) and Gemini (usage_metadata.prompt_token_count ...)
+    responses, as SDK objects or as JSON dicts.
+
+    Args:
+        response: SDK response object, or a response body dict
+
+    Returns:
+        LLMResponse keyword arguments (prompt_tokens, completion_tokens,
+        reasoning_tokens, cached_tokens); counters the provider did not
+        report are None
+    """
+    if isinstance(response, dict):
+        usage = response.get("usage") or response.get("usage_metadata") or response.get("usageMetadata")
+    else:
+        usage = getattr(response, "usage", None) or getattr(response, "usage_metadata", None)
+
+    usage_dict = {
+        "prompt_tokens": None,
+        "completion_tokens": None,
+        "reasoning_tokens": None,
+        "cached_tokens": None,
+    }
+    if usage is None:
+        return usage_dict
+
+    if _usage_value(usage, "prompt_tokens") is not None:
+        # OpenAI / Azure OpenAI chat completions
+        prompt_details = usage.get("prompt_tokens_details") if isinstance(usage, dict) \
+            else getattr(usage, "prompt_tokens_details", None)
+        completion_details = usage.get("completion_tokens_details") if isinstance(usage, dict) \
+            else getattr(usage, "completion_tokens_details", None)
+        usage_dict["prompt_tokens"] = _usage_value(usage, "prompt_tokens")
+        usage_dict["completion_tokens"] = _usage_value(usage, "completion_tokens")
+        usage_dict["reasoning_tokens"] = _usage_value(completion_details, "reasoning_tokens")
+        usage_dict["cached_tokens"] = _usage_value(prompt_details, "cached_tokens")
+    elif _usage_value(usage, "input_tokens") is not None:
+        # Anthropic: input_tokens excludes cache reads and writes
+        cache_read = _usage_value(usage, "cache_read_input_tokens")
+        cache_write = _usage_value(usage, "cache_creation_input_tokens")
+        usage_dict["prompt_tokens"] = _usage_value(usage, "input_tokens") + (cache_read or 0) + (cache_write or 0)
+        usage_dict["completion_tokens"] = _usage_value(usage, "output_tokens")
+        usage_dict["cached_tokens"] = cache_read
+    elif _usage_value(usage, "prompt_token_count") is not None:
+        # Gemini: thinking tokens are reported separately from candidates
+        candidates = _usage_value(usage, "candidates_token_count")
+        thoughts = _usage_value(usage, "thoughts_token_count")
+        usage_dict["prompt_tokens"] = _usage_value(usage, "prompt_token_count")
+        if candidates is not None or thoughts is not None:
+            usage_dict["completion_tokens"] = (candidates or 0) + (thoughts or 0)
+        usage_dict["reasoning_tokens"] = thoughts
+        usage_dict["cached_tokens"] = _usage_value(usage, "cached_content_token_count")
+    return usage_dict
+
+
+_RETRY_AFTER_TEXT = re.compile(r"retry after (\d+(?:\.\d+)?) (?:second|sec|s\b)", re.IGNORECASE)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header value (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_error_details(error: Exception) -> Dict[str, Optional[Union[int, float]]]:
+    """Extract HTTP status and Retry-After from an SDK exception.
+
+    Understands OpenAI / Anthropic APIStatusError (status_code, response
+    headers retry-after-ms / retry-after), Google API errors (code) and the
+    "Please retry after N seconds" hint Azure OpenAI puts in its 429 messages.
+
+    Args:
+        error: Exception raised by the SDK call
+
+    Returns:
+        LLMResponse keyword arguments (status_code, retry_after); values the
+        exception does not carry are None
+    """
+    status_code = getattr(error, "status_code", None)
+    if not isinstance(status_code, int):
+        code = getattr(error, "code", None)
+        status_code = code if isinstance(code, int) else None
+
+    retry_after = None
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        retry_after_ms = _parse_retry_after(headers.get("retry-after-ms"))
+        if retry_after_ms is not None:
+            retry_after = retry_after_ms / 1000
+        else:
+            retry_after = _parse_retry_after(headers.get("retry-after"))
+    if retry_after is None:
+        match = _RETRY_AFTER_TEXT.search(str(error))
+        if match:
+            retry_after = float(match.group(1))
+    return {"status_code": status_code, "retry_after": retry_after}
 
 
 @dataclass
@@ -241,6 +371,153 @@ class LLMClient(ABC):
         """
         pass
 
+    async def acall(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute LLM call asynchronously.
+
+        Used by the asyncio execution mode of JobManager. Plugins backed by an
+        SDK with a native async client should override this method so that
+        in-flight requests do not occupy a thread each.
+
+        Default implementation runs the blocking call() in the default
+        thread pool of the running event loop.
+
+        Args:
+            prompt: Same as call()
+            messages: Same as call()
+            images: Same as call()
+            **kwargs: Same as call()
+
+        Returns:
+            LLMResponse object with result or error
+        """
+        return await asyncio.to_thread(
+            self.call,
+            prompt=prompt,
+            messages=messages,
+            images=images,
+            **kwargs
+        )
+
+    def stream(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute LLM call with the provider's streaming API.
+
+        Same as call(), but also measures time to first token and output
+        throughput, and passes each text delta to on_text as it arrives.
+        Plugins with a streaming API override this method (typically with
+        _collect_stream()); get_model_info() then reports supports_streaming.
+
+        Default implementation calls call() and passes the whole response
+        text to on_text at once (ttft_ms and tokens_per_second stay None).
+
+        Args:
+            prompt: Same as call()
+            messages: Same as call()
+            images: Same as call()
+            on_text: Called with each text delta
+            **kwargs: Same as call()
+
+        Returns:
+            LLMResponse object with result or error
+        """
+        response = self.call(prompt=prompt, messages=messages, images=images, **kwargs)
+        if on_text and response.success and response.response_text:
+            on_text(response.response_text)
+        return response
+
+    def _collect_stream(
+        self,
+        deltas: Iterable[Optional[str]],
+        start_time: float,
+        on_text: Optional[Callable[[str], None]] = None,
+        final_usage: Optional[Callable[[], Any]] = None
+    ) -> LLMResponse:
+        """Consume a stream of text deltas into an LLMResponse with timing.
+
+        Helper for stream() implementations. The rate is measured from the
+        first to the last delta over the completion tokens the provider
+        reported (less reasoning tokens, which are produced before the
+        first delta); when usage is missing, each non-empty delta counts as
+        one token.
+
+        Args:
+            deltas: Text deltas from the provider stream (None/"" are skipped)
+            start_time: time.time() when the request was sent
+            on_text: Called with each text delta
+            final_usage: Called once the stream is consumed; returns the
+                provider object carrying the usage of the whole stream
+                (final chunk or message), read with extract_usage()
+
+        Returns:
+            Successful LLMResponse (exceptions from the stream propagate)
+        """
+        parts = []
+        first_at = last_at = None
+        for delta in deltas:
+            if not delta:
+                continue
+            last_at = time.time()
+            if first_at is None:
+                first_at = last_at
+            parts.append(delta)
+            if on_text:
+                on_text(delta)
+
+        end_time = time.time()
+        usage = extract_usage(final_usage() if final_usage else None)
+        output_tokens = len(parts)
+        if usage["completion_tokens"] is not None:
+            output_tokens = usage["completion_tokens"] - (usage["reasoning_tokens"] or 0)
+        tokens_per_second = None
+        if output_tokens > 1 and first_at is not None and last_at > first_at:
+            tokens_per_second = round((output_tokens - 1) / (last_at - first_at), 2)
+        return LLMResponse(
+            success=True,
+            response_text="".join(parts),
+            error_message=None,
+            turnaround_ms=int((end_time - start_time) * 1000),
+            ttft_ms=int((first_at - start_time) * 1000) if first_at is not None else None,
+            tokens_per_second=tokens_per_second,
+            **usage
+        )
+
+    def _collect_chat_completion_stream(
+        self,
+        chunks: Iterable[Any],
+        start_time: float,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> LLMResponse:
+        """Consume an OpenAI / Azure OpenAI chat completion stream (see _collect_stream).
+
+        Requests must be sent with stream_options={"include_usage": True}:
+        the usage then arrives in a final chunk without choices.
+        """
+        usage_chunks = []
+
+        def deltas():
+            for chunk in chunks:
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunks.append(chunk)
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
+
+        return self._collect_stream(
+            deltas(), start_time, on_text,
+            final_usage=lambda: usage_chunks[-1] if usage_chunks else None
+        )
+
     @abstractmethod
     def get_default_parameters(self) -> dict:
         """Get default parameters for this LLM client.
@@ -313,7 +590,7 @@ class LLMClient(ABC):
             provider="unknown",
             description="",
             supports_vision=False,
-            supports_streaming=False,
+            supports_streaming=type(self).stream is not LLMClient.stream,
             is_private=False
         )
 
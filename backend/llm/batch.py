@@ -0,0 +1,294 @@
+"""Provider batch APIs for offloaded job execution.
+
+Large non-interactive jobs can be sent as one provider batch submission
+instead of one request per item. Batches are cheaper and have separate rate
+limits, but complete within hours instead of seconds. JobManager's "offload"
+execution mode packages pending items with a BatchProvider, polls until the
+batch ends and writes the results back to job_items.
+
+Providers:
+- OpenAIBatchProvider: OpenAI / Azure OpenAI Batch API (JSONL upload)
+- AnthropicBatchProvider: Anthropic Message Batches
+- LocalBatchProvider: File-based stand-in that runs the requests with the
+  regular client in a background thread (tests, development, models
+  without a batch API)
+
+Requests are built with the plugin's own _build_request(), so an offloaded
+item sends the same body as call() would.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from typing import Iterator, List, Optional, Tuple
+
+from .base import LLMClient, LLMResponse, extract_usage
+
+logger = logging.getLogger(__name__)
+
+# Batch states returned by BatchProvider.poll()
+BATCH_RUNNING = "running"
+BATCH_ENDED = "ended"
+BATCH_FAILED = "failed"
+
+
+class BatchProvider(ABC):
+    """Submits item requests as one provider batch and reads back the results."""
+
+    name = "unknown"
+
+    def __init__(self, llm_client: LLMClient):
+        """Initialize provider.
+
+        Args:
+            llm_client: Plugin whose model (and SDK client) the batch runs on
+        """
+        self.llm_client = llm_client
+
+    @abstractmethod
+    def build_request(self, custom_id: str, call_args: dict) -> dict:
+        """Build one batch entry.
+
+        Args:
+            custom_id: ID the result is returned under
+            call_args: Keyword arguments the item would pass to call()
+
+        Returns:
+            JSON-serializable batch entry
+        """
+
+    @abstractmethod
+    def submit(self, requests: List[dict]) -> str:
+        """Submit batch entries. Returns the batch ID."""
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> str:
+        """Get the batch state (BATCH_RUNNING, BATCH_ENDED or BATCH_FAILED).
+
+        Results may be available for a failed batch (e.g. expired batches
+        return what was finished).
+        """
+
+    @abstractmethod
+    def iter_results(self, batch_id: str) -> Iterator[Tuple[str, LLMResponse]]:
+        """Yield (custom_id, response) of an ended batch."""
+
+    @abstractmethod
+    def cancel(self, batch_id: str):
+        """Request cancellation of a running batch."""
+
+
+class OpenAIBatchProvider(BatchProvider):
+    """OpenAI / Azure OpenAI Batch API (chat completions)."""
+
+    name = "openai"
+    COMPLETION_WINDOW = "24h"
+
+    def __init__(self, llm_client: LLMClient):
+        super().__init__(llm_client)
+        self.sdk = llm_client.client
+        # Azure routes batch lines without the version prefix
+        is_azure = type(self.sdk).__name__ == "AzureOpenAI"
+        self.endpoint = "/chat/completions" if is_azure else "/v1/chat/completions"
+
+    def build_request(self, custom_id: str, call_args: dict) -> dict:
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": self.endpoint,
+            "body": self.llm_client._build_request(**call_args)
+        }
+
+    def submit(self, requests: List[dict]) -> str:
+        content = "\n".join(json.dumps(request, ensure_ascii=False) for request in requests).encode("utf-8")
+        input_file = self.sdk.files.create(file=("batch_input.jsonl", content), purpose="batch")
+        batch = self.sdk.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.endpoint,
+            completion_window=self.COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> str:
+        status = self.sdk.batches.retrieve(batch_id).status
+        if status == "completed":
+            return BATCH_ENDED
+        if status in ("failed", "expired", "cancelled"):
+            return BATCH_FAILED
+        return BATCH_RUNNING
+
+    def iter_results(self, batch_id: str) -> Iterator[Tuple[str, LLMResponse]]:
+        batch = self.sdk.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.sdk.files.content(file_id).text.splitlines():
+                if line.strip():
+                    yield self._parse_line(json.loads(line))
+
+    @staticmethod
+    def _parse_line(entry: dict) -> Tuple[str, LLMResponse]:
+        response = entry.get("response") or {}
+        body = response.get("body") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            error = entry.get("error") or body.get("error") or {}
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            return entry["custom_id"], LLMResponse(
+                success=False,
+                error_message=message or f"HTTP {response.get('status_code')}"
+            )
+        return entry["custom_id"], LLMResponse(
+            success=True,
+            response_text=body["choices"][0]["message"]["content"],
+            **extract_usage(body)
+        )
+
+    def cancel(self, batch_id: str):
+        self.sdk.batches.cancel(batch_id)
+
+
+class AnthropicBatchProvider(BatchProvider):
+    """Anthropic Message Batches."""
+
+    name = "anthropic"
+
+    def __init__(self, llm_client: LLMClient):
+        super().__init__(llm_client)
+        self.sdk = llm_client.client
+
+    def build_request(self, custom_id: str, call_args: dict) -> dict:
+        return {"custom_id": custom_id, "params": self.llm_client._build_request(**call_args)}
+
+    def submit(self, requests: List[dict]) -> str:
+        return self.sdk.messages.batches.create(requests=requests).id
+
+    def poll(self, batch_id: str) -> str:
+        if self.sdk.messages.batches.retrieve(batch_id).processing_status == "ended":
+            return BATCH_ENDED
+        return BATCH_RUNNING
+
+    def iter_results(self, batch_id: str) -> Iterator[Tuple[str, LLMResponse]]:
+        for entry in self.sdk.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                text = "".join(block.text for block in result.message.content if block.type == "text")
+                yield entry.custom_id, LLMResponse(success=True, response_text=text, **extract_usage(result.message))
+            elif result.type == "errored":
+                yield entry.custom_id, LLMResponse(success=False, error_message=str(result.error))
+            else:
+                yield entry.custom_id, LLMResponse(success=False, error_message=f"Batch request {result.type}")
+
+    def cancel(self, batch_id: str):
+        self.sdk.messages.batches.cancel(batch_id)
+
+
+class LocalBatchProvider(BatchProvider):
+    """File-based stand-in for a provider batch API.
+
+    submit() writes <batch_id>.input.jsonl to the directory and runs its
+    entries with the regular client in a background thread, writing
+    <batch_id>.output.jsonl when done. A <batch_id>.cancel marker file stops
+    the remaining entries.
+    """
+
+    name = "local"
+
+    def __init__(self, llm_client: LLMClient, directory: str):
+        super().__init__(llm_client)
+        self.directory = directory
+
+    def _path(self, batch_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.{suffix}")
+
+    def build_request(self, custom_id: str, call_args: dict) -> dict:
+        return {"custom_id": custom_id, "body": call_args}
+
+    def submit(self, requests: List[dict]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        batch_id = f"local_{uuid.uuid4().hex}"
+        with open(self._path(batch_id, "input.jsonl"), "w", encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        threading.Thread(target=self._process, args=(batch_id,), name=f"local_batch_{batch_id}", daemon=True).start()
+        return batch_id
+
+    def _process(self, batch_id: str):
+        part_path = self._path(batch_id, "output.jsonl.part")
+        try:
+            with open(self._path(batch_id, "input.jsonl"), encoding="utf-8") as src, \
+                    open(part_path, "w", encoding="utf-8") as dst:
+                for line in src:
+                    request = json.loads(line)
+                    if os.path.exists(self._path(batch_id, "cancel")):
+                        response = LLMResponse(success=False, error_message="Batch request cancelled")
+                    else:
+                        start_time = time.time()
+                        try:
+                            response = self.llm_client.call(**request["body"])
+                        except Exception as e:
+                            response = LLMResponse(success=False, error_message=str(e))
+                        if response.turnaround_ms is None:
+                            response.turnaround_ms = int((time.time() - start_time) * 1000)
+                    dst.write(json.dumps({"custom_id": request["custom_id"], "response": asdict(response)}) + "\n")
+            os.replace(part_path, self._path(batch_id, "output.jsonl"))
+        except Exception as e:
+            logger.error(f"[LOCAL-BATCH] Batch {batch_id} failed: {e}")
+            with open(self._path(batch_id, "error"), "w", encoding="utf-8") as f:
+                f.write(str(e))
+
+    def poll(self, batch_id: str) -> str:
+        if os.path.exists(self._path(batch_id, "output.jsonl")):
+            return BATCH_ENDED
+        if os.path.exists(self._path(batch_id, "error")):
+            return BATCH_FAILED
+        return BATCH_RUNNING
+
+    def iter_results(self, batch_id: str) -> Iterator[Tuple[str, LLMResponse]]:
+        path = self._path(batch_id, "output.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                yield entry["custom_id"], LLMResponse(**entry["response"])
+
+    def cancel(self, batch_id: str):
+        open(self._path(batch_id, "cancel"), "w").close()
+
+
+def get_local_batch_dir() -> str:
+    """Get the directory of local batch files (LOCAL_BATCH_DIR, default next to the database)."""
+    env_dir = os.getenv("LOCAL_BATCH_DIR")
+    if env_dir:
+        return os.path.abspath(os.path.expanduser(env_dir))
+    database_path = os.getenv("DATABASE_PATH", "database/app.db")
+    return os.path.abspath(os.path.join(os.path.dirname(database_path) or ".", "batches"))
+
+
+def get_batch_provider(llm_client: LLMClient, provider: str = "auto") -> Optional[BatchProvider]:
+    """Get the batch provider for a model.
+
+    Args:
+        llm_client: Plugin the job runs on (unwrapped)
+        provider: "auto" (the plugin's provider API) or "local" (file-based stand-in)
+
+    Returns:
+        BatchProvider, or None if the plugin has no supported batch API
+    """
+    if provider == "local":
+        return LocalBatchProvider(llm_client, get_local_batch_dir())
+
+    # Only plugins with a shared request builder can produce batch bodies
+    if not hasattr(llm_client, "_build_request") or not hasattr(llm_client, "client"):
+        return None
+    sdk_name = type(llm_client.client).__name__
+    if sdk_name in ("OpenAI", "AzureOpenAI"):
+        return OpenAIBatchProvider(llm_client)
+    if sdk_name == "Anthropic":
+        return AnthropicBatchProvider(llm_client)
+    return None
@@ -0,0 +1,176 @@
+"""Process-wide registry of pooled SDK clients.
+
+Every OpenAI / Azure OpenAI / Anthropic SDK client owns an httpx connection
+pool. Plugins used to construct a new SDK client per get_llm_client() call,
+i.e. per job, retry and workflow step, so connections (and TLS sessions)
+were never reused across them. Plugins now take their SDK clients from this
+registry instead:
+
+- Clients are cached per (model, SDK class). The constructor arguments
+  (endpoint, credentials, API version, timeouts) form a fingerprint; a call
+  with a different fingerprint (env or settings changed) replaces the entry.
+- The httpx pool is sized with configure(), from the scheduler and job
+  concurrency settings (JobManager._get_connection_pool_size()). Changing
+  the size drops all entries so the next clients are built with the new limits.
+- Async clients are bound to the event loop they were created on, so they
+  are cached per loop and released together with the loop.
+
+Dropped clients are not closed explicitly: plugins of running jobs may still
+use them. The SDK closes the underlying httpx client when it is garbage collected.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_LIMIT = 1000
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+
+def _fingerprint(kwargs: dict) -> str:
+    """Hash constructor arguments (credentials are never stored in clear)."""
+    content = repr(sorted((name, repr(value)) for name, value in kwargs.items()))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class SDKClientRegistry:
+    """Thread-safe cache of configured SDK clients with shared connection pools."""
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._clients: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        # loop -> {(model, sdk class): (fingerprint, client)}
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def configure(self, max_connections: int):
+        """Set the connection pool size of new clients.
+
+        Args:
+            max_connections: Connections per client (clamped to 1-MAX_CONNECTIONS_LIMIT);
+                a changed value invalidates all cached clients
+        """
+        max_connections = max(1, min(int(max_connections), MAX_CONNECTIONS_LIMIT))
+        with self._lock:
+            if max_connections == self.max_connections:
+                return
+            self.max_connections = max_connections
+            self._clients.clear()
+            self._async_clients = weakref.WeakKeyDictionary()
+        logger.info(f"[CLIENT-POOL] Connection pool size set to {max_connections}")
+
+    def invalidate(self, model_name: str = None):
+        """Drop cached clients (of one model, or all) so the next call rebuilds them."""
+        with self._lock:
+            if model_name is None:
+                self._clients.clear()
+                self._async_clients = weakref.WeakKeyDictionary()
+                return
+            for key in [key for key in self._clients if key[0] == model_name]:
+                del self._clients[key]
+            for loop_clients in self._async_clients.values():
+                for key in [key for key in loop_clients if key[0] == model_name]:
+                    del loop_clients[key]
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+        )
+
+    def _get_or_create(self, clients: dict, model_name: str, sdk_class: type, http_client_class: type, kwargs: dict):
+        key = (model_name, sdk_class.__name__)
+        fingerprint = _fingerprint(kwargs)
+        entry = clients.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self.reused += 1
+            return entry[1]
+        if entry is not None:
+            logger.info(f"[CLIENT-POOL] Configuration of {model_name} changed, replacing {sdk_class.__name__} client")
+        client = sdk_class(http_client=http_client_class(limits=self._limits()), **kwargs)
+        clients[key] = (fingerprint, client)
+        self.created += 1
+        return client
+
+    def get(self, model_name: str, sdk_class: type, **kwargs) -> Any:
+        """Get the shared sync SDK client of a model.
+
+        Args:
+            model_name: Plugin DISPLAY_NAME
+            sdk_class: SDK client class (e.g. openai.AzureOpenAI, anthropic.Anthropic)
+            **kwargs: Constructor arguments (without http_client)
+
+        Returns:
+            SDK client instance (shared across threads; SDK clients are thread-safe)
+        """
+        with self._lock:
+            return self._get_or_create(
+                self._clients, model_name, sdk_class, _http_client_class(sdk_class, is_async=False), kwargs
+            )
+
+    def get_async(self, model_name: str, sdk_class: type, **kwargs) -> Any:
+        """Get the async SDK client of a model for the running event loop.
+
+        Same arguments as get(). Must be called from a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._async_clients.get(loop)
+            if loop_clients is None:
+                loop_clients = self._async_clients[loop] = {}
+            return self._get_or_create(
+                loop_clients, model_name, sdk_class, _http_client_class(sdk_class, is_async=True), kwargs
+            )
+
+    def stats(self) -> dict:
+        """Get pool size, cached clients and creation/reuse counters."""
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "clients": sorted(f"{model}:{sdk}" for model, sdk in self._clients),
+                "async_loops": len(self._async_clients),
+                "created": self.created,
+                "reused": self.reused
+            }
+
+
+def _http_client_class(sdk_class: type, is_async: bool) -> type:
+    """Get the SDK's httpx client class (keeps SDK default timeouts and redirects)."""
+    if sdk_class.__module__.split(".")[0] == "anthropic":
+        import anthropic
+        return anthropic.DefaultAsyncHttpxClient if is_async else anthropic.DefaultHttpxClient
+    import openai
+    return openai.DefaultAsyncHttpxClient if is_async else openai.DefaultHttpxClient
+
+
+# Singleton instance
+_sdk_client_registry = None
+_sdk_client_registry_lock = threading.Lock()
+
+
+def get_sdk_client_registry() -> SDKClientRegistry:
+    """Get the process-wide SDK client registry."""
+    global _sdk_client_registry
+    if _sdk_client_registry is None:
+        with _sdk_client_registry_lock:
+            if _sdk_client_registry is None:
+                _sdk_client_registry = SDKClientRegistry()
+    return _sdk_client_registry
+
+
+def reset_sdk_client_registry():
+    """Reset the registry (for tests)."""
+    global _sdk_client_registry
+    with _sdk_client_registry_lock:
+        _sdk_client_registry = None
@@ -0,0 +1,306 @@
+"""Adaptive per-model concurrency control (AIMD).
+
+A fixed job_parallelism value is either too low for fast endpoints or too high
+for rate-limited ones. The controller keeps one limit per model and adapts it
+the way TCP congestion control does:
+
+- Additive increase: each healthy success adds 1/limit, i.e. the limit grows
+  by about one slot per round of `limit` requests.
+- Multiplicative decrease: a rate limit (429/quota) or timeout halves the
+  limit, at most once per cooldown period.
+
+A response counts as healthy when the short-term latency average stays within
+LATENCY_TOLERANCE x the long-term baseline, so the limit stops growing once
+the endpoint starts queueing requests.
+
+Usage:
+    controller = get_concurrency_controller()
+    client = controller.wrap(get_llm_client(model_name))
+    client.call(...)  # blocks until the model has a free slot
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .base import LLMClient, LLMResponse, Message
+
+logger = logging.getLogger(__name__)
+
+
+def is_congestion_error(error_message: Optional[str]) -> bool:
+    """Check whether an LLM error indicates rate limiting or overload.
+
+    Args:
+        error_message: LLMResponse.error_message or exception text
+
+    Returns:
+        True for 429/rate limit/quota errors and timeouts
+    """
+    if not error_message:
+        return False
+    lowered = error_message.lower()
+    return (
+        "429" in lowered
+        or "rate limit" in lowered
+        or "ratelimit" in lowered
+        or "rate_limit" in lowered
+        or "too many requests" in lowered
+        or "quota" in lowered
+        or "timeout" in lowered
+        or "timed out" in lowered
+    )
+
+
+@dataclass
+class ModelConcurrencyState:
+    """Adaptive limit and statistics for one model."""
+    limit: float
+    in_flight: int = 0
+    ewma_latency_ms: Optional[float] = None
+    baseline_latency_ms: Optional[float] = None
+    successes: int = 0
+    errors: int = 0
+    congestion_events: int = 0
+    last_decrease: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "ewma_latency_ms": round(self.ewma_latency_ms) if self.ewma_latency_ms is not None else None,
+            "baseline_latency_ms": round(self.baseline_latency_ms) if self.baseline_latency_ms is not None else None,
+            "successes": self.successes,
+            "errors": self.errors,
+            "congestion_events": self.congestion_events
+        }
+
+
+class AdaptiveConcurrencyController:
+    """Per-model AIMD concurrency limiter shared by all jobs in the process."""
+
+    DECREASE_FACTOR = 0.5
+    DECREASE_COOLDOWN = 2.0  # seconds between multiplicative decreases
+    LATENCY_TOLERANCE = 2.0  # healthy while ewma <= tolerance x baseline
+    EWMA_ALPHA = 0.2
+    BASELINE_ALPHA = 0.02
+    ASYNC_POLL_INTERVAL = 0.05  # seconds
+
+    def __init__(self, max_limit: int = 32):
+        """Initialize controller.
+
+        Args:
+            max_limit: Upper bound for every model's limit
+        """
+        self.max_limit = max_limit
+        self._states: Dict[str, ModelConcurrencyState] = {}
+        self._cond = threading.Condition()
+
+    def set_max_limit(self, max_limit: int):
+        """Change the upper bound and clamp existing limits to it."""
+        with self._cond:
+            self.max_limit = max(1, max_limit)
+            for state in self._states.values():
+                state.limit = min(state.limit, self.max_limit)
+            self._cond.notify_all()
+
+    def _state(self, key: str, initial_limit: int = None) -> ModelConcurrencyState:
+        state = self._states.get(key)
+        if state is None:
+            limit = initial_limit if initial_limit else 1
+            state = ModelConcurrencyState(limit=float(max(1, min(limit, self.max_limit))))
+            self._states[key] = state
+        return state
+
+    def _has_slot(self, state: ModelConcurrencyState) -> bool:
+        return state.in_flight < int(state.limit)
+
+    def acquire(self, key: str, initial_limit: int = None):
+        """Block until a slot for the model is free, then take it.
+
+        Args:
+            key: Model name
+            initial_limit: Starting limit if the model has no state yet
+        """
+        with self._cond:
+            state = self._state(key, initial_limit)
+            while not self._has_slot(state):
+                self._cond.wait()
+            state.in_flight += 1
+
+    def try_acquire(self, key: str, initial_limit: int = None) -> bool:
+        """Take a slot for the model if one is free, without blocking."""
+        with self._cond:
+            state = self._state(key, initial_limit)
+            if not self._has_slot(state):
+                return False
+            state.in_flight += 1
+            return True
+
+    async def acquire_async(self, key: str, initial_limit: int = None):
+        """Wait for a slot without blocking the event loop."""
+        while not self.try_acquire(key, initial_limit):
+            await asyncio.sleep(self.ASYNC_POLL_INTERVAL)
+
+    def release(self, key: str, success: bool, latency_ms: Optional[int] = None, error_message: str = None):
+        """Return a slot and adapt the model's limit to the outcome.
+
+        Args:
+            key: Model name
+            success: Whether the call succeeded
+            latency_ms: Call turnaround time
+            error_message: Error text for failed calls (classified for congestion)
+        """
+        with self._cond:
+            state = self._state(key)
+            state.in_flight = max(0, state.in_flight - 1)
+
+            if success:
+                state.successes += 1
+                if latency_ms is not None:
+                    self._record_latency(state, latency_ms)
+                if self._is_healthy(state):
+                    state.limit = min(self.max_limit, state.limit + 1.0 / state.limit)
+            else:
+                state.errors += 1
+                if is_congestion_error(error_message):
+                    self._decrease(key, state)
+
+            self._cond.notify_all()
+
+    def record_congestion(self, key: str):
+        """Report a rate limit/timeout seen outside release().
+
+        Used by plugins that retry internally, so the limit drops while they back off.
+        """
+        with self._cond:
+            self._decrease(key, self._state(key))
+
+    def _record_latency(self, state: ModelConcurrencyState, latency_ms: int):
+        if state.ewma_latency_ms is None:
+            state.ewma_latency_ms = float(latency_ms)
+            state.baseline_latency_ms = float(latency_ms)
+            return
+        state.ewma_latency_ms += self.EWMA_ALPHA * (latency_ms - state.ewma_latency_ms)
+        state.baseline_latency_ms += self.BASELINE_ALPHA * (latency_ms - state.baseline_latency_ms)
+
+    def _is_healthy(self, state: ModelConcurrencyState) -> bool:
+        if state.ewma_latency_ms is None or not state.baseline_latency_ms:
+            return True
+        return state.ewma_latency_ms <= self.LATENCY_TOLERANCE * state.baseline_latency_ms
+
+    def _decrease(self, key: str, state: ModelConcurrencyState):
+        state.congestion_events += 1
+        now = time.monotonic()
+        if now - state.last_decrease < self.DECREASE_COOLDOWN:
+            return
+        state.last_decrease = now
+        old_limit = int(state.limit)
+        state.limit = max(1.0, state.limit * self.DECREASE_FACTOR)
+        logger.info(f"[CONCURRENCY] {key}: congestion, limit {old_limit} -> {int(state.limit)}")
+
+    def get_limits(self) -> Dict[str, dict]:
+        """Get current limits and statistics per model."""
+        with self._cond:
+            return {key: state.to_dict() for key, state in self._states.items()}
+
+    def reset(self, key: str = None):
+        """Forget learned state for one model (or all models)."""
+        with self._cond:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+            self._cond.notify_all()
+
+    def wrap(self, client: LLMClient, initial_limit: int = None) -> "AdaptiveLimitedClient":
+        """Wrap an LLM client so its calls are gated by this controller."""
+        return AdaptiveLimitedClient(client, self, initial_limit)
+
+
+class AdaptiveLimitedClient(LLMClient):
+    """LLMClient proxy that takes a concurrency slot around every call."""
+
+    def __init__(self, client: LLMClient, controller: AdaptiveConcurrencyController, initial_limit: int = None):
+        self._client = client
+        self._controller = controller
+        self._key = client.get_model_name()
+        self._initial_limit = initial_limit
+
+    def __getattr__(self, name):
+        # Delegate plugin-specific attributes (MODEL_NAME, client, ...)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def call(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        self._controller.acquire(self._key, self._initial_limit)
+        try:
+            response = self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+        except Exception as e:
+            self._controller.release(self._key, False, error_message=str(e))
+            raise
+        self._release(response)
+        return response
+
+    async def acall(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        await self._controller.acquire_async(self._key, self._initial_limit)
+        try:
+            response = await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+        except Exception as e:
+            self._controller.release(self._key, False, error_message=str(e))
+            raise
+        self._release(response)
+        return response
+
+    def stream(self, prompt: str = None, messages: List[Message] = None, images: list = None,
+               on_text=None, **kwargs) -> LLMResponse:
+        self._controller.acquire(self._key, self._initial_limit)
+        try:
+            response = self._client.stream(prompt=prompt, messages=messages, images=images, on_text=on_text, **kwargs)
+        except Exception as e:
+            self._controller.release(self._key, False, error_message=str(e))
+            raise
+        self._release(response)
+        return response
+
+    def _release(self, response: LLMResponse):
+        self._controller.release(
+            self._key,
+            response.success,
+            latency_ms=response.turnaround_ms,
+            error_message=response.error_message
+        )
+
+    def get_default_parameters(self) -> dict:
+        return self._client.get_default_parameters()
+
+    def get_model_name(self) -> str:
+        return self._key
+
+    def get_parameter_schema(self):
+        return self._client.get_parameter_schema()
+
+
+# Singleton instance
+_concurrency_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Get the process-wide concurrency controller."""
+    global _concurrency_controller
+    if _concurrency_controller is None:
+        with _controller_lock:
+            if _concurrency_controller is None:
+                _concurrency_controller = AdaptiveConcurrencyController()
+    return _concurrency_controller
+
+
+def reset_concurrency_controller():
+    """Reset the controller (for testing)."""
+    global _concurrency_controller
+    _concurrency_controller = None
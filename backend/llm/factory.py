@@ -25,6 +25,7 @@ from typing import List, Dict
 from dotenv import load_dotenv
 
 from .base import LLMClient, EnvVarConfig
+from .retry import RetryingLLMClient, RetryPolicy
 
 load_dotenv()
 
@@ -50,7 +51,8 @@ def _discover_models():
     llm_dir = Path(__file__).parent
 
     # Scan all .py files in llm directory (excluding system files)
-    exclude_files = {'__init__.py', 'base.py', 'factory.py'}
+    exclude_files = {'__init__.py', 'base.py', 'factory.py', 'concurrency.py', 'response_cache.py',
+                     'batch.py', 'client_pool.py', 'retry.py', 'prompt_cache.py'}
 
     for py_file in llm_dir.glob('*.py'):
         if py_file.name in exclude_files:
@@ -128,6 +130,23 @@ def get_llm_client(model_name: str = None) -> LLMClient:
     )
 
 
+def get_retrying_llm_client(model_name: str = None, policy: RetryPolicy = None) -> LLMClient:
+    """Get an LLM client that retries failed calls inline.
+
+    For callers outside the job executors (agent guardrail and intent
+    classification, single-item retries, MCP tool runs); the executors
+    re-queue failed items through RetrySchedule instead.
+
+    Args:
+        model_name: Model identifier (DISPLAY_NAME). If None, uses ACTIVE_LLM_MODEL from env.
+        policy: Retry policy (default: RetryPolicy() with the inline wait cap)
+
+    Returns:
+        RetryingLLMClient around the model's client
+    """
+    return RetryingLLMClient(get_llm_client(model_name), policy)
+
+
 def get_available_models() -> List[Dict[str, any]]:
     """Get list of all available LLM models with their default parameters.
 
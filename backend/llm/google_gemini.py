@@ -12,7 +12,7 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
-from .base import LLMClient, LLMResponse, Message, EnvVarConfig, ModelInfo, ParameterSchema
+from .base import LLMClient, LLMResponse, extract_error_details, extract_usage, Message, EnvVarConfig, ModelInfo, ParameterSchema
 
 # Load environment variables
 load_dotenv()
@@ -185,7 +185,8 @@ class GoogleGeminiFlashClient(LLMClient):
                 success=True,
                 response_text=response_text,
                 error_message=None,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
             )
 
         except Exception as e:
@@ -198,7 +199,8 @@ class GoogleGeminiFlashClient(LLMClient):
                 success=False,
                 response_text=None,
                 error_message=error_msg,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
     def get_default_parameters(self) -> dict:
@@ -395,7 +397,8 @@ class GoogleGeminiProClient(LLMClient):
                 success=True,
                 response_text=response_text,
                 error_message=None,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
             )
 
         except Exception as e:
@@ -404,7 +407,8 @@ class GoogleGeminiProClient(LLMClient):
                 success=False,
                 response_text=None,
                 error_message=str(e),
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
     def get_default_parameters(self) -> dict:
@@ -0,0 +1,292 @@
+"""Hedged LLM requests to cut tail latency.
+
+A few requests of a batch routinely take several times the median, and a
+job cannot finish before its slowest item. With hedging enabled, a call
+that is still running after the model's recent latency percentile (e.g.
+p95) gets a duplicate request, optionally to an alternate model or
+deployment. The first successful response wins.
+
+- Latencies are tracked per model across all jobs (LatencyTracker). Below
+  MIN_SAMPLES observations no call is hedged.
+- Each job's HedgedLLMClient hedges at most max_rate of its calls, so a slow
+  provider cannot double the load.
+- The losing request is ignored, not cancelled. The request was already sent
+  and is billed either way. It still finishes in the background, and its
+  latency feeds both the tracker and the measured saving (loser latency
+  minus winner latency).
+
+Only call() and acall() are hedged. Streamed calls pass through, because
+two partial texts for one item cannot be interleaved.
+
+Usage:
+    client = HedgedLLMClient(get_llm_client(model_name), get_latency_tracker(), percentile=95)
+    client.call(...)
+    client.stats.to_dict()
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+from .base import LLMClient, LLMResponse, Message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_MAX_RATE = 0.1
+MIN_SAMPLES = 20
+LATENCY_WINDOW = 500
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies per model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._latencies: Dict[str, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency_ms: Optional[int]):
+        if latency_ms is None:
+            return
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency_ms)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = MIN_SAMPLES) -> Optional[float]:
+        """Get a latency percentile in ms (None while fewer than min_samples are known)."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < max(1, min_samples):
+            return None
+        index = min(len(latencies) - 1, max(0, math.ceil(percentile / 100 * len(latencies)) - 1))
+        return float(latencies[index])
+
+    def reset(self, key: str = None):
+        """Forget latencies of one model (or all models)."""
+        with self._lock:
+            if key is None:
+                self._latencies.clear()
+            else:
+                self._latencies.pop(key, None)
+
+
+@dataclass
+class HedgeStats:
+    """Hedging counters of one job."""
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    saved_ms: int = 0  # Measured: loser latency - winner latency, summed over hedge wins
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+                "saved_ms": self.saved_ms
+            }
+
+
+def _run_in_thread(fn: Callable[[], LLMResponse], name: str) -> Future:
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+
+class HedgedLLMClient(LLMClient):
+    """LLMClient proxy that sends a duplicate request for slow calls."""
+
+    def __init__(
+        self,
+        client: LLMClient,
+        tracker: LatencyTracker,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        max_rate: float = DEFAULT_HEDGE_MAX_RATE,
+        alternate: LLMClient = None,
+        min_samples: int = MIN_SAMPLES
+    ):
+        """Initialize hedged client.
+
+        Args:
+            client: Primary client
+            tracker: Latency tracker shared by all jobs
+            percentile: Hedge once a call runs longer than this latency percentile
+            max_rate: Maximum fraction of calls that may be hedged
+            alternate: Client the hedge is sent to (default: the primary client)
+            min_samples: Latencies needed before calls are hedged
+        """
+        self._client = client
+        self._tracker = tracker
+        self._key = client.get_model_name()
+        self._alternate = alternate
+        self._alternate_key = alternate.get_model_name() if alternate else self._key
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+
+    def __getattr__(self, name):
+        # Delegate plugin-specific attributes (MODEL_NAME, client, ...)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (None: do not hedge this call)."""
+        with self.stats._lock:
+            self.stats.calls += 1
+        threshold_ms = self._tracker.percentile(self._key, self.percentile, self.min_samples)
+        return threshold_ms / 1000 if threshold_ms is not None else None
+
+    def _take_hedge_budget(self) -> bool:
+        with self.stats._lock:
+            if self.stats.hedged + 1 > max(1.0, self.max_rate * self.stats.calls):
+                return False
+            self.stats.hedged += 1
+            return True
+
+    def _record(self, key: str, response: Optional[LLMResponse]):
+        if response is not None and response.success:
+            self._tracker.record(key, response.turnaround_ms)
+
+    def _record_win(self, winner_ms: int, loser_ms: Optional[int] = None):
+        """Count a hedge win now; the saving is added once the loser finishes."""
+        with self.stats._lock:
+            if loser_ms is None:
+                self.stats.hedge_wins += 1
+            else:
+                self.stats.saved_ms += max(0, loser_ms - winner_ms)
+
+    def call(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        delay = self._hedge_delay()
+        if delay is None:
+            response = self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+            self._record(self._key, response)
+            return response
+
+        start_time = time.time()
+        hedge_client = self._alternate or self._client
+        primary = _run_in_thread(
+            lambda: self._client.call(prompt=prompt, messages=messages, images=images, **kwargs), "hedge_primary"
+        )
+        primary.add_done_callback(lambda f: self._record(self._key, None if f.exception() else f.result()))
+        if not wait([primary], timeout=delay).done and self._take_hedge_budget():
+            hedge = _run_in_thread(
+                lambda: hedge_client.call(prompt=prompt, messages=messages, images=images, **kwargs), "hedge_secondary"
+            )
+            hedge.add_done_callback(lambda f: self._record(self._alternate_key, None if f.exception() else f.result()))
+            return self._first_success(primary, hedge, start_time)
+        return primary.result()
+
+    def _first_success(self, primary: Future, hedge: Future, start_time: float) -> LLMResponse:
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                response = None if future.exception() else future.result()
+                if response is not None and response.success:
+                    winner_ms = int((time.time() - start_time) * 1000)
+                    if future is hedge:
+                        self._record_win(winner_ms)
+                        primary.add_done_callback(
+                            lambda f: self._record_win(winner_ms, int((time.time() - start_time) * 1000))
+                        )
+                    # Effective latency of the item, including the wait before hedging
+                    response.turnaround_ms = winner_ms
+                    return response
+        # Both failed: report the primary's outcome
+        return primary.result()
+
+    async def acall(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        delay = self._hedge_delay()
+        if delay is None:
+            response = await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+            self._record(self._key, response)
+            return response
+
+        start_time = time.time()
+        hedge_client = self._alternate or self._client
+        primary = asyncio.ensure_future(self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs))
+        primary.add_done_callback(
+            lambda t: self._record(self._key, None if t.cancelled() or t.exception() else t.result())
+        )
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._take_hedge_budget():
+            return await primary
+
+        hedge = asyncio.ensure_future(hedge_client.acall(prompt=prompt, messages=messages, images=images, **kwargs))
+        hedge.add_done_callback(
+            lambda t: self._record(self._alternate_key, None if t.cancelled() or t.exception() else t.result())
+        )
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                response = None if task.exception() else task.result()
+                if response is not None and response.success:
+                    winner_ms = int((time.time() - start_time) * 1000)
+                    if task is hedge:
+                        self._record_win(winner_ms)
+                        primary.add_done_callback(
+                            lambda t: None if t.cancelled() else self._record_win(
+                                winner_ms, int((time.time() - start_time) * 1000)
+                            )
+                        )
+                    response.turnaround_ms = winner_ms
+                    return response
+        return await primary
+
+    def stream(self, prompt: str = None, messages: List[Message] = None, images: list = None,
+               on_text=None, **kwargs) -> LLMResponse:
+        response = self._client.stream(prompt=prompt, messages=messages, images=images, on_text=on_text, **kwargs)
+        self._record(self._key, response)
+        return response
+
+    def get_default_parameters(self) -> dict:
+        return self._client.get_default_parameters()
+
+    def get_model_name(self) -> str:
+        return self._key
+
+    def get_parameter_schema(self):
+        return self._client.get_parameter_schema()
+
+
+# Singleton instance
+_latency_tracker = None
+_latency_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker."""
+    global _latency_tracker
+    if _latency_tracker is None:
+        with _latency_tracker_lock:
+            if _latency_tracker is None:
+                _latency_tracker = LatencyTracker()
+    return _latency_tracker
+
+
+def reset_latency_tracker():
+    """Reset the tracker (for testing)."""
+    global _latency_tracker
+    _latency_tracker = None
@@ -8,12 +8,13 @@ import logging
 import os
 import time
 from typing import Optional, List
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
-from .base import LLMClient, LLMResponse, Message, EnvVarConfig
+from .base import LLMClient, LLMResponse, extract_error_details, extract_usage, Message, EnvVarConfig
+from .client_pool import get_sdk_client_registry
 
 # Load environment variables
 load_dotenv()
@@ -44,7 +45,73 @@ class OpenAIGPT4NanoClient(LLMClient):
         self.api_key = self._get_env_var("api_key")
 
         # Initialize client
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_sdk_client_registry().get(self.DISPLAY_NAME, OpenAI, api_key=self.api_key)
+
+    def _build_request(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        **kwargs
+    ) -> dict:
+        """Build chat.completions.create() arguments.
+
+        Shared by call(), acall() and stream() so all paths send identical requests.
+
+        Returns:
+            Dictionary of keyword arguments for chat.completions.create()
+        """
+        # Get parameters with defaults
+        temperature = kwargs.get("temperature", 0.2)
+        max_tokens = kwargs.get("max_tokens", 4000)
+        top_p = kwargs.get("top_p", 1.0)
+
+        # Normalize input to messages list
+        normalized_messages = self._normalize_messages(prompt, messages, images)
+
+        # Build API messages format
+        api_messages = []
+
+        # Check if system message exists, if not add default
+        has_system = any(msg.get("role") == "system" for msg in normalized_messages)
+        if not has_system:
+            api_messages.append({"role": "system", "content": "You are a helpful AI assistant."})
+
+        for msg in normalized_messages:
+            role = msg.get("role", "user")
+            content = msg.get("content", "")
+            msg_images = msg.get("_images")
+
+            # Handle multimodal content (images)
+            if msg_images and role == "user":
+                if isinstance(content, str):
+                    api_content = [{"type": "text", "text": content}]
+                else:
+                    api_content = content.copy() if isinstance(content, list) else [content]
+
+                for img_data_uri in msg_images:
+                    logger.debug(f"Vision API: Adding image (data URI length: {len(img_data_uri)} chars)")
+                    api_content.append({
+                        "type": "image_url",
+                        "image_url": {"url": img_data_uri, "detail": "high"}
+                    })
+                logger.debug(f"Vision API: Sending {len(msg_images)} image(s) with prompt")
+                api_messages.append({"role": role, "content": api_content})
+            else:
+                # Text-only content
+                if isinstance(content, list):
+                    text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
+                    api_messages.append({"role": role, "content": "".join(text_parts)})
+                else:
+                    api_messages.append({"role": role, "content": content})
+
+        return {
+            "model": self.MODEL_NAME,
+            "messages": api_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p
+        }
 
     def call(
         self,
@@ -72,59 +139,91 @@ class OpenAIGPT4NanoClient(LLMClient):
         start_time = time.time()
 
         try:
-            # Get parameters with defaults
-            temperature = kwargs.get("temperature", 0.2)
-            max_tokens = kwargs.get("max_tokens", 4000)
-            top_p = kwargs.get("top_p", 1.0)
-
-            # Normalize input to messages list
-            normalized_messages = self._normalize_messages(prompt, messages, images)
-
-            # Build API messages format
-            api_messages = []
-
-            # Check if system message exists, if not add default
-            has_system = any(msg.get("role") == "system" for msg in normalized_messages)
-            if not has_system:
-                api_messages.append({"role": "system", "content": "You are a helpful AI assistant."})
-
-            for msg in normalized_messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                msg_images = msg.get("_images")
-
-                # Handle multimodal content (images)
-                if msg_images and role == "user":
-                    if isinstance(content, str):
-                        api_content = [{"type": "text", "text": content}]
-                    else:
-                        api_content = content.copy() if isinstance(content, list) else [content]
-
-                    for img_data_uri in msg_images:
-                        logger.debug(f"Vision API: Adding image (data URI length: {len(img_data_uri)} chars)")
-                        api_content.append({
-                            "type": "image_url",
-                            "image_url": {"url": img_data_uri, "detail": "high"}
-                        })
-                    logger.debug(f"Vision API: Sending {len(msg_images)} image(s) with prompt")
-                    api_messages.append({"role": role, "content": api_content})
-                else:
-                    # Text-only content
-                    if isinstance(content, list):
-                        text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
-                        api_messages.append({"role": role, "content": "".join(text_parts)})
-                    else:
-                        api_messages.append({"role": role, "content": content})
+            request_params = self._build_request(prompt, messages, images, **kwargs)
 
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.MODEL_NAME,
-                messages=api_messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                top_p=top_p
+            response = self.client.chat.completions.create(**request_params)
+
+            # Calculate turnaround time
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            # Extract response text
+            response_text = response.choices[0].message.content
+
+            return LLMResponse(
+                success=True,
+                response_text=response_text,
+                error_message=None,
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
+            )
+
+        except Exception as e:
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message=str(e),
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
+    def stream(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        on_text=None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute OpenAI GPT-4.1-nano call with the streaming API.
+
+        Same arguments as call(), plus on_text (called with each text delta).
+        Records time to first token and output throughput.
+        """
+        start_time = time.time()
+
+        try:
+            request_params = self._build_request(prompt, messages, images, **kwargs)
+
+            # Stream OpenAI API response
+            chunks = self.client.chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **request_params
+            )
+            return self._collect_chat_completion_stream(chunks, start_time, on_text)
+
+        except Exception as e:
+            turnaround_ms = int((time.time() - start_time) * 1000)
+
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message=str(e),
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
+            )
+
+    async def acall(
+        self,
+        prompt: str = None,
+        messages: List[Message] = None,
+        images: list = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Execute OpenAI GPT-4.1-nano call with the native async client.
+
+        Same arguments and return value as call(). Used by the asyncio
+        execution mode so in-flight requests do not hold a thread each.
+        """
+        start_time = time.time()
+
+        try:
+            request_params = self._build_request(prompt, messages, images, **kwargs)
+
+            # Call OpenAI API (non-blocking)
+            response = await self._get_async_client().chat.completions.create(**request_params)
+
             # Calculate turnaround time
             turnaround_ms = int((time.time() - start_time) * 1000)
 
@@ -135,7 +234,8 @@ class OpenAIGPT4NanoClient(LLMClient):
                 success=True,
                 response_text=response_text,
                 error_message=None,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
             )
 
         except Exception as e:
@@ -145,9 +245,14 @@ class OpenAIGPT4NanoClient(LLMClient):
                 success=False,
                 response_text=None,
                 error_message=str(e),
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the pooled async SDK client of the running event loop (used by acall())."""
+        return get_sdk_client_registry().get_async(self.DISPLAY_NAME, AsyncOpenAI, api_key=self.api_key)
+
     def get_default_parameters(self) -> dict:
         """Get default parameters for OpenAI GPT-4.1-nano.
 
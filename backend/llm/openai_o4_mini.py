@@ -10,7 +10,8 @@ from typing import Optional, List
 from openai import OpenAI
 from dotenv import load_dotenv
 
-from .base import LLMClient, LLMResponse, Message, EnvVarConfig
+from .base import LLMClient, LLMResponse, extract_error_details, extract_usage, Message, EnvVarConfig
+from .client_pool import get_sdk_client_registry
 
 # Load environment variables
 load_dotenv()
@@ -42,7 +43,7 @@ class OpenAIO4MiniClient(LLMClient):
         self.api_key = self._get_env_var("api_key")
 
         # Initialize client
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_sdk_client_registry().get(self.DISPLAY_NAME, OpenAI, api_key=self.api_key)
 
     def call(
         self,
@@ -135,7 +136,8 @@ class OpenAIO4MiniClient(LLMClient):
                 success=True,
                 response_text=response_text,
                 error_message=None,
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_usage(response)
             )
 
         except Exception as e:
@@ -145,7 +147,8 @@ class OpenAIO4MiniClient(LLMClient):
                 success=False,
                 response_text=None,
                 error_message=str(e),
-                turnaround_ms=turnaround_ms
+                turnaround_ms=turnaround_ms,
+                **extract_error_details(e)
             )
 
     def get_default_parameters(self) -> dict:
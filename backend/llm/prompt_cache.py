@@ -0,0 +1,122 @@
+"""Provider prompt-prefix caching for batch runs.
+
+Batch prompts share the template text before the first {{PARAM}} (often a
+long [SYSTEM] block and instructions); only the rest differs per row.
+Providers can serve such a prefix from their prompt cache:
+
+- Anthropic caches up to explicit cache_control breakpoints. The job marks
+  the message where the static prefix ends with "_cache_prefix" (number of
+  static characters, see MessageRoleParser.to_messages_list) and the Claude
+  plugin splits that message into a cached and an uncached text block.
+- OpenAI / Azure OpenAI cache identical request prefixes automatically.
+  The plugins already send text before images, so the rendered prompt
+  keeps the static prefix in front.
+
+Both only cache once a first request with the prefix has completed;
+requests sent concurrently before that all pay the full prefix (Anthropic
+also bills each of them as a cache write). PrefixWarmingClient therefore
+lets the first call of a job go alone and releases the others once it has
+finished (or after WARM_UP_TIMEOUT).
+
+Hit rates are reported per job from the stored cached_tokens counts
+(backend.usage: cached_ratio, cache_hit_rate).
+"""
+
+import asyncio
+import threading
+from typing import List
+
+from .base import LLMClient, LLMResponse, Message
+
+CACHE_PREFIX_KEY = "_cache_prefix"
+
+# Providers cache prefixes from 1024 tokens; a token is at least ~1 character,
+# so shorter prefixes can never be cached
+MIN_PREFIX_CHARS = 1024
+
+# Calls waiting for the first call are released after this many seconds
+WARM_UP_TIMEOUT = 30.0
+
+# Anthropic cache_control of a breakpoint (5 minute TTL, refreshed on every hit)
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def split_cache_prefix(content: str, prefix_chars: int) -> List[dict]:
+    """Split message text into a cached and an uncached Anthropic text block.
+
+    Args:
+        content: Message text
+        prefix_chars: Leading characters that belong to the static prefix
+
+    Returns:
+        Text blocks; the first one carries the cache_control breakpoint
+    """
+    head, tail = content[:prefix_chars], content[prefix_chars:]
+    blocks = [{"type": "text", "text": head, "cache_control": dict(EPHEMERAL_CACHE_CONTROL)}]
+    if tail.strip():
+        blocks.append({"type": "text", "text": tail})
+    return blocks
+
+
+class PrefixWarmingClient(LLMClient):
+    """LLMClient proxy that holds concurrent calls until the first call has finished."""
+
+    def __init__(self, client: LLMClient, timeout: float = WARM_UP_TIMEOUT):
+        self._client = client
+        self.timeout = timeout
+        self._warm = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def __getattr__(self, name):
+        # Delegate plugin-specific attributes (MODEL_NAME, client, ...)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def _claim_first_call(self) -> bool:
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+            return True
+
+    def call(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        if self._claim_first_call():
+            try:
+                return self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+            finally:
+                self._warm.set()
+        self._warm.wait(self.timeout)
+        return self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+
+    async def acall(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        if self._claim_first_call():
+            try:
+                return await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+            finally:
+                self._warm.set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while not self._warm.is_set() and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        return await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+
+    def stream(self, prompt: str = None, messages: List[Message] = None, images: list = None,
+               on_text=None, **kwargs) -> LLMResponse:
+        if self._claim_first_call():
+            try:
+                return self._client.stream(prompt=prompt, messages=messages, images=images, on_text=on_text, **kwargs)
+            finally:
+                self._warm.set()
+        self._warm.wait(self.timeout)
+        return self._client.stream(prompt=prompt, messages=messages, images=images, on_text=on_text, **kwargs)
+
+    def get_default_parameters(self) -> dict:
+        return self._client.get_default_parameters()
+
+    def get_model_name(self) -> str:
+        return self._client.get_model_name()
+
+    def get_parameter_schema(self):
+        return self._client.get_parameter_schema()
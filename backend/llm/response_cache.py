@@ -0,0 +1,363 @@
+"""Content-addressed LLM response cache.
+
+Re-running a batch after a parser change, or repeating a run at temperature 0,
+sends identical requests to the provider. With the cache enabled, successful
+responses are stored in the llm_response_cache table, keyed by a SHA-256 of
+(model, normalized messages, image digests, effective parameters).
+
+Modes (system setting "llm_cache_mode"):
+- bypass: cache is not used (default)
+- read-through: return cached responses, call the provider on a miss and store the result
+- replay-only: return cached responses, fail on a miss without calling the provider
+
+The table is bounded by llm_cache_max_mb (LRU eviction by last access) and
+entries expire after llm_cache_ttl_hours (0 = never).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from ..database.dialect import upsert
+from ..database.models import LLMResponseCache
+from .base import LLMClient, LLMResponse, Message
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ["bypass", "read-through", "replay-only"]
+DEFAULT_CACHE_MODE = "bypass"
+DEFAULT_CACHE_MAX_MB = 256
+DEFAULT_CACHE_TTL_HOURS = 168  # 7 days
+
+
+def compute_cache_key(
+    client: LLMClient,
+    prompt: str = None,
+    messages: List[Message] = None,
+    images: list = None,
+    **kwargs
+) -> str:
+    """Compute the cache key of an LLM request.
+
+    Args:
+        client: LLM client the request is sent to
+        prompt, messages, images, **kwargs: Arguments of LLMClient.call()
+
+    Returns:
+        SHA-256 hex digest
+    """
+    # Deployment/model identifiers distinguish plugins that share a display name
+    model = {
+        "name": client.get_model_name(),
+        "model": getattr(client, "MODEL_NAME", None),
+        "deployment": getattr(client, "deployment_name", None),
+    }
+    payload = {
+        "model": model,
+        # Hints for the plugins (e.g. "_cache_prefix") do not change the response
+        "messages": [
+            {key: value for key, value in message.items() if not key.startswith("_")}
+            for message in client._normalize_messages(prompt, messages, None)
+        ],
+        "images": [hashlib.sha256(str(image).encode("utf-8")).hexdigest() for image in images or []],
+        "params": kwargs,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCacheStore:
+    """SQLite-backed response store with TTL and size-bounded LRU eviction."""
+
+    # Access times are buffered and written in bulk, so hits don't commit one by one
+    TOUCH_FLUSH_SIZE = 100
+    # Evict down to this fraction of the budget, so eviction doesn't run on every put
+    EVICTION_TARGET = 0.9
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds: Optional[int] = DEFAULT_CACHE_TTL_HOURS * 3600
+    ):
+        """Initialize cache store.
+
+        Args:
+            session_factory: Callable returning a new SQLAlchemy session
+            max_bytes: Size budget for stored response text
+            ttl_seconds: Entry lifetime (None or 0 = never expire)
+        """
+        self.session_factory = session_factory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._touched: Dict[str, list] = {}  # cache_key -> [last access, hits]
+
+    def configure(self, max_bytes: int, ttl_seconds: Optional[int]):
+        """Update size budget and TTL."""
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Look up a cached response text (None on miss or expiry)."""
+        db = self.session_factory()
+        try:
+            row = db.execute(
+                text("SELECT response_text, created_at FROM llm_response_cache WHERE cache_key = :key"),
+                {"key": cache_key}
+            ).fetchone()
+            if row is None:
+                return None
+            if self._is_expired(row[1]):
+                db.execute(
+                    text("DELETE FROM llm_response_cache WHERE cache_key = :key"),
+                    {"key": cache_key}
+                )
+                db.commit()
+                return None
+        finally:
+            db.close()
+
+        with self._lock:
+            touch = self._touched.setdefault(cache_key, [None, 0])
+            touch[0] = datetime.utcnow().isoformat()
+            touch[1] += 1
+            if len(self._touched) >= self.TOUCH_FLUSH_SIZE:
+                self._flush_touches()
+        return row[0]
+
+    def put(self, cache_key: str, model_name: str, response_text: str):
+        """Store a response and evict least recently used entries over budget."""
+        now = datetime.utcnow().isoformat()
+        size_bytes = len(response_text.encode("utf-8"))
+        with self._lock:
+            db = self.session_factory()
+            try:
+                upsert(db, LLMResponseCache.__table__, {
+                    "cache_key": cache_key,
+                    "model_name": model_name,
+                    "response_text": response_text,
+                    "size_bytes": size_bytes,
+                    "hit_count": 0,
+                    "created_at": now,
+                    "last_accessed_at": now
+                }, key_columns=["cache_key"])
+                db.commit()
+            finally:
+                db.close()
+            self._flush_touches()
+            self._evict()
+
+    def flush(self):
+        """Write buffered access times and hit counts."""
+        with self._lock:
+            self._flush_touches()
+
+    def clear(self) -> int:
+        """Delete all entries. Returns number of deleted entries."""
+        with self._lock:
+            self._touched.clear()
+            db = self.session_factory()
+            try:
+                deleted = db.execute(text("DELETE FROM llm_response_cache")).rowcount
+                db.commit()
+                return deleted
+            finally:
+                db.close()
+
+    def stats(self) -> dict:
+        """Get entry count, stored bytes and total hits."""
+        self.flush()
+        db = self.session_factory()
+        try:
+            row = db.execute(text(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(hit_count), 0) "
+                "FROM llm_response_cache"
+            )).fetchone()
+            return {"entries": row[0], "size_bytes": row[1], "hits": row[2]}
+        finally:
+            db.close()
+
+    def _is_expired(self, created_at: str) -> bool:
+        if not self.ttl_seconds:
+            return False
+        try:
+            created = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            return True
+        return datetime.utcnow() - created > timedelta(seconds=self.ttl_seconds)
+
+    def _flush_touches(self):
+        """Write buffered access times and hit counts (caller holds the lock)."""
+        if not self._touched:
+            return
+        touched = [
+            {"key": key, "accessed": accessed, "hits": hits}
+            for key, (accessed, hits) in self._touched.items()
+        ]
+        self._touched = {}
+        db = self.session_factory()
+        try:
+            db.execute(
+                text(
+                    "UPDATE llm_response_cache SET last_accessed_at = :accessed, "
+                    "hit_count = hit_count + :hits WHERE cache_key = :key"
+                ),
+                touched
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"[LLM-CACHE] Failed to record cache hits: {e}")
+        finally:
+            db.close()
+
+    def _evict(self):
+        """Delete least recently used entries while over budget (caller holds the lock)."""
+        db = self.session_factory()
+        try:
+            total = db.execute(text("SELECT COALESCE(SUM(size_bytes), 0) FROM llm_response_cache")).scalar()
+            if total <= self.max_bytes:
+                return
+
+            target = int(self.max_bytes * self.EVICTION_TARGET)
+            evict_keys = []
+            rows = db.execute(text(
+                "SELECT cache_key, size_bytes FROM llm_response_cache ORDER BY last_accessed_at"
+            ))
+            for cache_key, size_bytes in rows:
+                if total <= target:
+                    break
+                evict_keys.append(cache_key)
+                total -= size_bytes
+            rows.close()
+
+            db.execute(
+                text("DELETE FROM llm_response_cache WHERE cache_key IN :keys").bindparams(
+                    bindparam("keys", expanding=True)
+                ),
+                {"keys": evict_keys}
+            )
+            db.commit()
+            logger.info(f"[LLM-CACHE] Evicted {len(evict_keys)} entries")
+        finally:
+            db.close()
+
+
+class CachedLLMClient(LLMClient):
+    """LLMClient proxy that serves identical requests from the response cache."""
+
+    def __init__(self, client: LLMClient, store: LLMResponseCacheStore, mode: str):
+        self._client = client
+        self._store = store
+        self.mode = mode
+
+    def __getattr__(self, name):
+        # Delegate plugin-specific attributes (MODEL_NAME, client, ...)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def _lookup(self, cache_key: str, start_time: float) -> Optional[LLMResponse]:
+        try:
+            cached = self._store.get(cache_key)
+        except Exception as e:
+            logger.warning(f"[LLM-CACHE] Lookup failed, calling provider: {e}")
+            cached = None
+        if cached is not None:
+            return LLMResponse(
+                success=True,
+                response_text=cached,
+                error_message=None,
+                turnaround_ms=int((time.time() - start_time) * 1000)
+            )
+        if self.mode == "replay-only":
+            return LLMResponse(
+                success=False,
+                response_text=None,
+                error_message="Response cache miss (replay-only mode)",
+                turnaround_ms=int((time.time() - start_time) * 1000)
+            )
+        return None
+
+    def _store_response(self, cache_key: str, response: LLMResponse):
+        if not response.success or response.response_text is None:
+            return
+        try:
+            self._store.put(cache_key, self.get_model_name(), response.response_text)
+        except Exception as e:
+            logger.warning(f"[LLM-CACHE] Failed to store response: {e}")
+
+    def call(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        start_time = time.time()
+        cache_key = compute_cache_key(self._client, prompt, messages, images, **kwargs)
+        cached = self._lookup(cache_key, start_time)
+        if cached is not None:
+            return cached
+
+        response = self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+        self._store_response(cache_key, response)
+        return response
+
+    async def acall(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        start_time = time.time()
+        cache_key = compute_cache_key(self._client, prompt, messages, images, **kwargs)
+        cached = self._lookup(cache_key, start_time)
+        if cached is not None:
+            return cached
+
+        response = await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+        self._store_response(cache_key, response)
+        return response
+
+    def stream(self, prompt: str = None, messages: List[Message] = None, images: list = None,
+               on_text=None, **kwargs) -> LLMResponse:
+        start_time = time.time()
+        cache_key = compute_cache_key(self._client, prompt, messages, images, **kwargs)
+        cached = self._lookup(cache_key, start_time)
+        if cached is not None:
+            if on_text and cached.success:
+                on_text(cached.response_text)
+            return cached
+
+        response = self._client.stream(prompt=prompt, messages=messages, images=images, on_text=on_text, **kwargs)
+        self._store_response(cache_key, response)
+        return response
+
+    def get_default_parameters(self) -> dict:
+        return self._client.get_default_parameters()
+
+    def get_model_name(self) -> str:
+        return self._client.get_model_name()
+
+    def get_parameter_schema(self):
+        return self._client.get_parameter_schema()
+
+
+# Singleton instance
+_response_cache_store = None
+_store_lock = threading.Lock()
+
+
+def get_response_cache_store() -> LLMResponseCacheStore:
+    """Get the process-wide response cache store (backed by the app database)."""
+    global _response_cache_store
+    if _response_cache_store is None:
+        with _store_lock:
+            if _response_cache_store is None:
+                from backend.database import SessionLocal
+                _response_cache_store = LLMResponseCacheStore(SessionLocal)
+    return _response_cache_store
+
+
+def reset_response_cache_store():
+    """Reset the cache store singleton (for testing)."""
+    global _response_cache_store
+    _response_cache_store = None
@@ -0,0 +1,284 @@
+"""Central retry handling for failed LLM calls.
+
+Retries used to be hand-rolled: the GPT-5 plugins slept 15-60s inside the
+worker thread, other plugins did not retry at all. Failed calls are now
+classified here and retried by the job executors:
+
+- classify_error() sorts a failure into rate_limit / timeout / server /
+  empty (retryable) or content / client / unknown (final).
+- RetryPolicy decides whether to retry and how long to wait: the provider's
+  Retry-After if it sent one (LLMResponse.retry_after), otherwise exponential
+  backoff with jitter.
+- RetrySchedule holds the delayed items of one job, ordered by due time.
+  Executors keep dispatching other items and pick a delayed item up once it
+  is due, so no worker slot is held during the backoff.
+
+RetryingLLMClient retries inline (sleeping) for callers without a dispatch
+queue, e.g. single-item retries and MCP tool calls. Those run inside a
+request, so their waits are capped in total (RetryPolicy.max_total_delay,
+INLINE_MAX_TOTAL_DELAY by default); a retry that would exceed the cap fails
+fast instead.
+
+Usage:
+    policy = RetryPolicy(max_attempts=4)
+    schedule = RetrySchedule(policy)
+    delay = schedule.schedule(item_id, payload, response)  # None: final failure
+    due = schedule.pop_due()
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import LLMClient, LLMResponse, Message
+
+logger = logging.getLogger(__name__)
+
+# Error kinds
+RATE_LIMIT = "rate_limit"
+TIMEOUT = "timeout"
+SERVER = "server"
+EMPTY = "empty"
+CONTENT = "content"
+CLIENT = "client"
+UNKNOWN = "unknown"
+
+RETRYABLE_KINDS = (RATE_LIMIT, TIMEOUT, SERVER, EMPTY)
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 2.0  # seconds before the first retry (doubles per attempt)
+DEFAULT_MAX_DELAY = 60.0  # cap of the exponential backoff
+MAX_RETRY_AFTER = 600.0  # longer Retry-After values are clamped
+INLINE_MAX_TOTAL_DELAY = 5.0  # total inline wait of one RetryingLLMClient call
+
+_RATE_LIMIT_MARKERS = ("429", "rate limit", "ratelimit", "rate_limit", "too many requests", "quota")
+_TIMEOUT_MARKERS = ("timeout", "timed out")
+_SERVER_MARKERS = (
+    "internal server error", "bad gateway", "service unavailable", "gateway timeout",
+    "overloaded", "server error", "connection error", "connection reset", "apiconnectionerror"
+)
+_CONTENT_MARKERS = (
+    "content_filter", "content filter", "content management", "responsibleaipolicyviolation",
+    "safety", "blocked", "policy violation"
+)
+_SERVER_STATUS = re.compile(r"\b(500|502|503|504|529)\b")
+
+
+def classify_error(error_message: Optional[str], status_code: int = None) -> str:
+    """Classify a failed LLM call.
+
+    Args:
+        error_message: LLMResponse.error_message or exception text
+        status_code: HTTP status of the failure, if known
+
+    Returns:
+        One of rate_limit, timeout, server, empty, content, client, unknown
+    """
+    lowered = (error_message or "").lower()
+    if status_code == 429:
+        return RATE_LIMIT
+    if status_code in (408, 504):
+        return TIMEOUT
+    if status_code is not None and status_code >= 500:
+        return SERVER
+    if any(marker in lowered for marker in _CONTENT_MARKERS):
+        return CONTENT
+    if status_code is not None and 400 <= status_code < 500:
+        return CLIENT
+    if any(marker in lowered for marker in _RATE_LIMIT_MARKERS):
+        return RATE_LIMIT
+    if any(marker in lowered for marker in _TIMEOUT_MARKERS):
+        return TIMEOUT
+    if any(marker in lowered for marker in _SERVER_MARKERS) or _SERVER_STATUS.search(lowered):
+        return SERVER
+    if "empty response" in lowered or "none response" in lowered:
+        return EMPTY
+    return UNKNOWN
+
+
+@dataclass
+class RetryPolicy:
+    """When and after how long a failed call is retried."""
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS  # Total attempts, including the first call
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    max_retry_after: float = MAX_RETRY_AFTER
+    max_total_delay: Optional[float] = None  # Cap of the summed waits of one inline call (None: no cap)
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        """Check whether a call that failed on `attempt` (1-based) gets another one."""
+        return kind in RETRYABLE_KINDS and attempt < self.max_attempts
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        """Get the wait before the retry after `attempt` (1-based) failed.
+
+        Retry-After from the provider wins; otherwise the backoff doubles per
+        attempt (capped at max_delay) with jitter in [50%, 100%] so retries of
+        a burst of rate-limited items do not arrive together.
+        """
+        if retry_after is not None:
+            return max(0.0, min(retry_after, self.max_retry_after))
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return backoff * random.uniform(0.5, 1.0)
+
+
+class RetrySchedule:
+    """Delayed retries of one job's items, ordered by due time (thread-safe)."""
+
+    def __init__(self, policy: RetryPolicy = None):
+        self.policy = policy or RetryPolicy()
+        self._heap: List[Tuple[float, int, int, Any]] = []
+        self._attempts: Dict[int, int] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def attempts(self, item_id: int) -> int:
+        """Number of calls made for an item so far."""
+        with self._lock:
+            return self._attempts.get(item_id, 0)
+
+    def schedule(self, item_id: int, payload: Any, response: LLMResponse = None,
+                 error_message: str = None) -> Optional[float]:
+        """Record a failed call and re-queue the item if the policy allows it.
+
+        Args:
+            item_id: JobItem ID
+            payload: Whatever the executor needs to run the item again
+            response: Failed response (status_code/retry_after are honored)
+            error_message: Error text when the call raised instead of returning
+
+        Returns:
+            Delay in seconds until the retry, or None if the failure is final
+        """
+        message = response.error_message if response is not None else error_message
+        status_code = response.status_code if response is not None else None
+        retry_after = response.retry_after if response is not None else None
+        kind = classify_error(message, status_code)
+        with self._lock:
+            attempt = self._attempts.get(item_id, 0) + 1
+            self._attempts[item_id] = attempt
+            if not self.policy.should_retry(kind, attempt):
+                return None
+            delay = self.policy.delay(attempt, retry_after)
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item_id, payload))
+            self.retries += 1
+        logger.info(
+            f"[RETRY] Item {item_id}: {kind} on attempt {attempt}/{self.policy.max_attempts}, "
+            f"retrying in {delay:.1f}s"
+        )
+        return delay
+
+    def pop_due(self) -> Optional[Tuple[int, Any]]:
+        """Take the earliest retry whose time has come ((item_id, payload) or None)."""
+        with self._lock:
+            if self._heap and self._heap[0][0] <= time.monotonic():
+                _, _, item_id, payload = heapq.heappop(self._heap)
+                return item_id, payload
+            return None
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest retry is due (None if nothing is scheduled)."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def clear(self) -> List[int]:
+        """Drop all scheduled retries (job cancelled). Returns their item IDs."""
+        with self._lock:
+            item_ids = [entry[2] for entry in self._heap]
+            self._heap = []
+            return item_ids
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+
+def final_error_message(error_message: Optional[str], attempts: int) -> Optional[str]:
+    """Note the number of attempts on the error of an item that was retried."""
+    if attempts <= 1:
+        return error_message
+    return f"{error_message} (after {attempts} attempts)"
+
+
+class RetryingLLMClient(LLMClient):
+    """LLMClient proxy that retries failed calls inline.
+
+    For callers without a dispatch queue. Sleeps between attempts, so job
+    executors use RetrySchedule instead. The waits of one call are capped at
+    the policy's max_total_delay (INLINE_MAX_TOTAL_DELAY if it has none).
+    """
+
+    def __init__(self, client: LLMClient, policy: RetryPolicy = None):
+        self._client = client
+        self.policy = policy or RetryPolicy()
+        if self.policy.max_total_delay is None:
+            self.policy = replace(self.policy, max_total_delay=INLINE_MAX_TOTAL_DELAY)
+
+    def __getattr__(self, name):
+        # Delegate plugin-specific attributes (MODEL_NAME, client, ...)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def _retry_delay(self, response: LLMResponse, attempt: int, waited: float) -> Optional[float]:
+        if response.success:
+            return None
+        kind = classify_error(response.error_message, response.status_code)
+        if not self.policy.should_retry(kind, attempt):
+            return None
+        delay = self.policy.delay(attempt, response.retry_after)
+        if waited + delay > self.policy.max_total_delay:
+            logger.info(
+                f"[RETRY] {self._client.get_model_name()}: {kind} on attempt {attempt}, "
+                f"not waiting {delay:.1f}s (inline wait limit {self.policy.max_total_delay:.0f}s)"
+            )
+            return None
+        logger.info(f"[RETRY] {self._client.get_model_name()}: {kind} on attempt {attempt}, retrying in {delay:.1f}s")
+        return delay
+
+    def call(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        attempt = 1
+        waited = 0.0
+        while True:
+            response = self._client.call(prompt=prompt, messages=messages, images=images, **kwargs)
+            delay = self._retry_delay(response, attempt, waited)
+            if delay is None:
+                if not response.success:
+                    response.error_message = final_error_message(response.error_message, attempt)
+                return response
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    async def acall(self, prompt: str = None, messages: List[Message] = None, images: list = None, **kwargs) -> LLMResponse:
+        attempt = 1
+        waited = 0.0
+        while True:
+            response = await self._client.acall(prompt=prompt, messages=messages, images=images, **kwargs)
+            delay = self._retry_delay(response, attempt, waited)
+            if delay is None:
+                if not response.success:
+                    response.error_message = final_error_message(response.error_message, attempt)
+                return response
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def get_default_parameters(self) -> dict:
+        return self._client.get_default_parameters()
+
+    def get_model_name(self) -> str:
+        return self._client.get_model_name()
+
+    def get_parameter_schema(self):
+        return self._client.get_parameter_schema()
@@ -15,6 +15,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from backend.database.database import SessionLocal
+from backend.database.dialect import describe_table_columns, get_table_columns
 from backend.database.models import (
     Project, Prompt, PromptRevision, Workflow, WorkflowStep,
     Job, JobItem, WorkflowJob, SystemSetting, Dataset, ProjectDataset
@@ -23,6 +24,7 @@ from backend.job import JobManager
 from backend.workflow import WorkflowManager
 from backend.workflow_validator import validate_workflow, ValidationResult, get_available_variables_at_step
 from backend.llm.factory import get_llm_client, get_available_models
+from backend.llm.retry import RetryingLLMClient
 from backend.prompt import PromptTemplateParser
 
 logger = logging.getLogger(__name__)
@@ -1269,8 +1271,8 @@ Examples:
                 # Also try simple placeholder
                 filled_template = filled_template.replace("{{" + param.name + "}}", str(value))
 
-            # Execute with LLM
-            client = get_llm_client(model_name)
+            # Execute with LLM (retryable failures are retried inline)
+            client = RetryingLLMClient(get_llm_client(model_name), JobManager(db)._get_retry_policy())
             response = client.call(
                 prompt=filled_template,
                 temperature=temperature
@@ -1626,7 +1628,7 @@ Examples:
                     raise ValueError(f"Job {job_id} not found")
 
                 # Check if CSV data exists
-                has_csv = bool(job.merged_csv_output)
+                has_csv = job.has_merged_csv
                 if not has_csv:
                     # Check job items
                     items_with_csv = db.query(JobItem).filter(
@@ -2897,8 +2899,7 @@ Examples:
             try:
                 from sqlalchemy import text
                 # Get column names
-                result = db.execute(text(f'PRAGMA table_info("{dataset.sqlite_table_name}")'))
-                columns = [{"name": row[1], "type": row[2]} for row in result]
+                columns = describe_table_columns(db, dataset.sqlite_table_name)
 
                 # Get row count
                 count_result = db.execute(text(f'SELECT COUNT(*) FROM "{dataset.sqlite_table_name}"'))
@@ -2975,8 +2976,7 @@ Examples:
             table_name = dataset.sqlite_table_name
 
             # Get column names
-            col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-            columns = [row[1] for row in col_result]
+            columns = get_table_columns(db, table_name)
 
             if not columns:
                 return {
@@ -2994,13 +2994,13 @@ Examples:
                 # Search specific column
                 if column not in columns:
                     raise ValueError(f"Column '{column}' not found in dataset. Available columns: {columns}")
-                where_clause = f'"{column}" LIKE :pattern'
+                where_clause = f'LOWER(CAST("{column}" AS TEXT)) LIKE LOWER(:pattern)'
             else:
-                # Search all columns
-                conditions = [f'CAST("{col}" AS TEXT) LIKE :pattern' for col in columns]
+                # Search all columns (case-insensitive like SQLite's LIKE, also on PostgreSQL)
+                conditions = [f'LOWER(CAST("{col}" AS TEXT)) LIKE LOWER(:pattern)' for col in columns]
                 where_clause = " OR ".join(conditions)
 
-            sql = f'SELECT rowid, * FROM "{table_name}" WHERE {where_clause} LIMIT :limit'
+            sql = f'SELECT id, * FROM "{table_name}" WHERE {where_clause} LIMIT :limit'
             result = db.execute(text(sql), {"pattern": search_pattern, "limit": limit})
 
             rows = []
@@ -3045,8 +3045,7 @@ Examples:
             table_name = dataset.sqlite_table_name
 
             # Get column names
-            col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-            columns = [row[1] for row in col_result]
+            columns = get_table_columns(db, table_name)
 
             if not columns:
                 return {
@@ -3118,8 +3117,7 @@ Examples:
             table_name = dataset.sqlite_table_name
 
             # Get column names
-            col_result = db.execute(text(f'PRAGMA table_info("{table_name}")'))
-            columns = [row[1] for row in col_result]
+            columns = get_table_columns(db, table_name)
 
             if not columns:
                 raise ValueError("Dataset has no columns")
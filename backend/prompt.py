@@ -25,7 +25,7 @@ Rules:
 import re
 import os
 import logging
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -243,6 +243,28 @@ class PromptTemplateParser:
         Note: TEXTFILEPATH parameters always read file content and embed in prompt
         Note: Optional parameters use default value if not provided, or empty string
         """
+        return self.compile_template(template, allowed_dirs, text_extensions)(params)
+
+    def compile_template(
+        self,
+        template: str,
+        allowed_dirs: List[str] = None,
+        text_extensions: List[str] = None
+    ) -> Callable[[Dict[str, str]], str]:
+        """Parse a template once and return a function that renders it.
+
+        Batch job creation renders the same template for every dataset row;
+        compiling it up front avoids re-parsing parameter definitions per row.
+
+        Args:
+            template: Prompt template string with {{}} syntax
+            allowed_dirs: List of allowed directories for file access (security)
+            text_extensions: List of extensions to treat as text files for FILEPATH
+
+        Returns:
+            Function taking a params dict and returning the substituted prompt,
+            equivalent to substitute_parameters(template, params, ...)
+        """
         # Parse template to get parameter types, defaults, and required status
         param_defs = self.parse_template(template)
         file_params = {p.name for p in param_defs if p.type == self.TYPE_FILE}
@@ -271,69 +293,72 @@ class PromptTemplateParser:
             ext = _get_file_extension(file_path)
             return ext in text_ext_set
 
-        def replacer(match):
-            param_name = match.group(1)
-
-            # Exclude FILE parameters from prompt text (always sent as images)
-            if param_name in file_params:
-                return ""  # Remove FILE parameters from prompt text
-
-            # Handle FILEPATH: check if it's a text file
-            if param_name in filepath_params:
-                file_path = params.get(param_name, None)
-                if file_path and _is_text_file(file_path):
-                    # Text file: read and embed content
-                    try:
-                        content = self._read_text_file(file_path, allowed_dirs)
-                        logger.info(f"FILEPATH '{param_name}' treated as text file: {file_path}")
-                        return content
-                    except Exception as e:
-                        logger.error(f"Error reading text file '{file_path}' for FILEPATH '{param_name}': {e}")
-                        return f"[Error reading file: {e}]"
-                else:
-                    # Not a text file or no value: exclude from prompt (send as image)
-                    return ""
-
-            # Handle TEXTFILEPATH: always read file content and embed
-            if param_name in textfile_params:
-                file_path = params.get(param_name, None)
-                if file_path:
-                    try:
-                        content = self._read_text_file(file_path, allowed_dirs)
-                        return content
-                    except Exception as e:
-                        logger.error(f"Error reading text file '{file_path}' for parameter '{param_name}': {e}")
-                        return f"[Error reading file: {e}]"
-                elif param_name in defaults:
-                    # Try to read default file path
-                    try:
-                        content = self._read_text_file(defaults[param_name], allowed_dirs)
-                        return content
-                    except Exception as e:
-                        logger.error(f"Error reading default text file for parameter '{param_name}': {e}")
+        def render(params: Dict[str, str]) -> str:
+            def replacer(match):
+                param_name = match.group(1)
+
+                # Exclude FILE parameters from prompt text (always sent as images)
+                if param_name in file_params:
+                    return ""  # Remove FILE parameters from prompt text
+
+                # Handle FILEPATH: check if it's a text file
+                if param_name in filepath_params:
+                    file_path = params.get(param_name, None)
+                    if file_path and _is_text_file(file_path):
+                        # Text file: read and embed content
+                        try:
+                            content = self._read_text_file(file_path, allowed_dirs)
+                            logger.info(f"FILEPATH '{param_name}' treated as text file: {file_path}")
+                            return content
+                        except Exception as e:
+                            logger.error(f"Error reading text file '{file_path}' for FILEPATH '{param_name}': {e}")
+                            return f"[Error reading file: {e}]"
+                    else:
+                        # Not a text file or no value: exclude from prompt (send as image)
                         return ""
+
+                # Handle TEXTFILEPATH: always read file content and embed
+                if param_name in textfile_params:
+                    file_path = params.get(param_name, None)
+                    if file_path:
+                        try:
+                            content = self._read_text_file(file_path, allowed_dirs)
+                            return content
+                        except Exception as e:
+                            logger.error(f"Error reading text file '{file_path}' for parameter '{param_name}': {e}")
+                            return f"[Error reading file: {e}]"
+                    elif param_name in defaults:
+                        # Try to read default file path
+                        try:
+                            content = self._read_text_file(defaults[param_name], allowed_dirs)
+                            return content
+                        except Exception as e:
+                            logger.error(f"Error reading default text file for parameter '{param_name}': {e}")
+                            return ""
+                    elif param_name in optional_params:
+                        return ""  # Optional without value
+                    else:
+                        return match.group(0)  # Required without value - keep placeholder
+
+                # Get user-provided value (may be empty string)
+                user_value = params.get(param_name, None)
+
+                # If user provided non-empty value, use it
+                if user_value:
+                    return user_value
+                # If parameter has default value, use it (for empty or missing values)
+                elif param_name in defaults:
+                    return defaults[param_name]
+                # If parameter is optional, return empty string
                 elif param_name in optional_params:
-                    return ""  # Optional without value
+                    return ""  # Optional parameter without value → empty string
+                # Required parameter without value → keep placeholder (error case)
                 else:
-                    return match.group(0)  # Required without value - keep placeholder
-
-            # Get user-provided value (may be empty string)
-            user_value = params.get(param_name, None)
-
-            # If user provided non-empty value, use it
-            if user_value:
-                return user_value
-            # If parameter has default value, use it (for empty or missing values)
-            elif param_name in defaults:
-                return defaults[param_name]
-            # If parameter is optional, return empty string
-            elif param_name in optional_params:
-                return ""  # Optional parameter without value → empty string
-            # Required parameter without value → keep placeholder (error case)
-            else:
-                return match.group(0)
+                    return match.group(0)
 
-        return self.PARAM_PATTERN.sub(replacer, template)
+            return self.PARAM_PATTERN.sub(replacer, template)
+
+        return render
 
     def _read_text_file(self, file_path: str, allowed_dirs: List[str] = None) -> str:
         """Read text file content for TEXTFILEPATH parameter.
@@ -444,6 +469,21 @@ class PromptTemplateParser:
 
         return names
 
+    def static_prefix(self, template: str) -> str:
+        """Get the part of the template before its first parameter.
+
+        Every prompt rendered from the template starts with this text, so
+        providers can cache it across the rows of a batch.
+
+        Args:
+            template: Prompt template string with {{}} syntax
+
+        Returns:
+            Template text up to the first {{PARAM}} (the whole template if it has none)
+        """
+        match = self.PARAM_PATTERN.search(template or "")
+        return template[:match.start()] if match else (template or "")
+
 
 # ========== Message Role Parser ==========
 
@@ -558,7 +598,7 @@ class MessageRoleParser:
 
         return messages
 
-    def to_messages_list(self, prompt_text: str) -> List[Dict[str, str]]:
+    def to_messages_list(self, prompt_text: str, static_prefix: str = None) -> List[Dict[str, str]]:
         """Parse prompt text and return as list of message dicts.
 
         This is a convenience method that returns the format expected by
@@ -566,13 +606,46 @@ class MessageRoleParser:
 
         Args:
             prompt_text: Prompt text potentially containing role markers
+            static_prefix: Text every prompt of the batch starts with
+                (PromptTemplateParser.static_prefix). The message where it
+                ends gets a "_cache_prefix" key: the number of leading
+                characters of its content that belong to the prefix.
 
         Returns:
             List of dicts with 'role' and 'content' keys.
             Example: [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
         """
         parsed = self.parse_messages(prompt_text)
-        return [{"role": msg.role, "content": msg.content} for msg in parsed]
+        messages = [{"role": msg.role, "content": msg.content} for msg in parsed]
+        if static_prefix:
+            boundary = self._cache_prefix_boundary(parsed, self.parse_messages(static_prefix))
+            if boundary is not None:
+                index, length = boundary
+                messages[index]["_cache_prefix"] = length
+        return messages
+
+    @staticmethod
+    def _cache_prefix_boundary(parsed: List[ParsedMessage], prefix: List[ParsedMessage]):
+        """Find where the static prefix ends in the parsed messages.
+
+        Messages of the prefix must match the prompt's messages; only the
+        last one may continue with rendered parameters.
+
+        Returns:
+            (message index, static content length), or None if the prompt
+            does not start with the prefix
+        """
+        boundary = None
+        for index, static in enumerate(prefix):
+            if index >= len(parsed) or parsed[index].role != static.role:
+                break
+            content = parsed[index].content
+            if not content.startswith(static.content):
+                break
+            boundary = (index, len(static.content))
+            if content != static.content:
+                break
+        return boundary
 
     def has_role_markers(self, prompt_text: str) -> bool:
         """Check if prompt text contains any role markers.
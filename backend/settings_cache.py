@@ -0,0 +1,224 @@
+"""In-process cache of system settings.
+
+Job execution used to query system_settings several times per job
+(parallelism, execution mode, model parameters, cache/retry/hedging
+settings, ...), and the agent engine re-read its limits on every run.
+All settings are now loaded with one query into a snapshot per database,
+and readers use the snapshot:
+
+    cache = get_settings_cache()
+    cache.get_int(db, "job_parallelism", 1, 1, 99)
+    settings = cache.values(db)  # read-only {key: value}
+
+Invalidation: a Session event hook collects SystemSetting rows that were
+added, changed or deleted in a flush. After the commit the cache bumps its
+version, drops the snapshots and notifies subscribers with the changed
+keys. The settings PUT/DELETE handlers write through the ORM, so every
+handler invalidates the cache when it commits.
+
+The version is process-local. Snapshots older than max_age are reloaded to
+pick up settings committed by other processes.
+"""
+
+import json
+import logging
+import threading
+import time
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, FrozenSet, List, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .database.models import SystemSetting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 30.0  # seconds before a snapshot is reloaded
+
+_PENDING_KEYS = "settings_cache_pending_keys"  # Session.info key of changed settings
+
+# Callback receiving the changed keys (None: everything may have changed)
+SettingsListener = Callable[[Optional[FrozenSet[str]]], None]
+
+
+class _Snapshot:
+    __slots__ = ("version", "loaded_at", "values")
+
+    def __init__(self, version: int, values: Mapping[str, Optional[str]]):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.values = values
+
+
+class SettingsCache:
+    """Thread-safe snapshots of system_settings, one per database engine."""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._snapshots: "weakref.WeakKeyDictionary[Any, _Snapshot]" = weakref.WeakKeyDictionary()
+        self._version = 0
+        self._listeners: List[SettingsListener] = []
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    @property
+    def version(self) -> int:
+        """Incremented on every invalidation (process-local)."""
+        with self._lock:
+            return self._version
+
+    def values(self, db: Session) -> Mapping[str, Optional[str]]:
+        """Get all settings of the session's database as a read-only mapping."""
+        if db.info.get(_PENDING_KEYS):
+            # Uncommitted setting changes in this session: read them, do not cache
+            return self._load(db)
+
+        engine = db.get_bind().engine
+        with self._lock:
+            snapshot = self._snapshots.get(engine)
+            version = self._version
+        if (snapshot is not None and snapshot.version == version
+                and time.monotonic() - snapshot.loaded_at < self.max_age):
+            return snapshot.values
+
+        values = self._load(db)
+        with self._lock:
+            # Keep it unless an invalidation happened while loading
+            if self._version == version:
+                self._snapshots[engine] = _Snapshot(version, values)
+        return values
+
+    def _load(self, db: Session) -> Mapping[str, Optional[str]]:
+        rows = db.query(SystemSetting.key, SystemSetting.value).all()
+        with self._lock:
+            self.loads += 1
+        return MappingProxyType({key: value for key, value in rows})
+
+    def get(self, db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a raw setting value (default only if the key does not exist)."""
+        return self.values(db).get(key, default)
+
+    def get_int(self, db: Session, key: str, default: int,
+                minimum: int = None, maximum: int = None) -> int:
+        """Get an integer setting, clamped to [minimum, maximum].
+
+        Unset, empty and non-numeric values give the default.
+        """
+        value = self.get(db, key)
+        if not value:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            return default
+        if minimum is not None:
+            number = max(minimum, number)
+        if maximum is not None:
+            number = min(maximum, number)
+        return number
+
+    def get_float(self, db: Session, key: str, default: float,
+                  minimum: float = None, maximum: float = None) -> float:
+        """Get a float setting, clamped to [minimum, maximum] (default if unset or invalid)."""
+        value = self.get(db, key)
+        if not value:
+            return default
+        try:
+            number = float(value)
+        except ValueError:
+            return default
+        if minimum is not None:
+            number = max(minimum, number)
+        if maximum is not None:
+            number = min(maximum, number)
+        return number
+
+    def get_bool(self, db: Session, key: str, default: bool = False) -> bool:
+        """Get a "true"/"false" setting (default if unset or empty)."""
+        value = self.get(db, key)
+        if not value:
+            return default
+        return value.strip().lower() == "true"
+
+    def get_json(self, db: Session, key: str, default: Any = None) -> Any:
+        """Get a JSON setting, parsed on every call (default if unset or invalid)."""
+        value = self.get(db, key)
+        if not value:
+            return default
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            return default
+
+    def invalidate(self, keys: Optional[FrozenSet[str]] = None):
+        """Drop all snapshots and notify subscribers.
+
+        Args:
+            keys: Changed setting keys (None if unknown)
+        """
+        with self._lock:
+            self._version += 1
+            self._snapshots.clear()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(keys)
+            except Exception as e:
+                logger.warning(f"[SETTINGS] Change listener failed: {e}")
+
+    def subscribe(self, listener: SettingsListener):
+        """Call listener(changed_keys) after settings changes are committed."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: SettingsListener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+# ========== Session hooks ==========
+
+@event.listens_for(Session, "after_flush")
+def _collect_setting_changes(session: Session, flush_context):
+    keys = {
+        obj.key for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, SystemSetting)
+    }
+    if keys:
+        session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    keys = session.info.pop(_PENDING_KEYS, None)
+    if keys:
+        get_settings_cache().invalidate(frozenset(keys))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop(_PENDING_KEYS, None)
+
+
+# Singleton instance
+_settings_cache = None
+_settings_cache_lock = threading.Lock()
+
+
+def get_settings_cache() -> SettingsCache:
+    """Get the process-wide settings cache."""
+    global _settings_cache
+    if _settings_cache is None:
+        with _settings_cache_lock:
+            if _settings_cache is None:
+                _settings_cache = SettingsCache()
+    return _settings_cache
+
+
+def reset_settings_cache():
+    """Reset the cache (for testing)."""
+    global _settings_cache
+    _settings_cache = None
@@ -0,0 +1,175 @@
+"""Token usage and cost reports.
+
+Plugins copy the token counts of each provider response into LLMResponse
+(see backend.llm.base.extract_usage) and JobManager stores them on the job
+item. This module aggregates the stored counts per job or per model with one
+SQL query and derives:
+
+- tokens_per_second: completion tokens per second of LLM call time
+- cached_ratio: share of prompt tokens served from the provider prompt cache
+- cache_hit_rate: share of items whose prompt prefix was a cache hit
+- cost: estimate from the price table in system settings (llm_price_table)
+
+The price table is a JSON object of USD prices per 1M tokens by model name:
+{"azure-gpt-4.1": {"input": 2.0, "output": 8.0, "cached_input": 0.5}}
+cached_input defaults to input. Models without an entry report cost None.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .database.models import Job, JobItem
+from .settings_cache import get_settings_cache
+
+logger = logging.getLogger(__name__)
+
+# JobItem columns holding provider token counts (same names as LLMResponse fields)
+TOKEN_USAGE_COLUMNS = ("prompt_tokens", "completion_tokens", "reasoning_tokens", "cached_tokens")
+
+PRICE_TABLE_SETTING_KEY = "llm_price_table"
+PRICE_FIELDS = ("input", "output", "cached_input")
+
+
+def load_price_table(db: Session) -> Dict[str, Dict[str, float]]:
+    """Load the per-model price table from system settings.
+
+    Args:
+        db: Database session
+
+    Returns:
+        {model_name: {"input": usd, "output": usd[, "cached_input": usd]}}
+        per 1M tokens; empty if unset or invalid
+    """
+    value = get_settings_cache().get(db, PRICE_TABLE_SETTING_KEY)
+    if not value:
+        return {}
+    try:
+        table = json.loads(value)
+    except ValueError:
+        logger.warning(f"[USAGE] Ignoring invalid {PRICE_TABLE_SETTING_KEY} setting")
+        return {}
+    return table if isinstance(table, dict) else {}
+
+
+def validate_price_table(table: dict) -> Optional[str]:
+    """Check a price table before saving it.
+
+    Returns:
+        Error message, or None if the table is valid
+    """
+    for model_name, prices in table.items():
+        if not isinstance(prices, dict) or "input" not in prices or "output" not in prices:
+            return f"Prices for {model_name} need input and output"
+        for field, value in prices.items():
+            if field not in PRICE_FIELDS:
+                return f"Unknown price field {field} for {model_name} (expected {', '.join(PRICE_FIELDS)})"
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                return f"Price {field} for {model_name} must be a non-negative number"
+    return None
+
+
+def estimate_cost(prices: Optional[dict], prompt_tokens: int, completion_tokens: int,
+                  cached_tokens: int) -> Optional[float]:
+    """Estimate the USD cost of token counts.
+
+    Args:
+        prices: Price table entry of the model (None if unpriced)
+        prompt_tokens: Input tokens, including cached_tokens
+        completion_tokens: Output tokens, including reasoning tokens
+        cached_tokens: Input tokens read from the prompt cache
+
+    Returns:
+        Cost in USD, or None if the model has no price entry
+    """
+    if not prices:
+        return None
+    cached_price = prices.get("cached_input", prices["input"])
+    cost = (
+        (prompt_tokens - cached_tokens) * prices["input"]
+        + cached_tokens * cached_price
+        + completion_tokens * prices["output"]
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+def _usage_columns():
+    return [
+        func.count(JobItem.id),
+        func.count(JobItem.prompt_tokens),
+        *[func.coalesce(func.sum(getattr(JobItem, column)), 0) for column in TOKEN_USAGE_COLUMNS],
+        # Call time of the items that reported usage
+        func.coalesce(func.sum(JobItem.turnaround_ms).filter(JobItem.completion_tokens.isnot(None)), 0),
+        func.count(JobItem.id).filter(JobItem.cached_tokens > 0),
+    ]
+
+
+def _build_report(row, prices: Optional[dict]) -> dict:
+    item_count, reported_items, prompt, completion, reasoning, cached, call_ms, cache_hit_items = row
+    return {
+        "item_count": item_count,
+        "reported_items": reported_items,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "reasoning_tokens": reasoning,
+        "cached_tokens": cached,
+        "total_tokens": prompt + completion,
+        "tokens_per_second": round(completion / (call_ms / 1000), 2) if call_ms else None,
+        "cached_ratio": round(cached / prompt, 4) if prompt else None,
+        "cache_hit_items": cache_hit_items,
+        "cache_hit_rate": round(cache_hit_items / reported_items, 4) if reported_items else None,
+        "cost": estimate_cost(prices, prompt, completion, cached),
+    }
+
+
+def get_job_usage(db: Session, job_id: int) -> Optional[dict]:
+    """Aggregate the token usage of a job.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Returns:
+        Usage report, or None if the job does not exist. Besides the
+        per-call tokens_per_second, job_tokens_per_second relates all tokens
+        to the job's wall-clock time (reflects parallelism).
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        return None
+    row = db.query(*_usage_columns()).filter(JobItem.job_id == job_id).one()
+    prices = load_price_table(db).get(job.model_name) if job.model_name else None
+
+    report = {"job_id": job.id, "model_name": job.model_name, **_build_report(row, prices)}
+    report["job_tokens_per_second"] = (
+        round(report["total_tokens"] / (job.turnaround_ms / 1000), 2) if job.turnaround_ms else None
+    )
+    return report
+
+
+def get_model_usage(db: Session) -> List[dict]:
+    """Aggregate token usage per model over all jobs.
+
+    Args:
+        db: Database session
+
+    Returns:
+        One usage report per model that reported usage, by total tokens descending
+    """
+    rows = (
+        db.query(Job.model_name, *_usage_columns())
+        .join(Job, JobItem.job_id == Job.id)
+        .group_by(Job.model_name)
+        .having(func.count(JobItem.prompt_tokens) > 0)
+        .all()
+    )
+    price_table = load_price_table(db)
+    reports = [
+        {"model_name": row[0], **_build_report(row[1:], price_table.get(row[0]))}
+        for row in rows
+    ]
+    reports.sort(key=lambda report: report["total_tokens"], reverse=True)
+    return reports
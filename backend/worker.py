@@ -0,0 +1,212 @@
+"""Standalone job worker.
+
+Jobs normally run inside the web process: the scheduler starts a thread per
+job, so CPU-heavy parsing, image processing and CSV merging compete with
+API requests, and execution cannot grow beyond one machine. With
+JOB_RUNNER=worker in the web process's environment, enqueue_job() only
+writes the durable queue row (see job_queue) and worker processes execute
+the jobs:
+
+    python -m backend.worker --concurrency 4
+    python -m backend.worker --lanes azure-gpt-4.1,gpt-5-mini
+
+Each worker claims unleased rows (lowest priority value, then oldest) with
+the same lease and heartbeat as the in-process scheduler and runs them with
+JobManager. Any number of workers can share the database, on one or more
+machines. A worker that dies stops renewing its leases; another worker takes
+the job over once the lease expires (right away on the same host) and
+continues with the unfinished items. A worker that only stalled (and lost
+its lease meanwhile) stops the job once its heartbeat notices and leaves
+the final status to the new owner.
+
+The scheduler settings apply across all workers: a job is only claimed
+while its lane has fewer live leases than its lane concurrency, and while
+fewer than max_running jobs are leased in total (checked by the claiming
+UPDATE itself, so concurrent claims cannot overshoot). Single runs may use one
+reserved slot beyond both, as in the in-process scheduler. --concurrency
+caps the jobs of one worker process.
+
+SIGINT/SIGTERM stop claiming and wait for the running jobs; a second signal
+exits right away (the jobs are taken over after their leases expire).
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .database.models import JobQueueEntry
+from .job_queue import JobQueueStore
+from .job_scheduler import INTERACTIVE_RESERVED_SLOTS, PRIORITY_INTERACTIVE, load_job_scheduler_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_CONCURRENCY = 4
+MAX_WORKER_CONCURRENCY = 256
+DEFAULT_POLL_SECONDS = 1.0
+
+
+class JobWorker:
+    """Claims jobs from the durable queue and executes them on local threads."""
+
+    def __init__(
+        self,
+        store: JobQueueStore,
+        session_factory: Callable,
+        runner: Optional[Callable[[JobQueueStore, dict], None]] = None,
+        concurrency: int = DEFAULT_WORKER_CONCURRENCY,
+        lanes: Optional[List[str]] = None,
+        poll_seconds: float = DEFAULT_POLL_SECONDS
+    ):
+        """Initialize worker.
+
+        Args:
+            store: Durable queue (its owner ID identifies this worker)
+            session_factory: Creates sessions for reading scheduler settings
+            runner: Executes a leased job config (default: execute_leased_job)
+            concurrency: Jobs running at once in this worker
+            lanes: Only claim jobs of these lanes (None: any lane)
+            poll_seconds: Wait between claims while the queue is empty or full
+        """
+        if runner is None:
+            from .job_scheduler import execute_leased_job
+            runner = execute_leased_job
+        self.store = store
+        self._session_factory = session_factory
+        self._runner = runner
+        self.concurrency = max(1, min(concurrency, MAX_WORKER_CONCURRENCY))
+        self.lanes = list(lanes) if lanes else None
+        self.poll_seconds = poll_seconds
+
+        self._running: Dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def running_job_ids(self) -> List[int]:
+        with self._lock:
+            return sorted(self._running)
+
+    def _load_limits(self) -> dict:
+        db = self._session_factory()
+        try:
+            return load_job_scheduler_settings(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claim_limits(limits: dict, entry: JobQueueEntry) -> Tuple[int, int]:
+        """Get the scheduler's lane and global limits (live leases) for a candidate."""
+        reserved = INTERACTIVE_RESERVED_SLOTS if entry.priority <= PRIORITY_INTERACTIVE else 0
+        lane_limit = limits["lane_overrides"].get(entry.lane, limits["lane_concurrency"])
+        return lane_limit + reserved, limits["max_running"] + reserved
+
+    def claim_one(self) -> Optional[int]:
+        """Claim one job and start it on a thread if this worker has a free slot.
+
+        Returns:
+            ID of the started job, or None
+        """
+        with self._lock:
+            if self._stopping.is_set() or len(self._running) >= self.concurrency:
+                return None
+        limits = self._load_limits()
+        job_config = self.store.claim_next(
+            lanes=self.lanes,
+            limits=lambda entry: self._claim_limits(limits, entry)
+        )
+        if job_config is None:
+            return None
+
+        job_id = job_config["job_id"]
+        thread = threading.Thread(target=self._run, args=(job_config,), name=f"worker_job_{job_id}", daemon=True)
+        with self._lock:
+            self._running[job_id] = thread
+        thread.start()
+        logger.info(f"[WORKER] Claimed job {job_id} (model={job_config.get('model_name')})")
+        return job_id
+
+    def _run(self, job_config: dict):
+        job_id = job_config["job_id"]
+        try:
+            self._runner(self.store, job_config)
+        except Exception as e:
+            logger.error(f"[WORKER] Job {job_id} failed: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+
+    def run(self):
+        """Claim and execute jobs until stop() is called, then wait for running jobs."""
+        pruned = self.store.prune()
+        logger.info(
+            f"[WORKER] {self.store.owner} started (concurrency={self.concurrency}, "
+            f"lanes={self.lanes or 'all'}, queued={len(pruned)})"
+        )
+        while not self._stopping.is_set():
+            try:
+                while self.claim_one() is not None:
+                    pass
+            except Exception as e:
+                logger.error(f"[WORKER] Claiming jobs failed: {e}")
+            self._stopping.wait(self.poll_seconds)
+
+        with self._lock:
+            threads = list(self._running.values())
+        if threads:
+            logger.info(f"[WORKER] Waiting for {len(threads)} running job(s)")
+        for thread in threads:
+            thread.join()
+        logger.info(f"[WORKER] {self.store.owner} stopped")
+
+    def stop(self):
+        """Stop claiming jobs (run() returns once the running jobs finished)."""
+        self._stopping.set()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.worker",
+        description="Execute queued jobs outside the web process (set JOB_RUNNER=worker for the web process)"
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKER_CONCURRENCY,
+                        help=f"jobs running at once in this worker (default {DEFAULT_WORKER_CONCURRENCY})")
+    parser.add_argument("--lanes", default=None,
+                        help="comma-separated models to take jobs for (default: all)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_SECONDS,
+                        help=f"seconds between queue polls (default {DEFAULT_POLL_SECONDS})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Importing the database package loads .env
+    from .database import SessionLocal, init_db
+    from .job_queue import get_job_queue_store
+
+    init_db()
+    lanes = [lane.strip() for lane in args.lanes.split(",") if lane.strip()] if args.lanes else None
+    worker = JobWorker(
+        get_job_queue_store(),
+        SessionLocal,
+        concurrency=args.concurrency,
+        lanes=lanes,
+        poll_seconds=args.poll_interval
+    )
+
+    def handle_signal(signum, frame):
+        if worker._stopping.is_set():
+            logger.warning("[WORKER] Exiting without waiting for running jobs")
+            sys.exit(1)
+        logger.info("[WORKER] Stopping, waiting for running jobs (signal again to exit now)")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    worker.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
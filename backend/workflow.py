@@ -18,6 +18,7 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
+from .database.dialect import get_table_columns
 
 from .database.models import (
     Workflow, WorkflowStep, WorkflowJob, WorkflowJobStep,
@@ -1862,8 +1863,7 @@ class WorkflowManager:
 
         # Get column names from table
         try:
-            col_result = self.db.execute(text(f'PRAGMA table_info("{table_name}")'))
-            all_columns = [row[1] for row in col_result]
+            all_columns = get_table_columns(self.db, table_name)
         except Exception as e:
             logger.error(f"Failed to get columns for dataset {dataset_id}: {e}")
             return []
@@ -1908,7 +1908,7 @@ class WorkflowManager:
                 # Seed specified: fetch all then use Python shuffle for reproducibility
                 pass  # Don't add ORDER BY RANDOM() - will shuffle in Python
             else:
-                # No seed: use SQL RANDOM() for efficiency
+                # No seed: use SQL RANDOM() for efficiency (SQLite and PostgreSQL)
                 sql += ' ORDER BY RANDOM()'
 
         if limit_clause and not (use_random and random_seed is not None):
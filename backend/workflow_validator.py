@@ -17,7 +17,7 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 
-from sqlalchemy import text
+from .database.dialect import get_table_columns
 from .database.models import Workflow, WorkflowStep, Prompt, PromptRevision, Dataset
 from .formula_parser import FormulaParser, validate_formula, TokenizerError, ParseError
 
@@ -1769,8 +1769,7 @@ def get_dataset_columns(db: Session, dataset_id: int) -> List[str]:
         return []
 
     try:
-        col_result = db.execute(text(f'PRAGMA table_info("{dataset.sqlite_table_name}")'))
-        return [row[1] for row in col_result]
+        return get_table_columns(db, dataset.sqlite_table_name)
     except Exception as e:
         logger.error(f"Failed to get columns for dataset {dataset_id}: {e}")
         return []
@@ -0,0 +1,227 @@
+"""Tests for adaptive per-model concurrency control (AIMD).
+
+Test Categories:
+1. Additive increase / multiplicative decrease
+2. Slot gating for threads and asyncio
+3. Settings API
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db
+from backend.llm.base import LLMClient, LLMResponse
+from backend.llm.concurrency import (
+    AdaptiveConcurrencyController,
+    is_congestion_error,
+    get_concurrency_controller,
+    reset_concurrency_controller,
+)
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class SlowClient(LLMClient):
+    """Client that tracks peak concurrency and can return rate limit errors."""
+
+    def __init__(self, delay: float = 0.02, rate_limited: bool = False):
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if self.rate_limited:
+            return LLMResponse(success=False, error_message="Error code: 429 - Rate limit reached", turnaround_ms=20)
+        return LLMResponse(success=True, response_text="ok", turnaround_ms=20)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "slow-model"
+
+
+@pytest.fixture
+def controller():
+    return AdaptiveConcurrencyController(max_limit=8)
+
+
+@pytest.fixture
+def client():
+    """API client with an in-memory database."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    reset_concurrency_controller()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    reset_concurrency_controller()
+
+
+# ============================================================================
+# AIMD
+# ============================================================================
+
+class TestAIMD:
+
+    def test_congestion_classification(self):
+        assert is_congestion_error("Error code: 429 - Too Many Requests")
+        assert is_congestion_error("RateLimitError: quota exceeded")
+        assert is_congestion_error("Request timed out.")
+        assert not is_congestion_error("Failed to generate: invalid prompt")
+        assert not is_congestion_error(None)
+
+    def test_additive_increase(self, controller):
+        for _ in range(10):
+            controller.acquire("m", initial_limit=2)
+            controller.release("m", True, latency_ms=100)
+        # 1/limit per success: 2 -> 2.5 -> 2.9 -> ... -> ~4.997 after 10 successes
+        assert controller.get_limits()["m"]["limit"] == 4
+
+    def test_increase_capped_at_max(self, controller):
+        for _ in range(200):
+            controller.acquire("m", initial_limit=4)
+            controller.release("m", True, latency_ms=100)
+        assert controller.get_limits()["m"]["limit"] == 8
+
+    def test_no_increase_when_latency_degrades(self, controller):
+        controller.acquire("m", initial_limit=4)
+        controller.release("m", True, latency_ms=100)
+        for _ in range(20):
+            controller.acquire("m")
+            controller.release("m", True, latency_ms=2000)
+        assert controller.get_limits()["m"]["limit"] == 4
+
+    def test_multiplicative_decrease_with_cooldown(self, controller):
+        controller.acquire("m", initial_limit=8)
+        controller.release("m", False, error_message="429 Too Many Requests")
+        assert controller.get_limits()["m"]["limit"] == 4
+
+        # Second congestion signal within the cooldown is counted but not applied
+        controller.record_congestion("m")
+        limits = controller.get_limits()["m"]
+        assert limits["limit"] == 4
+        assert limits["congestion_events"] == 2
+
+    def test_other_errors_do_not_decrease(self, controller):
+        controller.acquire("m", initial_limit=4)
+        controller.release("m", False, error_message="Invalid request")
+        assert controller.get_limits()["m"]["limit"] == 4
+
+    def test_limits_are_per_model(self, controller):
+        controller.acquire("a", initial_limit=4)
+        controller.acquire("b", initial_limit=4)
+        controller.release("a", False, error_message="429")
+        controller.release("b", True, latency_ms=10)
+        limits = controller.get_limits()
+        assert limits["a"]["limit"] == 2
+        assert limits["b"]["limit"] == 4
+
+
+# ============================================================================
+# Slot gating
+# ============================================================================
+
+class TestGating:
+
+    def test_wrapped_client_respects_limit(self, controller):
+        inner = SlowClient()
+        wrapped = controller.wrap(inner, initial_limit=3)
+        controller.LATENCY_TOLERANCE = 0  # never healthy -> no growth
+
+        threads = [threading.Thread(target=wrapped.call, kwargs={"prompt": "x"}) for _ in range(12)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert inner.peak == 3
+        assert controller.get_limits()["slow-model"]["in_flight"] == 0
+        assert wrapped.get_model_name() == "slow-model"
+
+    def test_rate_limits_shrink_limit(self, controller):
+        wrapped = controller.wrap(SlowClient(rate_limited=True), initial_limit=8)
+        response = wrapped.call(prompt="x")
+        assert not response.success
+        assert controller.get_limits()["slow-model"]["limit"] == 4
+
+    def test_async_acquire(self, controller):
+        async def run():
+            controller.acquire("m", initial_limit=1)
+            waiter = asyncio.create_task(controller.acquire_async("m"))
+            await asyncio.sleep(0.1)
+            assert not waiter.done()
+            controller.release("m", True, latency_ms=10)
+            await asyncio.wait_for(waiter, timeout=1)
+
+        asyncio.run(run())
+        assert controller.get_limits()["m"]["in_flight"] == 1
+
+
+# ============================================================================
+# Settings API
+# ============================================================================
+
+class TestSettingsAPI:
+
+    def test_defaults(self, client):
+        response = client.get("/api/settings/adaptive-concurrency")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is False
+        assert data["max_limit"] == 32
+        assert data["limits"] == {}
+
+    def test_update_and_report_limits(self, client):
+        response = client.put("/api/settings/adaptive-concurrency?enabled=true&max_limit=16")
+        assert response.status_code == 200
+        assert response.json()["enabled"] is True
+
+        controller = get_concurrency_controller()
+        controller.acquire("azure-gpt-4.1", initial_limit=4)
+        controller.release("azure-gpt-4.1", True, latency_ms=500)
+
+        data = client.get("/api/settings/adaptive-concurrency").json()
+        assert data["max_limit"] == 16
+        assert data["limits"]["azure-gpt-4.1"]["limit"] == 4
+
+        assert client.delete("/api/settings/adaptive-concurrency/limits").status_code == 200
+        assert client.get("/api/settings/adaptive-concurrency").json()["limits"] == {}
+
+    def test_invalid_max(self, client):
+        response = client.put("/api/settings/adaptive-concurrency?enabled=true&max_limit=0")
+        assert response.status_code == 400
@@ -0,0 +1,206 @@
+"""Tests for streaming, chunked batch job creation.
+
+Test Categories:
+1. create_batch_job item creation across chunk boundaries
+2. Deferred item creation (populate_batch_job_items)
+3. Precompiled prompt templates
+"""
+
+import json
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Project, ProjectRevision, Dataset, Job, JobItem
+from backend.job import JobManager
+from backend.prompt import PromptTemplateParser
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def test_db():
+    """Create an in-memory SQLite database for testing."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def dataset_setup(test_db):
+    """Create a project revision and a 25-row dataset table."""
+    project = Project(name="Batch Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(
+        project_id=project.id,
+        revision=1,
+        prompt_template="Q: {{question}} ({{note:TEXT1|none}})"
+    )
+    test_db.add(revision)
+
+    table_name = "Dataset_PJ1_test"
+    test_db.execute(text(
+        f'CREATE TABLE "{table_name}" (id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT, note TEXT)'
+    ))
+    for i in range(25):
+        test_db.execute(
+            text(f'INSERT INTO "{table_name}" (question, note) VALUES (:q, :n)'),
+            {"q": f"q{i}", "n": None if i % 2 else f"n{i}"}
+        )
+    dataset = Dataset(
+        project_id=project.id,
+        name="questions",
+        source_file_name="questions.csv",
+        sqlite_table_name=table_name
+    )
+    test_db.add(dataset)
+    test_db.commit()
+    return revision, dataset
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(JobManager, "BATCH_ITEM_CHUNK_SIZE", 10)
+
+
+# ============================================================================
+# create_batch_job
+# ============================================================================
+
+class TestCreateBatchJob:
+
+    def test_items_created_across_chunks(self, test_db, dataset_setup, small_chunks):
+        revision, dataset = dataset_setup
+        job = JobManager(test_db).create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id
+        )
+
+        items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+        assert len(items) == 25
+        assert job.status == "pending"
+        assert all(item.status == "pending" and item.created_at for item in items)
+
+        assert json.loads(items[0].input_params) == {"question": "q0", "note": "n0"}
+        assert items[0].raw_prompt == "Q: q0 (n0)"
+        # NULL values become "" and fall back to the template default
+        assert json.loads(items[1].input_params) == {"question": "q1", "note": ""}
+        assert items[1].raw_prompt == "Q: q1 (none)"
+        assert items[24].raw_prompt == "Q: q24 (n24)"
+
+    def test_empty_dataset(self, test_db, dataset_setup):
+        revision, dataset = dataset_setup
+        test_db.execute(text(f'DELETE FROM "{dataset.sqlite_table_name}"'))
+        test_db.commit()
+
+        job = JobManager(test_db).create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id
+        )
+        assert test_db.query(JobItem).filter(JobItem.job_id == job.id).count() == 0
+
+    def test_missing_dataset(self, test_db, dataset_setup):
+        revision, _ = dataset_setup
+        with pytest.raises(ValueError):
+            JobManager(test_db).create_batch_job(project_revision_id=revision.id, dataset_id=999)
+
+
+# ============================================================================
+# Deferred creation
+# ============================================================================
+
+class TestDeferredItems:
+
+    def test_defer_returns_job_without_items(self, test_db, dataset_setup, small_chunks):
+        revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        job = manager.create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id,
+            defer_items=True
+        )
+        assert test_db.query(JobItem).filter(JobItem.job_id == job.id).count() == 0
+
+        assert manager.populate_batch_job_items(job.id) == 25
+        assert test_db.query(JobItem).filter(JobItem.job_id == job.id).count() == 25
+
+    def test_populate_stops_when_cancelled(self, test_db, dataset_setup, small_chunks):
+        revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        job = manager.create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id,
+            defer_items=True
+        )
+        job.status = "cancelled"
+        test_db.commit()
+
+        # The first chunk is written before the status check
+        assert manager.populate_batch_job_items(job.id) == 10
+
+    def test_populate_resumes_after_interruption(self, test_db, dataset_setup, small_chunks):
+        revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        job = manager.create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id,
+            defer_items=True
+        )
+        job.status = "cancelled"
+        test_db.commit()
+        assert manager.populate_batch_job_items(job.id) == 10
+
+        job.status = "pending"
+        test_db.commit()
+        assert manager.populate_batch_job_items(job.id) == 15
+        items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+        assert [item.raw_prompt.split(" ")[1] for item in items] == [f"q{i}" for i in range(25)]
+
+        # Fully populated: nothing left to create
+        assert manager.populate_batch_job_items(job.id) == 0
+
+    def test_populate_failure_marks_job_error(self, test_db, dataset_setup):
+        revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        job = manager.create_batch_job(
+            project_revision_id=revision.id,
+            dataset_id=dataset.id,
+            defer_items=True
+        )
+        test_db.execute(text(f'DROP TABLE "{dataset.sqlite_table_name}"'))
+        test_db.commit()
+
+        with pytest.raises(Exception):
+            manager.populate_batch_job_items(job.id)
+        test_db.expire_all()
+        assert test_db.query(Job).filter(Job.id == job.id).first().status == "error"
+
+
+# ============================================================================
+# Precompiled templates
+# ============================================================================
+
+class TestCompileTemplate:
+
+    def test_matches_substitute_parameters(self):
+        parser = PromptTemplateParser()
+        template = "{{a}} / {{b:NUM|7}} / {{img:FILE}} / {{c:TEXT2|}} / {{d}}"
+        render = parser.compile_template(template)
+        for params in [{"a": "x", "b": "1"}, {"a": "", "img": "data"}, {}]:
+            assert render(params) == parser.substitute_parameters(template, params)
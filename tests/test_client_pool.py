@@ -0,0 +1,136 @@
+"""Tests for the shared SDK client registry.
+
+Test Categories:
+1. Client reuse and invalidation
+2. Async clients per event loop
+3. Plugins and pool sizing
+"""
+
+import asyncio
+import pytest
+from anthropic import Anthropic
+from openai import AsyncOpenAI, OpenAI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, SystemSetting
+from backend.job import JobManager
+from backend.llm.azure_gpt_4_1 import AzureGPT41Client
+from backend.llm.client_pool import SDKClientRegistry, get_sdk_client_registry, reset_sdk_client_registry
+
+
+def _max_connections(client) -> int:
+    return client._client._transport._pool._max_connections
+
+
+@pytest.fixture
+def registry():
+    reset_sdk_client_registry()
+    yield get_sdk_client_registry()
+    reset_sdk_client_registry()
+
+
+# ============================================================================
+# Reuse and invalidation
+# ============================================================================
+
+class TestClientReuse:
+
+    def test_same_configuration_is_reused(self):
+        registry = SDKClientRegistry(max_connections=12)
+        first = registry.get("model-a", OpenAI, api_key="key-1")
+        assert registry.get("model-a", OpenAI, api_key="key-1") is first
+        assert registry.get("model-b", OpenAI, api_key="key-1") is not first
+        assert _max_connections(first) == 12
+        assert (registry.created, registry.reused) == (2, 1)
+
+    def test_changed_credentials_replace_the_client(self):
+        registry = SDKClientRegistry()
+        first = registry.get("model-a", OpenAI, api_key="key-1")
+        second = registry.get("model-a", OpenAI, api_key="key-2")
+        assert second is not first
+        assert registry.get("model-a", OpenAI, api_key="key-2") is second
+        assert registry.stats()["clients"] == ["model-a:OpenAI"]
+
+    def test_configure_and_invalidate(self):
+        registry = SDKClientRegistry(max_connections=10)
+        first = registry.get("model-a", Anthropic, api_key="key")
+        registry.configure(10)
+        assert registry.get("model-a", Anthropic, api_key="key") is first
+
+        registry.configure(40)
+        second = registry.get("model-a", Anthropic, api_key="key")
+        assert second is not first
+        assert _max_connections(second) == 40
+
+        registry.invalidate("model-a")
+        assert registry.get("model-a", Anthropic, api_key="key") is not second
+
+
+# ============================================================================
+# Async clients
+# ============================================================================
+
+class TestAsyncClients:
+
+    def test_one_client_per_event_loop(self):
+        registry = SDKClientRegistry()
+
+        async def get_twice():
+            first = registry.get_async("model-a", AsyncOpenAI, api_key="key")
+            return first, registry.get_async("model-a", AsyncOpenAI, api_key="key")
+
+        first, again = asyncio.run(get_twice())
+        other_loop, _ = asyncio.run(get_twice())
+        assert again is first
+        assert other_loop is not first
+
+
+# ============================================================================
+# Plugins and pool sizing
+# ============================================================================
+
+class TestPluginsShareClients:
+
+    def test_plugin_instances_share_the_sdk_client(self, registry, monkeypatch):
+        monkeypatch.setenv("AZURE_GPT41_ENDPOINT", "https://example.openai.azure.com")
+        monkeypatch.setenv("AZURE_GPT41_API_KEY", "key-1")
+        monkeypatch.setenv("AZURE_GPT41_DEPLOYMENT_NAME", "gpt-4.1")
+        first = AzureGPT41Client()
+        assert AzureGPT41Client().client is first.client
+
+        monkeypatch.setenv("AZURE_GPT41_API_KEY", "key-2")
+        assert AzureGPT41Client().client is not first.client
+
+    def test_pool_size_follows_settings(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        manager = JobManager(db)
+        # Defaults: one job per lane (+1 reserved) with parallelism 1
+        assert manager._get_connection_pool_size() == 2
+
+        db.add_all([
+            SystemSetting(key="job_parallelism", value="8"),
+            SystemSetting(key="job_lane_concurrency", value="2"),
+            SystemSetting(key="job_lane_overrides", value='{"gpt-5": 3}'),
+        ])
+        db.commit()
+        assert manager._get_connection_pool_size() == 4 * 8
+
+        db.add_all([
+            SystemSetting(key="job_execution_mode", value="async"),
+            SystemSetting(key="job_async_concurrency", value="50"),
+        ])
+        db.commit()
+        assert manager._get_connection_pool_size() == 4 * 50
+        db.close()
@@ -0,0 +1,329 @@
+"""Tests for multi-model comparison jobs.
+
+Test Categories:
+1. Shared item population (each row rendered once)
+2. Comparison group progress
+3. Batch-all fan-out endpoint
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, Prompt, PromptRevision, Dataset, Job, JobItem
+from backend.job import JobManager
+from app.main import app
+import app.routes.run as run_routes
+
+
+MODELS = ["model-a", "model-b", "model-c"]
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def dataset_setup(test_db, monkeypatch):
+    """Create a prompt revision and a 25-row dataset table (chunks of 10)."""
+    monkeypatch.setattr(JobManager, "BATCH_ITEM_CHUNK_SIZE", 10)
+    return create_dataset(test_db)
+
+
+def create_dataset(test_db):
+    """Create a project, prompt revision and 25-row dataset table."""
+    project = Project(name="Compare Project")
+    test_db.add(project)
+    test_db.commit()
+    prompt = Prompt(project_id=project.id, name="compare")
+    test_db.add(prompt)
+    test_db.commit()
+    revision = PromptRevision(prompt_id=prompt.id, revision=1, prompt_template="Q: {{question}}")
+    test_db.add(revision)
+
+    table_name = "Dataset_PJ1_compare"
+    test_db.execute(text(f'CREATE TABLE "{table_name}" (id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT)'))
+    for i in range(25):
+        test_db.execute(text(f'INSERT INTO "{table_name}" (question) VALUES (:q)'), {"q": f"q{i}"})
+    dataset = Dataset(
+        project_id=project.id,
+        name="questions",
+        source_file_name="questions.csv",
+        sqlite_table_name=table_name
+    )
+    test_db.add(dataset)
+    test_db.commit()
+    return project, revision, dataset
+
+
+def _count_renders(manager: JobManager) -> list:
+    """Wrap the compiled template of manager so each render is recorded."""
+    rendered = []
+    compile_template = manager.parser.compile_template
+
+    def counting_compile(*args, **kwargs):
+        render = compile_template(*args, **kwargs)
+
+        def counting_render(params):
+            rendered.append(params["question"])
+            return render(params)
+        return counting_render
+
+    manager.parser.compile_template = counting_compile
+    return rendered
+
+
+def _prompts(db, job_id: int) -> list:
+    items = db.query(JobItem).filter(JobItem.job_id == job_id).order_by(JobItem.id).all()
+    return [item.raw_prompt for item in items]
+
+
+# ============================================================================
+# Shared item population
+# ============================================================================
+
+class TestComparisonPopulation:
+
+    def test_rows_rendered_once_for_all_models(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS + ["model-a"])
+
+        assert [job.model_name for job in jobs] == MODELS
+        assert len({job.comparison_group for job in jobs}) == 1
+        assert test_db.query(JobItem).count() == 0
+
+        rendered = _count_renders(manager)
+        assert manager.populate_batch_job_items(jobs[1].id) == 75
+        assert len(rendered) == 25
+        expected = [f"Q: q{i}" for i in range(25)]
+        for job in jobs:
+            assert _prompts(test_db, job.id) == expected
+        assert json.loads(test_db.query(JobItem).first().input_params) == {"question": "q0"}
+
+        # The other jobs of the group find their items already created
+        assert manager.populate_batch_job_items(jobs[0].id) == 0
+        assert manager.populate_batch_job_items(jobs[2].id) == 0
+        assert test_db.query(JobItem).count() == 75
+
+    def test_resume_and_cancelled_jobs(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS)
+        # model-a was interrupted after its first chunk, model-c was cancelled
+        for i in range(10):
+            test_db.add(JobItem(job_id=jobs[0].id, input_params="{}", raw_prompt=f"Q: q{i}", status="pending"))
+        jobs[2].status = "cancelled"
+        test_db.commit()
+
+        rendered = _count_renders(manager)
+        assert manager.populate_batch_job_items(jobs[0].id) == 15 + 25
+        assert rendered == [f"q{i}" for i in range(25)]
+        assert _prompts(test_db, jobs[0].id) == _prompts(test_db, jobs[1].id)
+        assert _prompts(test_db, jobs[2].id) == []
+
+    def test_eager_creation(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        jobs = JobManager(test_db).create_comparison_jobs(revision.id, dataset.id, MODELS[:2], defer_items=False)
+        assert [len(_prompts(test_db, job.id)) for job in jobs] == [25, 25]
+
+    def test_failure_marks_group_error(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS)
+
+        def failing_compile(*args, **kwargs):
+            def render(params):
+                raise RuntimeError("render failed")
+            return render
+
+        manager.parser.compile_template = failing_compile
+        with pytest.raises(RuntimeError):
+            manager.populate_batch_job_items(jobs[0].id)
+        test_db.expire_all()
+        assert {job.status for job in test_db.query(Job).all()} == {"error"}
+
+
+    def test_two_sessions_populate_group_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobManager, "BATCH_ITEM_CHUNK_SIZE", 5)
+        monkeypatch.setattr(JobManager, "COMPARISON_POPULATION_POLL_SECONDS", 0.05)
+        # A file database: each session has its own connection, like separate workers
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'compare.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = factory()
+        _, revision, dataset = create_dataset(db)
+        job_ids = [job.id for job in JobManager(db).create_comparison_jobs(revision.id, dataset.id, MODELS)]
+        db.close()
+
+        barrier = threading.Barrier(2)
+        created = {}
+
+        def populate(job_id):
+            session = factory()
+            try:
+                barrier.wait()
+                created[job_id] = JobManager(session).populate_batch_job_items(job_id)
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=populate, args=(job_id,)) for job_id in (job_ids[2], job_ids[0])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(created.values()) == [0, 75]
+        db = factory()
+        expected = [f"Q: q{i}" for i in range(25)]
+        assert [_prompts(db, job_id) for job_id in job_ids] == [expected] * 3
+        leader = db.query(Job).filter(Job.id == job_ids[0]).first()
+        assert (leader.items_populated, leader.items_population_lease) == (1, None)
+        db.close()
+        engine.dispose()
+
+    def test_expired_claim_is_taken_over(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS[:2])
+        # A process died while creating the first chunk of items
+        for i in range(10):
+            test_db.add(JobItem(job_id=jobs[0].id, input_params="{}", raw_prompt=f"Q: q{i}", status="pending"))
+        jobs[0].items_population_lease = f"{(datetime.utcnow() - timedelta(seconds=1)).isoformat(timespec='microseconds')} dead"
+        test_db.commit()
+
+        assert manager.populate_batch_job_items(jobs[1].id) == 15 + 25
+        assert _prompts(test_db, jobs[0].id) == _prompts(test_db, jobs[1].id)
+
+    def test_lost_claim_stops_item_creation(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS[:2])
+        renew = manager._renew_comparison_population
+        renewals = []
+
+        def renew_once(leader_id, claim):
+            renewals.append(claim[0])
+            if len(renewals) > 1:
+                # Another process took over after our claim expired
+                claim[0] = None
+                return False
+            return renew(leader_id, claim)
+
+        manager._renew_comparison_population = renew_once
+        assert manager.populate_batch_job_items(jobs[0].id) == 20
+        test_db.expire_all()
+        assert len(_prompts(test_db, jobs[0].id)) == 10
+        assert test_db.query(Job.items_populated).filter(Job.id == jobs[0].id).scalar() == 0
+
+
+# ============================================================================
+# Comparison group progress
+# ============================================================================
+
+class TestComparisonProgress:
+
+    def test_group_turnaround_is_slowest_job(self, test_db, dataset_setup):
+        _, revision, dataset = dataset_setup
+        manager = JobManager(test_db)
+        jobs = manager.create_comparison_jobs(revision.id, dataset.id, MODELS, defer_items=False)
+        start = datetime(2026, 1, 1, 12, 0, 0)
+        for job, seconds in zip(jobs, [10, 40, 25]):
+            job.status = "done"
+            job.started_at = start.isoformat()
+            job.finished_at = (start + timedelta(seconds=seconds)).isoformat()
+            job.turnaround_ms = seconds * 1000
+        jobs[2].status = "running"
+        test_db.commit()
+
+        progress = manager.get_comparison_progress(jobs[0].comparison_group)
+        assert progress["status"] == "running"
+        assert progress["turnaround_ms"] is None
+        assert progress["model_names"] == MODELS
+        assert progress["jobs"][0]["total_items"] == 25
+
+        jobs[2].status = "done"
+        test_db.commit()
+        progress = manager.get_comparison_progress(jobs[0].comparison_group)
+        assert progress["status"] == "done"
+        assert progress["turnaround_ms"] == 40000
+        assert progress["sum_job_turnaround_ms"] == 75000
+
+        with pytest.raises(ValueError):
+            manager.get_comparison_progress("missing")
+
+
+# ============================================================================
+# Batch-all fan-out endpoint
+# ============================================================================
+
+class TestBatchAllFanOut:
+
+    def test_jobs_enqueued_per_model_lane(self, session_factory, test_db, dataset_setup, monkeypatch):
+        project, _, dataset = dataset_setup
+        enqueued = []
+        monkeypatch.setattr(
+            run_routes, "enqueue_job",
+            lambda job_id, model_name, *args, **kwargs: enqueued.append((job_id, model_name, kwargs)) or len(enqueued)
+        )
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            response = client.post("/api/run/batch-all", json={
+                "project_id": project.id,
+                "dataset_id": dataset.id,
+                "model_names": MODELS,
+                "force": True
+            })
+            assert response.status_code == 200
+            body = response.json()
+            assert body["prompt_count"] == 1
+            assert len(body["comparison_groups"]) == 1
+            assert [model for _, model, _ in enqueued] == MODELS
+            assert all(kwargs["populate_items"] for _, _, kwargs in enqueued)
+
+            group = body["comparison_groups"][0]
+            comparison = client.get(f"/api/comparisons/{group}").json()
+            assert [job["job_id"] for job in comparison["jobs"]] == body["job_ids"]
+            assert client.get("/api/comparisons/missing").status_code == 404
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,291 @@
+"""Tests for incremental merged CSV output.
+
+Test Categories:
+1. IncrementalCsvMerger ordering, header and finalization
+2. Job merged CSV access (stored text, file)
+3. JobManager integration
+"""
+
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.csv_merge import (
+    IncrementalCsvMerger, extract_csv_row, merged_csv_files_enabled, remove_merged_csv_file
+)
+from backend.database import Base, Project, ProjectRevision, Job, JobItem
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+def parsed(csv_output, fields):
+    return json.dumps({"csv_output": csv_output, "fields": fields, "parsed": True})
+
+
+class CsvClient(LLMClient):
+    """Client that answers 'ANSWER: <prompt>' (fails on prompts containing 'bad')."""
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        if "bad" in prompt:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=1)
+        return LLMResponse(success=True, response_text=f"ANSWER: {prompt}", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "csv-model"
+
+
+@pytest.fixture
+def test_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("CSV_OUTPUT_DIR", str(tmp_path / "csv"))
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def csv_job(test_db):
+    """Batch job with a regex parser that produces CSV output."""
+    project = Project(name="CSV Project")
+    test_db.add(project)
+    test_db.commit()
+    parser_config = json.dumps({
+        "type": "regex",
+        "patterns": {"answer": "ANSWER: (.*)"},
+        "csv_template": "$answer$"
+    })
+    revision = ProjectRevision(
+        project_id=project.id, revision=1,
+        prompt_template="{{q}}", parser_config=parser_config
+    )
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for q in ["q0", "q1", "bad2", "q3", "q4", "q5"]:
+        test_db.add(JobItem(job_id=job.id, input_params=json.dumps({"q": q}), raw_prompt=q))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+# ============================================================================
+# IncrementalCsvMerger
+# ============================================================================
+
+class TestIncrementalCsvMerger:
+
+    def test_out_of_order_results_written_in_id_order(self, tmp_path):
+        path = str(tmp_path / "out" / "job.csv")
+        merger = IncrementalCsvMerger(path, [1, 2, 3, 4], include_header=True, field_order=["b", "a"])
+
+        merger.record(3, "done", parsed("3a,3b", {"a": "3a", "b": "3b"}))
+        merger.record(2, "error", None)
+        assert not os.path.exists(path)
+        merger.record(1, "done", parsed("1a,1b", {"a": "1a", "b": "1b"}))
+        merger.skip(4)
+
+        assert merger.finalize() == path
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "b,a\n1a,1b\n3a,3b"
+        assert not os.path.exists(path + ".part")
+
+    def test_finalize_writes_remaining_rows(self, tmp_path):
+        path = str(tmp_path / "job.csv")
+        merger = IncrementalCsvMerger(path, [1, 2, 3], include_header=False)
+        merger.record(3, "done", parsed("c", {"x": "c"}))
+        merger.record(2, "done", parsed("b", {"x": "b"}))
+        # Item 1 never finished (e.g. cancelled)
+        merger.finalize()
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "b\nc"
+
+    def test_rows_spilled_beyond_max_ready(self, tmp_path):
+        path = str(tmp_path / "job.csv")
+        merger = IncrementalCsvMerger(path, list(range(1, 21)), include_header=True, max_ready=4)
+        # Item 1 is on a long retry delay while the others finish
+        for item_id in range(20, 1, -1):
+            if item_id == 7:
+                merger.skip(item_id)
+            else:
+                merger.record(item_id, "done", parsed(f"r{item_id}", {"x": f"r{item_id}"}))
+            assert len(merger._ready) <= 4
+        assert os.path.exists(path + ".spill")
+
+        merger.record(1, "done", parsed("r1", {"x": "r1"}))
+        assert merger.finalize() == path
+        with open(path, encoding="utf-8") as f:
+            assert f.read().split("\n") == ["x"] + [f"r{i}" for i in range(1, 21) if i != 7]
+        assert not os.path.exists(path + ".spill")
+
+    def test_finalize_reads_spilled_rows(self, tmp_path):
+        path = str(tmp_path / "job.csv")
+        merger = IncrementalCsvMerger(path, [1, 2, 3, 4], include_header=False, max_ready=1)
+        for item_id in (4, 2, 3):
+            merger.record(item_id, "done", parsed(f"r{item_id}", {"x": item_id}))
+        merger.finalize()
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "r2\nr3\nr4"
+        assert not os.path.exists(path + ".spill")
+
+    def test_discard_removes_partial_file(self, tmp_path):
+        path = str(tmp_path / "job.csv")
+        merger = IncrementalCsvMerger(path, [1], include_header=True)
+        merger.discard()
+        assert not os.path.exists(path + ".part")
+        assert not os.path.exists(path)
+
+    def test_extract_double_encoded(self):
+        double = json.dumps(parsed("x", {"f": "x"}))
+        assert extract_csv_row(double) == ("x", {"f": "x"})
+        assert extract_csv_row(json.dumps({"raw": "text", "parsed": False})) is None
+
+
+# ============================================================================
+# Job model
+# ============================================================================
+
+class TestJobMergedCsv:
+
+    def test_stored_column_only(self, tmp_path):
+        path = tmp_path / "job.csv"
+        path.write_text("h\nrow", encoding="utf-8")
+
+        job = Job(job_type="batch", merged_csv_path=str(path))
+        # The file is only read through open_merged_csv()
+        assert job.merged_csv_output is None
+        assert job.has_merged_csv
+        with job.open_merged_csv() as stream:
+            assert stream.read() == "h\nrow"
+
+        job.merged_csv_output = "retried"
+        with job.open_merged_csv() as stream:
+            assert stream.read() == "retried"
+
+        assert not Job(job_type="batch").has_merged_csv
+        assert Job(job_type="batch").open_merged_csv() is None
+
+    def test_missing_file_raises(self, tmp_path):
+        job = Job(job_type="batch", merged_csv_path=str(tmp_path / "missing.csv"))
+        with pytest.raises(OSError):
+            job.open_merged_csv()
+
+    def test_remove_merged_csv_file(self, tmp_path):
+        path = tmp_path / "job.csv"
+        path.write_text("h", encoding="utf-8")
+        remove_merged_csv_file(str(path))
+        assert not path.exists()
+        # Missing files and unset paths are ignored
+        remove_merged_csv_file(str(path))
+        remove_merged_csv_file(None)
+
+
+# ============================================================================
+# JobManager
+# ============================================================================
+
+class TestJobManagerIntegration:
+
+    @pytest.mark.parametrize("mode", ["serial", "parallel", "async"])
+    def test_matches_full_rebuild(self, test_db, csv_job, mode):
+        job, revision, items = csv_job
+        manager = JobManager(test_db)
+        manager._csv_merger = manager._create_csv_merger(job, revision, True)
+        client = CsvClient()
+
+        if mode == "serial":
+            manager._execute_items_serial(items, client, revision, 0)
+        elif mode == "parallel":
+            manager._execute_items_parallel(items, client, revision, 0, 4)
+        else:
+            manager._execute_items_async(items, client, revision, 0, 4)
+        path = manager._csv_merger.finalize()
+        manager._csv_merger = None
+
+        test_db.expire_all()
+        all_items = test_db.query(JobItem).filter(JobItem.job_id == job.id).all()
+        expected = manager._merge_csv_outputs(all_items, True)
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == expected
+        assert expected.split("\n") == ["answer", "q0", "q1", "q3", "q4", "q5"]
+
+    def test_previously_finished_items_included(self, test_db, csv_job):
+        job, revision, items = csv_job
+        items[0].status = "done"
+        items[0].parsed_response = parsed("earlier", {"answer": "earlier"})
+        test_db.commit()
+
+        manager = JobManager(test_db)
+        manager._csv_merger = manager._create_csv_merger(job, revision, True)
+        manager._execute_items_serial(items[1:], CsvClient(), revision, 0)
+        path = manager._csv_merger.finalize()
+
+        with open(path, encoding="utf-8") as f:
+            assert f.read().split("\n") == ["answer", "earlier", "q1", "q3", "q4", "q5"]
+
+    def test_duplicates_do_not_hold_rows_back(self, test_db, csv_job):
+        job, revision, items = csv_job
+        # Item 1 duplicates item 0; rows after it must not wait for the job to end
+        items[1].raw_prompt = "q0"
+        for i in range(30):
+            test_db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt=f"x{i}"))
+        test_db.commit()
+        items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+
+        manager = JobManager(test_db)
+        merger = manager._create_csv_merger(job, revision, True)
+        manager._csv_merger = merger
+        ready_sizes = []
+        put = merger._put
+
+        def tracking_put(item_id, row):
+            put(item_id, row)
+            ready_sizes.append(len(merger._ready))
+
+        merger._put = tracking_put
+        manager._duplicate_members = manager._group_duplicate_items(items, revision)
+        member_ids = {i for ids in manager._duplicate_members.values() for i in ids}
+        representatives = [item for item in items if item.id not in member_ids]
+        errors = manager._execute_items_serial(representatives, CsvClient(), revision, 0)
+        path = merger.finalize()
+
+        assert errors == 1
+        assert max(ready_sizes) == 0
+        with open(path, encoding="utf-8") as f:
+            assert f.read().split("\n") == ["answer", "q0", "q0", "q3", "q4", "q5"] + [f"x{i}" for i in range(30)]
+
+    def test_files_need_shared_dir_with_workers(self, monkeypatch):
+        monkeypatch.setenv("CSV_OUTPUT_DIR", "/shared/csv")
+        assert merged_csv_files_enabled("postgresql", external_workers=True)
+        monkeypatch.delenv("CSV_OUTPUT_DIR")
+        assert merged_csv_files_enabled("sqlite", external_workers=False)
+        assert not merged_csv_files_enabled("sqlite", external_workers=True)
+        assert not merged_csv_files_enabled("postgresql", external_workers=False)
+
+    def test_no_file_with_workers(self, test_db, csv_job, monkeypatch):
+        job, revision, items = csv_job
+        monkeypatch.delenv("CSV_OUTPUT_DIR")
+        monkeypatch.setenv("JOB_RUNNER", "worker")
+
+        assert JobManager(test_db)._create_csv_merger(job, revision, True) is None
@@ -0,0 +1,300 @@
+"""Tests for streaming CSV download endpoints.
+
+Test Categories:
+1. Chunk helpers
+2. Job CSV download (merged CSV, file-backed CSV, item fallback, gzip)
+3. Merged CSV files in job responses and retries
+4. Workflow job CSV download
+"""
+
+import gzip
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Job, JobItem, Project, ProjectRevision
+from backend.database.models import WorkflowJob
+from backend.llm.base import LLMClient, LLMResponse
+from app.main import app
+from app.routes.run import _TextColumnReader, _iter_job_item_csv_chunks, _iter_text_chunks, _strip_text_chunks
+
+BOM = "\ufeff".encode("utf-8")
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def add_job(db, **kwargs):
+    job = Job(job_type="batch", status="done", **kwargs)
+    db.add(job)
+    db.commit()
+    return job
+
+
+class EchoClient(LLMClient):
+    """Client that answers with the prompt."""
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        return LLMResponse(success=True, response_text=prompt, turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "echo-model"
+
+
+def add_done_item(db, job, parsed_response):
+    db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status="done",
+                   parsed_response=json.dumps(parsed_response)))
+    db.commit()
+
+
+# ============================================================================
+# Chunk helpers
+# ============================================================================
+
+class TestChunkHelpers:
+
+    @pytest.mark.parametrize("text", ["\n a,b\n1,2  \n\n3,4 \n\n", "a", "  ", "x\n\n\ny\n"])
+    def test_strip_matches_str_strip(self, text):
+        for chunk_size in (1, 2, 3, 100):
+            chunks = _strip_text_chunks(_iter_text_chunks(io.StringIO(text), chunk_size))
+            assert "".join(chunks) == text.strip()
+
+    @pytest.mark.parametrize("value", ["", "x,y\n1,2", "é日本語\n" * 50])
+    def test_text_column_reader(self, test_db, value):
+        wf_job = WorkflowJob(workflow_id=1, status="done", merged_csv_output=value)
+        test_db.add(wf_job)
+        test_db.commit()
+
+        # Chunk sizes split multi-byte characters
+        for chunk_size in (1, 2, 7, 1024):
+            reader = _TextColumnReader(test_db, WorkflowJob.merged_csv_output, wf_job.id)
+            assert "".join(_iter_text_chunks(reader, chunk_size)) == value
+
+    def test_text_column_reader_null(self, test_db):
+        wf_job = WorkflowJob(workflow_id=1, status="done")
+        test_db.add(wf_job)
+        test_db.commit()
+        assert list(_iter_text_chunks(_TextColumnReader(test_db, WorkflowJob.merged_csv_output, wf_job.id))) == []
+
+    def test_item_chunks_batched(self, test_db):
+        job = add_job(test_db)
+        for i in range(5):
+            add_done_item(test_db, job, {"fields": {"a": i, "b": i * 2}})
+
+        chunks = list(_iter_job_item_csv_chunks(test_db, job.id, batch_rows=2))
+        assert len(chunks) > 1
+        assert "".join(chunks).split("\n") == ["a,b", "0,0", "1,2", "2,4", "3,6", "4,8"]
+
+
+# ============================================================================
+# Job CSV download
+# ============================================================================
+
+class TestJobCsvDownload:
+
+    def test_stored_merged_csv_with_bom(self, client, test_db):
+        # The stored merge wins over the items (csv-preview does the same)
+        job = add_job(test_db, merged_csv_output="\nh1,h2\nv1,v2\n")
+        add_done_item(test_db, job, {"csv_header": "other", "csv_output": "x"})
+
+        resp = client.get(f"/api/jobs/{job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert f"job_{job.id}.csv" in resp.headers["content-disposition"]
+        assert resp.content == BOM + b"h1,h2\nv1,v2"
+
+    def test_file_backed_merged_csv(self, client, test_db, tmp_path):
+        path = tmp_path / "job.csv"
+        rows = ["col"] + [f"row{i}" for i in range(20000)]
+        path.write_text("\n".join(rows), encoding="utf-8")
+        job = add_job(test_db, merged_csv_path=str(path))
+
+        resp = client.get(f"/api/jobs/{job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.content.decode("utf-8-sig").split("\n") == rows
+
+    def test_missing_merged_csv_file_fails(self, client, test_db, tmp_path):
+        job = add_job(test_db, merged_csv_path=str(tmp_path / "missing.csv"))
+
+        resp = client.get(f"/api/jobs/{job.id}/csv")
+        assert resp.status_code == 500
+        assert "CSV_OUTPUT_DIR" in resp.json()["detail"]
+
+    def test_item_fallback(self, client, test_db):
+        job = add_job(test_db)
+        add_done_item(test_db, job, {"raw": "x", "parsed": False})
+        add_done_item(test_db, job, {"csv_header": "a,b", "csv_output": "1,2\n3,4\n"})
+        add_done_item(test_db, job, {"csv_header": "a,b", "csv_output": "5,6"})
+
+        resp = client.get(f"/api/jobs/{job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.content.decode("utf-8-sig") == "a,b\n1,2\n3,4\n5,6"
+
+    def test_gzip_transfer(self, client, test_db, tmp_path):
+        path = tmp_path / "job.csv"
+        path.write_text("h\né", encoding="utf-8")
+        job = add_job(test_db, merged_csv_path=str(path))
+
+        with client.stream("GET", f"/api/jobs/{job.id}/csv", params={"gzip": "true"}) as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-encoding"] == "gzip"
+            raw = b"".join(resp.iter_raw())
+        assert gzip.decompress(raw) == BOM + "h\né".encode("utf-8")
+
+    def test_no_data_is_404(self, client, test_db):
+        job = add_job(test_db)
+        assert client.get(f"/api/jobs/{job.id}/csv").status_code == 404
+        assert client.get("/api/jobs/9999/csv").status_code == 404
+
+
+# ============================================================================
+# Merged CSV in job responses and retries
+# ============================================================================
+
+class TestMergedCsvFile:
+
+    def test_details_do_not_read_file(self, client, test_db, tmp_path):
+        path = tmp_path / "job.csv"
+        path.write_text("h\nrow", encoding="utf-8")
+        job = add_job(test_db, merged_csv_path=str(path))
+
+        data = client.get(f"/api/jobs/{job.id}/details").json()
+        assert data["merged_csv_output"] is None
+        assert data["merged_csv_available"] is True
+
+    def test_retry_replaces_file(self, client, test_db, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.llm.get_llm_client", lambda model_name=None: EchoClient())
+        path = tmp_path / "job.csv"
+        path.write_text("h\nrow", encoding="utf-8")
+        job = add_job(test_db, merged_csv_path=str(path), model_name="echo-model")
+        item = JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status="error")
+        test_db.add(item)
+        test_db.commit()
+
+        resp = client.post(f"/api/jobs/{job.id}/items/{item.id}/retry")
+        assert resp.json()["success"]
+        test_db.expire_all()
+        job = test_db.query(Job).filter(Job.id == job.id).one()
+        assert job.merged_csv_path is None
+        assert not path.exists()
+
+    def test_download_and_preview_after_retry(self, client, test_db, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.llm.get_llm_client", lambda model_name=None: EchoClient())
+        project = Project(name="P")
+        test_db.add(project)
+        test_db.commit()
+        parser_config = json.dumps({
+            "type": "regex",
+            "patterns": {"a": "A=(\\w+)", "b": "B=(\\w+)"},
+            "csv_template": "$b$,$a$"
+        })
+        revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{x}}",
+                                   parser_config=parser_config)
+        test_db.add(revision)
+        test_db.commit()
+        path = tmp_path / "job.csv"
+        path.write_text("b,a\n2,1", encoding="utf-8")
+        job = add_job(test_db, project_revision_id=revision.id, merged_csv_path=str(path), model_name="echo-model")
+        add_done_item(test_db, job, {"fields": {"a": "1", "b": "2"}, "csv_output": "2,1", "csv_header": "b,a"})
+        item = JobItem(job_id=job.id, input_params="{}", raw_prompt="A=3 B=4", status="error")
+        test_db.add(item)
+        test_db.commit()
+
+        assert client.post(f"/api/jobs/{job.id}/items/{item.id}/retry").json()["success"]
+
+        # Download and preview serve the stored merge that replaced the file
+        test_db.expire_all()
+        stored = test_db.query(Job).filter(Job.id == job.id).one().merged_csv_output
+        assert stored.split("\n") == ["b,a", "2,1", "4,3"]
+        resp = client.get(f"/api/jobs/{job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.content.decode("utf-8-sig") == stored
+        assert client.get(f"/api/jobs/{job.id}/csv-preview").json()["csv_data"] == stored
+
+
+# ============================================================================
+# Workflow job CSV download
+# ============================================================================
+
+class TestWorkflowJobCsvDownload:
+
+    def test_merged_csv(self, client, test_db):
+        wf_job = WorkflowJob(workflow_id=1, status="done", merged_csv_output="x,y\n1,2\n")
+        test_db.add(wf_job)
+        test_db.commit()
+
+        resp = client.get(f"/api/workflow-jobs/{wf_job.id}/csv", params={"gzip": "true"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.content == BOM + b"x,y\n1,2"
+
+    def test_no_data_is_404(self, client, test_db):
+        wf_job = WorkflowJob(workflow_id=1, status="done")
+        test_db.add(wf_job)
+        test_db.commit()
+        assert client.get(f"/api/workflow-jobs/{wf_job.id}/csv").status_code == 404
+
+    def test_large_merged_csv(self, client, test_db):
+        rows = ["col"] + [f"row{i}" for i in range(20000)]
+        wf_job = WorkflowJob(workflow_id=1, status="done", merged_csv_output="\n " + "\n".join(rows) + "\n\n")
+        test_db.add(wf_job)
+        test_db.commit()
+
+        resp = client.get(f"/api/workflow-jobs/{wf_job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.content.decode("utf-8-sig").split("\n") == rows
+
+    def test_vars_fallback(self, client, test_db):
+        merged_output = json.dumps({"vars": {"a": "1", "b": None, "ROW": {"x": 1}}})
+        wf_job = WorkflowJob(workflow_id=1, status="done", merged_output=merged_output)
+        test_db.add(wf_job)
+        test_db.commit()
+
+        resp = client.get(f"/api/workflow-jobs/{wf_job.id}/csv")
+        assert resp.status_code == 200
+        assert resp.content == BOM + b"a,b\n1,"
@@ -0,0 +1,216 @@
+"""Tests for dialect-neutral SQL helpers and the PostgreSQL migration tool.
+
+Test Categories:
+1. Dialect helpers (SQLite)
+2. Dataset row endpoints addressed by id
+3. Copying a SQLite database
+4. PostgreSQL (only with TEST_POSTGRES_URL pointing to an empty database)
+"""
+
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, Job, JobItem, Dataset, LLMResponseCache
+from backend.database.dialect import (
+    describe_table_columns, get_table_columns, id_column_ddl, insert_returning_id, upsert
+)
+from backend.database.migrate_postgres import migrate
+from app.main import app
+
+DATASET_TABLE = "Dataset_PJ1_20250101_000000"
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def populate(db, orphan_items=0):
+    """Create a project, a job with items and a dataset table with a RowID column."""
+    project = Project(name="Dialect Project")
+    db.add(project)
+    db.commit()
+    job = Job(job_type="batch", status="done")
+    db.add(job)
+    db.commit()
+    for i in range(3):
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt=f"p{i}", status="done"))
+    for i in range(orphan_items):
+        db.add(JobItem(job_id=job.id + 100, input_params="{}", raw_prompt="orphan", status="done"))
+    db.add(Dataset(project_id=project.id, name="DS", source_file_name="ds.xlsx", sqlite_table_name=DATASET_TABLE))
+    db.execute(text(f'CREATE TABLE "{DATASET_TABLE}" ({id_column_ddl(db)}, "RowID" INTEGER, "question" TEXT)'))
+    for i in range(3):
+        db.execute(text(f'INSERT INTO "{DATASET_TABLE}" ("RowID", "question") VALUES (:r, :q)'),
+                   {"r": 100 + i, "q": f"q{i}"})
+    db.commit()
+    return project, job
+
+
+# ============================================================================
+# Dialect helpers
+# ============================================================================
+
+class TestDialectHelpers:
+
+    def test_table_columns(self, session_factory):
+        db = session_factory()
+        db.execute(text(f'CREATE TABLE "Mixed_Case" ({id_column_ddl(db)}, "a b" TEXT, "n" INTEGER)'))
+        # Visible inside the creating transaction
+        assert get_table_columns(db, "Mixed_Case") == ["id", "a b", "n"]
+        assert describe_table_columns(db, "Mixed_Case")[2] == {"name": "n", "type": "INTEGER"}
+        assert get_table_columns(db, "missing") == []
+        db.close()
+
+    def test_insert_returning_id(self, session_factory):
+        db = session_factory()
+        db.execute(text(f'CREATE TABLE "t" ({id_column_ddl(db)}, "v" TEXT)'))
+        first = insert_returning_id(db, 'INSERT INTO "t" ("v") VALUES (:v)', {"v": "a"})
+        second = insert_returning_id(db, 'INSERT INTO "t" ("v") VALUES (:v)', {"v": "b"})
+        assert second == first + 1
+        db.close()
+
+    def test_upsert_overwrites_row(self, session_factory):
+        db = session_factory()
+        row = {"cache_key": "k", "model_name": "m", "response_text": "old", "size_bytes": 3,
+               "hit_count": 5, "created_at": "t0", "last_accessed_at": "t0"}
+        upsert(db, LLMResponseCache.__table__, row, key_columns=["cache_key"])
+        upsert(db, LLMResponseCache.__table__, {**row, "response_text": "new", "hit_count": 0},
+               key_columns=["cache_key"])
+        db.commit()
+        entries = db.query(LLMResponseCache).all()
+        assert [(entry.response_text, entry.hit_count) for entry in entries] == [("new", 0)]
+        db.close()
+
+
+# ============================================================================
+# Dataset rows
+# ============================================================================
+
+class TestDatasetRows:
+
+    def test_rows_are_addressed_by_id(self, session_factory):
+        db = session_factory()
+        populate(db)
+        dataset_id = db.query(Dataset.id).scalar()
+        db.close()
+
+        def override_get_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            rows = client.get(f"/api/datasets/{dataset_id}/rows").json()["rows"]
+            # The RowID column does not shadow the row id
+            assert [(row["rowid"], row["RowID"]) for row in rows] == [(1, 100), (2, 101), (3, 102)]
+
+            added = client.post(f"/api/datasets/{dataset_id}/rows", json={"data": {"question": "q3"}}).json()
+            assert added["rowid"] == 4
+            assert client.put(f"/api/datasets/{dataset_id}/rows/2", json={"data": {"question": "edited"}}).status_code == 200
+            assert client.delete(f"/api/datasets/{dataset_id}/rows/1").status_code == 200
+            assert client.delete(f"/api/datasets/{dataset_id}/rows/1").status_code == 404
+
+            rows = client.get(f"/api/datasets/{dataset_id}/rows").json()["rows"]
+            assert [(row["rowid"], row["question"]) for row in rows] == [(2, "edited"), (3, "q2"), (4, "q3")]
+        finally:
+            app.dependency_overrides.clear()
+
+
+# ============================================================================
+# Copying a database
+# ============================================================================
+
+class TestMigration:
+
+    def test_copies_tables_and_skips_orphans(self, tmp_path):
+        source = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+        target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+        Base.metadata.create_all(bind=source)
+        db = sessionmaker(bind=source)()
+        populate(db, orphan_items=2)
+        db.close()
+
+        result = migrate(source, target, batch_size=2)
+
+        assert result.copied["job_items"] == 3
+        assert result.skipped == {"job_items": 2}
+        assert result.copied[DATASET_TABLE] == 3
+        with target.connect() as connection:
+            assert connection.execute(text(f'SELECT "question" FROM "{DATASET_TABLE}" ORDER BY id')).scalars().all() \
+                == ["q0", "q1", "q2"]
+            assert "RowID" in [column["name"] for column in inspect(connection).get_columns(DATASET_TABLE)]
+
+        with pytest.raises(ValueError):
+            migrate(source, target)
+        source.dispose()
+        target.dispose()
+
+
+# ============================================================================
+# PostgreSQL
+# ============================================================================
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+class TestPostgres:
+
+    @pytest.fixture
+    def pg_engine(self):
+        from backend.database.database import create_database_engine
+        engine = create_database_engine(os.environ["TEST_POSTGRES_URL"])
+        yield engine
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP TABLE IF EXISTS "{DATASET_TABLE}"'))
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+    def test_migrate_and_use(self, tmp_path, pg_engine):
+        source = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+        Base.metadata.create_all(bind=source)
+        db = sessionmaker(bind=source)()
+        populate(db, orphan_items=1)
+        db.close()
+
+        result = migrate(source, pg_engine)
+        assert result.skipped == {"job_items": 1}
+        source.dispose()
+
+        db = sessionmaker(bind=pg_engine)()
+        try:
+            assert get_table_columns(db, DATASET_TABLE) == ["id", "RowID", "question"]
+            # Sequences continue after the copied IDs
+            assert insert_returning_id(db, f'INSERT INTO "{DATASET_TABLE}" ("question") VALUES (:q)', {"q": "x"}) == 4
+            project = Project(name="After migration")
+            db.add(project)
+            db.commit()
+            assert project.id == 2
+
+            row = {"cache_key": "k", "model_name": "m", "response_text": "a", "size_bytes": 1,
+                   "hit_count": 0, "created_at": "t", "last_accessed_at": "t"}
+            upsert(db, LLMResponseCache.__table__, row, key_columns=["cache_key"])
+            upsert(db, LLMResponseCache.__table__, {**row, "response_text": "b"}, key_columns=["cache_key"])
+            db.commit()
+            assert db.query(LLMResponseCache.response_text).scalar() == "b"
+        finally:
+            db.close()
@@ -0,0 +1,227 @@
+"""Tests for hedged LLM requests.
+
+Test Categories:
+1. Latency percentiles
+2. Hedged calls (sync and async)
+3. Settings and job metrics
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse
+from backend.llm.hedging import HedgedLLMClient, LatencyTracker
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class SlowFirstClient(LLMClient):
+    """LLM client whose calls with prompt "slow" take `slow_seconds` the first time."""
+
+    def __init__(self, name: str = "fake-model", slow_seconds: float = 0.5, fail: bool = False):
+        self.name = name
+        self.slow_seconds = slow_seconds
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next_delay(self, prompt):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        return self.slow_seconds if prompt == "slow" and first else 0.01
+
+    def _response(self, prompt, delay):
+        if self.fail:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=int(delay * 1000))
+        return LLMResponse(success=True, response_text=f"{self.name}:{prompt}", turnaround_ms=int(delay * 1000))
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        delay = self._next_delay(prompt)
+        time.sleep(delay)
+        return self._response(prompt, delay)
+
+    async def acall(self, prompt=None, messages=None, images=None, **kwargs):
+        delay = self._next_delay(prompt)
+        await asyncio.sleep(delay)
+        return self._response(prompt, delay)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return self.name
+
+
+def _warm_tracker(key: str = "fake-model", latency_ms: int = 20) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(30):
+        tracker.record(key, latency_ms)
+    return tracker
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# ============================================================================
+# Latency percentiles
+# ============================================================================
+
+class TestLatencyTracker:
+
+    def test_percentile_needs_samples(self):
+        tracker = LatencyTracker()
+        for latency in range(1, 11):
+            tracker.record("m", latency * 100)
+        assert tracker.percentile("m", 95, min_samples=20) is None
+        assert tracker.percentile("m", 95, min_samples=10) == 1000.0
+        assert tracker.percentile("m", 50, min_samples=10) == 500.0
+        assert tracker.percentile("other", 50, min_samples=1) is None
+
+    def test_window_is_bounded(self):
+        tracker = LatencyTracker(window=5)
+        for latency in [1000] * 5 + [10] * 5:
+            tracker.record("m", latency)
+        assert tracker.percentile("m", 100, min_samples=5) == 10.0
+
+
+# ============================================================================
+# Hedged calls
+# ============================================================================
+
+class TestHedgedCalls:
+
+    def test_slow_call_is_hedged(self):
+        client = HedgedLLMClient(SlowFirstClient(), _warm_tracker(), percentile=95, max_rate=1.0)
+        response = client.call(prompt="slow")
+
+        assert response.success and response.response_text == "fake-model:slow"
+        assert response.turnaround_ms < 400
+        assert client.stats.to_dict()["hedged"] == 1
+        assert client.stats.hedge_wins == 1
+        # The ignored primary finishes in the background and yields the saving
+        time.sleep(0.6)
+        assert client.stats.saved_ms > 200
+
+    def test_fast_calls_and_cold_models_are_not_hedged(self):
+        inner = SlowFirstClient()
+        client = HedgedLLMClient(inner, _warm_tracker(), percentile=95, max_rate=1.0)
+        assert client.call(prompt="fast").success
+        assert inner.calls == 1
+
+        cold = HedgedLLMClient(SlowFirstClient(slow_seconds=0.1), LatencyTracker(), max_rate=1.0)
+        assert cold.call(prompt="slow").turnaround_ms >= 100
+        assert cold.stats.hedged == 0
+
+    def test_hedge_budget(self):
+        inner = SlowFirstClient(slow_seconds=0.2)
+        client = HedgedLLMClient(inner, _warm_tracker(), max_rate=0.1)
+        for _ in range(9):
+            client.call(prompt="fast")
+        inner.calls = 0
+        client.call(prompt="slow")
+        assert client.stats.hedged == 1
+
+        # A second hedge would exceed 10% of 11 calls: waits for the slow primary
+        inner.calls = 0
+        response = client.call(prompt="slow")
+        assert client.stats.hedged == 1
+        assert response.turnaround_ms >= 200
+
+    def test_hedge_goes_to_alternate(self):
+        alternate = SlowFirstClient(name="alt-model", slow_seconds=0.01)
+        client = HedgedLLMClient(SlowFirstClient(), _warm_tracker(), max_rate=1.0, alternate=alternate)
+        assert client.call(prompt="slow").response_text == "alt-model:slow"
+        assert client.get_model_name() == "fake-model"
+
+    def test_failed_hedge_waits_for_primary(self):
+        client = HedgedLLMClient(
+            SlowFirstClient(slow_seconds=0.2), _warm_tracker(), max_rate=1.0,
+            alternate=SlowFirstClient(name="alt-model", fail=True)
+        )
+        response = client.call(prompt="slow")
+        assert response.response_text == "fake-model:slow"
+        assert client.stats.hedge_wins == 0
+
+    def test_async_call_is_hedged(self):
+        client = HedgedLLMClient(SlowFirstClient(), _warm_tracker(), max_rate=1.0)
+
+        async def run():
+            return await asyncio.gather(client.acall(prompt="slow"), client.acall(prompt="fast"))
+
+        slow, fast = asyncio.run(run())
+        assert slow.success and slow.turnaround_ms < 400
+        assert fast.success
+        assert client.stats.hedge_wins == 1
+
+
+# ============================================================================
+# Settings and job metrics
+# ============================================================================
+
+class TestHedgingSettings:
+
+    def test_settings_roundtrip(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            assert client.get("/api/settings/job-hedging").json()["enabled"] is False
+            response = client.put("/api/settings/job-hedging", params={"enabled": True, "percentile": 90, "max_rate": 0.2})
+            assert response.status_code == 200
+            assert response.json()["percentile"] == 90.0
+            assert client.put("/api/settings/job-hedging", params={"enabled": True, "percentile": 10}).status_code == 400
+            assert client.put(
+                "/api/settings/job-hedging", params={"enabled": True, "alternate_model": "no-such-model"}
+            ).status_code == 400
+        finally:
+            app.dependency_overrides.clear()
+
+        db = session_factory()
+        assert JobManager(db)._get_hedging_setting() == (True, 90.0, 0.2, None)
+        db.close()
+
+    def test_job_progress_reports_hedging(self, session_factory):
+        db = session_factory()
+        job = Job(job_type="batch", status="done", hedged_calls=2, hedge_wins=1, hedge_saved_ms=1500)
+        db.add(job)
+        db.commit()
+        for _ in range(10):
+            db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status="done"))
+        db.commit()
+
+        progress = JobManager(db).get_job_progress(job.id)
+        assert progress["hedged_calls"] == 2
+        assert progress["hedge_rate"] == 0.2
+        assert progress["hedge_saved_ms"] == 1500
+        db.close()
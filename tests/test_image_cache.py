@@ -0,0 +1,194 @@
+"""Tests for the image payload cache.
+
+Test Categories:
+1. LRU with byte budget
+2. FILEPATH / FILE caching in JobManager
+3. Settings API
+"""
+
+import base64
+import io
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db
+from backend.image_cache import ImagePayloadCache, get_image_cache, reset_image_cache
+from backend.job import JobManager
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def manager(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setenv("ALLOWED_IMAGE_DIRS", str(tmp_path))
+    reset_image_cache()
+    db = session_factory()
+    yield JobManager(db)
+    db.close()
+    reset_image_cache()
+
+
+def write_png(path, size=(8, 8), color="red"):
+    Image.new("RGB", size, color).save(path, format="PNG")
+
+
+# ============================================================================
+# LRU
+# ============================================================================
+
+class TestLRU:
+
+    def test_get_put(self):
+        cache = ImagePayloadCache(max_bytes=100)
+        assert cache.get(("k",)) is None
+        cache.put(("k",), "data:x")
+        assert cache.get(("k",)) == "data:x"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = ImagePayloadCache(max_bytes=30)
+        cache.put(("a",), "a" * 10)
+        cache.put(("b",), "b" * 10)
+        cache.put(("c",), "c" * 10)
+        cache.get(("a",))
+        cache.put(("d",), "d" * 10)
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) is not None
+        assert cache.stats()["size_bytes"] == 30
+
+    def test_oversized_and_disabled(self):
+        cache = ImagePayloadCache(max_bytes=5)
+        cache.put(("big",), "x" * 6)
+        assert cache.stats()["entries"] == 0
+
+        cache.put(("small",), "x")
+        cache.configure(0)
+        assert cache.stats()["entries"] == 0
+
+
+# ============================================================================
+# JobManager integration
+# ============================================================================
+
+class TestJobManagerCaching:
+
+    def test_filepath_cached(self, manager, tmp_path, monkeypatch):
+        path = tmp_path / "ref.png"
+        write_png(path)
+        allowed = manager._get_allowed_image_directories()
+
+        first = manager._load_image_from_filepath(str(path), allowed)
+        assert first.startswith("data:image/png;base64,")
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("cached image must not be re-opened")
+
+        monkeypatch.setattr(Image, "open", fail_open)
+        assert manager._load_image_from_filepath(str(path), allowed) is first
+
+    def test_modified_file_is_reloaded(self, manager, tmp_path):
+        path = tmp_path / "ref.png"
+        write_png(path, color="red")
+        allowed = manager._get_allowed_image_directories()
+        first = manager._load_image_from_filepath(str(path), allowed)
+
+        write_png(path, color="blue")
+        later = time.time() + 10
+        os.utime(path, (later, later))
+        assert manager._load_image_from_filepath(str(path), allowed) != first
+
+    def test_resized_payload_cached(self, manager, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobManager, "MAX_IMAGE_DIMENSION", 16)
+        path = tmp_path / "large.png"
+        write_png(path, size=(64, 32))
+        allowed = manager._get_allowed_image_directories()
+
+        data_uri = manager._load_image_from_filepath(str(path), allowed)
+        img = Image.open(io.BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+        assert img.size == (16, 8)
+        assert get_image_cache().stats()["entries"] == 1
+
+    def test_access_check_not_bypassed(self, manager, tmp_path):
+        path = tmp_path / "ref.png"
+        write_png(path)
+        manager._load_image_from_filepath(str(path), manager._get_allowed_image_directories())
+
+        with pytest.raises(ValueError):
+            manager._load_image_from_filepath(str(path), ["/nonexistent"])
+
+    def test_process_image_parameters(self, manager, tmp_path):
+        write_png(tmp_path / "ref.png")
+        payload = "data:image/png;base64,AAAA"
+        template = "{{photo:FILEPATH}} {{raw:FILE}} {{text}}"
+        params = {"photo": str(tmp_path / "ref.png"), "raw": payload, "text": "hi"}
+
+        first = manager._process_image_parameters(params, template)
+        second = manager._process_image_parameters(params, template)
+
+        assert len(first) == 2
+        assert first[1] == payload
+        assert all(a is b for a, b in zip(first, second))
+        assert get_image_cache().stats()["entries"] == 2
+
+
+# ============================================================================
+# Settings API
+# ============================================================================
+
+class TestSettingsAPI:
+
+    @pytest.fixture
+    def client(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        reset_image_cache()
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+        reset_image_cache()
+
+    def test_get_and_set(self, client):
+        data = client.get("/api/settings/image-cache").json()
+        assert data["max_mb"] == 128
+        assert data["stats"]["entries"] == 0
+
+        response = client.put("/api/settings/image-cache?max_mb=16")
+        assert response.status_code == 200
+        assert response.json()["stats"]["max_bytes"] == 16 * 1024 * 1024
+
+    def test_invalid_and_clear(self, client):
+        assert client.put("/api/settings/image-cache?max_mb=-1").status_code == 400
+
+        get_image_cache().put(("k",), "data:x")
+        assert client.delete("/api/settings/image-cache/entries").status_code == 200
+        assert get_image_cache().stats()["entries"] == 0
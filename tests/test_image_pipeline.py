@@ -0,0 +1,197 @@
+"""Tests for process-pool image preprocessing.
+
+Test Categories:
+1. encode_image_file
+2. ImagePrefetcher
+3. JobManager prefetch stage
+"""
+
+import base64
+import io
+import json
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.image_cache import filepath_cache_key, reset_image_cache
+from backend.image_pipeline import ImagePrefetcher, encode_image_file
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class ImageRecordingClient(LLMClient):
+    """Client that records the images of each call."""
+
+    def __init__(self):
+        self.images = []
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        self.images.append(images)
+        return LLMResponse(success=True, response_text="ok", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "vision-model"
+
+
+def write_png(path, size=(8, 8), color="red"):
+    Image.new("RGB", size, color).save(path, format="PNG")
+
+
+@pytest.fixture
+def test_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALLOWED_IMAGE_DIRS", str(tmp_path))
+    reset_image_cache()
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+    reset_image_cache()
+
+
+@pytest.fixture
+def vision_job(test_db, tmp_path):
+    """Batch job whose 6 items reference 3 image files."""
+    for i in range(3):
+        write_png(tmp_path / f"img{i}.png", color=(i * 80, 0, 0))
+
+    project = Project(name="Vision Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="Describe {{photo:FILEPATH}}")
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for i in range(6):
+        path = str(tmp_path / f"img{i % 3}.png")
+        test_db.add(JobItem(job_id=job.id, input_params=json.dumps({"photo": path}), raw_prompt=f"Describe {path}"))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return revision, items
+
+
+# ============================================================================
+# encode_image_file
+# ============================================================================
+
+class TestEncodeImageFile:
+
+    def test_small_image_sent_as_is(self, tmp_path):
+        path = tmp_path / "a.png"
+        write_png(path)
+        data_uri = encode_image_file(str(path), 2048)
+        assert data_uri.startswith("data:image/png;base64,")
+        assert base64.b64decode(data_uri.split(",", 1)[1]) == path.read_bytes()
+
+    def test_large_image_resized(self, tmp_path):
+        path = tmp_path / "a.png"
+        write_png(path, size=(100, 50))
+        data_uri = encode_image_file(str(path), 20)
+        img = Image.open(io.BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+        assert img.size == (20, 10)
+
+    def test_unsupported_format(self, tmp_path):
+        path = tmp_path / "a.bmp"
+        Image.new("RGB", (4, 4)).save(path, format="BMP")
+        with pytest.raises(ValueError):
+            encode_image_file(str(path), 2048)
+
+
+# ============================================================================
+# ImagePrefetcher
+# ============================================================================
+
+class TestImagePrefetcher:
+
+    def test_prefetch_window_and_refcount(self, tmp_path):
+        write_png(tmp_path / "a.png")
+        path = str(tmp_path / "a.png")
+        key = filepath_cache_key(path, 2048)
+        requested = []
+
+        def item_targets(index):
+            requested.append(index)
+            return [(key, path)]
+
+        with ImagePrefetcher(item_targets, item_count=10, depth=2, workers=1, max_dimension=2048) as prefetcher:
+            prefetcher.advance(0)
+            assert requested == [0, 1, 2]
+            prefetcher.advance(1)
+            assert requested == [0, 1, 2, 3]
+
+            futures = [prefetcher.take(key) for _ in range(4)]
+            assert all(f is futures[0] for f in futures)
+            assert futures[0].result(timeout=30) == encode_image_file(path, 2048)
+            # All four registered uses were taken
+            assert prefetcher.take(key) is None
+
+
+# ============================================================================
+# JobManager prefetch stage
+# ============================================================================
+
+class TestJobManagerPrefetch:
+
+    def test_disabled_by_default(self, test_db, vision_job):
+        revision, items = vision_job
+        assert JobManager(test_db)._create_image_prefetcher(items, revision) is None
+
+    def test_serial_execution_uses_prefetched_images(self, test_db, vision_job, tmp_path):
+        revision, items = vision_job
+        test_db.add(SystemSetting(key="image_preprocess_workers", value="2"))
+        test_db.add(SystemSetting(key="image_prefetch_depth", value="3"))
+        test_db.commit()
+
+        manager = JobManager(test_db)
+        client = ImageRecordingClient()
+        manager._image_prefetcher = manager._create_image_prefetcher(items, revision)
+        assert manager._image_prefetcher is not None
+        try:
+            errors = manager._execute_items_serial(items, client, revision, 0)
+        finally:
+            manager._image_prefetcher.close()
+            manager._image_prefetcher = None
+
+        assert errors == 0
+        expected = [encode_image_file(str(tmp_path / f"img{i % 3}.png"), 2048) for i in range(6)]
+        assert [images[0] for images in client.images] == expected
+
+    def test_parallel_execution_with_prefetch(self, test_db, vision_job):
+        revision, items = vision_job
+        test_db.add(SystemSetting(key="image_preprocess_workers", value="1"))
+        test_db.commit()
+
+        manager = JobManager(test_db)
+        client = ImageRecordingClient()
+        manager._image_prefetcher = manager._create_image_prefetcher(items, revision)
+        try:
+            errors = manager._execute_items_parallel(items, client, revision, 0, 4)
+        finally:
+            manager._image_prefetcher.close()
+            manager._image_prefetcher = None
+
+        assert errors == 0
+        assert len(client.images) == 6
+        assert all(images and images[0].startswith("data:image/png;base64,") for images in client.images)
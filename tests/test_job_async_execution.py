@@ -0,0 +1,214 @@
+"""Tests for the asyncio job item execution mode.
+
+Test Categories:
+1. Execution mode / concurrency settings
+2. Async pipeline results and error handling
+3. Concurrency bound and cancellation
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.job_buffer import JobItemWriteBuffer
+from backend.llm.base import LLMClient, LLMResponse
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class FakeAsyncClient(LLMClient):
+    """LLM client that echoes the prompt and records peak concurrency."""
+
+    def __init__(self, delay: float = 0.01, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = []
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        raise AssertionError("async mode must not use the blocking call()")
+
+    async def acall(self, prompt=None, messages=None, images=None, **kwargs):
+        self.calls.append({"prompt": prompt, "messages": messages, "kwargs": kwargs})
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.fail_on and prompt == self.fail_on:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=1)
+        return LLMResponse(success=True, response_text=f"echo:{prompt}", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {"temperature": 0.7}
+
+    def get_model_name(self):
+        return "fake-model"
+
+
+@pytest.fixture
+def test_db():
+    """Create an in-memory SQLite database for testing."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def job_with_items(test_db):
+    """Create a batch job with 20 pending items."""
+    project = Project(name="Async Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for i in range(20):
+        test_db.add(JobItem(
+            job_id=job.id,
+            input_params=json.dumps({"text": f"row{i}"}),
+            raw_prompt=f"row{i}"
+        ))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).all()
+    return revision, items
+
+
+# ============================================================================
+# Settings
+# ============================================================================
+
+class TestExecutionModeSettings:
+
+    def test_defaults(self, test_db):
+        manager = JobManager(test_db)
+        assert manager._get_execution_mode() == "auto"
+        assert manager._get_async_concurrency() == JobManager.DEFAULT_ASYNC_CONCURRENCY
+
+    def test_configured_values(self, test_db):
+        test_db.add(SystemSetting(key="job_execution_mode", value="ASYNC"))
+        test_db.add(SystemSetting(key="job_async_concurrency", value="5000"))
+        test_db.commit()
+        manager = JobManager(test_db)
+        assert manager._get_execution_mode() == "async"
+        assert manager._get_async_concurrency() == JobManager.MAX_ASYNC_CONCURRENCY
+
+    def test_unknown_mode_falls_back_to_auto(self, test_db):
+        test_db.add(SystemSetting(key="job_execution_mode", value="fibers"))
+        test_db.commit()
+        assert JobManager(test_db)._get_execution_mode() == "auto"
+
+
+# ============================================================================
+# Async pipeline
+# ============================================================================
+
+class TestAsyncPipeline:
+
+    def test_all_items_completed(self, test_db, job_with_items):
+        revision, items = job_with_items
+        client = FakeAsyncClient()
+        errors = JobManager(test_db)._execute_items_async(items, client, revision, 0.3, 8)
+
+        assert errors == 0
+        test_db.expire_all()
+        for item in test_db.query(JobItem).all():
+            assert item.status == "done"
+            assert item.raw_response == f"echo:{item.raw_prompt}"
+            assert json.loads(item.parsed_response)["parsed"] is False
+        assert all(c["kwargs"]["temperature"] == 0.3 for c in client.calls)
+
+    def test_concurrency_is_bounded(self, test_db, job_with_items):
+        revision, items = job_with_items
+        client = FakeAsyncClient(delay=0.02)
+        JobManager(test_db)._execute_items_async(items, client, revision, 0.7, 4)
+
+        assert len(client.calls) == 20
+        assert 1 < client.peak_in_flight <= 4
+
+    def test_errors_are_recorded(self, test_db, job_with_items):
+        revision, items = job_with_items
+        client = FakeAsyncClient(fail_on="row3")
+        errors = JobManager(test_db)._execute_items_async(items, client, revision, 0.7, 8)
+
+        assert errors == 1
+        test_db.expire_all()
+        failed = test_db.query(JobItem).filter(JobItem.status == "error").all()
+        assert [i.raw_prompt for i in failed] == ["row3"]
+        assert failed[0].error_message == "boom"
+
+    def test_cancelled_items_are_skipped(self, test_db, job_with_items):
+        revision, items = job_with_items
+        for item in items[10:]:
+            item.status = "cancelled"
+        test_db.commit()
+
+        client = FakeAsyncClient()
+        errors = JobManager(test_db)._execute_items_async(items, client, revision, 0.7, 8)
+
+        assert errors == 0
+        assert len(client.calls) == 10
+        test_db.expire_all()
+        assert test_db.query(JobItem).filter(JobItem.status == "cancelled").count() == 10
+
+    def test_claims_in_batches_off_the_event_loop(self, test_db, job_with_items, monkeypatch):
+        revision, items = job_with_items
+        claims = []
+        writes = []
+        original_claim = JobItemWriteBuffer.claim
+        original_record = JobItemWriteBuffer.record_result
+
+        def claim(buffer, item_ids):
+            claims.append((len(item_ids), threading.current_thread()))
+            return original_claim(buffer, item_ids)
+
+        def record_result(buffer, item_id, **values):
+            writes.append(threading.current_thread())
+            return original_record(buffer, item_id, **values)
+
+        monkeypatch.setattr(JobItemWriteBuffer, "claim", claim)
+        monkeypatch.setattr(JobItemWriteBuffer, "record_result", record_result)
+        loop_thread = threading.current_thread()
+        JobManager(test_db)._execute_items_async(items, FakeAsyncClient(), revision, 0.7, 8)
+
+        assert [size for size, _ in claims] == [8, 8, 4]
+        assert len(writes) == 20
+        assert all(thread is not loop_thread for _, thread in claims)
+        assert all(thread is not loop_thread for thread in writes)
+
+    def test_runs_inside_running_event_loop(self, test_db, job_with_items):
+        revision, items = job_with_items
+        client = FakeAsyncClient()
+        manager = JobManager(test_db)
+
+        async def caller():
+            # e.g. async MCP tool handler calling the sync execute path
+            return manager._execute_items_async(items, client, revision, 0.7, 8)
+
+        assert asyncio.run(caller()) == 0
+        assert len(client.calls) == 20
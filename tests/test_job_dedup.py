@@ -0,0 +1,261 @@
+"""Tests for in-batch deduplication of identical prompts.
+
+Test Categories:
+1. Dedup mode settings
+2. Grouping by request payload
+3. Result fan-out and progress reporting
+4. Settings API
+"""
+
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class EchoClient(LLMClient):
+    """Client that echoes the prompt and records calls."""
+
+    def __init__(self, model_name: str = "echo-model", fail_on: str = None):
+        self.model_name = model_name
+        self.fail_on = fail_on
+        self.calls = []
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        self.calls.append(prompt)
+        if prompt == self.fail_on:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=3)
+        return LLMResponse(success=True, response_text=f"echo:{prompt}", turnaround_ms=3)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return self.model_name
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+def create_job(test_db, rows, prompt_template="{{text}}"):
+    """Create a batch job with one pending item per input params dict."""
+    project = Project(name="Dedup Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template=prompt_template)
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for params in rows:
+        test_db.add(JobItem(
+            job_id=job.id,
+            input_params=json.dumps(params),
+            raw_prompt=params["text"]
+        ))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+def _representatives(items, members):
+    """Items that are executed (not members of a duplicate group)."""
+    member_ids = {member_id for ids in members.values() for member_id in ids}
+    return [item for item in items if item.id not in member_ids]
+
+
+# ============================================================================
+# Settings
+# ============================================================================
+
+class TestDedupMode:
+
+    def test_default_off(self, test_db):
+        manager = JobManager(test_db)
+        assert manager._get_dedup_mode() == "off"
+        assert not manager._should_deduplicate(EchoClient(), 0)
+
+    def test_auto_requires_temperature_zero(self, test_db):
+        test_db.add(SystemSetting(key="job_dedup_mode", value="auto"))
+        test_db.commit()
+        manager = JobManager(test_db)
+        assert manager._should_deduplicate(EchoClient(), 0)
+        assert not manager._should_deduplicate(EchoClient(), 0.7)
+        # GPT-5 ignores temperature
+        assert not manager._should_deduplicate(EchoClient("azure-gpt-5-mini"), 0)
+
+    def test_force(self, test_db):
+        test_db.add(SystemSetting(key="job_dedup_mode", value="force"))
+        test_db.commit()
+        assert JobManager(test_db)._should_deduplicate(EchoClient(), 1.0)
+
+
+# ============================================================================
+# Grouping
+# ============================================================================
+
+class TestGrouping:
+
+    def test_identical_prompts_grouped(self, test_db):
+        _, revision, items = create_job(test_db, [{"text": t} for t in ["a", "b", "a", "a", "c", "b"]])
+        members = JobManager(test_db)._group_duplicate_items(items, revision)
+
+        assert [item.raw_prompt for item in _representatives(items, members)] == ["a", "b", "c"]
+        assert members == {items[0].id: [items[2].id, items[3].id], items[1].id: [items[5].id]}
+
+    def test_image_parameters_are_part_of_key(self, test_db):
+        rows = [
+            {"text": "describe", "img": "data:image/png;base64,AAAA"},
+            {"text": "describe", "img": "data:image/png;base64,BBBB"},
+            {"text": "describe", "img": "data:image/png;base64,AAAA"},
+        ]
+        _, revision, items = create_job(test_db, rows, prompt_template="describe {{img:FILE}}")
+        members = JobManager(test_db)._group_duplicate_items(items, revision)
+
+        assert len(_representatives(items, members)) == 2
+        assert members == {items[0].id: [items[2].id]}
+
+
+# ============================================================================
+# Fan-out
+# ============================================================================
+
+class TestFanOut:
+
+    def test_results_copied_to_members(self, test_db):
+        job, revision, items = create_job(test_db, [{"text": t} for t in ["a", "b", "a", "b", "a"]])
+        manager = JobManager(test_db)
+        client = EchoClient(fail_on="b")
+
+        manager._duplicate_members = manager._group_duplicate_items(items, revision)
+        representatives = _representatives(items, manager._duplicate_members)
+        errors = manager._execute_items_serial(representatives, client, revision, 0)
+
+        assert client.calls == ["a", "b"]
+        assert errors == 2
+        test_db.expire_all()
+        for item in test_db.query(JobItem).filter(JobItem.job_id == job.id).all():
+            if item.raw_prompt == "a":
+                assert item.status == "done"
+                assert item.raw_response == "echo:a"
+                assert json.loads(item.parsed_response)["raw"] == "echo:a"
+            else:
+                assert item.status == "error"
+                assert item.error_message == "boom"
+
+    def test_cancelled_members_untouched(self, test_db):
+        _, revision, items = create_job(test_db, [{"text": "a"}] * 3)
+        manager = JobManager(test_db)
+        manager._duplicate_members = manager._group_duplicate_items(items, revision)
+        representatives = _representatives(items, manager._duplicate_members)
+        items[2].status = "cancelled"
+        test_db.commit()
+
+        manager._execute_items_serial(representatives, EchoClient(), revision, 0)
+
+        test_db.expire_all()
+        statuses = [i.status for i in test_db.query(JobItem).order_by(JobItem.id).all()]
+        assert statuses == ["done", "done", "cancelled"]
+
+    def test_unfinished_representative_not_copied(self, test_db):
+        job, revision, items = create_job(test_db, [{"text": "a"}] * 2)
+        manager = JobManager(test_db)
+        manager._duplicate_members = manager._group_duplicate_items(items, revision)
+        representatives = _representatives(items, manager._duplicate_members)
+
+        # The representative was skipped (e.g. the job was cancelled)
+        with manager._create_write_buffer(job.id) as buffer:
+            assert manager._record_final_result(buffer, representatives[0].id, None) == 0
+        test_db.expire_all()
+        assert test_db.query(JobItem).filter(JobItem.status == "pending").count() == 2
+
+    @pytest.mark.parametrize("mode", ["parallel", "async"])
+    def test_results_copied_in_all_modes(self, test_db, mode):
+        job, revision, items = create_job(test_db, [{"text": t} for t in ["a", "b", "a", "a"]])
+        manager = JobManager(test_db)
+        manager._duplicate_members = manager._group_duplicate_items(items, revision)
+        representatives = _representatives(items, manager._duplicate_members)
+        client = EchoClient(fail_on="b")
+
+        if mode == "parallel":
+            errors = manager._execute_items_parallel(representatives, client, revision, 0, 2)
+        else:
+            errors = manager._execute_items_async(representatives, client, revision, 0, 2)
+
+        assert errors == 1
+        test_db.expire_all()
+        items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+        assert [(item.status, item.raw_response) for item in items] == [
+            ("done", "echo:a"), ("error", None), ("done", "echo:a"), ("done", "echo:a")
+        ]
+
+    def test_progress_reports_saved_calls(self, test_db):
+        job, _, _ = create_job(test_db, [{"text": "a"}])
+        manager = JobManager(test_db)
+        assert manager.get_job_progress(job.id)["dedup_saved_calls"] == 0
+
+        job.dedup_saved_calls = 4
+        test_db.commit()
+        assert manager.get_job_progress(job.id)["dedup_saved_calls"] == 4
+
+
+# ============================================================================
+# Settings API
+# ============================================================================
+
+class TestSettingsAPI:
+
+    @pytest.fixture
+    def client(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_get_and_set(self, client):
+        assert client.get("/api/settings/job-dedup").json()["mode"] == "off"
+
+        response = client.put("/api/settings/job-dedup?mode=AUTO")
+        assert response.status_code == 200
+        assert client.get("/api/settings/job-dedup").json()["mode"] == "auto"
+
+    def test_invalid_mode(self, client):
+        assert client.put("/api/settings/job-dedup?mode=sometimes").status_code == 400
@@ -0,0 +1,220 @@
+"""Tests for the provider batch offload execution mode.
+
+Test Categories:
+1. Provider selection and settings
+2. Offloaded execution with the local file-based provider
+3. Provider result parsing
+"""
+
+import json
+import os
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse
+from backend.llm.batch import LocalBatchProvider, OpenAIBatchProvider, get_batch_provider
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class FakeClient(LLMClient):
+    """LLM client that echoes the prompt (no provider batch API)."""
+
+    def __init__(self, fail_on: str = None, gate: threading.Event = None):
+        self.fail_on = fail_on
+        self.gate = gate
+        self.calls = []
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        if self.gate:
+            self.gate.wait(timeout=10)
+        self.calls.append({"prompt": prompt, "kwargs": kwargs})
+        if self.fail_on and prompt == self.fail_on:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=1)
+        return LLMResponse(success=True, response_text=f"echo:{prompt}", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {"temperature": 0.7}
+
+    def get_model_name(self):
+        return "fake-model"
+
+
+@pytest.fixture
+def test_db():
+    """Create an in-memory SQLite database for testing."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def job_with_items(test_db):
+    """Create a batch job with 20 pending items."""
+    project = Project(name="Offload Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for i in range(20):
+        test_db.add(JobItem(
+            job_id=job.id,
+            input_params=json.dumps({"text": f"row{i}"}),
+            raw_prompt=f"row{i}"
+        ))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+@pytest.fixture
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(JobManager, "OFFLOAD_POLL_SECONDS", 0.01)
+
+
+# ============================================================================
+# Provider selection
+# ============================================================================
+
+class TestProviderSelection:
+
+    def test_offload_is_a_valid_mode(self, test_db):
+        test_db.add(SystemSetting(key="job_execution_mode", value="offload"))
+        test_db.commit()
+        assert JobManager(test_db)._get_execution_mode() == "offload"
+
+    def test_small_and_single_jobs_are_not_offloaded(self, test_db, job_with_items):
+        job, _, _ = job_with_items
+        test_db.add(SystemSetting(key="job_offload_provider", value="local"))
+        test_db.commit()
+        manager = JobManager(test_db)
+        # Default threshold is far above 20 items
+        assert manager._get_batch_provider(job, FakeClient(), 20) is None
+
+        test_db.add(SystemSetting(key="job_offload_min_items", value="10"))
+        test_db.commit()
+        assert isinstance(manager._get_batch_provider(job, FakeClient(), 20), LocalBatchProvider)
+        job.job_type = "single"
+        assert manager._get_batch_provider(job, FakeClient(), 20) is None
+
+    def test_model_without_batch_api_falls_back(self, test_db, job_with_items):
+        job, _, _ = job_with_items
+        test_db.add(SystemSetting(key="job_offload_min_items", value="1"))
+        test_db.commit()
+        assert JobManager(test_db)._get_batch_provider(job, FakeClient(), 20) is None
+        assert get_batch_provider(FakeClient(), "auto") is None
+
+
+# ============================================================================
+# Offloaded execution
+# ============================================================================
+
+class TestLocalOffload:
+
+    def test_results_are_written_back(self, test_db, job_with_items, tmp_path, fast_poll, monkeypatch):
+        monkeypatch.setattr(JobManager, "OFFLOAD_MAX_BATCH_REQUESTS", 7)
+        _, revision, items = job_with_items
+        client = FakeClient(fail_on="row3")
+        provider = LocalBatchProvider(client, str(tmp_path))
+
+        errors = JobManager(test_db)._execute_items_offload(items, provider, revision, 0.3)
+
+        assert errors == 1
+        assert len(list(tmp_path.glob("*.output.jsonl"))) == 3
+        assert client.calls[0]["kwargs"] == {"temperature": 0.3}
+        test_db.expire_all()
+        for item in test_db.query(JobItem).all():
+            if item.raw_prompt == "row3":
+                assert item.status == "error"
+                assert item.error_message == "boom"
+            else:
+                assert item.status == "done"
+                assert item.raw_response == f"echo:{item.raw_prompt}"
+                assert json.loads(item.parsed_response) == {"raw": item.raw_response, "parsed": False}
+
+    def test_missing_results_are_errors(self, test_db, job_with_items, tmp_path, fast_poll):
+        _, revision, items = job_with_items
+
+        class LossyProvider(LocalBatchProvider):
+            def iter_results(self, batch_id):
+                for custom_id, response in super().iter_results(batch_id):
+                    if custom_id != f"item-{items[0].id}":
+                        yield custom_id, response
+
+        errors = JobManager(test_db)._execute_items_offload(
+            items, LossyProvider(FakeClient(), str(tmp_path)), revision, 0.3
+        )
+        assert errors == 1
+        test_db.expire_all()
+        first = test_db.query(JobItem).filter(JobItem.id == items[0].id).first()
+        assert first.status == "error"
+        assert "No result in batch" in first.error_message
+
+    def test_cancel_stops_the_batch(self, test_db, job_with_items, tmp_path, fast_poll):
+        job, revision, items = job_with_items
+        gate = threading.Event()
+        provider = LocalBatchProvider(FakeClient(gate=gate), str(tmp_path))
+        job_id = job.id
+
+        def cancel_later():
+            time.sleep(0.1)
+            # Separate session, as the cancel request would use
+            cancel_db = sessionmaker(bind=test_db.get_bind())()
+            JobManager(cancel_db).cancel_pending_items(job_id)
+            cancel_db.close()
+
+        canceller = threading.Thread(target=cancel_later)
+        canceller.start()
+        errors = JobManager(test_db)._execute_items_offload(items, provider, revision, 0.3)
+        canceller.join()
+        gate.set()
+
+        assert errors == 0
+        assert len(list(tmp_path.glob("*.cancel"))) == 1
+        test_db.expire_all()
+        assert {item.status for item in test_db.query(JobItem).all()} == {"cancelled"}
+
+
+# ============================================================================
+# Provider result parsing
+# ============================================================================
+
+class TestOpenAIResultParsing:
+
+    def test_success_and_error_lines(self):
+        custom_id, response = OpenAIBatchProvider._parse_line({
+            "custom_id": "item-1",
+            "response": {"status_code": 200, "body": {"choices": [{"message": {"content": "hi"}}]}}
+        })
+        assert custom_id == "item-1"
+        assert response.success and response.response_text == "hi"
+
+        _, response = OpenAIBatchProvider._parse_line({
+            "custom_id": "item-2",
+            "response": {"status_code": 429, "body": {"error": {"message": "rate limited"}}}
+        })
+        assert not response.success
+        assert response.error_message == "rate limited"
@@ -0,0 +1,244 @@
+"""Tests for aggregate job progress and the SSE progress stream.
+
+Test Categories:
+1. get_job_progress counts
+2. JobProgressTracker notifications
+3. Progress stream endpoint
+"""
+
+import json
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Job, JobItem
+from backend.job import JobManager
+from backend.job_buffer import JobItemWriteBuffer
+from backend.job_progress import get_job_progress_tracker, reset_job_progress_tracker
+from app.main import app
+import app.routes.run as run_routes
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    reset_job_progress_tracker()
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    reset_job_progress_tracker()
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def add_job(db, statuses, job_status="running"):
+    job = Job(job_type="batch", status=job_status)
+    db.add(job)
+    db.commit()
+    for status in statuses:
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="p" * 1000, status=status))
+    db.commit()
+    return job
+
+
+def read_events(resp):
+    return [json.loads(line[len("data: "):]) for line in resp.iter_lines() if line.startswith("data: ")]
+
+
+# ============================================================================
+# get_job_progress
+# ============================================================================
+
+class TestGetJobProgress:
+
+    def test_counts_by_status(self, test_db):
+        job = add_job(test_db, ["done", "done", "error", "pending", "running", "cancelled"])
+
+        progress = JobManager(test_db).get_job_progress(job.id)
+        assert progress["total_items"] == 6
+        assert progress["completed"] == 2
+        assert progress["errors"] == 1
+        assert progress["pending"] == 1
+        assert progress["running"] == 1
+        assert progress["cancelled"] == 1
+        assert progress["progress_percent"] == 66
+
+    def test_empty_and_missing_job(self, test_db):
+        job = add_job(test_db, [])
+        progress = JobManager(test_db).get_job_progress(job.id)
+        assert progress["total_items"] == 0
+        assert progress["progress_percent"] == 0
+        with pytest.raises(ValueError):
+            JobManager(test_db).get_job_progress(9999)
+
+
+# ============================================================================
+# JobProgressTracker
+# ============================================================================
+
+class TestJobProgressTracker:
+
+    def test_buffer_flush_and_cancel_notify(self, test_db, session_factory):
+        job = add_job(test_db, ["pending", "pending"])
+        tracker = get_job_progress_tracker()
+        assert tracker.version(job.id) == 0
+
+        buffer = JobItemWriteBuffer(session_factory(), job.id, max_delay=60)
+        buffer.mark_running(1)
+        buffer.close()
+        assert tracker.version(job.id) == 1
+
+        # Nothing buffered: no notification
+        buffer = JobItemWriteBuffer(session_factory(), job.id, max_delay=60)
+        buffer.close()
+        assert tracker.version(job.id) == 1
+
+        JobManager(test_db).cancel_pending_items(job.id)
+        assert tracker.version(job.id) == 2
+
+    def test_finished_jobs_are_dropped(self):
+        tracker = get_job_progress_tracker()
+        for job_id in range(1, 101):
+            tracker.notify(job_id)
+            tracker.add_partial_text(job_id, 1, "text")
+            tracker.notify(job_id, finished=True)
+        assert tracker.tracked_jobs() == 0
+
+    def test_finished_job_is_kept_for_subscribers(self):
+        tracker = get_job_progress_tracker()
+        tracker.subscribe(1)
+        tracker.subscribe(1)
+        tracker.notify(1)
+        tracker.notify(1, finished=True)
+        assert tracker.version(1) == 2
+        tracker.unsubscribe(1)
+        assert tracker.tracked_jobs() == 1
+        tracker.unsubscribe(1)
+        assert tracker.tracked_jobs() == 0
+
+    def test_restarted_job_is_not_dropped(self):
+        tracker = get_job_progress_tracker()
+        tracker.subscribe(1)
+        tracker.notify(1, finished=True)
+        tracker.notify(1)  # Error items retried
+        tracker.unsubscribe(1)
+        assert tracker.version(1) == 2
+
+
+# ============================================================================
+# Progress stream endpoint
+# ============================================================================
+
+class TestProgressStream:
+
+    def test_finished_job_sends_one_event(self, client, test_db):
+        job = add_job(test_db, ["done", "error"], job_status="error")
+
+        with client.stream("GET", f"/api/jobs/{job.id}/progress/stream") as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            events = read_events(resp)
+
+        assert len(events) == 1
+        assert events[0]["status"] == "error"
+        assert events[0]["completed"] == 1
+
+    def test_missing_job_is_404(self, client):
+        assert client.get("/api/jobs/9999/progress/stream").status_code == 404
+
+    def test_pushes_changes_until_finished(self, client, session_factory, monkeypatch):
+        monkeypatch.setattr(run_routes, "PROGRESS_STREAM_TICK_SECONDS", 0.01)
+        db = session_factory()
+        job = add_job(db, ["pending", "pending"])
+        job_id = job.id
+        db.close()
+
+        def execute():
+            time.sleep(0.1)
+            worker_db = session_factory()
+            try:
+                for item in worker_db.query(JobItem).filter(JobItem.job_id == job_id).order_by(JobItem.id):
+                    item.status = "done"
+                    worker_db.commit()
+                    get_job_progress_tracker().notify(job_id)
+                    time.sleep(0.1)
+                worker_db.query(Job).filter(Job.id == job_id).update({"status": "done"})
+                worker_db.commit()
+                get_job_progress_tracker().notify(job_id)
+            finally:
+                worker_db.close()
+
+        worker = threading.Thread(target=execute)
+        worker.start()
+        with client.stream("GET", f"/api/jobs/{job_id}/progress/stream") as resp:
+            events = read_events(resp)
+        worker.join()
+
+        assert [e["completed"] for e in events] == [0, 1, 2, 2]
+        assert events[-1]["status"] == "done"
+
+    def test_polls_database_with_workers(self, client, session_factory, monkeypatch):
+        monkeypatch.setenv("JOB_RUNNER", "worker")
+        monkeypatch.setattr(run_routes, "PROGRESS_STREAM_TICK_SECONDS", 0.01)
+        monkeypatch.setattr(run_routes, "PROGRESS_STREAM_WORKER_POLL_SECONDS", 0.05)
+        db = session_factory()
+        job = add_job(db, ["pending"])
+        job_id = job.id
+        db.close()
+
+        def execute():
+            # Another process: commits without notifying this process's tracker
+            time.sleep(0.1)
+            worker_db = session_factory()
+            try:
+                worker_db.query(JobItem).filter(JobItem.job_id == job_id).update({"status": "done"})
+                worker_db.query(Job).filter(Job.id == job_id).update({"status": "done"})
+                worker_db.commit()
+            finally:
+                worker_db.close()
+
+        worker = threading.Thread(target=execute)
+        worker.start()
+        start = time.monotonic()
+        with client.stream("GET", f"/api/jobs/{job_id}/progress/stream") as resp:
+            events = read_events(resp)
+        worker.join()
+
+        assert events[-1]["status"] == "done"
+        assert time.monotonic() - start < run_routes.PROGRESS_STREAM_REFRESH_SECONDS
+        assert get_job_progress_tracker().tracked_jobs() == 0
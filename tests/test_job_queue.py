@@ -0,0 +1,303 @@
+"""Tests for the durable job queue.
+
+Test Categories:
+1. Leases and heartbeats
+2. Interrupted item reset
+3. Recovery after restart
+4. Failed execution
+5. Fencing of lost leases
+"""
+
+import json
+import socket
+import subprocess
+import sys
+import os
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend.database
+from backend.database import Base, Job, JobItem
+from backend.job import JobManager
+from backend.job_queue import JobLease, JobQueueStore, recover_queued_jobs
+from backend.job_scheduler import PRIORITY_INTERACTIVE, execute_leased_job
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def store(session_factory):
+    return JobQueueStore(session_factory, owner="test-host:1:aaaa")
+
+
+class RecordingScheduler:
+    """Scheduler stand-in that records submissions."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, job_config, lane, priority=50, project_id=None):
+        self.submitted.append((job_config["job_id"], lane, priority, project_id))
+        return 0
+
+
+def add_job(session_factory, status="pending", item_statuses=()):
+    db = session_factory()
+    job = Job(job_type="batch", status=status)
+    db.add(job)
+    db.commit()
+    for item_status in item_statuses:
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status=item_status))
+    db.commit()
+    job_id = job.id
+    db.close()
+    return job_id
+
+
+def job_config(job_id):
+    return {"job_id": job_id, "model_name": "gpt-test", "include_csv_header": True, "temperature": 0.7}
+
+
+# ============================================================================
+# Leases and heartbeats
+# ============================================================================
+
+class TestLeases:
+
+    def test_add_replaces_existing_row(self, store, session_factory):
+        job_id = add_job(session_factory)
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        store.add(job_config(job_id), lane="gpt-other", priority=PRIORITY_INTERACTIVE, project_id=3)
+
+        entries = store.entries()
+        assert len(entries) == 1
+        assert entries[0].lane == "gpt-other"
+        assert entries[0].project_id == 3
+        assert json.loads(entries[0].job_config)["model_name"] == "gpt-test"
+
+    def test_live_lease_blocks_other_owner(self, store, session_factory):
+        job_id = add_job(session_factory)
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        other = JobQueueStore(session_factory, owner="test-host:2:bbbb")
+
+        assert store.acquire(job_id) is True
+        assert other.acquire(job_id) is False
+        # Re-acquiring our own lease is allowed
+        assert store.acquire(job_id) is True
+        assert store.entries()[0].attempts == 2
+
+    def test_expired_lease_can_be_taken(self, session_factory):
+        job_id = add_job(session_factory)
+        store = JobQueueStore(session_factory, owner="test-host:1:aaaa", lease_seconds=0.05)
+        other = JobQueueStore(session_factory, owner="test-host:2:bbbb")
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+
+        assert store.acquire(job_id) is True
+        time.sleep(0.1)
+        assert other.acquire(job_id) is True
+        assert store.renew(job_id) is False
+        assert store.entries()[0].lease_owner == "test-host:2:bbbb"
+
+    def test_removed_job_is_not_acquired(self, store, session_factory):
+        job_id = add_job(session_factory)
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        store.remove(job_id)
+        assert store.acquire(job_id) is None
+        assert store.wait_for_lease(job_id) is False
+
+    def test_heartbeat_renews_lease(self, session_factory):
+        job_id = add_job(session_factory)
+        store = JobQueueStore(session_factory, owner="test-host:1:aaaa", lease_seconds=0.2, heartbeat_seconds=0.05)
+        other = JobQueueStore(session_factory, owner="test-host:2:bbbb")
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+
+        assert store.acquire(job_id) is True
+        with store.heartbeat(job_id):
+            time.sleep(0.4)
+            assert other.acquire(job_id) is False
+
+
+# ============================================================================
+# Interrupted item reset
+# ============================================================================
+
+class TestResetStaleItems:
+
+    def test_only_running_items_are_reset(self, store, session_factory):
+        job_id = add_job(session_factory, status="running", item_statuses=["done", "running", "running", "pending", "error"])
+        assert store.reset_stale_items(job_id) == 2
+
+        db = session_factory()
+        statuses = [item.status for item in db.query(JobItem).filter(JobItem.job_id == job_id).order_by(JobItem.id)]
+        db.close()
+        assert statuses == ["done", "pending", "pending", "pending", "error"]
+
+
+# ============================================================================
+# Recovery after restart
+# ============================================================================
+
+class TestRecovery:
+
+    def test_resubmits_unfinished_jobs(self, store, session_factory):
+        running_id = add_job(session_factory, status="running")
+        pending_id = add_job(session_factory, status="pending")
+        done_id = add_job(session_factory, status="done")
+        store.add(job_config(running_id), lane="gpt-test", priority=50, project_id=1)
+        store.add(job_config(pending_id), lane="gpt-other", priority=PRIORITY_INTERACTIVE)
+        store.add(job_config(done_id), lane="gpt-test", priority=50)
+        store.add(job_config(9999), lane="gpt-test", priority=50)  # job was deleted
+
+        scheduler = RecordingScheduler()
+        assert recover_queued_jobs(store, scheduler) == [running_id, pending_id]
+        assert scheduler.submitted == [
+            (running_id, "gpt-test", 50, 1),
+            (pending_id, "gpt-other", PRIORITY_INTERACTIVE, None)
+        ]
+        assert [entry.job_id for entry in store.entries()] == [running_id, pending_id]
+
+    def test_releases_leases_of_dead_processes(self, session_factory):
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        proc.wait()
+        dead = JobQueueStore(session_factory, owner=f"{socket.gethostname()}:{proc.pid}:dead")
+        remote = JobQueueStore(session_factory, owner="other-host:1:cccc")
+        dead_job = add_job(session_factory, status="running")
+        remote_job = add_job(session_factory, status="running")
+        for owner, job_id in ((dead, dead_job), (remote, remote_job)):
+            owner.add(job_config(job_id), lane="gpt-test", priority=50)
+            assert owner.acquire(job_id) is True
+
+        store = JobQueueStore(session_factory, owner="test-host:9:new")
+        recover_queued_jobs(store, RecordingScheduler())
+
+        assert store.acquire(dead_job) is True
+        # Processes on other hosts cannot be checked; their lease has to expire
+        assert store.acquire(remote_job) is False
+
+
+# ============================================================================
+# Failed execution
+# ============================================================================
+
+class TestFailedExecution:
+
+    @pytest.fixture
+    def failing_execution(self, session_factory, monkeypatch):
+        def execute_job(self, **kwargs):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(backend.database, "SessionLocal", session_factory)
+        monkeypatch.setattr(JobManager, "execute_job", execute_job)
+
+    def test_job_is_marked_failed(self, store, session_factory, failing_execution):
+        job_id = add_job(session_factory, status="running", item_statuses=("done", "running", "pending"))
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        assert store.acquire(job_id) is True
+
+        execute_leased_job(store, job_config(job_id))
+
+        db = session_factory()
+        assert db.query(Job.status).filter(Job.id == job_id).scalar() == "error"
+        items = db.query(JobItem.status, JobItem.error_message).order_by(JobItem.id).all()
+        db.close()
+        assert items == [
+            ("done", None),
+            ("error", "Job execution failed: database is locked"),
+            ("error", "Job execution failed: database is locked")
+        ]
+        assert store.entries() == []
+
+    def test_row_is_kept_if_job_cannot_be_marked(self, store, session_factory, failing_execution, monkeypatch):
+        job_id = add_job(session_factory, status="running", item_statuses=("pending",))
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        assert store.acquire(job_id) is True
+        monkeypatch.setattr(store, "fail_job", lambda job_id, error_message: False)
+
+        execute_leased_job(store, job_config(job_id))
+
+        # Lease released, so the job can be claimed again
+        assert [entry.job_id for entry in store.entries()] == [job_id]
+        other = JobQueueStore(session_factory, owner="test-host:2:bbbb")
+        assert other.acquire(job_id) is True
+
+
+# ============================================================================
+# Fencing
+# ============================================================================
+
+def take_over(session_factory, job_id, owner="test-host:2:bbbb"):
+    """Let another owner take the job's lease (as after an expiry)."""
+    db = session_factory()
+    db.query(backend.database.JobQueueEntry).filter(
+        backend.database.JobQueueEntry.job_id == job_id
+    ).update({"lease_owner": owner})
+    db.commit()
+    db.close()
+
+
+class TestFencing:
+
+    def test_heartbeat_flags_lost_lease(self, session_factory):
+        job_id = add_job(session_factory)
+        store = JobQueueStore(session_factory, owner="test-host:1:aaaa", heartbeat_seconds=0.02)
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        assert store.acquire(job_id) is True
+
+        with store.heartbeat(job_id) as lease:
+            assert not lease.lost.wait(0.1)
+            take_over(session_factory, job_id)
+            assert lease.lost.wait(2)
+            # Executors see the flag through their write buffer
+            buffer = JobManager(session_factory(), lease=lease)._create_write_buffer(job_id)
+            assert buffer.stopped and not buffer.job_cancelled
+            buffer.close()
+
+    def test_hold_checks_owner_in_transaction(self, store, session_factory):
+        job_id = add_job(session_factory)
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        assert store.acquire(job_id) is True
+        lease = JobLease(job_id, store.owner)
+
+        db = session_factory()
+        assert lease.hold(db)
+        db.commit()
+        take_over(session_factory, job_id)
+        assert not lease.hold(db)
+        assert lease.lost.is_set()
+        db.close()
+
+    def test_lost_lease_leaves_job_to_new_owner(self, store, session_factory, monkeypatch):
+        job_id = add_job(session_factory, status="running")
+        store.add(job_config(job_id), lane="gpt-test", priority=50)
+        assert store.acquire(job_id) is True
+
+        def execute_job(self, job_id, **kwargs):
+            take_over(session_factory, job_id)
+            assert not self.lease.hold(self.db)
+            return self.db.query(Job).filter(Job.id == job_id).first()
+
+        monkeypatch.setattr(backend.database, "SessionLocal", session_factory)
+        monkeypatch.setattr(JobManager, "execute_job", execute_job)
+        execute_leased_job(store, job_config(job_id))
+
+        entries = store.entries()
+        assert [(entry.job_id, entry.lease_owner) for entry in entries] == [(job_id, "test-host:2:bbbb")]
@@ -0,0 +1,227 @@
+"""Tests for the multi-lane job scheduler.
+
+Test Categories:
+1. Lanes, priorities and fair sharing
+2. Capacity limits and failures
+3. Settings API
+"""
+
+import json
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, SystemSetting
+from backend.job_scheduler import (
+    JobScheduler, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+    load_job_scheduler_settings, reset_job_scheduler
+)
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class BlockingRunner:
+    """Runner that records start order and blocks each job until released."""
+
+    def __init__(self):
+        self.started = []
+        self._events = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def __call__(self, job_config):
+        job_id = job_config["job_id"]
+        with self._lock:
+            event = self._events.setdefault(job_id, threading.Event())
+            self.started.append(job_id)
+            self._changed.notify_all()
+        event.wait(timeout=10)
+        if job_config.get("fail"):
+            raise RuntimeError("boom")
+
+    def release(self, job_id):
+        with self._lock:
+            self._events.setdefault(job_id, threading.Event()).set()
+
+    def wait_started(self, count, timeout=5):
+        with self._changed:
+            assert self._changed.wait_for(lambda: len(self.started) >= count, timeout=timeout)
+
+
+@pytest.fixture
+def runner():
+    return BlockingRunner()
+
+
+@pytest.fixture
+def scheduler(runner):
+    scheduler = JobScheduler(runner, lane_concurrency=1, max_running=8)
+    yield scheduler
+    for job_id in range(100):
+        runner.release(job_id)
+    scheduler.wait_idle(timeout=10)
+
+
+def submit(scheduler, job_id, lane="model-a", **kwargs):
+    config = {"job_id": job_id, **kwargs.pop("config", {})}
+    return scheduler.submit(config, lane=lane, **kwargs)
+
+
+# ============================================================================
+# Lanes, priorities and fair sharing
+# ============================================================================
+
+class TestDispatchOrder:
+
+    def test_lanes_run_independently(self, scheduler, runner):
+        submit(scheduler, 1, lane="slow-model")
+        submit(scheduler, 2, lane="slow-model")
+        submit(scheduler, 3, lane="fast-model")
+        runner.wait_started(2)
+        assert sorted(runner.started) == [1, 3]
+        assert scheduler.stats()["lanes"]["slow-model"]["queued"] == [2]
+
+        runner.release(1)
+        runner.wait_started(3)
+        assert runner.started[-1] == 2
+
+    def test_interactive_job_uses_reserved_slot(self, scheduler, runner):
+        submit(scheduler, 1, priority=PRIORITY_BATCH)
+        submit(scheduler, 2, priority=PRIORITY_BATCH)
+        submit(scheduler, 3, priority=PRIORITY_INTERACTIVE)
+        runner.wait_started(2)
+        assert sorted(runner.started) == [1, 3]
+        assert scheduler.queued_count() == 1
+
+    def test_priority_order(self, scheduler, runner):
+        submit(scheduler, 1)
+        submit(scheduler, 2, priority=80)
+        submit(scheduler, 3, priority=20)
+        runner.wait_started(1)
+
+        runner.release(1)
+        runner.wait_started(2)
+        assert runner.started[1] == 3
+
+    def test_fair_share_across_projects(self, scheduler, runner):
+        for job_id in (1, 2, 3):
+            submit(scheduler, job_id, project_id=10)
+        submit(scheduler, 4, project_id=20)
+        runner.wait_started(1)
+
+        for job_id in (1, 4, 2):
+            runner.release(job_id)
+        runner.release(3)
+        scheduler.wait_idle(timeout=10)
+        assert runner.started == [1, 4, 2, 3]
+
+
+# ============================================================================
+# Capacity limits and failures
+# ============================================================================
+
+class TestCapacity:
+
+    def test_max_running_caps_all_lanes(self, runner):
+        scheduler = JobScheduler(runner, lane_concurrency=4, max_running=2)
+        for job_id in range(1, 5):
+            submit(scheduler, job_id, lane=f"model-{job_id}")
+        runner.wait_started(2)
+        assert scheduler.stats()["running"] == 2
+        assert scheduler.queued_count() == 2
+
+        scheduler.configure(max_running=4)
+        runner.wait_started(4)
+        for job_id in range(1, 5):
+            runner.release(job_id)
+        assert scheduler.wait_idle(timeout=10)
+
+    def test_lane_override(self, scheduler, runner):
+        scheduler.configure(lane_overrides={"model-a": 2})
+        for job_id in (1, 2, 3):
+            submit(scheduler, job_id)
+        runner.wait_started(2)
+        assert scheduler.stats()["lanes"]["model-a"] == {"concurrency": 2, "running": [1, 2], "queued": [3]}
+
+    def test_failed_job_frees_slot(self, scheduler, runner):
+        submit(scheduler, 1, config={"fail": True})
+        submit(scheduler, 2)
+        runner.release(1)
+        runner.wait_started(2)
+        assert runner.started == [1, 2]
+
+
+# ============================================================================
+# Settings API
+# ============================================================================
+
+class TestSettingsAPI:
+
+    @pytest.fixture
+    def session_factory(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    @pytest.fixture
+    def client(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        reset_job_scheduler()
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+        reset_job_scheduler()
+
+    def test_defaults_and_clamping(self, session_factory):
+        db = session_factory()
+        assert load_job_scheduler_settings(db) == {"lane_concurrency": 1, "max_running": 8, "lane_overrides": {}}
+
+        db.add(SystemSetting(key="job_lane_concurrency", value="999"))
+        db.add(SystemSetting(key="job_lane_overrides", value=json.dumps({"gpt-5": 0, "nano": "x"})))
+        db.commit()
+        settings = load_job_scheduler_settings(db)
+        assert settings["lane_concurrency"] == 64
+        assert settings["lane_overrides"] == {"gpt-5": 1}
+        db.close()
+
+    def test_get_and_set(self, client):
+        resp = client.put(
+            "/api/settings/job-scheduler",
+            params={"lane_concurrency": 2, "max_running": 6},
+            json={"lane_overrides": {"gpt-5": 1}}
+        )
+        assert resp.status_code == 200
+        assert "message" in resp.json()
+
+        data = client.get("/api/settings/job-scheduler").json()
+        assert data["lane_concurrency"] == 2
+        assert data["max_running"] == 6
+        assert data["lane_overrides"] == {"gpt-5": 1}
+        assert data["scheduler"]["lane_concurrency"] == 2
+
+    def test_invalid_values(self, client):
+        assert client.put("/api/settings/job-scheduler", params={"lane_concurrency": 0}).status_code == 400
+        assert client.put("/api/settings/job-scheduler", params={"max_running": 1000}).status_code == 400
+        resp = client.put("/api/settings/job-scheduler", json={"lane_overrides": {"gpt-5": 0}})
+        assert resp.status_code == 400
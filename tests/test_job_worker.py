@@ -0,0 +1,276 @@
+"""Tests for standalone job workers.
+
+Test Categories:
+1. Claiming queued jobs
+2. Scheduler limits across workers
+3. Worker loop
+4. Web process with JOB_RUNNER=worker
+"""
+
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Job, SystemSetting
+from backend.database.models import JobQueueEntry
+from backend.job_queue import JobQueueStore
+from backend.job_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from backend.settings_cache import reset_settings_cache
+from backend.worker import JobWorker
+import app.routes.run as run_routes
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    reset_settings_cache()
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    reset_settings_cache()
+
+
+@pytest.fixture
+def store(session_factory):
+    return JobQueueStore(session_factory, owner="worker-a:1:aaaa")
+
+
+def queue_job(session_factory, store, lane="gpt-test", priority=PRIORITY_BATCH, status="pending"):
+    db = session_factory()
+    job = Job(job_type="batch", status=status)
+    db.add(job)
+    db.commit()
+    job_id = job.id
+    db.close()
+    config = {"job_id": job_id, "model_name": lane, "include_csv_header": True, "temperature": 0.7}
+    store.add(config, lane=lane, priority=priority)
+    return job_id
+
+
+def set_settings(session_factory, **values):
+    db = session_factory()
+    for key, value in values.items():
+        db.add(SystemSetting(key=key, value=value))
+    db.commit()
+    db.close()
+
+
+# ============================================================================
+# Claiming
+# ============================================================================
+
+class TestClaimNext:
+
+    def test_priority_then_submission_order(self, store, session_factory):
+        first = queue_job(session_factory, store)
+        second = queue_job(session_factory, store)
+        interactive = queue_job(session_factory, store, priority=PRIORITY_INTERACTIVE)
+
+        assert [store.claim_next()["job_id"] for _ in range(3)] == [interactive, first, second]
+        assert store.claim_next() is None
+        assert store.stats() == {"queued": 0, "leased": 3, "owners": ["worker-a:1:aaaa"]}
+
+    def test_workers_do_not_claim_the_same_job(self, store, session_factory):
+        job_id = queue_job(session_factory, store)
+        other = JobQueueStore(session_factory, owner="worker-b:1:bbbb")
+
+        assert store.claim_next()["job_id"] == job_id
+        assert other.claim_next() is None
+
+        # Released or expired leases can be taken over
+        store.release(job_id)
+        assert other.claim_next()["job_id"] == job_id
+        db = session_factory()
+        entry = db.query(JobQueueEntry).filter(JobQueueEntry.job_id == job_id).one()
+        entry.lease_expires_at = "2000-01-01T00:00:00.000000"
+        db.commit()
+        db.close()
+        assert store.claim_next()["job_id"] == job_id
+
+    def test_lane_filter(self, store, session_factory):
+        queue_job(session_factory, store, lane="model-a")
+        job_b = queue_job(session_factory, store, lane="model-b")
+        assert store.claim_next(lanes=["model-b"])["job_id"] == job_b
+        assert store.claim_next(lanes=["model-b"]) is None
+
+    def test_prune_removes_finished_jobs(self, store, session_factory):
+        queue_job(session_factory, store, status="done")
+        pending = queue_job(session_factory, store)
+        assert [entry.job_id for entry in store.prune()] == [pending]
+        assert store.stats()["queued"] == 1
+
+
+# ============================================================================
+# Scheduler limits
+# ============================================================================
+
+class TestLimits:
+
+    def test_lane_concurrency_counts_leases_of_all_workers(self, store, session_factory):
+        set_settings(session_factory, job_lane_concurrency="1", job_lane_overrides='{"model-b": 2}')
+        a1 = queue_job(session_factory, store, lane="model-a")
+        queue_job(session_factory, store, lane="model-a")
+        b_jobs = [queue_job(session_factory, store, lane="model-b") for _ in range(3)]
+
+        other = JobQueueStore(session_factory, owner="worker-b:1:bbbb")
+        worker_a = JobWorker(store, session_factory, runner=lambda store, config: None)
+        worker_b = JobWorker(other, session_factory, runner=lambda store, config: None)
+        limits = worker_a._load_limits()
+
+        def claim(worker):
+            return worker.store.claim_next(limits=lambda entry: worker._claim_limits(limits, entry))
+
+        assert claim(worker_a)["job_id"] == a1
+        assert claim(worker_b)["job_id"] == b_jobs[0]
+        assert claim(worker_a)["job_id"] == b_jobs[1]
+        assert claim(worker_b) is None
+
+    def test_racing_claims_respect_lane_limit(self, tmp_path):
+        # A file database: each store's session has its own connection
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'queue.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        stores = [JobQueueStore(factory, owner=f"worker-{i}:1:{i:04d}") for i in range(6)]
+        for _ in range(6):
+            queue_job(factory, stores[0])
+
+        barrier = threading.Barrier(len(stores))
+        claimed = []
+
+        def claim(store):
+            barrier.wait()
+            job_config = store.claim_next(limits=lambda entry: (2, 10))
+            if job_config is not None:
+                claimed.append(job_config["job_id"])
+
+        threads = [threading.Thread(target=claim, args=(store,)) for store in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 2
+        assert stores[0].stats()["leased"] == 2
+        engine.dispose()
+
+    def test_interactive_jobs_use_reserved_slot(self, store, session_factory):
+        set_settings(session_factory, job_lane_concurrency="1", job_max_running="1")
+        worker = JobWorker(store, session_factory)
+        limits = worker._load_limits()
+        queue_job(session_factory, store)
+        queue_job(session_factory, store)
+
+        def claim():
+            return store.claim_next(limits=lambda entry: worker._claim_limits(limits, entry))
+
+        assert claim() is not None
+        assert claim() is None
+        interactive = queue_job(session_factory, store, priority=PRIORITY_INTERACTIVE)
+        assert claim()["job_id"] == interactive
+
+
+# ============================================================================
+# Worker loop
+# ============================================================================
+
+class TestWorkerLoop:
+
+    def test_runs_jobs_up_to_concurrency(self, store, session_factory):
+        release = threading.Event()
+        executed = []
+
+        def runner(lease_store, job_config):
+            release.wait(5)
+            executed.append(job_config["job_id"])
+            lease_store.remove(job_config["job_id"])
+
+        job_ids = [queue_job(session_factory, store) for _ in range(3)]
+        set_settings(session_factory, job_lane_concurrency="8")
+        worker = JobWorker(store, session_factory, runner=runner, concurrency=2, poll_seconds=0.01)
+
+        assert worker.claim_one() == job_ids[0]
+        assert worker.claim_one() == job_ids[1]
+        assert worker.claim_one() is None  # Both slots busy
+
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(executed) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        thread.join(5)
+
+        assert sorted(executed) == job_ids
+        assert worker.running_job_ids == []
+        assert store.stats() == {"queued": 0, "leased": 0, "owners": []}
+
+    def test_failing_job_does_not_stop_worker(self, store, session_factory):
+        def runner(lease_store, job_config):
+            raise RuntimeError("boom")
+
+        queue_job(session_factory, store)
+        worker = JobWorker(store, session_factory, runner=runner)
+        assert worker.claim_one() is not None
+        deadline = time.monotonic() + 5
+        while worker.running_job_ids and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert worker.running_job_ids == []
+
+
+# ============================================================================
+# Web process
+# ============================================================================
+
+class RecordingScheduler:
+    """Scheduler stand-in that records submissions."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def configure(self, **kwargs):
+        pass
+
+    def submit(self, job_config, lane, priority=50, project_id=None):
+        self.submitted.append(job_config["job_id"])
+        return 0
+
+
+class TestEnqueue:
+
+    @pytest.mark.parametrize("runner_mode, runs_locally", [("worker", False), ("local", True)])
+    def test_job_runner_mode(self, store, session_factory, monkeypatch, runner_mode, runs_locally):
+        scheduler = RecordingScheduler()
+        monkeypatch.setenv("JOB_RUNNER", runner_mode)
+        monkeypatch.setattr(run_routes, "get_job_queue_store", lambda: store)
+        monkeypatch.setattr(run_routes, "get_job_scheduler", lambda: scheduler)
+        monkeypatch.setattr(run_routes, "SessionLocal", session_factory)
+
+        db = session_factory()
+        job = Job(job_type="batch", status="pending")
+        db.add(job)
+        db.commit()
+        job_id = job.id
+        db.close()
+
+        run_routes.enqueue_job(job_id, "gpt-test", True, 0.7)
+        assert store.stats()["queued"] == 1
+        assert scheduler.submitted == ([job_id] if runs_locally else [])
@@ -0,0 +1,267 @@
+"""Tests for the write-behind buffer used by serial/parallel job execution.
+
+Test Categories:
+1. JobItemWriteBuffer coalescing, thresholds and cancellation
+2. Serial and thread-pool executors writing through the buffer
+"""
+
+import json
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Project, ProjectRevision, Job, JobItem
+from backend.job import JobManager
+from backend.job_buffer import JobItemWriteBuffer
+from backend.llm.base import LLMClient, LLMResponse
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class EchoClient(LLMClient):
+    """Synchronous LLM client that echoes the prompt."""
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        self.calls += 1
+        if prompt == self.fail_on:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=1)
+        return LLMResponse(success=True, response_text=f"echo:{prompt}", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {"temperature": 0.7}
+
+    def get_model_name(self):
+        return "echo-model"
+
+
+@pytest.fixture
+def test_db():
+    """Create an in-memory SQLite database for testing."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def job_with_items(test_db):
+    """Create a batch job with 10 pending items."""
+    project = Project(name="Buffer Project")
+    test_db.add(project)
+    test_db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    test_db.add(revision)
+    test_db.commit()
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    test_db.add(job)
+    test_db.commit()
+    for i in range(10):
+        test_db.add(JobItem(
+            job_id=job.id,
+            input_params=json.dumps({"text": f"row{i}"}),
+            raw_prompt=f"row{i}"
+        ))
+    test_db.commit()
+    items = test_db.query(JobItem).filter(JobItem.job_id == job.id).all()
+    return job, revision, items
+
+
+def make_buffer(test_db, job_id, **kwargs):
+    kwargs.setdefault("max_delay", 60)
+    return JobItemWriteBuffer(Session(bind=test_db.get_bind()), job_id, **kwargs)
+
+
+def statuses(test_db):
+    test_db.expire_all()
+    return {item.id: item.status for item in test_db.query(JobItem).all()}
+
+
+# ============================================================================
+# JobItemWriteBuffer
+# ============================================================================
+
+class TestJobItemWriteBuffer:
+
+    def test_nothing_written_before_flush(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        buffer = make_buffer(test_db, job.id)
+        buffer.mark_running(items[0].id)
+        buffer.record_result(items[1].id, status="done", raw_response="x")
+
+        assert set(statuses(test_db).values()) == {"pending"}
+        buffer.close()
+
+        after = statuses(test_db)
+        assert after[items[0].id] == "running"
+        assert after[items[1].id] == "done"
+
+    def test_result_supersedes_running(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        with make_buffer(test_db, job.id) as buffer:
+            buffer.mark_running(items[0].id)
+            buffer.record_result(items[0].id, status="error", error_message="bad", turnaround_ms=5)
+
+        test_db.expire_all()
+        item = test_db.query(JobItem).filter(JobItem.id == items[0].id).first()
+        assert item.status == "error"
+        assert item.error_message == "bad"
+        assert item.turnaround_ms == 5
+
+    def test_size_threshold_flushes(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        buffer = make_buffer(test_db, job.id, max_items=3)
+        for item in items[:3]:
+            buffer.record_result(item.id, status="done")
+
+        assert list(statuses(test_db).values()).count("done") == 3
+        buffer.close()
+
+    def test_time_threshold_flushes(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        buffer = make_buffer(test_db, job.id, max_delay=0.05)
+        buffer.mark_running(items[0].id)
+        deadline = time.time() + 2
+        while statuses(test_db)[items[0].id] != "running" and time.time() < deadline:
+            time.sleep(0.02)
+
+        assert statuses(test_db)[items[0].id] == "running"
+        buffer.close()
+
+    def test_cancelled_items_are_not_overwritten(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        with make_buffer(test_db, job.id) as buffer:
+            buffer.mark_running(items[0].id)
+            buffer.mark_running(items[1].id)
+            # cancel_pending_items() runs before the buffer flushes
+            items[0].status = "cancelled"
+            job.status = "cancelled"
+            test_db.commit()
+            buffer.record_result(items[0].id, status="done", raw_response="late")
+            buffer.flush()
+            assert buffer.job_cancelled
+
+        after = statuses(test_db)
+        assert after[items[0].id] == "cancelled"
+        assert after[items[1].id] == "running"
+
+    def test_claim_skips_cancelled_items(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        items[1].status = "cancelled"
+        test_db.commit()
+        with make_buffer(test_db, job.id) as buffer:
+            buffer.record_result(items[5].id, status="done")
+            claimed = buffer.claim([items[2].id, items[1].id, items[0].id])
+
+            assert claimed == [items[2].id, items[0].id]
+            # Buffered updates are written along with the claim
+            after = statuses(test_db)
+            assert after[items[5].id] == "done"
+            assert [after[items[i].id] for i in range(3)] == ["running", "cancelled", "running"]
+
+
+# ============================================================================
+# Executors
+# ============================================================================
+
+class TestExecutorsUseBuffer:
+
+    def test_serial_execution(self, test_db, job_with_items):
+        _, revision, items = job_with_items
+        errors = JobManager(test_db)._execute_items_serial(items, EchoClient(fail_on="row4"), revision, 0.7)
+
+        assert errors == 1
+        test_db.expire_all()
+        for item in test_db.query(JobItem).all():
+            if item.raw_prompt == "row4":
+                assert item.status == "error"
+                assert item.error_message == "boom"
+            else:
+                assert item.status == "done"
+                assert item.raw_response == f"echo:{item.raw_prompt}"
+
+    def test_parallel_execution(self, test_db, job_with_items):
+        _, revision, items = job_with_items
+        client = EchoClient()
+        errors = JobManager(test_db)._execute_items_parallel(items, client, revision, 0.7, 4)
+
+        assert errors == 0
+        assert client.calls == 10
+        assert set(statuses(test_db).values()) == {"done"}
+
+    def test_serial_stops_after_cancellation(self, test_db, job_with_items):
+        job, revision, items = job_with_items
+        job.status = "cancelled"
+        test_db.commit()
+
+        manager = JobManager(test_db)
+        manager._create_write_buffer = lambda job_id: make_buffer(test_db, job_id, max_items=1)
+        client = EchoClient()
+        manager._execute_items_serial(items, client, revision, 0.7)
+
+        # First flush (item 1 marked running) observes the cancelled job
+        assert client.calls == 1
+
+
+# ============================================================================
+# Pending item reads
+# ============================================================================
+
+class TestPendingItemReads:
+
+    def test_items_read_in_keyset_batches(self, test_db, job_with_items):
+        job, _, items = job_with_items
+        manager = JobManager(test_db)
+        manager.PENDING_ITEM_BATCH_SIZE = 3
+
+        reader = manager._iter_pending_items(job.id, skip_ids={items[1].id})
+        first_batch = [next(reader).id, next(reader).id]
+        # Items cancelled before their batch is read are left out
+        test_db.query(JobItem).filter(JobItem.id == items[5].id).update({"status": "cancelled"})
+        test_db.commit()
+
+        assert first_batch == [items[0].id, items[2].id]
+        assert [item.id for item in reader] == [item.id for item in items[3:] if item is not items[5]]
+
+    def test_parallel_reads_items_as_workers_free_up(self, test_db, job_with_items):
+        job, revision, _ = job_with_items
+        manager = JobManager(test_db)
+        manager.PENDING_ITEM_BATCH_SIZE = 2
+        read = []
+
+        def tracked_items():
+            for item in manager._iter_pending_items(job.id):
+                read.append(item.id)
+                yield item
+
+        class ReadCountClient(EchoClient):
+            def call(self, prompt=None, **kwargs):
+                reads_at_call.append(len(read))
+                return super().call(prompt=prompt, **kwargs)
+
+        reads_at_call = []
+        errors = manager._execute_items_parallel(tracked_items(), ReadCountClient(), revision, 0.7, 2)
+
+        assert errors == 0
+        assert len(read) == 10
+        # 2 workers, 2 queued items each
+        assert reads_at_call[0] <= 2 * manager.THREAD_QUEUE_ITEMS_PER_WORKER
+        assert set(statuses(test_db).values()) == {"done"}
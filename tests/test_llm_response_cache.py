@@ -0,0 +1,252 @@
+"""Tests for the content-addressed LLM response cache.
+
+Test Categories:
+1. Cache keys
+2. Cache modes (bypass / read-through / replay-only)
+3. TTL expiry and LRU eviction
+4. Settings API
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, LLMResponseCache
+from backend.llm.base import LLMClient, LLMResponse
+from backend.llm.response_cache import (
+    CachedLLMClient,
+    LLMResponseCacheStore,
+    compute_cache_key,
+    reset_response_cache_store,
+)
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class CountingClient(LLMClient):
+    """Client that echoes the prompt and counts provider calls."""
+
+    MODEL_NAME = "counting-1"
+
+    def __init__(self, success: bool = True):
+        self.success = success
+        self.calls = 0
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        self.calls += 1
+        if not self.success:
+            return LLMResponse(success=False, error_message="boom", turnaround_ms=5)
+        return LLMResponse(success=True, response_text=f"echo: {prompt}", turnaround_ms=5)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "counting-model"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def store(session_factory):
+    return LLMResponseCacheStore(session_factory)
+
+
+@pytest.fixture
+def client(session_factory):
+    """API client with an in-memory database."""
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    reset_response_cache_store()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    reset_response_cache_store()
+
+
+# ============================================================================
+# Cache keys
+# ============================================================================
+
+class TestCacheKey:
+
+    def test_prompt_and_messages_share_key(self):
+        inner = CountingClient()
+        assert compute_cache_key(inner, prompt="hi") == compute_cache_key(
+            inner, messages=[{"role": "user", "content": "hi"}]
+        )
+
+    def test_key_depends_on_params_and_images(self):
+        inner = CountingClient()
+        base = compute_cache_key(inner, prompt="hi", temperature=0)
+        assert base == compute_cache_key(inner, prompt="hi", temperature=0)
+        assert base != compute_cache_key(inner, prompt="hi", temperature=0.5)
+        assert base != compute_cache_key(inner, prompt="hi", images=["aGVsbG8="], temperature=0)
+        assert base != compute_cache_key(inner, prompt="hello", temperature=0)
+
+
+# ============================================================================
+# Modes
+# ============================================================================
+
+class TestModes:
+
+    def test_read_through(self, store):
+        inner = CountingClient()
+        cached = CachedLLMClient(inner, store, "read-through")
+
+        first = cached.call(prompt="q1", temperature=0)
+        second = cached.call(prompt="q1", temperature=0)
+        assert first.response_text == second.response_text == "echo: q1"
+        assert inner.calls == 1
+
+        cached.call(prompt="q2", temperature=0)
+        assert inner.calls == 2
+        assert store.stats() == {"entries": 2, "size_bytes": 16, "hits": 1}
+
+    def test_async_read_through(self, store):
+        inner = CountingClient()
+        cached = CachedLLMClient(inner, store, "read-through")
+
+        async def run():
+            await cached.acall(prompt="q1")
+            return await cached.acall(prompt="q1")
+
+        assert asyncio.run(run()).response_text == "echo: q1"
+        assert inner.calls == 1
+
+    def test_failures_not_stored(self, store):
+        inner = CountingClient(success=False)
+        cached = CachedLLMClient(inner, store, "read-through")
+        cached.call(prompt="q1")
+        cached.call(prompt="q1")
+        assert inner.calls == 2
+        assert store.stats()["entries"] == 0
+
+    def test_replay_only(self, store):
+        CachedLLMClient(CountingClient(), store, "read-through").call(prompt="q1")
+
+        inner = CountingClient()
+        replay = CachedLLMClient(inner, store, "replay-only")
+        assert replay.call(prompt="q1").response_text == "echo: q1"
+
+        miss = replay.call(prompt="q2")
+        assert not miss.success
+        assert "replay-only" in miss.error_message
+        assert inner.calls == 0
+
+    def test_proxy_delegates(self, store):
+        cached = CachedLLMClient(CountingClient(), store, "read-through")
+        assert cached.get_model_name() == "counting-model"
+        assert cached.MODEL_NAME == "counting-1"
+
+
+# ============================================================================
+# TTL and eviction
+# ============================================================================
+
+class TestEviction:
+
+    def test_ttl_expiry(self, store, session_factory):
+        store.put("k1", "m", "old")
+        db = session_factory()
+        old = (datetime.utcnow() - timedelta(hours=2)).isoformat()
+        db.execute(text("UPDATE llm_response_cache SET created_at = :old"), {"old": old})
+        db.commit()
+        db.close()
+
+        store.configure(store.max_bytes, 3600)
+        assert store.get("k1") is None
+        assert store.stats()["entries"] == 0
+
+    def test_zero_ttl_never_expires(self, store, session_factory):
+        store.configure(store.max_bytes, 0)
+        store.put("k1", "m", "old")
+        db = session_factory()
+        db.execute(text("UPDATE llm_response_cache SET created_at = '2000-01-01T00:00:00'"))
+        db.commit()
+        db.close()
+        assert store.get("k1") == "old"
+
+    def test_lru_eviction(self, store, session_factory):
+        store.configure(30, None)
+        store.put("a", "m", "x" * 10)
+        store.put("b", "m", "x" * 10)
+        store.put("c", "m", "x" * 10)
+
+        # Make "a" the most recently used entry
+        db = session_factory()
+        db.execute(text("UPDATE llm_response_cache SET last_accessed_at = '2000-01-01' WHERE cache_key != 'a'"))
+        db.commit()
+        db.close()
+
+        store.put("d", "m", "x" * 10)
+        db = session_factory()
+        keys = {row.cache_key for row in db.query(LLMResponseCache).all()}
+        db.close()
+        # 40 bytes > 30 budget -> evict oldest down to 27 bytes (90%)
+        assert keys == {"a", "d"}
+
+
+# ============================================================================
+# Settings API
+# ============================================================================
+
+class TestSettingsAPI:
+
+    def test_defaults(self, client):
+        response = client.get("/api/settings/llm-cache")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "bypass"
+        assert data["max_mb"] == 256
+        assert data["ttl_hours"] == 168
+        assert data["stats"] == {"entries": 0, "size_bytes": 0, "hits": 0}
+
+    def test_update(self, client):
+        response = client.put("/api/settings/llm-cache?mode=replay-only&max_mb=64&ttl_hours=0")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "replay-only"
+        assert data["max_mb"] == 64
+        assert data["ttl_hours"] == 0
+
+    def test_invalid_values(self, client):
+        assert client.put("/api/settings/llm-cache?mode=sometimes").status_code == 400
+        assert client.put("/api/settings/llm-cache?mode=bypass&max_mb=0").status_code == 400
+        assert client.put("/api/settings/llm-cache?mode=bypass&ttl_hours=-1").status_code == 400
+
+    def test_clear(self, client, session_factory):
+        store = LLMResponseCacheStore(session_factory)
+        store.put("k1", "m", "hello")
+        assert client.get("/api/settings/llm-cache").json()["stats"]["entries"] == 1
+
+        response = client.delete("/api/settings/llm-cache/entries")
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 1
+        assert client.get("/api/settings/llm-cache").json()["stats"]["entries"] == 0
@@ -0,0 +1,385 @@
+"""Tests for streamed LLM calls and time-to-first-token capture.
+
+Test Categories:
+1. Stream collection and the non-streaming fallback
+2. Plugin streaming implementations (fake SDK clients)
+3. Job execution with streaming enabled
+4. Partial text on the progress stream
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.job_progress import get_job_progress_tracker, reset_job_progress_tracker
+from backend.llm.anthropic_claude import ClaudeSonnet4Client
+from backend.llm.azure_gpt_4_1 import AzureGPT41Client
+from backend.llm.base import LLMClient, LLMResponse
+from app.main import app
+import app.routes.run as run_routes
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class FakeStreamingClient(LLMClient):
+    """LLM client that streams the prompt back one word at a time."""
+
+    def __init__(self, delay: float = 0.005):
+        self.delay = delay
+        self.partials_seen = []
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        return LLMResponse(success=True, response_text=prompt, turnaround_ms=1)
+
+    def stream(self, prompt=None, messages=None, images=None, on_text=None, **kwargs):
+        words = prompt.split(" ")
+
+        def deltas():
+            for word in words:
+                time.sleep(self.delay)
+                yield word + " "
+                self.partials_seen.append(dict(get_job_progress_tracker().partial_texts(1)[1]))
+
+        usage = {"usage": {"prompt_tokens": 10, "completion_tokens": len(words)}}
+        return self._collect_stream(deltas(), time.time(), on_text, final_usage=lambda: usage)
+
+    def get_default_parameters(self):
+        return {"temperature": 0.7}
+
+    def get_model_name(self):
+        return "fake-model"
+
+
+class EchoClient(LLMClient):
+    """Non-streaming client."""
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        return LLMResponse(success=True, response_text=f"echo:{prompt}", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "echo"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    reset_job_progress_tracker()
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    reset_job_progress_tracker()
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+# ============================================================================
+# Stream collection
+# ============================================================================
+
+class TestCollectStream:
+
+    def test_measures_ttft_and_rate(self):
+        def deltas():
+            time.sleep(0.05)
+            for part in ["a", None, "b", "", "c"]:
+                yield part
+                time.sleep(0.01)
+
+        received = []
+        start = time.time()
+        response = EchoClient()._collect_stream(deltas(), start, received.append)
+
+        assert response.success
+        assert response.response_text == "abc"
+        assert received == ["a", "b", "c"]
+        assert response.ttft_ms >= 50
+        assert response.turnaround_ms >= response.ttft_ms
+        assert 0 < response.tokens_per_second < 1000
+
+    def test_rate_uses_reported_completion_tokens(self, monkeypatch):
+        # Clock: one reading per delta, then the end of the stream
+        clock = iter([10.0, 12.0, 12.5])
+        monkeypatch.setattr("backend.llm.base.time.time", lambda: next(clock))
+        usage = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=5, completion_tokens=41))
+
+        response = EchoClient()._collect_stream(iter(["twenty tokens", "more"]), 9.0,
+                                                final_usage=lambda: usage)
+
+        assert response.completion_tokens == 41
+        assert response.tokens_per_second == 20.0
+
+    def test_rate_excludes_reasoning_tokens(self, monkeypatch):
+        clock = iter([10.0, 12.0, 12.5])
+        monkeypatch.setattr("backend.llm.base.time.time", lambda: next(clock))
+        usage = SimpleNamespace(usage=SimpleNamespace(
+            prompt_tokens=5, completion_tokens=141,
+            completion_tokens_details=SimpleNamespace(reasoning_tokens=100)
+        ))
+
+        response = EchoClient()._collect_stream(iter(["a", "b"]), 9.0, final_usage=lambda: usage)
+
+        assert response.tokens_per_second == 20.0
+
+    def test_rate_falls_back_to_chunk_count(self, monkeypatch):
+        clock = iter([10.0, 11.0, 12.0, 12.5])
+        monkeypatch.setattr("backend.llm.base.time.time", lambda: next(clock))
+
+        response = EchoClient()._collect_stream(iter(["a", "b", "c"]), 9.0)
+
+        assert response.completion_tokens is None
+        assert response.tokens_per_second == 1.0
+
+    def test_empty_stream(self):
+        response = EchoClient()._collect_stream(iter([]), time.time())
+        assert response.success and response.response_text == ""
+        assert response.ttft_ms is None and response.tokens_per_second is None
+
+    def test_default_stream_falls_back_to_call(self):
+        received = []
+        response = EchoClient().stream(prompt="hi", on_text=received.append)
+        assert response.response_text == "echo:hi"
+        assert received == ["echo:hi"]
+        assert response.ttft_ms is None
+        assert EchoClient().get_model_info().supports_streaming is False
+        assert FakeStreamingClient().get_model_info().supports_streaming is True
+
+
+# ============================================================================
+# Plugin streaming
+# ============================================================================
+
+class TestPluginStreaming:
+
+    def test_openai_chunks(self):
+        client = object.__new__(AzureGPT41Client)
+        client.deployment_name = "gpt-4.1"
+        sent = {}
+
+        def create(**params):
+            sent.update(params)
+            return iter([
+                SimpleNamespace(choices=[]),
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hel"))]),
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="lo"))]),
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))]),
+            ])
+
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        response = client.stream(prompt="hi", temperature=0.1)
+
+        assert sent["stream"] is True
+        assert sent["messages"] == [{"role": "user", "content": "hi"}]
+        assert response.success and response.response_text == "Hello"
+        assert response.ttft_ms is not None
+
+    def test_openai_usage_chunk(self):
+        client = object.__new__(AzureGPT41Client)
+        client.deployment_name = "gpt-4.1"
+        sent = {}
+        usage = SimpleNamespace(
+            prompt_tokens=12,
+            completion_tokens=2,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=8),
+            completion_tokens_details=SimpleNamespace(reasoning_tokens=0)
+        )
+
+        def create(**params):
+            sent.update(params)
+            return iter([
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hi"))], usage=None),
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="!"))], usage=None),
+                SimpleNamespace(choices=[], usage=usage),  # Sent last with include_usage
+            ])
+
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        response = client.stream(prompt="hi")
+
+        assert sent["stream_options"] == {"include_usage": True}
+        assert response.response_text == "Hi!"
+        assert (response.prompt_tokens, response.completion_tokens) == (12, 2)
+        assert (response.cached_tokens, response.reasoning_tokens) == (8, 0)
+
+    def test_anthropic_text_stream(self):
+        client = object.__new__(ClaudeSonnet4Client)
+
+        @contextmanager
+        def stream(**params):
+            yield SimpleNamespace(
+                text_stream=iter(["Hi", " there"]),
+                get_final_message=lambda: SimpleNamespace(
+                    usage=SimpleNamespace(input_tokens=3, output_tokens=2)
+                )
+            )
+
+        client.client = SimpleNamespace(messages=SimpleNamespace(stream=stream))
+        received = []
+        response = client.stream(prompt="hi", on_text=received.append)
+        assert response.response_text == "Hi there"
+        assert received == ["Hi", " there"]
+        assert (response.prompt_tokens, response.completion_tokens) == (3, 2)
+
+    def test_stream_error_is_returned(self):
+        client = object.__new__(AzureGPT41Client)
+        client.deployment_name = "gpt-4.1"
+
+        def create(**params):
+            raise RuntimeError("connection reset")
+
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        response = client.stream(prompt="hi")
+        assert not response.success
+        assert response.error_message == "connection reset"
+
+
+# ============================================================================
+# Job execution
+# ============================================================================
+
+def create_streaming_job(db):
+    """Create a running batch job with three items and streaming enabled."""
+    project = Project(name="Streaming Project")
+    db.add(project)
+    db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    db.add(revision)
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running")
+    db.add(job)
+    db.commit()
+    for i in range(3):
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt=f"one two three {i}"))
+    db.add(SystemSetting(key="job_streaming_enabled", value="true"))
+    db.commit()
+    items = db.query(JobItem).filter(JobItem.job_id == job.id).all()
+    return job, revision, items
+
+
+def assert_items_streamed(db):
+    db.expire_all()
+    for item in db.query(JobItem).all():
+        assert item.status == "done"
+        assert item.raw_response == item.raw_prompt + " "
+        assert item.ttft_ms is not None
+        assert item.tokens_per_second > 0
+        assert (item.prompt_tokens, item.completion_tokens) == (10, 4)
+
+
+class TestStreamingExecution:
+
+    def test_items_record_ttft(self, test_db):
+        job, revision, items = create_streaming_job(test_db)
+
+        manager = JobManager(test_db)
+        assert manager._get_streaming_enabled() is True
+        client = FakeStreamingClient()
+        manager._stream_job_id = job.id
+        errors = manager._execute_items_serial(items, client, revision, 0.5)
+
+        assert errors == 0
+        # Partial text was visible while the first item streamed, and cleared afterwards
+        assert client.partials_seen[1] == {items[0].id: "one two "}
+        assert get_job_progress_tracker().partial_texts(job.id)[1] == {}
+        assert_items_streamed(test_db)
+
+    def test_thread_items_record_ttft(self, test_db):
+        job, revision, items = create_streaming_job(test_db)
+        item_ids = {item.id for item in items}
+
+        manager = JobManager(test_db)
+        client = FakeStreamingClient()
+        manager._stream_job_id = job.id
+        errors = manager._execute_items_parallel(items, client, revision, 0.5, 3)
+
+        assert errors == 0
+        # Every item published partial text while it streamed
+        seen = {item_id for partials in client.partials_seen for item_id in partials}
+        assert seen == item_ids
+        assert get_job_progress_tracker().partial_texts(job.id)[1] == {}
+        assert_items_streamed(test_db)
+
+    def test_disabled_by_default(self, test_db):
+        assert JobManager(test_db)._get_streaming_enabled() is False
+
+
+# ============================================================================
+# Progress stream
+# ============================================================================
+
+class TestPartialEvents:
+
+    def test_partial_events_are_sent(self, session_factory, monkeypatch):
+        monkeypatch.setattr(run_routes, "PROGRESS_STREAM_TICK_SECONDS", 0.01)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            db = session_factory()
+            job = Job(job_type="batch", status="running")
+            db.add(job)
+            db.commit()
+            db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status="running"))
+            db.commit()
+            job_id = job.id
+            db.close()
+
+            tracker = get_job_progress_tracker()
+
+            def execute():
+                time.sleep(0.05)
+                tracker.add_partial_text(job_id, 1, "Hel")
+                time.sleep(0.05)
+                tracker.add_partial_text(job_id, 1, "lo")
+                time.sleep(0.05)
+                tracker.clear_partial_text(job_id, 1)
+                worker_db = session_factory()
+                worker_db.query(JobItem).update({"status": "done"})
+                worker_db.query(Job).update({"status": "done"})
+                worker_db.commit()
+                worker_db.close()
+                tracker.notify(job_id)
+
+            worker = threading.Thread(target=execute)
+            worker.start()
+            with TestClient(app).stream("GET", f"/api/jobs/{job_id}/progress/stream") as resp:
+                lines = list(resp.iter_lines())
+            worker.join()
+        finally:
+            app.dependency_overrides.clear()
+
+        partials = [
+            json.loads(lines[i + 1][len("data: "):])["items"]
+            for i, line in enumerate(lines) if line == "event: partial"
+        ]
+        assert partials == [{"1": "Hel"}, {"1": "Hello"}, {}]
@@ -0,0 +1,301 @@
+"""Tests for provider prompt-prefix caching of batch runs.
+
+Test Categories:
+1. Static prefix and cache breakpoints in messages
+2. Claude request with cache_control
+3. Cache warm-up of the first call
+4. Job integration, usage report and settings
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, ProjectRevision, Job, JobItem
+from backend.job import JobManager
+from backend.prompt import PromptTemplateParser, MessageRoleParser
+from backend.llm.base import LLMClient, LLMResponse
+from backend.llm.anthropic_claude import AnthropicClaudeClient
+from backend.llm.prompt_cache import PrefixWarmingClient, MIN_PREFIX_CHARS
+from backend.llm.response_cache import compute_cache_key
+from backend.usage import get_job_usage
+from app.main import app
+
+
+RULES = "Follow these extraction rules carefully. " * 40  # > MIN_PREFIX_CHARS
+TEMPLATE = f"[SYSTEM]\n{RULES}\n[USER]\nExtract the fields.\nText: {{{{text}}}}"
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class RecordingClient(LLMClient):
+    """LLM client recording call arguments and the order calls start/finish."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, prompt, messages, event):
+        with self._lock:
+            if event == "start":
+                self.calls.append({"prompt": prompt, "messages": messages})
+            self.events.append(event)
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        self._record(prompt, messages, "start")
+        time.sleep(self.delay)
+        self._record(prompt, messages, "end")
+        return LLMResponse(success=True, response_text="ok", turnaround_ms=1, prompt_tokens=100, cached_tokens=80)
+
+    async def acall(self, prompt=None, messages=None, images=None, **kwargs):
+        self._record(prompt, messages, "start")
+        await asyncio.sleep(self.delay)
+        self._record(prompt, messages, "end")
+        return LLMResponse(success=True, response_text="ok", turnaround_ms=1)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "recording-model"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+def _create_batch_job(db, template=TEMPLATE, count=4):
+    project = Project(name="Prefix Project")
+    db.add(project)
+    db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template=template)
+    db.add(revision)
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running", model_name="recording-model")
+    db.add(job)
+    db.commit()
+    parser = PromptTemplateParser()
+    for i in range(count):
+        db.add(JobItem(job_id=job.id, input_params="{}", status="pending",
+                       raw_prompt=parser.substitute_parameters(template, {"text": f"row {i}"})))
+    db.commit()
+    items = db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+# ============================================================================
+# Static prefix and breakpoints
+# ============================================================================
+
+class TestCachePrefix:
+
+    def test_static_prefix(self):
+        parser = PromptTemplateParser()
+        assert parser.static_prefix("Intro {{a}} middle {{b:NUM}}") == "Intro "
+        assert parser.static_prefix("No parameters") == "No parameters"
+        assert parser.static_prefix("{{a}} first") == ""
+
+    def test_breakpoint_in_partially_static_message(self):
+        parser = MessageRoleParser()
+        prefix = PromptTemplateParser().static_prefix(TEMPLATE)
+        messages = parser.to_messages_list(TEMPLATE.replace("{{text}}", "hello"), prefix)
+
+        assert "_cache_prefix" not in messages[0]
+        assert messages[1]["content"][:messages[1]["_cache_prefix"]] == "Extract the fields.\nText:"
+        # Without a prefix the output is unchanged
+        assert all("_cache_prefix" not in message for message in parser.to_messages_list(TEMPLATE))
+
+    def test_breakpoint_on_fully_static_message(self):
+        parser = MessageRoleParser()
+        template = "[SYSTEM]\nYou are careful.\n[USER]\n{{text}}"
+        prefix = PromptTemplateParser().static_prefix(template)
+        messages = parser.to_messages_list("[SYSTEM]\nYou are careful.\n[USER]\nhi", prefix)
+        assert messages[0]["_cache_prefix"] == len("You are careful.")
+        assert "_cache_prefix" not in messages[1]
+
+        # A prompt that does not start with the prefix gets no breakpoint
+        other = parser.to_messages_list("[USER]\nYou are careful.", prefix)
+        assert all("_cache_prefix" not in message for message in other)
+
+
+# ============================================================================
+# Claude request
+# ============================================================================
+
+class TestClaudeCacheControl:
+
+    @pytest.fixture
+    def claude(self):
+        return object.__new__(AnthropicClaudeClient)
+
+    def test_system_and_user_breakpoints(self, claude):
+        request = claude._build_request(messages=[
+            {"role": "system", "content": "Static rules", "_cache_prefix": 12},
+            {"role": "user", "content": "Question: what?"},
+        ])
+        assert request["system"] == [{"type": "text", "text": "Static rules", "cache_control": {"type": "ephemeral"}}]
+        assert request["messages"] == [{"role": "user", "content": "Question: what?"}]
+
+        request = claude._build_request(messages=[
+            {"role": "user", "content": "Instructions. Row: 1", "_cache_prefix": 13},
+        ])
+        assert request["messages"][0]["content"] == [
+            {"type": "text", "text": "Instructions.", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": " Row: 1"},
+        ]
+        assert "system" not in request
+
+    def test_cached_text_goes_before_images(self, claude):
+        request = claude._build_request(
+            messages=[{"role": "user", "content": "Describe. Row 1", "_cache_prefix": 9}],
+            images=["data:image/png;base64,AAAA"]
+        )
+        content = request["messages"][0]["content"]
+        assert [block["type"] for block in content] == ["text", "image", "text"]
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_hint_does_not_change_response_cache_key(self):
+        client = RecordingClient()
+        plain = compute_cache_key(client, messages=[{"role": "user", "content": "x"}])
+        hinted = compute_cache_key(client, messages=[{"role": "user", "content": "x", "_cache_prefix": 1}])
+        assert plain == hinted == compute_cache_key(client, prompt="x")
+
+
+# ============================================================================
+# Warm-up
+# ============================================================================
+
+class TestPrefixWarming:
+
+    def test_concurrent_calls_wait_for_first(self):
+        inner = RecordingClient()
+        client = PrefixWarmingClient(inner)
+        threads = [threading.Thread(target=client.call, kwargs={"prompt": "p"}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert inner.events[:2] == ["start", "end"]
+        assert client.get_model_name() == "recording-model"
+
+    def test_async_calls_wait_for_first(self):
+        inner = RecordingClient()
+        client = PrefixWarmingClient(inner)
+
+        async def run():
+            await asyncio.gather(*[client.acall(prompt="p") for _ in range(4)])
+
+        asyncio.run(run())
+        assert inner.events[:2] == ["start", "end"]
+
+    def test_waiting_is_bounded(self):
+        inner = RecordingClient(delay=0.5)
+        client = PrefixWarmingClient(inner, timeout=0.05)
+        first = threading.Thread(target=client.call, kwargs={"prompt": "p"})
+        first.start()
+        time.sleep(0.01)
+        started = time.monotonic()
+        client.call(prompt="p")
+        assert time.monotonic() - started < 0.9
+        first.join()
+
+
+# ============================================================================
+# Job integration
+# ============================================================================
+
+class TestJobIntegration:
+
+    def test_prompt_prefix_of_job(self, test_db):
+        job, revision, items = _create_batch_job(test_db)
+        manager = JobManager(test_db)
+        prefix = manager._get_prompt_prefix(job, revision, len(items))
+        assert prefix is not None and len(prefix) >= MIN_PREFIX_CHARS
+
+        assert manager._get_prompt_prefix(job, revision, 1) is None
+        short_job, short_revision, _ = _create_batch_job(test_db, template="Short {{text}}")
+        assert manager._get_prompt_prefix(short_job, short_revision, 4) is None
+
+    def test_parallel_batch_marks_prefix_and_warms_first(self, test_db):
+        job, revision, items = _create_batch_job(test_db)
+        manager = JobManager(test_db)
+        manager._prompt_prefix = manager._get_prompt_prefix(job, revision, len(items))
+        inner = RecordingClient()
+
+        errors = manager._execute_items_parallel(items, PrefixWarmingClient(inner), revision, 0.5, 4)
+
+        assert errors == 0
+        assert inner.events[:2] == ["start", "end"]
+        for call in inner.calls:
+            assert call["prompt"] is None
+            assert call["messages"][1]["_cache_prefix"] == len("Extract the fields.\nText:")
+
+    def test_plain_prompt_prefix(self, test_db):
+        template = RULES + "\nText: {{text}}"
+        job, revision, items = _create_batch_job(test_db, template=template, count=2)
+        manager = JobManager(test_db)
+        manager._prompt_prefix = manager._get_prompt_prefix(job, revision, len(items))
+        prompt, messages = manager._build_call_input(items[0].raw_prompt)
+        assert prompt is None
+        assert messages == [{"role": "user", "content": items[0].raw_prompt, "_cache_prefix": len(RULES + "\nText: ")}]
+
+        manager._prompt_prefix = None
+        assert manager._build_call_input(items[0].raw_prompt) == (items[0].raw_prompt, None)
+
+    def test_usage_reports_cache_hit_rate(self, test_db):
+        job, revision, items = _create_batch_job(test_db)
+        JobManager(test_db)._execute_items_serial(items, RecordingClient(delay=0), revision, 0.5)
+        item = test_db.query(JobItem).filter(JobItem.job_id == job.id).first()
+        item.cached_tokens = 0
+        test_db.commit()
+
+        usage = get_job_usage(test_db, job.id)
+        assert usage["cache_hit_items"] == 3
+        assert usage["cache_hit_rate"] == 0.75
+
+    def test_settings_roundtrip(self, session_factory, test_db):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        job, revision, items = _create_batch_job(test_db)
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            assert client.get("/api/settings/prompt-prefix-cache").json()["enabled"] is True
+            assert client.put("/api/settings/prompt-prefix-cache", params={"enabled": False}).status_code == 200
+            assert client.get("/api/settings/prompt-prefix-cache").json()["enabled"] is False
+        finally:
+            app.dependency_overrides.clear()
+
+        assert JobManager(test_db)._get_prompt_prefix(job, revision, len(items)) is None
@@ -0,0 +1,359 @@
+"""Tests for the central retry handling of failed LLM calls.
+
+Test Categories:
+1. Error classification and Retry-After
+2. Retry policy and schedule
+3. Re-queued items in the serial, thread and async executors
+4. Inline retries, bulk retry endpoint and settings
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, ProjectRevision, Job, JobItem
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse, extract_error_details
+from backend.llm.retry import (
+    INLINE_MAX_TOTAL_DELAY, RetryingLLMClient, RetryPolicy, RetrySchedule, classify_error,
+    RATE_LIMIT, TIMEOUT, SERVER, EMPTY, CONTENT, CLIENT, UNKNOWN
+)
+from app.main import app
+import app.routes.run as run_routes
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class FlakyClient(LLMClient):
+    """LLM client whose prompts fail with a scripted error before succeeding.
+
+    failures maps a prompt to the number of calls that fail with `error`.
+    Every call is logged in order.
+    """
+
+    def __init__(self, failures=None, error="Error code: 429 - rate limit", retry_after=0.05, status_code=None):
+        self.failures = dict(failures or {})
+        self.error = error
+        self.retry_after = retry_after
+        self.status_code = status_code
+        self.log = []
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt):
+        with self._lock:
+            self.log.append(prompt)
+            remaining = self.failures.get(prompt, 0)
+            if remaining:
+                self.failures[prompt] = remaining - 1
+                return LLMResponse(success=False, error_message=self.error, turnaround_ms=1,
+                                   status_code=self.status_code, retry_after=self.retry_after)
+        return LLMResponse(success=True, response_text=f"ok:{prompt}", turnaround_ms=1)
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        return self._respond(prompt)
+
+    async def acall(self, prompt=None, messages=None, images=None, **kwargs):
+        await asyncio.sleep(0)
+        return self._respond(prompt)
+
+    def get_default_parameters(self):
+        return {}
+
+    def get_model_name(self):
+        return "flaky-model"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+def _create_job(db, prompts, status="running", item_status="pending"):
+    project = Project(name="Retry Project")
+    db.add(project)
+    db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    db.add(revision)
+    job = Job(project_revision_id=revision.id, job_type="batch", status=status, model_name="flaky-model")
+    db.add(job)
+    db.commit()
+    for prompt in prompts:
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt=prompt, status=item_status,
+                       error_message="boom" if item_status == "error" else None))
+    db.commit()
+    items = db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+def _statuses(db):
+    db.expire_all()
+    return {item.raw_prompt: (item.status, item.error_message) for item in db.query(JobItem).all()}
+
+
+# ============================================================================
+# Classification
+# ============================================================================
+
+class TestClassification:
+
+    @pytest.mark.parametrize("message,status_code,kind", [
+        ("Error code: 429 - Requests exceeded rate limit", None, RATE_LIMIT),
+        ("anything", 429, RATE_LIMIT),
+        ("Request timed out.", None, TIMEOUT),
+        ("Error code: 503 - Service Unavailable", None, SERVER),
+        ("overloaded_error", 529, SERVER),
+        ("API returned empty response. Finish reason: length.", None, EMPTY),
+        ("The response was filtered due to content_filter", 400, CONTENT),
+        ("Invalid parameter: max_tokens", 400, CLIENT),
+        ("Requested 15000 tokens", None, UNKNOWN),
+    ])
+    def test_classify(self, message, status_code, kind):
+        assert classify_error(message, status_code) == kind
+
+    def test_retry_after_header(self):
+        error = Exception("Error code: 429")
+        error.status_code = 429
+        error.response = SimpleNamespace(headers={"retry-after": "7"})
+        assert extract_error_details(error) == {"status_code": 429, "retry_after": 7.0}
+
+        error.response = SimpleNamespace(headers={"retry-after-ms": "1500", "retry-after": "7"})
+        assert extract_error_details(error)["retry_after"] == 1.5
+
+    def test_retry_after_in_message(self):
+        error = Exception("Rate limit exceeded. Please retry after 20 seconds.")
+        assert extract_error_details(error) == {"status_code": None, "retry_after": 20.0}
+        assert extract_error_details(Exception("boom")) == {"status_code": None, "retry_after": None}
+
+
+# ============================================================================
+# Policy and schedule
+# ============================================================================
+
+class TestPolicyAndSchedule:
+
+    def test_delay(self):
+        policy = RetryPolicy(base_delay=2.0, max_delay=10.0, max_retry_after=30.0)
+        assert policy.delay(1, retry_after=12.0) == 12.0
+        assert policy.delay(1, retry_after=300.0) == 30.0
+        assert 1.0 <= policy.delay(1) <= 2.0
+        assert 5.0 <= policy.delay(10) <= 10.0
+
+    def test_schedule_orders_by_due_time_and_stops_at_max_attempts(self):
+        schedule = RetrySchedule(RetryPolicy(max_attempts=2))
+        rate_limited = LLMResponse(success=False, error_message="429", retry_after=0.05)
+        assert schedule.schedule(1, "late", LLMResponse(success=False, error_message="429", retry_after=10.0)) == 10.0
+        assert schedule.schedule(2, "soon", rate_limited) == 0.05
+        assert schedule.schedule(3, "final", LLMResponse(success=False, error_message="content_filter")) is None
+        assert len(schedule) == 2
+        assert schedule.pop_due() is None
+
+        time.sleep(0.06)
+        assert schedule.pop_due() == (2, "soon")
+        assert schedule.pop_due() is None
+        # Second failure of item 2 is final (2 attempts)
+        assert schedule.schedule(2, "soon", rate_limited) is None
+        assert schedule.attempts(2) == 2
+        assert schedule.clear() == [1]
+
+
+# ============================================================================
+# Executors
+# ============================================================================
+
+def _manager_with_retries(db, max_attempts=3) -> JobManager:
+    manager = JobManager(db)
+    manager._retry_schedule = RetrySchedule(RetryPolicy(max_attempts=max_attempts, base_delay=0.01))
+    return manager
+
+
+class TestExecutorRetries:
+
+    def test_serial_retry_does_not_block_later_items(self, test_db):
+        _, revision, items = _create_job(test_db, ["a", "b", "c"])
+        client = FlakyClient({"a": 1})
+        errors = _manager_with_retries(test_db)._execute_items_serial(items, client, revision, 0.5)
+
+        assert errors == 0
+        # "a" is retried after the items behind it instead of blocking them
+        assert client.log == ["a", "b", "c", "a"]
+        assert _statuses(test_db)["a"] == ("done", None)
+
+    def test_thread_pool_retry(self, test_db):
+        _, revision, items = _create_job(test_db, ["a", "b", "c", "d"])
+        client = FlakyClient({"a": 2, "c": 1})
+        errors = _manager_with_retries(test_db)._execute_items_parallel(items, client, revision, 0.5, 2)
+
+        assert errors == 0
+        assert client.log.count("a") == 3
+        assert {status for status, _ in _statuses(test_db).values()} == {"done"}
+
+    def test_async_retry(self, test_db):
+        _, revision, items = _create_job(test_db, ["a", "b", "c"])
+        client = FlakyClient({"b": 1}, error="Request timed out.", retry_after=None)
+        errors = _manager_with_retries(test_db)._execute_items_async(items, client, revision, 0.5, 1)
+
+        assert errors == 0
+        assert client.log == ["a", "b", "c", "b"]
+        assert _statuses(test_db)["b"] == ("done", None)
+
+    def test_final_errors(self, test_db):
+        _, revision, items = _create_job(test_db, ["limited", "filtered"])
+        client = FlakyClient({"limited": 5})
+        manager = _manager_with_retries(test_db)
+        assert manager._execute_items_serial(items[:1], client, revision, 0.5) == 1
+        assert _statuses(test_db)["limited"] == ("error", "Error code: 429 - rate limit (after 3 attempts)")
+
+        client = FlakyClient({"filtered": 1}, error="content_filter triggered", status_code=400)
+        assert manager._execute_items_serial(items[1:], client, revision, 0.5) == 1
+        assert client.log == ["filtered"]
+        assert _statuses(test_db)["filtered"] == ("error", "content_filter triggered")
+
+    def test_no_retries_without_schedule(self, test_db):
+        _, revision, items = _create_job(test_db, ["a"])
+        client = FlakyClient({"a": 1})
+        assert JobManager(test_db)._execute_items_serial(items, client, revision, 0.5) == 1
+        assert client.log == ["a"]
+
+
+# ============================================================================
+# Inline retries, bulk retry and settings
+# ============================================================================
+
+class TestRetryingClientAndEndpoints:
+
+    def test_retrying_client(self):
+        client = RetryingLLMClient(FlakyClient({"x": 2}), RetryPolicy(max_attempts=3))
+        assert client.call(prompt="x").success
+        assert client.get_model_name() == "flaky-model"
+
+        failing = RetryingLLMClient(FlakyClient({"y": 5}), RetryPolicy(max_attempts=2))
+        response = asyncio.run(failing.acall(prompt="y"))
+        assert not response.success and response.error_message.endswith("(after 2 attempts)")
+
+    def test_retrying_client_caps_inline_wait(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("backend.llm.retry.time.sleep", sleeps.append)
+
+        # A Retry-After beyond the inline limit fails fast
+        client = RetryingLLMClient(FlakyClient({"x": 1}, retry_after=30), RetryPolicy(max_attempts=10))
+        assert client.policy.max_total_delay == INLINE_MAX_TOTAL_DELAY
+        response = client.call(prompt="x")
+        assert not response.success and sleeps == []
+
+        # Waits stop once their sum would exceed the limit
+        client = RetryingLLMClient(FlakyClient({"y": 9}, retry_after=2), RetryPolicy(max_attempts=10, max_total_delay=5))
+        assert not client.call(prompt="y").success
+        assert sleeps == [2, 2]
+
+    @pytest.fixture
+    def client(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_retry_all_errors_is_queued(self, client, session_factory, monkeypatch):
+        enqueued = []
+        monkeypatch.setattr(
+            run_routes, "enqueue_job",
+            lambda job_id, model_name, *args, **kwargs: enqueued.append((job_id, model_name)) or 1
+        )
+        db = session_factory()
+        job, _, _ = _create_job(db, ["a", "b"], status="error", item_status="error")
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="c", status="done"))
+        db.commit()
+        job_id = job.id
+
+        response = client.post(f"/api/jobs/{job_id}/retry-all-errors")
+        assert response.status_code == 200
+        assert response.json()["queued_count"] == 2
+        assert enqueued == [(job_id, "flaky-model")]
+        assert _statuses(db) == {"a": ("pending", None), "b": ("pending", None), "c": ("done", None)}
+
+        # The job is queued now; a second request is rejected
+        assert client.post(f"/api/jobs/{job_id}/retry-all-errors").status_code == 400
+        db.close()
+
+    def test_settings_roundtrip(self, client, session_factory):
+        assert client.get("/api/settings/job-retry").json() == {"max_attempts": 4, "max_delay": 60.0}
+        response = client.put("/api/settings/job-retry", params={"max_attempts": 6, "max_delay": 30})
+        assert response.status_code == 200
+        assert client.put("/api/settings/job-retry", params={"max_attempts": 0}).status_code == 400
+        assert client.put("/api/settings/job-retry", params={"max_attempts": 3, "max_delay": 900}).status_code == 400
+
+        db = session_factory()
+        policy = JobManager(db)._get_retry_policy()
+        assert (policy.max_attempts, policy.max_delay) == (6, 30.0)
+        db.close()
+
+
+# ============================================================================
+# Agent callers
+# ============================================================================
+
+class TestAgentRetries:
+
+    @pytest.fixture
+    def flaky_factory(self, monkeypatch):
+        """Every model's client fails its first call with a 429."""
+        class FirstCallFails(FlakyClient):
+            def _respond(self, prompt):
+                self.failures.setdefault(prompt, 1 if not self.log else 0)
+                response = super()._respond(prompt)
+                if response.success:
+                    response.response_text = '{"decision": "pass"}'
+                return response
+
+        clients = []
+        monkeypatch.setattr(
+            "backend.llm.factory.get_llm_client",
+            lambda model_name=None: clients.append(FirstCallFails(retry_after=0.01)) or clients[-1]
+        )
+        return clients
+
+    def test_guardrail_retries_rate_limit(self, flaky_factory):
+        from backend.agent.guardrail_chain import GuardrailChain
+
+        parsed, _, _ = GuardrailChain(model_name="openai-gpt-5-nano")._call_llm("check")
+        assert parsed == {"decision": "pass"}
+        assert flaky_factory[0].log == ["check", "check"]
+
+    def test_intent_client_retries_rate_limit(self, flaky_factory):
+        from backend.agent.intent_v2 import LLMIntentClassifier
+
+        client = LLMIntentClassifier(model_name="azure-gpt-5-nano")._get_client()
+        assert isinstance(client, RetryingLLMClient)
+        assert client.call(prompt="classify").success
+        assert flaky_factory[0].log == ["classify", "classify"]
@@ -0,0 +1,188 @@
+"""Tests for the in-process system settings cache.
+
+Test Categories:
+1. Typed getters
+2. Snapshot reuse and invalidation on commit
+3. Settings endpoints and job execution readers
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, SystemSetting
+from backend.job import JobManager
+from backend.settings_cache import get_settings_cache, reset_settings_cache
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+def _session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def session_factory():
+    return _session_factory()
+
+
+@pytest.fixture
+def cache():
+    reset_settings_cache()
+    yield get_settings_cache()
+    reset_settings_cache()
+
+
+def _set(session_factory, **values):
+    db = session_factory()
+    for key, value in values.items():
+        setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+        if setting:
+            setting.value = value
+        else:
+            db.add(SystemSetting(key=key, value=value))
+    db.commit()
+    db.close()
+
+
+# ============================================================================
+# Typed getters
+# ============================================================================
+
+class TestTypedGetters:
+
+    def test_values_defaults_and_clamping(self, session_factory, cache):
+        _set(session_factory, number="250", bad="x", empty="", ratio="0.5", flag="True", params='{"a": 1}', broken="{")
+        db = session_factory()
+
+        assert cache.get(db, "empty", "default") == ""
+        assert cache.get(db, "missing", "default") == "default"
+        assert cache.get_int(db, "number", 1, 1, 99) == 99
+        assert cache.get_int(db, "bad", 7) == 7
+        assert cache.get_int(db, "empty", 7) == 7
+        assert cache.get_float(db, "ratio", 1.0, minimum=0.75) == 0.75
+        assert cache.get_bool(db, "flag") is True
+        assert cache.get_bool(db, "missing", True) is True
+        assert cache.get_json(db, "params") == {"a": 1}
+        assert cache.get_json(db, "broken", {}) == {}
+        with pytest.raises(TypeError):
+            cache.values(db)["number"] = "1"
+        db.close()
+
+
+# ============================================================================
+# Snapshots and invalidation
+# ============================================================================
+
+class TestInvalidation:
+
+    def test_one_load_until_a_setting_is_committed(self, session_factory, cache):
+        _set(session_factory, job_parallelism="4")
+        changes = []
+        cache.subscribe(changes.append)
+        db = session_factory()
+        manager = JobManager(db)
+
+        for _ in range(5):
+            assert manager._get_parallelism_setting() == 4
+            manager._get_execution_mode()
+            manager._get_retry_policy()
+        assert cache.loads == 1
+
+        version = cache.version
+        _set(session_factory, job_parallelism="8", job_dedup_mode="exact")
+        assert cache.version == version + 1
+        assert changes == [frozenset({"job_parallelism", "job_dedup_mode"})]
+        assert manager._get_parallelism_setting() == 8
+        assert cache.loads == 2
+
+        # Commits that do not touch settings keep the snapshot
+        db.commit()
+        manager._get_parallelism_setting()
+        assert cache.loads == 2
+        db.close()
+
+    def test_delete_and_rollback(self, session_factory, cache):
+        _set(session_factory, job_parallelism="4")
+        db = session_factory()
+        assert cache.get(db, "job_parallelism") == "4"
+
+        setting = db.query(SystemSetting).filter(SystemSetting.key == "job_parallelism").first()
+        setting.value = "6"
+        db.flush()
+        # Uncommitted change is visible to its own session but not cached
+        assert cache.get(db, "job_parallelism") == "6"
+        db.rollback()
+        version = cache.version
+        assert cache.get(db, "job_parallelism") == "4"
+
+        db.delete(db.query(SystemSetting).filter(SystemSetting.key == "job_parallelism").first())
+        db.commit()
+        assert cache.version == version + 1
+        assert cache.get(db, "job_parallelism") is None
+        db.close()
+
+    def test_databases_are_cached_separately(self, cache):
+        first, second = _session_factory(), _session_factory()
+        _set(first, job_parallelism="2")
+        db_first, db_second = first(), second()
+        assert cache.get(db_first, "job_parallelism") == "2"
+        assert cache.get(db_second, "job_parallelism") is None
+        db_first.close()
+        db_second.close()
+
+    def test_snapshots_expire(self, session_factory, cache):
+        cache.max_age = 0
+        db = session_factory()
+        cache.values(db)
+        cache.values(db)
+        assert cache.loads == 2
+        db.close()
+
+
+# ============================================================================
+# Endpoints and readers
+# ============================================================================
+
+class TestSettingsEndpoints:
+
+    def test_put_handler_invalidates(self, session_factory, cache):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        db = session_factory()
+        manager = JobManager(db)
+        assert manager._get_parallelism_setting() == 1
+        assert manager._get_adaptive_concurrency_setting()[0] is False
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            assert client.put("/api/settings/job-parallelism", params={"parallelism": 5}).status_code == 200
+            assert manager._get_parallelism_setting() == 5
+            response = client.put("/api/settings/adaptive-concurrency", params={"enabled": True, "max_limit": 12})
+            assert response.status_code == 200
+            assert manager._get_adaptive_concurrency_setting() == (True, 12)
+        finally:
+            app.dependency_overrides.clear()
+        db.close()
@@ -0,0 +1,191 @@
+"""Tests for the SQLite performance profile and the database writer thread.
+
+Test Categories:
+1. Connection pragmas
+2. Writer thread
+3. WAL checkpoints
+4. Job item buffer integration
+"""
+
+import os
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, Job, JobItem
+from backend.database.sqlite_profile import BUSY_TIMEOUT_MS, configure_sqlite_engine
+from backend.database.writer import DatabaseWriter, get_database_writer, reset_database_writers, run_write
+from backend.job_buffer import JobItemWriteBuffer
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def file_engine(tmp_path, monkeypatch):
+    monkeypatch.delenv("SQLITE_JOURNAL_MODE", raising=False)
+    monkeypatch.delenv("SQLITE_WRITER_THREAD", raising=False)
+    reset_database_writers()
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    reset_database_writers()
+    engine.dispose()
+
+
+def _pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+# ============================================================================
+# Connection pragmas
+# ============================================================================
+
+class TestPragmas:
+
+    def test_profile_applied_on_connect(self, file_engine):
+        with file_engine.connect() as connection:
+            assert _pragma(connection, "journal_mode") == "wal"
+            assert _pragma(connection, "synchronous") == 1  # NORMAL
+            assert _pragma(connection, "busy_timeout") == BUSY_TIMEOUT_MS
+            assert _pragma(connection, "temp_store") == 2  # MEMORY
+            assert _pragma(connection, "cache_size") < 0  # KiB
+
+    def test_memory_database_is_left_alone(self):
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        configure_sqlite_engine(engine)
+        with engine.connect() as connection:
+            assert _pragma(connection, "busy_timeout") != BUSY_TIMEOUT_MS
+        assert get_database_writer(engine) is None
+
+    def test_journal_mode_override(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SQLITE_JOURNAL_MODE", "delete")
+        engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+        configure_sqlite_engine(engine)
+        with engine.connect() as connection:
+            assert _pragma(connection, "journal_mode") == "delete"
+        # Checkpoint management needs WAL
+        assert get_database_writer(engine) is None
+        engine.dispose()
+
+
+# ============================================================================
+# Writer thread
+# ============================================================================
+
+class TestWriter:
+
+    def test_concurrent_writes_are_serialized(self, file_engine):
+        writer = get_database_writer(file_engine)
+        assert writer is get_database_writer(file_engine)
+        errors = []
+
+        def write(n):
+            try:
+                writer.run(lambda session: session.add(Job(job_type="batch", status="pending", model_name=f"m{n}")))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert writer.writes == 40
+        with file_engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM jobs")).scalar() == 40
+
+    def test_failed_write_is_rolled_back(self, file_engine):
+        writer = get_database_writer(file_engine)
+
+        def failing(session):
+            session.add(Job(job_type="batch", status="pending"))
+            session.flush()
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            writer.run(failing)
+        assert writer.run(lambda session: session.execute(text("SELECT COUNT(*) FROM jobs")).scalar()) == 0
+
+    def test_run_write_without_writer_commits_on_session(self, file_engine, monkeypatch):
+        monkeypatch.setenv("SQLITE_WRITER_THREAD", "false")
+        db = sessionmaker(bind=file_engine)()
+        assert get_database_writer(file_engine) is None
+        run_write(db, lambda session: session.add(Job(job_type="batch", status="pending")))
+        db.close()
+        with file_engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM jobs")).scalar() == 1
+
+
+# ============================================================================
+# Checkpoints
+# ============================================================================
+
+class TestCheckpoints:
+
+    def test_truncate_checkpoint_resets_wal(self, file_engine):
+        writer = DatabaseWriter(file_engine, checkpoint_interval=0)
+        try:
+            for _ in range(20):
+                writer.run(lambda session: session.add(Job(job_type="batch", status="pending")))
+            assert os.path.getsize(writer.wal_path) > 0
+
+            busy, _, _ = writer.checkpoint("TRUNCATE")
+            assert busy == 0
+            assert os.path.getsize(writer.wal_path) == 0
+        finally:
+            writer.close()
+
+    def test_periodic_checkpoint(self, file_engine):
+        writer = DatabaseWriter(file_engine, checkpoint_interval=0.01, wal_truncate_bytes=0)
+        try:
+            writer.run(lambda session: session.add(Job(job_type="batch", status="pending")))
+            for _ in range(200):
+                if writer.checkpoints and os.path.getsize(writer.wal_path) == 0:
+                    break
+                time.sleep(0.01)
+            assert writer.checkpoints > 0
+            assert os.path.getsize(writer.wal_path) == 0
+        finally:
+            writer.close()
+
+
+# ============================================================================
+# Job item buffer
+# ============================================================================
+
+class TestBufferIntegration:
+
+    def test_buffer_flushes_through_writer(self, file_engine):
+        Session = sessionmaker(bind=file_engine)
+        db = Session()
+        job = Job(job_type="batch", status="running")
+        db.add(job)
+        db.commit()
+        items = [JobItem(job_id=job.id, input_params="{}", raw_prompt="p", status="pending") for _ in range(3)]
+        db.add_all(items)
+        db.commit()
+        item_ids = [item.id for item in items]
+        job_id = job.id
+        db.close()
+
+        with JobItemWriteBuffer(Session(), job_id, max_delay=60) as buffer:
+            for item_id in item_ids:
+                buffer.mark_running(item_id)
+            buffer.record_result(item_ids[0], status="done", raw_response="ok")
+
+        assert get_database_writer(file_engine).writes == 1
+        db = Session()
+        statuses = dict(db.query(JobItem.id, JobItem.status).all())
+        db.close()
+        assert statuses == {item_ids[0]: "done", item_ids[1]: "running", item_ids[2]: "running"}
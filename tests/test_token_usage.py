@@ -0,0 +1,257 @@
+"""Tests for token usage capture and usage/cost reports.
+
+Test Categories:
+1. Usage extraction from provider responses
+2. Usage persisted on job items
+3. Job and model usage reports
+4. Usage and price API endpoints
+"""
+
+import json
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import Base, get_db, Project, ProjectRevision, Job, JobItem, SystemSetting
+from backend.job import JobManager
+from backend.llm.base import LLMClient, LLMResponse, extract_usage
+from backend.llm.batch import LocalBatchProvider, OpenAIBatchProvider
+from backend.usage import estimate_cost, get_job_usage, get_model_usage
+from app.main import app
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+class UsageClient(LLMClient):
+    """LLM client reporting fixed token usage per call."""
+
+    def call(self, prompt=None, messages=None, images=None, **kwargs):
+        return LLMResponse(
+            success=True,
+            response_text=f"echo:{prompt}",
+            turnaround_ms=500,
+            prompt_tokens=100,
+            completion_tokens=20,
+            reasoning_tokens=5,
+            cached_tokens=40
+        )
+
+    def get_default_parameters(self):
+        return {"temperature": 0.7}
+
+    def get_model_name(self):
+        return "usage-model"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+def _create_job(db, model_name="usage-model", item_count=3, turnaround_ms=None):
+    project = Project(name="Usage Project")
+    db.add(project)
+    db.commit()
+    revision = ProjectRevision(project_id=project.id, revision=1, prompt_template="{{text}}")
+    db.add(revision)
+    job = Job(project_revision_id=revision.id, job_type="batch", status="running",
+              model_name=model_name, turnaround_ms=turnaround_ms)
+    db.add(job)
+    db.commit()
+    for i in range(item_count):
+        db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt=f"p{i}"))
+    db.commit()
+    items = db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    return job, revision, items
+
+
+# ============================================================================
+# Usage extraction
+# ============================================================================
+
+class TestExtractUsage:
+
+    def test_openai(self):
+        response = SimpleNamespace(usage=SimpleNamespace(
+            prompt_tokens=120,
+            completion_tokens=80,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+            completion_tokens_details=SimpleNamespace(reasoning_tokens=50)
+        ))
+        assert extract_usage(response) == {
+            "prompt_tokens": 120, "completion_tokens": 80, "reasoning_tokens": 50, "cached_tokens": 64
+        }
+
+    def test_openai_batch_body(self):
+        body = {"usage": {"prompt_tokens": 10, "completion_tokens": 3, "prompt_tokens_details": None}}
+        assert extract_usage(body) == {
+            "prompt_tokens": 10, "completion_tokens": 3, "reasoning_tokens": None, "cached_tokens": None
+        }
+
+    def test_anthropic_counts_cache_reads_as_prompt(self):
+        response = SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=30, output_tokens=12, cache_read_input_tokens=200, cache_creation_input_tokens=None
+        ))
+        assert extract_usage(response) == {
+            "prompt_tokens": 230, "completion_tokens": 12, "reasoning_tokens": None, "cached_tokens": 200
+        }
+
+    def test_gemini_includes_thoughts_in_completion(self):
+        response = SimpleNamespace(usage_metadata=SimpleNamespace(
+            prompt_token_count=50, candidates_token_count=10, thoughts_token_count=25,
+            cached_content_token_count=None
+        ))
+        assert extract_usage(response) == {
+            "prompt_tokens": 50, "completion_tokens": 35, "reasoning_tokens": 25, "cached_tokens": None
+        }
+
+    def test_missing_usage(self):
+        assert set(extract_usage(SimpleNamespace()).values()) == {None}
+
+    def test_batch_result_line(self):
+        _, response = OpenAIBatchProvider._parse_line({
+            "custom_id": "item-1",
+            "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "hi"}}],
+                "usage": {"prompt_tokens": 7, "completion_tokens": 2}
+            }}
+        })
+        assert (response.prompt_tokens, response.completion_tokens) == (7, 2)
+
+
+# ============================================================================
+# Persistence
+# ============================================================================
+
+class TestUsagePersisted:
+
+    def test_serial_execution(self, test_db):
+        _, revision, items = _create_job(test_db)
+        errors = JobManager(test_db)._execute_items_serial(items, UsageClient(), revision, 0.5)
+        assert errors == 0
+        test_db.expire_all()
+        for item in test_db.query(JobItem).all():
+            assert (item.prompt_tokens, item.completion_tokens, item.reasoning_tokens, item.cached_tokens) \
+                == (100, 20, 5, 40)
+
+    def test_offload_execution(self, test_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobManager, "OFFLOAD_POLL_SECONDS", 0.01)
+        _, revision, items = _create_job(test_db)
+        provider = LocalBatchProvider(UsageClient(), str(tmp_path))
+        assert JobManager(test_db)._execute_items_offload(items, provider, revision, 0.5) == 0
+        test_db.expire_all()
+        assert {item.completion_tokens for item in test_db.query(JobItem).all()} == {20}
+
+
+# ============================================================================
+# Reports
+# ============================================================================
+
+class TestUsageReports:
+
+    def test_estimate_cost(self):
+        prices = {"input": 2.0, "output": 8.0, "cached_input": 0.5}
+        # 600k uncached + 400k cached input, 100k output
+        assert estimate_cost(prices, 1_000_000, 100_000, 400_000) == pytest.approx(1.2 + 0.2 + 0.8)
+        assert estimate_cost({"input": 1.0, "output": 1.0}, 10, 0, 10) == pytest.approx(0.00001)
+        assert estimate_cost(None, 10, 10, 0) is None
+
+    def test_job_usage(self, test_db):
+        job, revision, items = _create_job(test_db, turnaround_ms=1000)
+        JobManager(test_db)._execute_items_serial(items, UsageClient(), revision, 0.5)
+        test_db.add(JobItem(job_id=job.id, input_params="{}", raw_prompt="no usage", status="error"))
+        test_db.add(SystemSetting(key="llm_price_table", value=json.dumps(
+            {"usage-model": {"input": 1.0, "output": 2.0}}
+        )))
+        test_db.commit()
+
+        usage = get_job_usage(test_db, job.id)
+        assert usage["item_count"] == 4
+        assert usage["reported_items"] == 3
+        assert usage["prompt_tokens"] == 300
+        assert usage["completion_tokens"] == 60
+        assert usage["total_tokens"] == 360
+        # 60 completion tokens over 1.5s of call time
+        assert usage["tokens_per_second"] == 40.0
+        assert usage["job_tokens_per_second"] == 360.0
+        assert usage["cached_ratio"] == 0.4
+        assert usage["cost"] == pytest.approx((300 * 1.0 + 60 * 2.0) / 1_000_000)
+        assert get_job_usage(test_db, 999) is None
+
+    def test_model_usage(self, test_db):
+        for model_name, count in [("usage-model", 2), ("other-model", 1), ("unused-model", 0)]:
+            _, revision, items = _create_job(test_db, model_name=model_name, item_count=count)
+            JobManager(test_db)._execute_items_serial(items, UsageClient(), revision, 0.5)
+
+        reports = get_model_usage(test_db)
+        assert [report["model_name"] for report in reports] == ["usage-model", "other-model"]
+        assert reports[0]["prompt_tokens"] == 200
+        assert reports[0]["cost"] is None
+
+
+# ============================================================================
+# API endpoints
+# ============================================================================
+
+class TestUsageEndpoints:
+
+    @pytest.fixture
+    def client(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_prices_and_job_usage(self, client, session_factory):
+        response = client.put("/api/settings/llm-prices", json={"prices": {"usage-model": {"input": 1, "output": 4}}})
+        assert response.status_code == 200
+        assert client.get("/api/settings/llm-prices").json()["prices"] == {"usage-model": {"input": 1.0, "output": 4.0}}
+
+        db = session_factory()
+        job, revision, items = _create_job(db)
+        JobManager(db)._execute_items_serial(items, UsageClient(), revision, 0.5)
+        job_id = job.id
+        db.close()
+
+        usage = client.get(f"/api/jobs/{job_id}/usage").json()
+        assert usage["cost"] == pytest.approx((300 + 60 * 4) / 1_000_000)
+        assert client.get("/api/usage/models").json()[0]["model_name"] == "usage-model"
+        assert client.get("/api/jobs/999/usage").status_code == 404
+
+        items = client.get(f"/api/jobs/{job_id}/details").json()["items"]
+        assert items[0]["prompt_tokens"] == 100
+
+    def test_invalid_prices_rejected(self, client):
+        response = client.put("/api/settings/llm-prices", json={"prices": {"m": {"input": 1}}})
+        assert response.status_code == 400
+        response = client.put("/api/settings/llm-prices", json={"prices": {"m": {"input": 1, "output": -1}}})
+        assert response.status_code == 400